@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for multi-agent knowledge graph construction.
+
+This script measures how graph construction scales with the number of agents:
+1. Generates synthetic agents at constant spatial and inventory/goal density,
+   so the number of inter-agent relationships grows linearly with N
+2. Times single-pass AgentStateToGraph.agents_to_graph (NetworkX)
+3. Times AgentStateToGraph.agents_to_torch_geometric (direct PyG tensors)
+4. Times the legacy nx.compose loop for small N as a reference
+5. Reports the log-log scaling exponent of each method (1.0 is linear)
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import networkx as nx
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from meaning_transform.src.data import AGENT_ROLES, AgentState
+from meaning_transform.src.knowledge_graph import AgentStateToGraph
+
+
+def generate_agents(count: int, seed: int = 42) -> List[AgentState]:
+    """
+    Generate agents with a constant number of relationships per agent.
+
+    Positions fill a cube whose volume grows with the agent count, and
+    inventory items and goals are drawn from vocabularies of size ~N, so each
+    agent overlaps with a constant expected number of others.
+
+    Args:
+        count: Number of agents
+        seed: Random seed
+
+    Returns:
+        agents: List of synthetic agent states
+    """
+    rng = np.random.default_rng(seed)
+    side = (2.0 * count) ** (1.0 / 3.0)
+    positions = rng.uniform(0.0, side, size=(count, 3))
+    vocabulary = max(count, 1)
+
+    agents = []
+    for i in range(count):
+        items = rng.integers(0, vocabulary, size=3)
+        goals = rng.integers(0, vocabulary, size=2)
+        agents.append(
+            AgentState(
+                position=tuple(float(p) for p in positions[i]),
+                health=float(rng.uniform(0.1, 1.0)),
+                energy=float(rng.uniform(0.1, 1.0)),
+                inventory={f"item_{item}": int(rng.integers(1, 10)) for item in items},
+                role=AGENT_ROLES[i % len(AGENT_ROLES)],
+                goals=[f"goal_{goal}" for goal in goals],
+                agent_id=f"agent_{i}",
+                resource_level=float(rng.uniform(0.0, 1.0)),
+            )
+        )
+    return agents
+
+
+def compose_graph(converter: AgentStateToGraph, agents: List[AgentState]) -> nx.Graph:
+    """Legacy construction composing per-agent graphs one by one."""
+    G = nx.Graph()
+    for agent in agents:
+        G = nx.compose(G, converter.agent_to_graph(agent))
+    if converter.include_relations:
+        converter._add_agent_relationships(G, agents)
+    return G
+
+
+def time_call(fn: Callable[[], object], repeats: int) -> float:
+    """Return the best wall-clock time of several calls."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def scaling_exponent(sizes: List[int], times: List[float]) -> float:
+    """Slope of log(time) against log(size)."""
+    if len(sizes) < 2:
+        return float("nan")
+    return float(np.polyfit(np.log(sizes), np.log(times), 1)[0])
+
+
+def run_benchmark(
+    sizes: List[int], compose_max: int, repeats: int, threshold: float
+) -> Dict[str, Dict[str, List[float]]]:
+    """
+    Time each construction method at every size.
+
+    Args:
+        sizes: Agent counts to benchmark
+        compose_max: Largest agent count for the legacy compose loop
+        repeats: Timed repetitions per size (best is reported)
+        threshold: Relationship threshold of the converter
+
+    Returns:
+        results: Sizes and timings per method
+    """
+    converter = AgentStateToGraph(relationship_threshold=threshold)
+    methods = {
+        "agents_to_graph": lambda agents: converter.agents_to_graph(agents),
+        "agents_to_torch_geometric": lambda agents: converter.agents_to_torch_geometric(
+            agents
+        ),
+        "compose_loop": lambda agents: compose_graph(converter, agents),
+    }
+    results = {name: {"sizes": [], "seconds": []} for name in methods}
+
+    for size in sizes:
+        agents = generate_agents(size)
+        for name, method in methods.items():
+            if name == "compose_loop" and size > compose_max:
+                continue
+            seconds = time_call(lambda: method(agents), repeats)
+            results[name]["sizes"].append(size)
+            results[name]["seconds"].append(seconds)
+            print(f"{name:>28s}  N={size:>7d}  {seconds:9.3f} s")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark multi-agent knowledge graph construction"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 3000, 10000, 30000, 100000],
+        help="Agent counts to benchmark",
+    )
+    parser.add_argument(
+        "--compose-max",
+        type=int,
+        default=3000,
+        help="Largest agent count for the legacy nx.compose loop",
+    )
+    parser.add_argument("--repeats", type=int, default=1, help="Timed repetitions")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.01,
+        help="Relationship threshold (0.01 is a proximity radius of 1 unit)",
+    )
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.compose_max, args.repeats, args.threshold)
+
+    print("\nScaling exponents (time ~ N^k, k=1 is linear):")
+    for name, timings in results.items():
+        exponent = scaling_exponent(timings["sizes"], timings["seconds"])
+        timings["exponent"] = exponent
+        print(f"{name:>28s}  k={exponent:.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for the batched inference server.
+
+This script compares encode throughput for:
+1. Direct single-item calls (one model call per agent state)
+2. Concurrent single-item requests coalesced by InferenceServer
+3. One large batch through the encoder pipeline (upper bound)
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import torch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from meaning_transform.src.data import AgentStateBatch, generate_agent_states
+from meaning_transform.src.inference_server import InferenceServer
+from meaning_transform.src.models import MeaningVAE
+from meaning_transform.src.pipelines.pipeline import PipelineFactory
+
+
+async def serve_requests(server: InferenceServer, states, concurrency: int) -> float:
+    """Encode every state with a fixed number of concurrent callers."""
+    queue = list(reversed(states))
+
+    async def caller():
+        while queue:
+            await server.encode(queue.pop())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the inference server")
+    parser.add_argument("--num-states", type=int, default=20000, help="Agent states")
+    parser.add_argument("--latent-dim", type=int, default=32, help="Latent dimension")
+    parser.add_argument("--concurrency", type=int, default=512, help="Concurrent callers")
+    parser.add_argument("--max-batch-size", type=int, default=512, help="Micro-batch size")
+    parser.add_argument("--max-latency-ms", type=float, default=2.0, help="Batch deadline")
+    args = parser.parse_args()
+
+    states = generate_agent_states(count=args.num_states, random_seed=42)
+    features = AgentStateBatch.from_states(states).to_tensor()
+    model = MeaningVAE(input_dim=features.size(1), latent_dim=args.latent_dim).eval()
+    pipeline = PipelineFactory.create_encoder_only_pipeline(model)
+
+    # Single-item calls
+    single_count = min(2000, len(states))
+    start = time.perf_counter()
+    with torch.inference_mode():
+        for row in features[:single_count]:
+            pipeline.process(row.unsqueeze(0))
+    single_rate = single_count / (time.perf_counter() - start)
+
+    # Coalesced single-item requests
+    async def run_server():
+        async with InferenceServer(
+            model,
+            max_batch_size=args.max_batch_size,
+            max_latency_ms=args.max_latency_ms,
+            encoder_pipeline=pipeline,
+        ) as server:
+            seconds = await serve_requests(server, features, args.concurrency)
+            return seconds, server.stats()
+
+    server_seconds, stats = asyncio.run(run_server())
+    server_rate = len(states) / server_seconds
+
+    # One large batch
+    start = time.perf_counter()
+    with torch.inference_mode():
+        pipeline.process(features)
+    batch_rate = len(states) / (time.perf_counter() - start)
+
+    print(f"single-item calls:  {single_rate:12.0f} states/s")
+    print(f"inference server:   {server_rate:12.0f} states/s")
+    print(f"large batch:        {batch_rate:12.0f} states/s")
+    print(f"mean batch size:    {stats['batch_size']['mean']:12.1f}")
+    print(f"mean queue depth:   {stats['queue_depth']['mean']:12.1f}")
+    print(f"mean latency:       {stats['mean_latency_ms']:12.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
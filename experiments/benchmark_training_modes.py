@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for Trainer execution modes.
+
+This script compares training throughput (samples/sec) on synthetic agent
+states for:
+1. fp32 eager (baseline)
+2. bf16 and fp16 autocast (fp16 uses a GradScaler on CUDA)
+3. Fused Adam
+4. torch.compile of the model forward and loss, alone and with bf16
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from meaning_transform.src.config import Config
+from meaning_transform.src.data import AgentStateDataset, generate_agent_states
+from meaning_transform.src.train import Trainer
+
+MODES = {
+    "fp32": {},
+    "bf16": {"precision": "bf16"},
+    "fp16": {"precision": "fp16"},
+    "fused-adam": {"fused_optimizer": True},
+    "compile": {"compile": True},
+    "compile+bf16": {"compile": True, "precision": "bf16"},
+}
+
+
+def benchmark_mode(name, options, states, args, checkpoint_dir):
+    """Train a fresh model in one mode and return samples/sec and final loss."""
+    config = Config()
+    config.verbose = False
+    config.experiment_name = f"benchmark_{name}"
+    config.model.input_dim = states[0].to_tensor().numel()
+    config.model.latent_dim = args.latent_dim
+    config.training.batch_size = args.batch_size
+    config.training.checkpoint_dir = checkpoint_dir
+    for key, value in options.items():
+        setattr(config.training, key, value)
+
+    torch.manual_seed(0)
+    trainer = Trainer(config, device=args.device)
+    trainer.train_dataset = AgentStateDataset(states, batch_size=args.batch_size)
+
+    # Warm-up epoch (includes compilation)
+    trainer.train_epoch()
+
+    if trainer.device.type == "cuda":
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    for _ in range(args.epochs):
+        metrics = trainer.train_epoch()
+    if trainer.device.type == "cuda":
+        torch.cuda.synchronize()
+    seconds = time.perf_counter() - start
+
+    samples = args.epochs * (len(states) // args.batch_size) * args.batch_size
+    return samples / seconds, metrics["train_loss"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Trainer execution modes")
+    parser.add_argument("--num-states", type=int, default=20000, help="Agent states")
+    parser.add_argument("--batch-size", type=int, default=256, help="Batch size")
+    parser.add_argument("--latent-dim", type=int, default=32, help="Latent dimension")
+    parser.add_argument("--epochs", type=int, default=3, help="Timed epochs per mode")
+    parser.add_argument("--device", type=str, default=None, help="cuda or cpu")
+    parser.add_argument(
+        "--modes", nargs="+", default=list(MODES), choices=list(MODES), help="Modes to run"
+    )
+    args = parser.parse_args()
+
+    states = generate_agent_states(count=args.num_states, random_seed=42)
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        results = {
+            name: benchmark_mode(name, MODES[name], states, args, checkpoint_dir)
+            for name in args.modes
+        }
+
+    baseline = results.get("fp32", (None, None))[0]
+    print(f"{'mode':<14} {'samples/s':>12} {'speedup':>8} {'final loss':>11}")
+    for name, (rate, loss) in results.items():
+        speedup = f"{rate / baseline:7.2f}x" if baseline else "      -"
+        print(f"{name:<14} {rate:12.0f} {speedup:>8} {loss:11.4f}")
+
+
+if __name__ == "__main__":
+    main()
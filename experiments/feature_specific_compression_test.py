@@ -96,7 +96,7 @@ def load_data(
             if os.path.exists(pkl_path):
                 print(f"Loading agent states from pickle file {pkl_path}...")
                 try:
-                    dataset.load_from_file(pkl_path)
+                    dataset.load_from_file(pkl_path, allow_pickle=True)
                     if dataset.states:
                         db_loaded = True
                         break
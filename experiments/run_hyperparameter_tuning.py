@@ -11,6 +11,10 @@ This script runs a series of experiments to tune hyperparameters:
 
 The goal is to find optimal settings that minimize semantic drift and 
 maintain meaning preservation across transformations.
+
+Trials can run in parallel worker processes (--workers); finished trials are
+recorded as they complete, so an interrupted sweep resumes with --resume-dir.
+With --asha, losing trials are stopped early by successive halving.
 """
 
 import argparse
@@ -30,12 +34,15 @@ import torch
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.append(str(project_root))
+sys.path.append(str(project_root.parent))  # For meaning_transform.* imports
 
-from src.config import Config
-from src.data import AgentState, AgentStateDataset
-from src.metrics import SemanticMetrics, compute_feature_drift
-from src.model import MeaningVAE
-from src.train import Trainer
+from meaning_transform.experiment.scheduler import ASHAScheduler
+from meaning_transform.experiment.sweep import SweepExecutor
+from meaning_transform.src.config import Config
+from meaning_transform.src.data import AgentState, AgentStateBatch, AgentStateDataset
+from meaning_transform.src.metrics import SemanticMetrics, compute_feature_drift
+from meaning_transform.src.models import MeaningVAE
+from meaning_transform.src.train import Trainer
 
 
 class HyperparameterTuningExperiment:
@@ -45,6 +52,10 @@ class HyperparameterTuningExperiment:
         self,
         base_config: Config = None,
         output_dir: str = None,
+        num_workers: int = 1,
+        threads_per_worker: int = None,
+        resume_dir: str = None,
+        scheduler: ASHAScheduler = None,
     ):
         """
         Initialize hyperparameter tuning experiment.
@@ -52,16 +63,27 @@ class HyperparameterTuningExperiment:
         Args:
             base_config: Base configuration to use (will be modified for each experiment)
             output_dir: Directory to save experiment results
+            num_workers: Number of trials trained in parallel worker processes
+            threads_per_worker: torch threads per worker (defaults to an even share of cores)
+            resume_dir: Experiment directory of an interrupted sweep to resume
+            scheduler: Optional ASHA scheduler that stops losing trials early
         """
         self.base_config = base_config or Config()
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+        self.scheduler = scheduler
 
         # Create timestamp for experiment
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.experiment_name = f"hyperparameter_tuning_{timestamp}"
 
-        # Create output directory
+        # Create output directory (or reuse the one being resumed)
         self.output_dir = Path(output_dir or "results/hyperparameter_tuning")
-        self.experiment_dir = self.output_dir / self.experiment_name
+        if resume_dir:
+            self.experiment_dir = Path(resume_dir)
+            self.experiment_name = self.experiment_dir.name
+        else:
+            self.experiment_dir = self.output_dir / self.experiment_name
         self.experiment_dir.mkdir(parents=True, exist_ok=True)
 
         # Create subdirectories
@@ -152,62 +174,108 @@ class HyperparameterTuningExperiment:
         total_experiments = len(param_combinations)
         print(f"Total experiments to run: {total_experiments}")
 
-        # Run an experiment for each combination
-        for i, (latent_dim, compression_level, semantic_weight) in enumerate(param_combinations):
-            experiment_id = f"latent{latent_dim}_comp{compression_level}_sem{semantic_weight}"
-            
-            print(f"\n{'='*80}")
-            print(f"Running experiment {i+1}/{total_experiments}: {experiment_id}")
-            print(f"Latent dim: {latent_dim}, Compression: {compression_level}, Semantic weight: {semantic_weight}")
-            print(f"{'='*80}")
-
-            # Create a config for this experiment
-            config = self._create_config_for_experiment(
-                latent_dim, compression_level, semantic_weight
-            )
-
-            # Create a trainer with this config
-            trainer = Trainer(config)
-
-            # Set the pre-prepared dataset to the trainer
-            trainer.train_dataset = dataset["train"]
-            trainer.val_dataset = dataset["val"]
-            trainer.drift_tracking_states = dataset["drift_tracking"]
-
-            # Train the model
-            training_results = trainer.train()
-
-            # Save model directly after training
-            model_dest = self.models_dir / f"model_{experiment_id}.pt"
-            trainer.model.compression_level = compression_level  # Ensure compression level is set
-            trainer.model.latent_dim = latent_dim  # Ensure latent dimension is set
-            trainer.model.save(model_dest)
-            print(f"Saved model to {model_dest}")
-
-            # Store semantic drift for this model
-            semantic_drift = self._evaluate_semantic_drift(trainer.model)
-
-            # Save results
-            self.results[experiment_id] = {
+        trials = {
+            f"latent{latent_dim}_comp{compression_level}_sem{semantic_weight}": {
                 "latent_dim": latent_dim,
                 "compression_level": compression_level,
                 "semantic_weight": semantic_weight,
-                "training_results": training_results,
-                "model_path": str(model_dest),
-                "experiment_dir": training_results.get(
-                    "experiment_dir", str(self.models_dir)
-                ),
-                "semantic_drift": semantic_drift,
-                "val_loss": training_results.get("best_val_loss", 0.0),
-                "recon_loss": training_results.get("best_recon_loss", 0.0),
-                "kl_loss": training_results.get("best_kl_loss", 0.0),
-                "semantic_loss": training_results.get("best_semantic_loss", 0.0),
-                "compression_loss": training_results.get("best_compression_loss", 0.0),
             }
+            for latent_dim, compression_level, semantic_weight in param_combinations
+        }
+
+        # Share rung records between worker processes through the metrics directory
+        if self.scheduler is not None and self.scheduler.state_path is None:
+            self.scheduler.state_path = self.metrics_dir / "asha_rungs.jsonl"
+
+        # Run trials in parallel, recording each result as it finishes
+        executor = SweepExecutor(
+            self.metrics_dir / "trials.jsonl",
+            max_workers=self.num_workers,
+            threads_per_worker=self.threads_per_worker,
+        )
+        executor.share_dataset(dataset)
+        self.results = executor.run(self._run_trial, trials)
 
         # Analyze results
         self._analyze_results()
 
+    def _run_trial(
+        self, experiment_id: str, params: Dict[str, Any], dataset: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Train and evaluate one hyperparameter combination.
+
+        Runs in a sweep worker process when trials are parallel.
+
+        Args:
+            experiment_id: Identifier of the combination
+            params: latent_dim, compression_level and semantic_weight
+            dataset: Prepared train, validation and drift tracking data
+
+        Returns:
+            Result entry for self.results
+        """
+        latent_dim = params["latent_dim"]
+        compression_level = params["compression_level"]
+        semantic_weight = params["semantic_weight"]
+
+        print(f"\n{'='*80}")
+        print(f"Running experiment: {experiment_id}")
+        print(f"Latent dim: {latent_dim}, Compression: {compression_level}, Semantic weight: {semantic_weight}")
+        print(f"{'='*80}")
+
+        # Create a config for this experiment
+        config = self._create_config_for_experiment(
+            latent_dim, compression_level, semantic_weight
+        )
+
+        # Create a trainer with this config
+        trainer = Trainer(config)
+
+        # Set the pre-prepared dataset to the trainer
+        trainer.train_dataset = dataset["train"]
+        trainer.val_dataset = dataset["val"]
+        trainer.drift_tracking_states = dataset["drift_tracking"]
+
+        # Let the scheduler stop this trial early
+        if self.scheduler is not None:
+            self.scheduler.attach(trainer, experiment_id)
+
+        # Train the model
+        training_results = trainer.train()
+        epochs_trained = len(training_results.get("val_losses", []))
+
+        # Save model directly after training
+        model_dest = self.models_dir / f"model_{experiment_id}.pt"
+        trainer.model.compression_level = compression_level  # Ensure compression level is set
+        trainer.model.latent_dim = latent_dim  # Ensure latent dimension is set
+        trainer.model.save(model_dest)
+        print(f"Saved model to {model_dest}")
+
+        # Store semantic drift for this model
+        semantic_drift = self._evaluate_semantic_drift(
+            trainer.model, dataset["drift_tracking"]
+        )
+
+        return {
+            "latent_dim": latent_dim,
+            "compression_level": compression_level,
+            "semantic_weight": semantic_weight,
+            "training_results": training_results,
+            "model_path": str(model_dest),
+            "experiment_dir": training_results.get(
+                "experiment_dir", str(self.models_dir)
+            ),
+            "semantic_drift": semantic_drift,
+            "epochs_trained": epochs_trained,
+            "early_stopped": epochs_trained < config.training.num_epochs,
+            "val_loss": training_results.get("best_val_loss", 0.0),
+            "recon_loss": training_results.get("best_recon_loss", 0.0),
+            "kl_loss": training_results.get("best_kl_loss", 0.0),
+            "semantic_loss": training_results.get("best_semantic_loss", 0.0),
+            "compression_loss": training_results.get("best_compression_loss", 0.0),
+        }
+
     def _prepare_data(self) -> Dict[str, AgentStateDataset]:
         """
         Prepare datasets for experiments.
@@ -301,12 +369,15 @@ class HyperparameterTuningExperiment:
 
         return config
 
-    def _evaluate_semantic_drift(self, model: MeaningVAE) -> float:
+    def _evaluate_semantic_drift(
+        self, model: MeaningVAE, drift_states: List[AgentState]
+    ) -> float:
         """
         Evaluate semantic drift for a model using the drift tracking states.
 
         Args:
             model: The model to evaluate
+            drift_states: States set aside for drift tracking
 
         Returns:
             Average semantic drift score
@@ -319,14 +390,6 @@ class HyperparameterTuningExperiment:
 
         semantic_metrics = SemanticMetrics()
 
-        # Get the drift tracking states from prepared data
-        try:
-            dataset = self._prepare_data()
-            drift_states = dataset["drift_tracking"]
-        except Exception as e:
-            print(f"Error preparing drift tracking data: {e}")
-            return 0.5  # Return a default value if we can't get drift states
-
         # Ensure we have at least some states to evaluate
         if not drift_states:
             print("Warning: No drift tracking states available for evaluation")
@@ -338,17 +401,14 @@ class HyperparameterTuningExperiment:
 
         try:
             with torch.no_grad():
-                for state in drift_states:
-                    # Convert state to tensor
-                    tensor = state.to_tensor().unsqueeze(0).to(device)
+                # Encode all states and run them through the model in one pass
+                tensor = AgentStateBatch.from_states(drift_states).to_tensor().to(device)
+                result = model(tensor)
 
-                    # Run through the model
-                    result = model(tensor)
-                    reconstructed = result["x_reconstructed"][0].cpu()
-
-                    # Convert back to agent state
-                    reconstructed_state = AgentState.from_tensor(reconstructed)
+                # Decode all reconstructions back to columnar agent states at once
+                reconstructed_states = AgentStateBatch.from_tensor(result["x_reconstructed"])
 
+                for state, reconstructed_state in zip(drift_states, reconstructed_states):
                     # Compute semantic drift
                     feature_drift = compute_feature_drift(state, reconstructed_state)
 
@@ -673,6 +733,47 @@ def parse_args():
     )
     parser.add_argument("--gpu", action="store_true", help="Use GPU for training")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of trials to train in parallel worker processes",
+    )
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=None,
+        help="torch threads per worker (defaults to an even share of the CPU cores)",
+    )
+    parser.add_argument(
+        "--asha",
+        action="store_true",
+        help="Stop losing trials early with asynchronous successive halving",
+    )
+    parser.add_argument(
+        "--asha-grace-period",
+        type=int,
+        default=1,
+        help="Epochs every trial trains before it can be stopped",
+    )
+    parser.add_argument(
+        "--asha-reduction-factor",
+        type=int,
+        default=3,
+        help="Keep the top 1/N trials at each successive-halving rung",
+    )
+    parser.add_argument(
+        "--asha-drift-weight",
+        type=float,
+        default=0.0,
+        help="Weight of semantic drift added to val_loss when ranking trials",
+    )
+    parser.add_argument(
+        "--resume-dir",
+        type=str,
+        default=None,
+        help="Experiment directory of an interrupted sweep to resume",
+    )
     
     # Add arguments for limiting hyperparameter search space
     parser.add_argument(
@@ -726,8 +827,25 @@ def main():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     base_config.experiment_name = f"hyperparameter_tuning_{timestamp}"
 
+    # Optional early-stopping scheduler
+    scheduler = None
+    if args.asha:
+        scheduler = ASHAScheduler(
+            max_epochs=args.epochs,
+            grace_period=args.asha_grace_period,
+            reduction_factor=args.asha_reduction_factor,
+            drift_weight=args.asha_drift_weight,
+        )
+
     # Create and run experiment
-    experiment = HyperparameterTuningExperiment(base_config, args.output_dir)
+    experiment = HyperparameterTuningExperiment(
+        base_config,
+        args.output_dir,
+        num_workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        resume_dir=args.resume_dir,
+        scheduler=scheduler,
+    )
     
     # Override default hyperparameter values with command line args
     experiment.latent_dimensions = latent_dims
@@ -416,8 +416,8 @@ def main():
     train_size = int(0.7 * total_size)
     val_size = int(0.15 * total_size)
     
-    # Shuffle the states
-    random.shuffle(states)
+    # Shuffle the states (a columnar batch, so select rows in shuffled order)
+    states = states[random.sample(range(total_size), total_size)]
     
     train_states = states[:train_size]
     val_states = states[train_size:train_size+val_size]
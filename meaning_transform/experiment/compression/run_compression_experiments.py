@@ -13,6 +13,12 @@ Experiments:
 3. Create visualization comparisons between compression levels
 4. Identify optimal compression setting for balancing information density with meaning retention
 5. Document findings in a compression analysis report
+
+With --asha, compression levels that are clearly losing after a few epochs are
+stopped early by an asynchronous successive-halving scheduler.
+
+With --ensemble, all compression levels are trained together as one batched
+ensemble of MeaningVAEs instead of one after another.
 """
 
 import argparse
@@ -22,7 +28,7 @@ import sys
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Callable, Dict, Tuple, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -34,6 +40,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
 from meaning_transform.experiment.base_experiment import BaseExperiment
+from meaning_transform.experiment.scheduler import ASHAScheduler
 
 # Import after adding project root to path
 from meaning_transform.src.config import Config
@@ -81,6 +88,8 @@ class CompressionExperiment(BaseExperiment):
         use_graph: bool = False,
         track_drift: bool = False,
         use_beta_annealing: bool = True,
+        scheduler: ASHAScheduler = None,
+        use_ensemble: bool = False,
     ):
         """
         Initialize compression experiment.
@@ -92,7 +101,16 @@ class CompressionExperiment(BaseExperiment):
             use_graph: Whether to use graph-based modeling
             track_drift: Whether to track semantic drift (may cause errors if dependencies missing)
             use_beta_annealing: Whether to use beta annealing for stable KL loss
+            scheduler: Optional ASHA scheduler that stops losing levels early
+            use_ensemble: Whether to train all compression levels together as
+                one batched ensemble (MeaningVAE without graphs or ASHA only)
         """
+        if use_ensemble and (use_adaptive_model or use_graph or scheduler is not None):
+            raise ValueError(
+                "Ensemble training supports the standard MeaningVAE without "
+                "graph modeling or an ASHA scheduler"
+            )
+
         # Create timestamp for experiment
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         experiment_name = f"compression_experiments_{timestamp}"
@@ -109,6 +127,8 @@ class CompressionExperiment(BaseExperiment):
         self.use_graph = use_graph
         self.track_drift = track_drift
         self.use_beta_annealing = use_beta_annealing
+        self.scheduler = scheduler
+        self.use_ensemble = use_ensemble
 
         # Set compression levels to test
         self.compression_levels = [0.5, 1.0, 2.0, 5.0]
@@ -131,6 +151,7 @@ class CompressionExperiment(BaseExperiment):
             "use_adaptive_model": self.use_adaptive_model,
             "use_graph": self.use_graph,
             "use_beta_annealing": self.use_beta_annealing,
+            "use_ensemble": self.use_ensemble,
         }
 
         # Use parent class method to save the config
@@ -155,6 +176,9 @@ class CompressionExperiment(BaseExperiment):
         )
         logging.info(f"Using device: {device}")
 
+        # Train every level up front when they share one batched ensemble
+        ensemble_runs = self._train_ensemble(dataset) if self.use_ensemble else {}
+
         # Run an experiment for each compression level
         for level in self.compression_levels:
             logging.info(f"\n{'='*80}")
@@ -164,8 +188,11 @@ class CompressionExperiment(BaseExperiment):
             # Create a config for this experiment
             config = self._create_config_for_level(level)
 
-            # Create model for this compression level
-            model = self._create_model(config, level)
+            # Create model for this compression level (already trained in an ensemble)
+            if level in ensemble_runs:
+                model, training_results = ensemble_runs[level]
+            else:
+                model = self._create_model(config, level)
             model = model.to(device)
 
             # Create pipeline for this compression level
@@ -178,7 +205,9 @@ class CompressionExperiment(BaseExperiment):
             )
 
             # Train the model
-            training_results = self._train_model(model, config, dataset)
+            if level not in ensemble_runs:
+                training_results = self._train_model(model, config, dataset)
+            epochs_trained = len(training_results.get("val_losses", []))
 
             # Save model after training
             model_dest = self.models_dir / f"model_compression_{level}.pt"
@@ -358,6 +387,8 @@ class CompressionExperiment(BaseExperiment):
                 "param_count": param_count,
                 "effective_dim": effective_dim,
                 "compression_rate": compression_rate,
+                "epochs_trained": epochs_trained,
+                "early_stopped": epochs_trained < config.training.num_epochs,
             }
 
             # Find the best values from training history
@@ -494,6 +525,10 @@ class CompressionExperiment(BaseExperiment):
         if self.track_drift and "drift_tracking" in dataset:
             trainer.drift_tracking_states = dataset["drift_tracking"]
 
+        # Let the scheduler stop this compression level early
+        if self.scheduler is not None:
+            self.scheduler.attach(trainer, config.experiment_name)
+
         # Implement beta annealing if enabled
         if self.use_beta_annealing:
             # Store the original train method
@@ -506,29 +541,9 @@ class CompressionExperiment(BaseExperiment):
                 # Original KL weight
                 original_kl_weight = config.training.kl_loss_weight
 
-                # Define a hook to update KL weight before each epoch
-                def pre_epoch_hook(trainer, epoch):
-                    # Calculate beta using sigmoid annealing
-                    beta = beta_annealing(
-                        epoch=epoch,
-                        max_epochs=config.training.num_epochs,
-                        min_beta=0.0001,  # Start with very small KL weight
-                        max_beta=original_kl_weight,  # End with configured weight
-                        schedule_type="sigmoid",
-                    )
-
-                    # Update KL weight in the loss function
-                    if hasattr(trainer, "loss_fn") and hasattr(
-                        trainer.loss_fn, "kl_loss_weight"
-                    ):
-                        trainer.loss_fn.kl_loss_weight = beta
-                        logging.info(
-                            f"Epoch {epoch+1}/{config.training.num_epochs}: KL weight set to {beta:.6f}"
-                        )
-
                 # Add the hook to trainer if it has the mechanism
                 if hasattr(trainer, "register_hook"):
-                    trainer.register_hook("pre_epoch", pre_epoch_hook)
+                    trainer.register_hook("pre_epoch", self._kl_annealing_hook(config))
                 else:
                     # If the trainer doesn't have hook mechanism, we'll modify the train_epoch method
                     original_train_epoch = trainer.train_epoch
@@ -574,6 +589,87 @@ class CompressionExperiment(BaseExperiment):
 
         return training_results
 
+    def _kl_annealing_hook(self, config: Config) -> Callable:
+        """
+        Create a pre-epoch hook that anneals the trainer's KL weight.
+
+        Args:
+            config: Training configuration with the final KL weight
+
+        Returns:
+            Hook called as ``hook(trainer, epoch)``
+        """
+        # Original KL weight
+        original_kl_weight = config.training.kl_loss_weight
+
+        def pre_epoch_hook(trainer, epoch):
+            # Calculate beta using sigmoid annealing
+            beta = beta_annealing(
+                epoch=epoch,
+                max_epochs=config.training.num_epochs,
+                min_beta=0.0001,  # Start with very small KL weight
+                max_beta=original_kl_weight,  # End with configured weight
+                schedule_type="sigmoid",
+            )
+
+            # Update KL weight in the loss function
+            if hasattr(trainer, "loss_fn") and hasattr(
+                trainer.loss_fn, "kl_loss_weight"
+            ):
+                trainer.loss_fn.kl_loss_weight = beta
+                logging.info(
+                    f"Epoch {epoch+1}/{config.training.num_epochs}: KL weight set to {beta:.6f}"
+                )
+
+        return pre_epoch_hook
+
+    def _train_ensemble(
+        self, dataset: Dict
+    ) -> Dict[float, Tuple[MeaningVAE, Dict[str, Any]]]:
+        """
+        Train a model for every compression level as one batched ensemble.
+
+        Args:
+            dataset: Dictionary containing train and validation datasets
+
+        Returns:
+            Trained model and training results keyed by compression level
+        """
+        # Import here to avoid circular imports
+        from meaning_transform.src.ensemble_trainer import EnsembleTrainer
+
+        logging.info(
+            f"Training {len(self.compression_levels)} compression levels as one ensemble"
+        )
+
+        # Levels differ only in the compression level of each member
+        config = self._create_config_for_level(self.compression_levels[0])
+        config.experiment_name = "compression_ensemble"
+        trainer = EnsembleTrainer(
+            config,
+            [
+                {"name": f"compression_{level}", "compression_level": level}
+                for level in self.compression_levels
+            ],
+        )
+
+        trainer.train_dataset = dataset["train"]
+        trainer.val_dataset = dataset["val"]
+        if self.track_drift and "drift_tracking" in dataset:
+            trainer.drift_tracking_states = dataset["drift_tracking"]
+
+        if self.use_beta_annealing:
+            logging.info("Using beta annealing for stable KL loss...")
+            trainer.register_hook("pre_epoch", self._kl_annealing_hook(config))
+
+        training_results = trainer.train()
+        return {
+            level: (model, results)
+            for level, model, results in zip(
+                self.compression_levels, trainer.models, training_results
+            )
+        }
+
     def _prepare_data(self) -> Dict[str, AgentStateDataset]:
         """
         Prepare datasets for experiments.
@@ -1831,6 +1927,34 @@ def parse_args():
         action="store_true",
         help="Use beta annealing for KL weight to prevent zero-valued losses",
     )
+    parser.add_argument(
+        "--asha",
+        action="store_true",
+        help="Stop losing compression levels early with asynchronous successive halving",
+    )
+    parser.add_argument(
+        "--asha-grace-period",
+        type=int,
+        default=1,
+        help="Epochs every level trains before it can be stopped",
+    )
+    parser.add_argument(
+        "--asha-reduction-factor",
+        type=int,
+        default=3,
+        help="Keep the top 1/N levels at each successive-halving rung",
+    )
+    parser.add_argument(
+        "--asha-drift-weight",
+        type=float,
+        default=0.0,
+        help="Weight of semantic drift added to val_loss when ranking levels",
+    )
+    parser.add_argument(
+        "--ensemble",
+        action="store_true",
+        help="Train all compression levels together as one batched ensemble",
+    )
 
     return parser.parse_args()
 
@@ -1892,6 +2016,18 @@ def main():
     logging.info(f"- Skip drift tracking: {args.skip_drift}")
     logging.info(f"- Compression levels: {compression_levels}")
     logging.info(f"- Beta annealing: {args.beta_annealing}")
+    logging.info(f"- ASHA early stopping: {args.asha}")
+    logging.info(f"- Ensemble training: {args.ensemble}")
+
+    # Optional early-stopping scheduler
+    scheduler = None
+    if args.asha:
+        scheduler = ASHAScheduler(
+            max_epochs=args.epochs,
+            grace_period=args.asha_grace_period,
+            reduction_factor=args.asha_reduction_factor,
+            drift_weight=args.asha_drift_weight,
+        )
 
     # Create and run experiment
     experiment = CompressionExperiment(
@@ -1901,6 +2037,8 @@ def main():
         use_graph=args.graph,
         track_drift=not args.skip_drift,
         use_beta_annealing=args.beta_annealing,
+        scheduler=scheduler,
+        use_ensemble=args.ensemble,
     )
 
     # Override default compression levels if specified
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Asynchronous successive-halving (ASHA) scheduler for experiment sweeps.
+
+This module provides:
+1. Rung budgets grace_period * reduction_factor**k epochs below the full budget
+2. Per-epoch scoring from the val_loss and drift metrics reported by Trainer.train
+3. Promotion of the top 1/reduction_factor of trials at each rung once it holds at
+   least reduction_factor scores; the rest stop early
+4. Rung records shared through an append-only file, so trials in separate
+   sweep worker processes are compared against each other
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+
+class ASHAScheduler:
+    """
+    Stops losing trials early using asynchronous successive halving.
+
+    Trials train continuously; when a trial finishes a rung epoch its score
+    is recorded for that rung and compared against every score recorded
+    there so far. Once a rung holds at least ``reduction_factor`` scores,
+    only trials in the top ``1 / reduction_factor`` continue (are promoted
+    to the next rung's budget); the rest stop. Trials reaching a rung with
+    fewer scores recorded always continue. Trials never
+    wait for each other, so the scheduler works with sequential and
+    parallel sweeps alike.
+
+    Lower scores are better. The score is ``metric`` plus ``drift_weight``
+    times the epoch's ``overall_drift`` (when drift is tracked).
+
+    Example:
+        scheduler = ASHAScheduler(max_epochs=30, grace_period=2)
+        trainer = Trainer(config)
+        scheduler.attach(trainer, "latent32_comp1.0")
+        trainer.train()
+    """
+
+    def __init__(
+        self,
+        max_epochs: int,
+        grace_period: int = 1,
+        reduction_factor: int = 3,
+        metric: str = "val_loss",
+        drift_weight: float = 0.0,
+        state_path: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_epochs: Full epoch budget of a trial
+            grace_period: Epochs every trial trains before its first rung
+            reduction_factor: Keep 1 of every reduction_factor trials per rung
+            metric: Per-epoch metric to minimize (e.g. "val_loss")
+            drift_weight: Weight of "overall_drift" added to the metric
+            state_path: Optional JSON-lines file shared by processes running
+                trials of the same sweep (in-memory records when None)
+        """
+        if grace_period < 1:
+            raise ValueError(f"grace_period must be positive, got {grace_period}")
+        if reduction_factor < 2:
+            raise ValueError(f"reduction_factor must be at least 2, got {reduction_factor}")
+
+        self.max_epochs = max_epochs
+        self.grace_period = grace_period
+        self.reduction_factor = reduction_factor
+        self.metric = metric
+        self.drift_weight = drift_weight
+        self.state_path = Path(state_path) if state_path is not None else None
+
+        # Rung budgets below the full budget, in epochs
+        self.rungs: List[int] = []
+        budget = grace_period
+        while budget < max_epochs:
+            self.rungs.append(budget)
+            budget *= reduction_factor
+
+        # Scores per rung: {rung: {trial_id: score}}
+        self._records: Dict[int, Dict[str, float]] = {rung: {} for rung in self.rungs}
+
+        # Epoch budget at which each trial stopped, for trials stopped early
+        self.stopped: Dict[str, int] = {}
+
+    def score(self, metrics: Dict[str, Any]) -> float:
+        """
+        Score one epoch's metrics (lower is better).
+
+        Args:
+            metrics: Epoch metrics with the configured metric and optional
+                "overall_drift"
+
+        Returns:
+            score: Combined score (inf when the metric is missing or NaN)
+        """
+        value = metrics.get(self.metric)
+        if value is None:
+            return math.inf
+        score = float(value) + self.drift_weight * float(metrics.get("overall_drift", 0.0))
+        return math.inf if math.isnan(score) else score
+
+    def on_epoch_end(self, trial_id: str, epoch: int, metrics: Dict[str, Any]) -> bool:
+        """
+        Record a finished epoch and decide whether the trial continues.
+
+        Args:
+            trial_id: Identifier of the trial
+            epoch: Zero-based epoch that just finished
+            metrics: The epoch's metrics
+
+        Returns:
+            True if the trial should stop
+        """
+        budget = epoch + 1
+        if budget not in self._records:
+            return False
+
+        score = self.score(metrics)
+        records = self._record(budget, trial_id, score)
+
+        # Too few trials at this rung to rank; keep training
+        if len(records) < self.reduction_factor:
+            return False
+
+        # Promote the top 1/reduction_factor of the trials seen at this rung
+        num_promoted = len(records) // self.reduction_factor
+        cutoff = sorted(records.values())[num_promoted - 1]
+        if score > cutoff:
+            self.stopped[trial_id] = budget
+            return True
+        return False
+
+    def attach(self, trainer, trial_id: str) -> None:
+        """
+        Let the scheduler stop a Trainer's run.
+
+        Args:
+            trainer: Trainer whose ``train`` reports epochs to the scheduler
+            trial_id: Identifier of the trial trained by this trainer
+        """
+        trainer.register_hook(
+            "post_epoch",
+            lambda _, epoch, metrics: self.on_epoch_end(trial_id, epoch, metrics),
+        )
+
+    def rung_records(self) -> Dict[int, Dict[str, float]]:
+        """
+        Scores recorded at each rung, including other processes' records.
+
+        Returns:
+            records: {rung: {trial_id: score}}
+        """
+        self._load()
+        return {rung: dict(records) for rung, records in self._records.items()}
+
+    def _record(self, rung: int, trial_id: str, score: float) -> Dict[str, float]:
+        """Store one score and return every score recorded at the rung."""
+        self._load()
+        self._records[rung][trial_id] = score
+
+        if self.state_path is not None:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            line = json.dumps({"rung": rung, "trial_id": trial_id, "score": score}) + "\n"
+            # One small O_APPEND write per record keeps concurrent writers from interleaving
+            fd = os.open(self.state_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode())
+            finally:
+                os.close(fd)
+
+        return self._records[rung]
+
+    def _load(self) -> None:
+        """Merge records written by other processes."""
+        if self.state_path is None or not self.state_path.exists():
+            return
+
+        with open(self.state_path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record["rung"] in self._records:
+                    self._records[record["rung"]][record["trial_id"]] = record["score"]
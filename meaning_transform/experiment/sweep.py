@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parallel executor for hyperparameter sweeps.
+
+This module provides:
+1. SweepExecutor, which runs independent trials in a process pool
+2. Read-only sharing of the prepared dataset through the memory-mapped TensorCache,
+   with the drift tracking states in a columnar archive next to it
+3. A fixed torch thread budget per worker process
+4. Incremental JSON-lines results, so an interrupted sweep resumes where it stopped
+"""
+
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+import torch
+
+from meaning_transform.src.data import AgentStateDataset
+from meaning_transform.src.serialization import read_states, write_states
+from meaning_transform.src.tensor_cache import TensorCache
+
+# Trial callable: (trial_id, params, data) -> JSON-serializable result dict
+TrialFn = Callable[[str, Dict[str, Any], Dict[str, Any]], Dict[str, Any]]
+
+# Name of the shared dataset inside the sweep's data directory
+SHARED_DATASET_NAME = "sweep_dataset"
+
+# Columnar archive holding the exact drift tracking states
+DRIFT_STATES_FILE = "drift_tracking.npz"
+
+# Datasets loaded once per worker process by _init_worker
+_worker_data: Optional[Dict[str, Any]] = None
+
+
+def load_shared_dataset(data_dir: Union[str, Path], batch_size: int) -> Dict[str, Any]:
+    """
+    Load the sweep dataset written by ``SweepExecutor.share_dataset``.
+
+    The feature matrix is memory-mapped, so every worker shares the same
+    physical pages. Drift tracking states are read from their columnar
+    archive, so workers measure drift on exactly the states used in-process
+    (decoding them from feature rows would lose ids, inventories and
+    unencoded precision).
+
+    Args:
+        data_dir: Directory holding the shared tensor cache
+        batch_size: Batch size for the datasets
+
+    Returns:
+        Dict with "train" and "val" datasets and "drift_tracking" states
+    """
+    train_tensor, val_tensor, _ = TensorCache(data_dir, SHARED_DATASET_NAME).load_split()
+    return {
+        "train": AgentStateDataset.from_tensor(train_tensor, batch_size),
+        "val": AgentStateDataset.from_tensor(val_tensor, batch_size),
+        "drift_tracking": read_states(Path(data_dir) / DRIFT_STATES_FILE),
+    }
+
+
+def _init_worker(data_dir: str, batch_size: int, num_threads: int) -> None:
+    """Set the thread budget and map the shared dataset in a worker process."""
+    global _worker_data
+
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(num_threads)
+    except RuntimeError:
+        # Only settable before the first inter-op parallel call in the process
+        pass
+
+    _worker_data = load_shared_dataset(data_dir, batch_size)
+
+
+def _run_in_worker(trial_fn: TrialFn, trial_id: str, params: Dict[str, Any]):
+    """Run one trial against the worker's shared dataset."""
+    return trial_fn(trial_id, params, _worker_data)
+
+
+class SweepExecutor:
+    """
+    Runs sweep trials in parallel and records results as they finish.
+
+    Each finished trial is appended to a JSON-lines file as
+    ``{"trial_id": ..., "result": ...}``. Trials already recorded there are
+    skipped, so rerunning the same sweep after a crash only trains the
+    missing trials. Failed trials are reported and left unrecorded.
+
+    Example:
+        executor = SweepExecutor(experiment_dir / "trials.jsonl", max_workers=8)
+        executor.share_dataset(datasets)
+        results = executor.run(run_trial, {"a": {"lr": 1e-3}, "b": {"lr": 1e-4}})
+    """
+
+    def __init__(
+        self,
+        results_path: Union[str, Path],
+        max_workers: int = 1,
+        threads_per_worker: Optional[int] = None,
+        data_dir: Optional[Union[str, Path]] = None,
+        start_method: str = "spawn",
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            results_path: JSON-lines file receiving trial results
+            max_workers: Number of worker processes (1 runs trials in this process)
+            threads_per_worker: torch threads per worker (defaults to an even
+                share of the CPU cores)
+            data_dir: Directory for the shared dataset (defaults to a
+                "shared_data" directory next to the results file)
+            start_method: multiprocessing start method for the pool
+        """
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be positive, got {max_workers}")
+
+        self.results_path = Path(results_path)
+        self.results_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.threads_per_worker = threads_per_worker or max(
+            1, (os.cpu_count() or 1) // max_workers
+        )
+        self.data_dir = Path(data_dir or self.results_path.parent / "shared_data")
+        self.start_method = start_method
+
+        self.datasets: Optional[Dict[str, Any]] = None
+        self.batch_size = 32
+
+    def share_dataset(self, datasets: Dict[str, Any]) -> None:
+        """
+        Publish the prepared datasets to the worker processes.
+
+        Args:
+            datasets: Dict with "train" and "val" AgentStateDatasets and
+                "drift_tracking" agent states
+        """
+        self.datasets = datasets
+        self.batch_size = datasets["train"].batch_size
+
+        if self.max_workers == 1:
+            return
+
+        train_tensor = datasets["train"].states_tensor
+        val_tensor = datasets["val"].states_tensor
+        num_train = len(train_tensor)
+        TensorCache(self.data_dir, SHARED_DATASET_NAME).save(
+            torch.cat([train_tensor, val_tensor]),
+            source_hash="sweep",
+            query_params={"num_train": num_train, "num_val": len(val_tensor)},
+            train_indices=range(num_train),
+            val_indices=range(num_train, num_train + len(val_tensor)),
+        )
+        write_states(self.data_dir / DRIFT_STATES_FILE, datasets.get("drift_tracking", []))
+
+    def load_results(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the results recorded so far.
+
+        Returns:
+            Results keyed by trial id (a truncated final line is ignored)
+        """
+        results = {}
+        if not self.results_path.exists():
+            return results
+
+        with open(self.results_path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                results[record["trial_id"]] = record["result"]
+        return results
+
+    def run(
+        self, trial_fn: TrialFn, trials: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run every trial that has no recorded result.
+
+        Args:
+            trial_fn: Picklable top-level function or method called as
+                ``trial_fn(trial_id, params, data)``
+            trials: Trial parameters keyed by trial id
+
+        Returns:
+            Results of all completed trials, in the order of ``trials``
+        """
+        if self.datasets is None:
+            raise RuntimeError("Call share_dataset() before run()")
+
+        completed = self.load_results()
+        self._drop_partial_record()
+        pending = {tid: params for tid, params in trials.items() if tid not in completed}
+        if completed:
+            print(f"Resuming sweep: {len(trials) - len(pending)}/{len(trials)} trials recorded")
+
+        if self.max_workers == 1:
+            for trial_id, params in pending.items():
+                try:
+                    result = trial_fn(trial_id, params, self.datasets)
+                except Exception:
+                    self._report_failure(trial_id)
+                    continue
+                self._record(trial_id, result)
+                completed[trial_id] = result
+        else:
+            completed.update(self._run_pool(trial_fn, pending))
+
+        return {tid: completed[tid] for tid in trials if tid in completed}
+
+    def _run_pool(
+        self, trial_fn: TrialFn, pending: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run pending trials in worker processes, recording each as it finishes."""
+        results = {}
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(self.max_workers, max(1, len(pending))),
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_init_worker,
+            initargs=(
+                str(self.data_dir),
+                self.batch_size,
+                self.threads_per_worker,
+            ),
+        ) as pool:
+            futures = {
+                pool.submit(_run_in_worker, trial_fn, trial_id, params): trial_id
+                for trial_id, params in pending.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                trial_id = futures[future]
+                try:
+                    result = future.result()
+                except Exception:
+                    self._report_failure(trial_id)
+                    continue
+                self._record(trial_id, result)
+                results[trial_id] = result
+        return results
+
+    def _drop_partial_record(self) -> None:
+        """Cut a line left incomplete by a crash so new records start cleanly."""
+        if not self.results_path.exists():
+            return
+        with open(self.results_path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def _record(self, trial_id: str, result: Dict[str, Any]) -> None:
+        """Append one result and flush it to disk."""
+        with open(self.results_path, "a") as f:
+            f.write(json.dumps({"trial_id": trial_id, "result": result}, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _report_failure(trial_id: str) -> None:
+        """Print a failed trial's traceback."""
+        print(f"Trial {trial_id} failed; it will be retried when the sweep is resumed")
+        traceback.print_exc()
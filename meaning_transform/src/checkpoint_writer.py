@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Background checkpoint writer for training runs.
+
+This module provides:
+1. CPU snapshots of model, optimizer and scheduler state taken on the training thread
+2. Serialization on a worker thread so training does not wait for the disk
+3. Atomic writes through temporary files renamed into place
+4. best_model.pt / latest_model.pt as hard links to the epoch file instead of
+   re-serialized copies
+5. The keep-every-N / keep-last-K retention policy for epoch checkpoints
+"""
+
+import concurrent.futures
+import os
+import shutil
+from pathlib import Path
+from typing import Any, List, Optional, Set, Union
+
+import torch
+
+
+def snapshot_to_cpu(obj: Any) -> Any:
+    """
+    Copy every tensor in a nested checkpoint structure to the CPU.
+
+    Tensors are always copied, so later in-place updates by the optimizer do
+    not change a snapshot that is still waiting to be written.
+
+    Args:
+        obj: Tensor, or dict/list/tuple containing tensors
+
+    Returns:
+        snapshot: Structure with the same layout holding CPU tensor copies
+    """
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, dict):
+        return type(obj)((key, snapshot_to_cpu(value)) for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(snapshot_to_cpu(value) for value in obj)
+    return obj
+
+
+class CheckpointWriter:
+    """
+    Writes training checkpoints on a background thread.
+
+    Checkpoints are written in submission order. Each epoch is serialized
+    once to ``checkpoint_epoch_{epoch}.pt``; ``latest_model.pt`` and, when
+    requested, ``best_model.pt`` are hard links to that file (copies on file
+    systems without hard links). Every file appears atomically, so a crash
+    mid-write never leaves a truncated checkpoint behind. The worker thread
+    starts with the first ``save`` and stops on ``close``; saving again after
+    ``close`` starts a new one.
+
+    Example:
+        writer = CheckpointWriter(experiment_dir)
+        writer.save(epoch, {"model_state_dict": model.state_dict()}, is_best=True)
+        writer.wait()
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        keep_every: int = 10,
+        keep_last: int = 5,
+        cleanup: bool = True,
+        max_pending: int = 2,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            directory: Directory receiving the checkpoint files
+            keep_every: Keep one epoch checkpoint every this many epochs
+            keep_last: Keep this many of the most recent epoch checkpoints
+            cleanup: Whether to delete checkpoints outside the retention policy
+            max_pending: Maximum snapshots held in memory before ``save``
+                waits for the oldest write
+        """
+        if keep_every < 1 or keep_last < 1:
+            raise ValueError(
+                f"keep_every and keep_last must be positive, got {keep_every} and {keep_last}"
+            )
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keep_every = keep_every
+        self.keep_last = keep_last
+        self.cleanup = cleanup
+        self.max_pending = max(1, max_pending)
+
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._pending: List[concurrent.futures.Future] = []
+
+        # Epoch files left by an earlier run into this directory (e.g. when
+        # resuming) fall under the same retention policy
+        self._epochs: Set[int] = set()
+        for path in self.directory.glob("checkpoint_epoch_*.pt"):
+            suffix = path.stem[len("checkpoint_epoch_") :]
+            if suffix.isdigit():
+                self._epochs.add(int(suffix))
+
+    def epoch_path(self, epoch: int) -> Path:
+        """Path of the checkpoint file for an epoch."""
+        return self.directory / f"checkpoint_epoch_{epoch}.pt"
+
+    def save(self, epoch: int, checkpoint: dict, is_best: bool = False) -> None:
+        """
+        Snapshot a checkpoint and queue it for writing.
+
+        Args:
+            epoch: Epoch number used in the file name and for retention
+            checkpoint: Checkpoint dictionary (tensors may live on any device)
+            is_best: Whether to point best_model.pt at this checkpoint
+        """
+        # Surface failed writes and bound the memory held by queued snapshots
+        self._collect(block=len(self._pending) >= self.max_pending)
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="checkpoint"
+            )
+
+        snapshot = snapshot_to_cpu(checkpoint)
+        self._pending.append(
+            self._executor.submit(self._write, epoch, snapshot, is_best)
+        )
+
+    def wait(self) -> None:
+        """Block until all queued checkpoints are on disk."""
+        while self._pending:
+            self._collect(block=True)
+
+    def close(self) -> None:
+        """Finish queued writes and stop the worker thread."""
+        if self._executor is None:
+            return
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _collect(self, block: bool) -> None:
+        """Drop finished writes (re-raising their errors), optionally waiting for one."""
+        if block and self._pending:
+            self._pending[0].result()
+
+        while self._pending and self._pending[0].done():
+            self._pending.pop(0).result()
+
+    def _write(self, epoch: int, snapshot: dict, is_best: bool) -> None:
+        """Serialize one snapshot and update links and retention (worker thread)."""
+        path = self.epoch_path(epoch)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            torch.save(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        self._epochs.add(epoch)
+
+        self._link(path, self.directory / "latest_model.pt")
+        if is_best:
+            self._link(path, self.directory / "best_model.pt")
+
+        if self.cleanup:
+            self._apply_retention(epoch)
+
+    @staticmethod
+    def _link(source: Path, target: Path) -> None:
+        """Atomically point target at the contents of source."""
+        temp_path = target.with_name(target.name + ".tmp")
+        if temp_path.exists():
+            temp_path.unlink()
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            # File systems without hard links get a copy instead
+            shutil.copyfile(source, temp_path)
+        os.replace(temp_path, target)
+
+    def _apply_retention(self, current_epoch: int) -> None:
+        """
+        Delete epoch checkpoints outside the retention policy.
+
+        Keeps one checkpoint every ``keep_every`` epochs and the
+        ``keep_last`` most recent epochs. best_model.pt and latest_model.pt
+        are separate links, so they survive deletion of their epoch file.
+
+        Args:
+            current_epoch: Most recently written epoch
+        """
+        for epoch in sorted(self._epochs):
+            if epoch % self.keep_every == 0 or epoch > current_epoch - self.keep_last:
+                continue
+            path = self.epoch_path(epoch)
+            if path.exists():
+                path.unlink()
+            self._epochs.discard(epoch)
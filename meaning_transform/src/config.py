@@ -52,6 +52,19 @@ class TrainingConfig:
     scheduler_step_size: int = 30
     scheduler_gamma: float = 0.5
     
+    # Data loading
+    num_workers: int = 0  # DataLoader worker processes (0 loads in the main process)
+    pin_memory: bool = True  # Pin host batches when training on CUDA
+    prefetch_factor: int = 2  # Batches prefetched per worker
+
+    # Logging
+    log_interval: int = 10  # Batches between verbose progress lines (0 disables them)
+
+    # Execution mode
+    precision: str = "fp32"  # "fp32", "bf16" or "fp16" (autocast; fp16 adds a GradScaler)
+    compile: bool = False  # torch.compile the model forward and the loss
+    fused_optimizer: bool = False  # Fused Adam kernels where the device supports them
+
     # Checkpointing
     checkpoint_dir: str = "../results/checkpoints"
     checkpoint_interval: int = 10
@@ -72,6 +85,9 @@ class DataConfig:
     
     # Database configuration
     db_path: str = "simulation.db"
+
+    # Directory for the memory-mapped tensor cache (None disables caching)
+    cache_dir: Optional[str] = None
     
     # Agent state properties
     position_range: Tuple[float, float] = (-10.0, 10.0)
@@ -12,24 +12,65 @@ This module handles:
 5. Conversion between agent states and graph representations
 """
 
+import io
 import json
 import pickle
 import random
 import sqlite3
 import struct
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import networkx as nx
 import numpy as np
 import torch
+from torch.utils.data import (
+    BatchSampler,
+    DataLoader,
+    Dataset,
+    RandomSampler,
+    SequentialSampler,
+)
 from torch_geometric.data import Batch, Data
 
-# Try to import graph-related utilities
-try:
-    from .knowledge_graph import AgentStateToGraph
-except ImportError:
-    AgentStateToGraph = None
-    deserialize_knowledge_graph = None
+
+def _graph_converter(
+    include_relations: bool = True, property_as_node: bool = True
+) -> "AgentStateToGraph":
+    """
+    Create an AgentStateToGraph converter.
+
+    knowledge_graph imports this module, so it is imported lazily here;
+    a module-level import would always fail on the partially initialized module.
+    """
+    try:
+        from .knowledge_graph import AgentStateToGraph
+    except ImportError:
+        raise ImportError("knowledge_graph module not available")
+
+    return AgentStateToGraph(
+        include_relations=include_relations, property_as_node=property_as_node
+    )
+
+
+# Role vocabulary used for the one-hot block of the tensor representation
+AGENT_ROLES = ["explorer", "gatherer", "defender", "attacker", "builder"]
+_ROLE_CODES = {role: code for code, role in enumerate(AGENT_ROLES)}
+
+# Columns read from the agent_states table of simulation databases
+AGENT_STATE_DB_COLUMNS = [
+    "id",
+    "simulation_id",
+    "step_number",
+    "agent_id",
+    "position_x",
+    "position_y",
+    "position_z",
+    "resource_level",
+    "current_health",
+    "is_defending",
+    "total_reward",
+    "age",
+]
 
 
 class AgentState:
@@ -106,7 +147,13 @@ class AgentState:
         }
 
     def to_binary(self) -> bytes:
-        """Serialize agent state to binary format."""
+        """Serialize agent state to the packed binary record format."""
+        from .serialization import pack_state
+
+        return pack_state(self)
+
+    def to_json_binary(self) -> bytes:
+        """Serialize agent state to the legacy length-prefixed JSON format."""
         # Convert to JSON string first
         state_dict = self.to_dict()
 
@@ -129,7 +176,13 @@ class AgentState:
 
     @classmethod
     def from_binary(cls, data: bytes) -> "AgentState":
-        """Deserialize agent state from binary format."""
+        """Deserialize agent state from packed or legacy JSON binary format."""
+        from .serialization import is_packed, unpack_state
+
+        # Packed buffers start with a version byte; legacy ones with a length
+        if is_packed(data):
+            return unpack_state(data)
+
         # Extract header
         header_size = struct.calcsize("!I")
         json_size = struct.unpack("!I", data[:header_size])[0]
@@ -372,10 +425,7 @@ class AgentState:
         Returns:
             G: NetworkX graph representing the agent state
         """
-        if AgentStateToGraph is None:
-            raise ImportError("knowledge_graph module not available")
-
-        converter = AgentStateToGraph(
+        converter = _graph_converter(
             include_relations=include_relations, property_as_node=True
         )
         return converter.agent_to_graph(self)
@@ -390,10 +440,7 @@ class AgentState:
         Returns:
             data: PyTorch Geometric Data object
         """
-        if AgentStateToGraph is None:
-            raise ImportError("knowledge_graph module not available")
-
-        converter = AgentStateToGraph(
+        converter = _graph_converter(
             include_relations=include_relations, property_as_node=True
         )
         nx_graph = converter.agent_to_graph(self)
@@ -441,24 +488,544 @@ class AgentState:
         return cls(**agent_data)
 
 
+class AgentStateBatch:
+    """Columnar (struct-of-arrays) collection of agent states.
+
+    Holds each tensor feature as a NumPy column so that a whole batch can be
+    encoded with a single vectorized call instead of one ``to_tensor()`` call
+    per state. ``AgentState`` objects are only created when single rows are
+    accessed, so a batch can stand in for a list of states (``len``,
+    indexing, slicing and iteration are supported).
+    """
+
+    def __init__(
+        self,
+        position: np.ndarray,
+        health: np.ndarray,
+        energy: np.ndarray,
+        resource_level: np.ndarray,
+        current_health: np.ndarray,
+        is_defending: np.ndarray,
+        age: np.ndarray,
+        total_reward: np.ndarray,
+        role_codes: np.ndarray,
+        agent_ids: Optional[List[Optional[str]]] = None,
+        step_numbers: Optional[np.ndarray] = None,
+        inventories: Optional[List[Dict[str, int]]] = None,
+        goals: Optional[List[List[str]]] = None,
+    ):
+        """
+        Initialize a batch from column arrays.
+
+        Args:
+            position: Positions, shape [N, 3]
+            health: Health levels, shape [N]
+            energy: Energy levels, shape [N]
+            resource_level: Resource levels, shape [N]
+            current_health: Current health levels, shape [N]
+            is_defending: Defensive stance flags, shape [N]
+            age: Ages in simulation steps, shape [N]
+            total_reward: Cumulative rewards, shape [N]
+            role_codes: Indices into AGENT_ROLES (-1 for unknown roles), shape [N]
+            agent_ids: Optional agent identifiers, one per row
+            step_numbers: Optional simulation step numbers, shape [N]
+            inventories: Optional inventories, one per row
+            goals: Optional goal lists, one per row
+        """
+        self.position = np.asarray(position, dtype=np.float64).reshape(-1, 3)
+        self.health = np.asarray(health, dtype=np.float64)
+        self.energy = np.asarray(energy, dtype=np.float64)
+        self.resource_level = np.asarray(resource_level, dtype=np.float64)
+        self.current_health = np.asarray(current_health, dtype=np.float64)
+        self.is_defending = np.asarray(is_defending, dtype=bool)
+        self.age = np.asarray(age, dtype=np.int64)
+        self.total_reward = np.asarray(total_reward, dtype=np.float64)
+        self.role_codes = np.asarray(role_codes, dtype=np.int8)
+        self.agent_ids = agent_ids
+        self.step_numbers = (
+            np.asarray(step_numbers, dtype=np.int64) if step_numbers is not None else None
+        )
+        self.inventories = inventories
+        self.goals = goals
+
+        num_rows = len(self.position)
+        for name in self._COLUMNS:
+            if len(getattr(self, name)) != num_rows:
+                raise ValueError(
+                    f"Column '{name}' has {len(getattr(self, name))} rows, expected {num_rows}"
+                )
+        for name in ("agent_ids", "step_numbers", "inventories", "goals"):
+            value = getattr(self, name)
+            if value is not None and len(value) != num_rows:
+                raise ValueError(
+                    f"Column '{name}' has {len(value)} rows, expected {num_rows}"
+                )
+
+    # Numeric columns that make up the tensor representation
+    _COLUMNS = (
+        "position",
+        "health",
+        "energy",
+        "resource_level",
+        "current_health",
+        "is_defending",
+        "age",
+        "total_reward",
+        "role_codes",
+    )
+
+    @classmethod
+    def from_states(cls, states: List[AgentState]) -> "AgentStateBatch":
+        """
+        Build a columnar batch from a list of agent states.
+
+        Missing values are filled with the same defaults used by
+        ``AgentState.to_tensor``.
+
+        Args:
+            states: List of AgentState objects
+
+        Returns:
+            Columnar batch holding the same states
+        """
+        if isinstance(states, AgentStateBatch):
+            return states
+
+        num_states = len(states)
+        position = np.zeros((num_states, 3), dtype=np.float64)
+        health = np.empty(num_states, dtype=np.float64)
+        energy = np.empty(num_states, dtype=np.float64)
+        resource_level = np.empty(num_states, dtype=np.float64)
+        current_health = np.empty(num_states, dtype=np.float64)
+        is_defending = np.empty(num_states, dtype=bool)
+        age = np.empty(num_states, dtype=np.int64)
+        total_reward = np.empty(num_states, dtype=np.float64)
+        role_codes = np.empty(num_states, dtype=np.int8)
+        step_numbers = np.full(num_states, -1, dtype=np.int64)
+
+        for i, state in enumerate(states):
+            if state.position is not None:
+                position[i] = [p if p is not None else 0.0 for p in state.position[:3]]
+            health[i] = state.health if state.health is not None else 1.0
+            energy[i] = state.energy if state.energy is not None else 1.0
+            resource_level[i] = (
+                state.resource_level if state.resource_level is not None else 0.0
+            )
+            current_health[i] = (
+                state.current_health
+                if state.current_health is not None
+                else health[i]
+            )
+            is_defending[i] = bool(state.is_defending)
+            age[i] = state.age if state.age is not None else 0
+            total_reward[i] = (
+                state.total_reward if state.total_reward is not None else 0.0
+            )
+            role_codes[i] = _ROLE_CODES.get(state.role, -1)
+            if state.step_number is not None:
+                step_numbers[i] = state.step_number
+
+        return cls(
+            position=position,
+            health=health,
+            energy=energy,
+            resource_level=resource_level,
+            current_health=current_health,
+            is_defending=is_defending,
+            age=age,
+            total_reward=total_reward,
+            role_codes=role_codes,
+            agent_ids=[state.agent_id for state in states],
+            step_numbers=step_numbers,
+            inventories=[state.inventory for state in states],
+            goals=[state.goals for state in states],
+        )
+
+    @classmethod
+    def from_tensor(cls, tensor: Union[torch.Tensor, np.ndarray]) -> "AgentStateBatch":
+        """
+        Decode a batch of tensor representations back to columnar states.
+
+        This is the batched inverse of ``to_tensor`` and applies the same
+        decoding rules as ``AgentState.from_tensor`` with array operations:
+        argmax over the role block, thresholding of is_defending and
+        denormalization of age and total reward.
+
+        Args:
+            tensor: Tensor of shape [N, 15] (or [15] for a single state)
+
+        Returns:
+            Columnar batch with one row per input row
+        """
+        # Move to host once and decode in float64 like the per-state path
+        if isinstance(tensor, torch.Tensor):
+            features = tensor.detach().cpu().to(torch.float64).numpy()
+        else:
+            features = np.asarray(tensor, dtype=np.float64)
+        if features.ndim == 1:
+            features = features[np.newaxis, :]
+        expected_dim = 10 + len(AGENT_ROLES)
+        if features.ndim != 2 or features.shape[1] < expected_dim:
+            raise ValueError(
+                f"Expected tensor of shape [N, {expected_dim}], got {tuple(features.shape)}"
+            )
+
+        return cls(
+            position=features[:, 0:3],
+            health=features[:, 3],
+            energy=features[:, 4],
+            resource_level=features[:, 5],
+            current_health=features[:, 6],
+            is_defending=features[:, 7] > 0.5,
+            age=np.trunc(features[:, 8] * 1000).astype(np.int64),
+            total_reward=features[:, 9] * 100.0,
+            role_codes=np.argmax(features[:, 10:expected_dim], axis=1),
+        )
+
+    @classmethod
+    def from_db_rows(cls, rows: List[Tuple]) -> "AgentStateBatch":
+        """
+        Build a columnar batch directly from agent_states database rows.
+
+        Rows must follow ``AGENT_STATE_DB_COLUMNS``. Values are mapped the same
+        way as ``AgentState.from_db_record`` without creating AgentState objects.
+
+        Args:
+            rows: Sequence of row tuples fetched from the agent_states table
+
+        Returns:
+            Columnar batch with one row per database record
+        """
+        if len(rows) == 0:
+            return cls.empty()
+
+        table = np.array(rows, dtype=object).reshape(len(rows), len(AGENT_STATE_DB_COLUMNS))
+        column = {name: table[:, i] for i, name in enumerate(AGENT_STATE_DB_COLUMNS)}
+
+        def _numeric(values, default, replace_falsy=False):
+            # Replace NULLs (and zeros where AgentState uses `or` defaults)
+            missing = np.equal(values, None)
+            if replace_falsy:
+                missing |= np.equal(values, 0)
+            return np.where(missing, default, values).astype(np.float64)
+
+        position = np.stack(
+            [_numeric(column[f"position_{axis}"], 0.0) for axis in ("x", "y", "z")],
+            axis=1,
+        )
+        # Health comes from current_health and energy from resource_level
+        health = _numeric(column["current_health"], 1.0, replace_falsy=True)
+        energy = _numeric(column["resource_level"], 1.0, replace_falsy=True)
+        is_defending = _numeric(column["is_defending"], 0.0).astype(bool)
+
+        return cls(
+            position=position,
+            health=health,
+            energy=energy,
+            resource_level=_numeric(column["resource_level"], 0.0),
+            current_health=health,
+            is_defending=is_defending,
+            age=_numeric(column["age"], 0).astype(np.int64),
+            total_reward=_numeric(column["total_reward"], 0.0),
+            role_codes=np.where(
+                is_defending, _ROLE_CODES["defender"], _ROLE_CODES["explorer"]
+            ),
+            agent_ids=list(column["agent_id"]),
+            step_numbers=_numeric(column["step_number"], -1).astype(np.int64),
+        )
+
+    @classmethod
+    def concatenate(cls, batches: List["AgentStateBatch"]) -> "AgentStateBatch":
+        """
+        Concatenate several batches into one.
+
+        Optional columns are kept only when every batch provides them.
+
+        Args:
+            batches: Batches to concatenate
+
+        Returns:
+            Combined batch
+        """
+        if not batches:
+            return cls.empty()
+
+        columns = {
+            name: np.concatenate([getattr(b, name) for b in batches])
+            for name in cls._COLUMNS
+        }
+        for name in ("agent_ids", "inventories", "goals"):
+            if all(getattr(b, name) is not None for b in batches):
+                columns[name] = [v for b in batches for v in getattr(b, name)]
+        if all(b.step_numbers is not None for b in batches):
+            columns["step_numbers"] = np.concatenate([b.step_numbers for b in batches])
+
+        return cls(**columns)
+
+    @classmethod
+    def empty(cls) -> "AgentStateBatch":
+        """Return a batch with no rows."""
+        return cls(
+            position=np.zeros((0, 3)),
+            health=np.zeros(0),
+            energy=np.zeros(0),
+            resource_level=np.zeros(0),
+            current_health=np.zeros(0),
+            is_defending=np.zeros(0, dtype=bool),
+            age=np.zeros(0, dtype=np.int64),
+            total_reward=np.zeros(0),
+            role_codes=np.zeros(0, dtype=np.int8),
+        )
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        Encode the whole batch to the 15-dim feature matrix.
+
+        The layout and normalization match ``AgentState.to_tensor``.
+
+        Returns:
+            Float32 array of shape [N, 15]
+        """
+        num_rows = len(self)
+        features = np.zeros((num_rows, 10 + len(AGENT_ROLES)), dtype=np.float32)
+
+        features[:, 0:3] = self.position
+        features[:, 3] = self.health
+        features[:, 4] = self.energy
+        features[:, 5] = self.resource_level
+        features[:, 6] = self.current_health
+        features[:, 7] = self.is_defending
+        features[:, 8] = np.minimum(self.age / 1000.0, 1.0)
+        features[:, 9] = np.clip(self.total_reward / 100.0, -1.0, 1.0)
+
+        # Role one-hot encoding; unknown roles (-1) leave the block at zero
+        known = self.role_codes >= 0
+        features[np.nonzero(known)[0], 10 + self.role_codes[known]] = 1.0
+
+        return features
+
+    def to_tensor(self) -> torch.Tensor:
+        """
+        Encode the whole batch to a tensor for model input.
+
+        Returns:
+            Float32 tensor of shape [N, 15]
+        """
+        return torch.from_numpy(self.to_numpy())
+
+    def to_dataframe(self):
+        """
+        Convert the batch to a pandas DataFrame with one column per attribute.
+
+        Returns:
+            DataFrame with position_x/y/z, health, energy, resource_level,
+            current_health, is_defending, age, total_reward and role columns
+        """
+        import pandas as pd
+
+        columns = {
+            "position_x": self.position[:, 0],
+            "position_y": self.position[:, 1],
+            "position_z": self.position[:, 2],
+            "health": self.health,
+            "energy": self.energy,
+            "resource_level": self.resource_level,
+            "current_health": self.current_health,
+            "is_defending": self.is_defending,
+            "age": self.age,
+            "total_reward": self.total_reward,
+            "role": pd.Categorical.from_codes(
+                self.role_codes.astype(np.int64), categories=AGENT_ROLES
+            ),
+        }
+        if self.agent_ids is not None:
+            columns["agent_id"] = self.agent_ids
+        if self.step_numbers is not None:
+            columns["step_number"] = self.step_numbers
+
+        return pd.DataFrame(columns)
+
+    @property
+    def roles(self) -> List[str]:
+        """Role names for every row."""
+        return [
+            AGENT_ROLES[code] if code >= 0 else "explorer" for code in self.role_codes
+        ]
+
+    def _take(self, index) -> "AgentStateBatch":
+        """Select rows with a slice, boolean mask or integer index array."""
+        if isinstance(index, torch.Tensor):
+            index = index.cpu().numpy()
+
+        columns = {name: getattr(self, name)[index] for name in self._COLUMNS}
+        if self.step_numbers is not None:
+            columns["step_numbers"] = self.step_numbers[index]
+
+        # List-valued columns are indexed through positional indices
+        if any(
+            getattr(self, name) is not None
+            for name in ("agent_ids", "inventories", "goals")
+        ):
+            positions = np.arange(len(self))[index]
+            for name in ("agent_ids", "inventories", "goals"):
+                values = getattr(self, name)
+                if values is not None:
+                    columns[name] = [values[i] for i in positions]
+
+        return AgentStateBatch(**columns)
+
+    def row(self, idx: int) -> AgentState:
+        """
+        Materialize a single row as an AgentState.
+
+        Args:
+            idx: Row index
+
+        Returns:
+            AgentState for the requested row
+        """
+        step_number = None
+        if self.step_numbers is not None and self.step_numbers[idx] >= 0:
+            step_number = int(self.step_numbers[idx])
+        role_code = int(self.role_codes[idx])
+
+        return AgentState(
+            position=tuple(float(p) for p in self.position[idx]),
+            health=float(self.health[idx]),
+            energy=float(self.energy[idx]),
+            inventory=self.inventories[idx] if self.inventories is not None else None,
+            role=AGENT_ROLES[role_code] if role_code >= 0 else None,
+            goals=self.goals[idx] if self.goals is not None else None,
+            agent_id=self.agent_ids[idx] if self.agent_ids is not None else None,
+            step_number=step_number,
+            resource_level=float(self.resource_level[idx]),
+            current_health=float(self.current_health[idx]),
+            is_defending=bool(self.is_defending[idx]),
+            age=int(self.age[idx]),
+            total_reward=float(self.total_reward[idx]),
+        )
+
+    def to_states(self) -> List[AgentState]:
+        """Materialize every row as an AgentState."""
+        return [self.row(i) for i in range(len(self))]
+
+    def __len__(self) -> int:
+        """Return the number of rows in the batch."""
+        return len(self.position)
+
+    def __getitem__(self, idx):
+        """Return an AgentState for an integer index, or a sub-batch otherwise."""
+        if isinstance(idx, (torch.Tensor, np.ndarray)) and idx.ndim == 0:
+            idx = int(idx)
+        if isinstance(idx, (int, np.integer)):
+            if idx < 0:
+                idx += len(self)
+            if not 0 <= idx < len(self):
+                raise IndexError(f"Row index {idx} out of range for batch of {len(self)}")
+            return self.row(idx)
+        return self._take(idx)
+
+    def __iter__(self):
+        """Iterate over rows as AgentState objects."""
+        for i in range(len(self)):
+            yield self.row(i)
+
+
+class _TensorBatchDataset(Dataset):
+    """Map-style dataset returning whole tensor batches for lists of indices."""
+
+    def __init__(self, states_tensor: torch.Tensor):
+        self.states_tensor = states_tensor
+
+    def __len__(self) -> int:
+        return len(self.states_tensor)
+
+    def __getitem__(self, indices: List[int]) -> torch.Tensor:
+        # One advanced-indexing gather per batch instead of per-item tuples
+        return self.states_tensor[torch.as_tensor(indices, dtype=torch.long)]
+
+
+class _GraphBatchDataset(Dataset):
+    """Map-style dataset converting lists of indices to batched agent graphs."""
+
+    def __init__(self, states: Union[List["AgentState"], "AgentStateBatch"]):
+        self.states = states
+        self.converter = _graph_converter(include_relations=True, property_as_node=True)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __getitem__(self, indices: List[int]) -> Batch:
+        # Graph conversion runs here, i.e. inside DataLoader worker processes
+        if isinstance(self.states, AgentStateBatch):
+            agents = self.states[np.asarray(indices, dtype=np.int64)]
+        else:
+            agents = [self.states[i] for i in indices]
+        return self.converter.agents_to_torch_geometric_batch(agents)
+
+
 class AgentStateDataset:
     """Dataset class for agent states."""
 
     def __init__(self, states=None, batch_size=32):
-        """Initialize dataset with agent states."""
-        self.states = states or []
+        """Initialize dataset with agent states.
+
+        Args:
+            states: List of AgentState objects or a columnar AgentStateBatch
+            batch_size: Number of states returned by get_batch
+        """
+        self.states = states if states is not None else []
         self.batch_size = batch_size
         self.states_tensor = None
         self._current_idx = 0  # Initialize current index position
         self._initialize_tensors()
 
+    @classmethod
+    def from_tensor(cls, tensor: torch.Tensor, batch_size: int = 32) -> "AgentStateDataset":
+        """
+        Create a dataset backed by an already encoded feature matrix.
+
+        The tensor is used as-is (no copy), so memory-mapped caches stay
+        zero-copy. ``states`` is decoded from the tensor into a columnar
+        batch only on first access.
+
+        Args:
+            tensor: Encoded agent states of shape [N, 15]
+            batch_size: Number of states returned by get_batch
+
+        Returns:
+            Dataset whose states_tensor is the given tensor
+        """
+        dataset = cls(batch_size=batch_size)
+        dataset.states = None
+        dataset.states_tensor = tensor
+        return dataset
+
+    @property
+    def states(self):
+        """Agent states, decoded from states_tensor on first access if tensor-backed."""
+        if self._states is None and self.states_tensor is not None:
+            self._states = AgentStateBatch.from_tensor(self.states_tensor)
+        return self._states
+
+    @states.setter
+    def states(self, states):
+        self._states = states
+
     def _initialize_tensors(self):
         """Convert agent states to tensors for efficient batching."""
-        if self.states:
-            self.states_tensor = torch.stack([state.to_tensor() for state in self.states])
+        if len(self.states) > 0:
+            # Encode all states in one vectorized pass over columnar data
+            if isinstance(self.states, AgentStateBatch):
+                batch = self.states
+            else:
+                batch = AgentStateBatch.from_states(self.states)
+            self.states_tensor = batch.to_tensor()
 
     def __len__(self):
         """Return the number of agent states in the dataset."""
+        if self.states_tensor is not None:
+            return len(self.states_tensor)
         return len(self.states)
     
     def __getitem__(self, idx):
@@ -485,6 +1052,72 @@ class AgentStateDataset:
         
         return batch
 
+    def get_dataloader(
+        self,
+        batch_size: Optional[int] = None,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        num_workers: int = 0,
+        pin_memory: bool = False,
+        prefetch_factor: int = 2,
+        persistent_workers: bool = False,
+        graph: bool = False,
+        generator: Optional[torch.Generator] = None,
+    ) -> DataLoader:
+        """
+        Create a DataLoader over this dataset.
+
+        Batches are produced by a BatchSampler over row indices, so shuffling
+        permutes indices into ``states_tensor`` rather than rebuilding lists,
+        and each batch is gathered with a single indexing operation.
+
+        Args:
+            batch_size: Number of states per batch (defaults to self.batch_size)
+            shuffle: Shuffle indices at the start of every epoch
+            drop_last: Drop the final incomplete batch
+            num_workers: Number of worker processes producing batches
+            pin_memory: Copy batches into pinned memory for faster host-to-device transfer
+            prefetch_factor: Batches loaded in advance by each worker
+            persistent_workers: Keep worker processes alive between epochs
+            graph: Yield batched graphs (converted in workers) instead of tensors
+            generator: Random generator controlling the shuffle order
+
+        Returns:
+            DataLoader yielding [batch, 15] tensors or PyG Batch objects
+        """
+        if len(self.states) == 0:
+            raise ValueError("Dataset is empty")
+        if batch_size is None:
+            batch_size = self.batch_size
+
+        if graph:
+            source = _GraphBatchDataset(self.states)
+        else:
+            if self.states_tensor is None:
+                self._initialize_tensors()
+            source = _TensorBatchDataset(self.states_tensor)
+
+        if shuffle:
+            sampler = RandomSampler(source, generator=generator)
+        else:
+            sampler = SequentialSampler(source)
+
+        # The batch sampler is passed as the sampler with batch_size=None, so
+        # the dataset receives whole index lists and no collation is needed
+        loader_kwargs = {}
+        if num_workers > 0:
+            loader_kwargs["prefetch_factor"] = prefetch_factor
+            loader_kwargs["persistent_workers"] = persistent_workers
+
+        return DataLoader(
+            source,
+            sampler=BatchSampler(sampler, batch_size=batch_size, drop_last=drop_last),
+            batch_size=None,
+            num_workers=num_workers,
+            pin_memory=pin_memory,
+            **loader_kwargs,
+        )
+
     def save(self, file_path: str) -> None:
         """
         Save dataset to pickle file.
@@ -513,62 +1146,79 @@ class AgentStateDataset:
         except (FileNotFoundError, pickle.UnpicklingError) as e:
             raise FileNotFoundError(f"Failed to load dataset from {file_path}: {e}")
     
-    def load_from_db(self, db_path: str, limit: Optional[int] = None) -> None:
+    def load_from_db(
+        self,
+        db_path: str,
+        limit: Optional[int] = None,
+        simulation_id: Optional[str] = None,
+        start_step: Optional[int] = None,
+        end_step: Optional[int] = None,
+        agent_ids: Optional[List[str]] = None,
+        chunk_size: int = 10000,
+    ) -> None:
         """
         Load agent states from simulation database.
 
+        Rows are fetched in chunks and converted straight to columnar
+        ``AgentStateBatch`` chunks, which are concatenated into ``states``.
+        AgentState objects are only created when single rows are accessed.
+        Use ``iter_agent_state_chunks`` to stream tensors without holding the
+        whole result set.
+
         Args:
             db_path: Path to the simulation.db file
             limit: Maximum number of states to load
+            simulation_id: Only load states from this simulation
+            start_step: First step number to load (inclusive)
+            end_step: Last step number to load (inclusive)
+            agent_ids: Only load states of these agents
+            chunk_size: Number of rows fetched from the database at a time
         """
-        # Connect to database
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        # Build query to select all relevant fields
-        query = """
-            SELECT 
-                id, simulation_id, step_number, agent_id, 
-                position_x, position_y, position_z,
-                resource_level, current_health, is_defending, 
-                total_reward, age
-            FROM agent_states
-        """
-
-        # Add ordering and limit if specified
-        query += " ORDER BY step_number"
-        if limit:
-            query += f" LIMIT {limit}"
-
         try:
-            # Execute query
-            cursor.execute(query)
-
-            # Convert results to AgentState objects
-            self.states = [
-                AgentState.from_db_record(dict(row)) for row in cursor.fetchall()
-            ]
-
-            conn.close()
-            print(f"Loaded {len(self.states)} agent states from database")
-
+            batches = list(
+                iter_agent_state_chunks(
+                    db_path,
+                    chunk_size=chunk_size,
+                    simulation_id=simulation_id,
+                    start_step=start_step,
+                    end_step=end_step,
+                    agent_ids=agent_ids,
+                    limit=limit,
+                    as_batch=True,
+                )
+            )
         except Exception as e:
-            conn.close()
             raise RuntimeError(f"Error loading agent states: {e}")
 
-    def load_from_file(self, file_path: str) -> None:
+        self.states = AgentStateBatch.concatenate(batches)
+        self._initialize_tensors()
+        print(f"Loaded {len(self.states)} agent states from database")
+
+    def load_from_file(self, file_path: str, allow_pickle: bool = False) -> None:
         """
-        Load agent states from a pickle file.
+        Load agent states from a columnar archive or legacy pickle file.
 
         Args:
-            file_path: Path to the pickle file containing agent states
+            file_path: Path to the file containing agent states
+            allow_pickle: Whether to accept legacy pickle files. Unpickling can
+                execute arbitrary code, so only enable this for trusted files.
+
+        Raises:
+            ValueError: If the file is not a columnar archive and allow_pickle is False
         """
+        from .serialization import is_columnar, read_states
+
         try:
-            with open(file_path, "rb") as f:
-                data = f.read()
-                self.states = deserialize_states(data)
+            if is_columnar(file_path):
+                self.states = read_states(file_path)
+            else:
+                with open(file_path, "rb") as f:
+                    data = f.read()
+                    self.states = deserialize_states(data, allow_pickle=allow_pickle)
+            self._initialize_tensors()
             print(f"Loaded {len(self.states)} agent states from file")
+        except ValueError:
+            raise
         except Exception as e:
             raise RuntimeError(f"Error loading agent states from file: {e}")
 
@@ -579,18 +1229,10 @@ class AgentStateDataset:
         Returns:
             graph_dataset: List of PyTorch Geometric Data objects
         """
-        if AgentStateToGraph is None:
-            raise ImportError("knowledge_graph module not available")
-
-        converter = AgentStateToGraph(include_relations=True, property_as_node=True)
+        converter = _graph_converter(include_relations=True, property_as_node=True)
 
-        graph_dataset = []
-        for agent in self.states:
-            nx_graph = converter.agent_to_graph(agent)
-            graph_data = converter.to_torch_geometric(nx_graph)
-            graph_dataset.append(graph_data)
-
-        return graph_dataset
+        # Build all agent graphs at once and split them into Data objects
+        return converter.agents_to_torch_geometric_batch(self.states).to_data_list()
 
     def to_multi_agent_graph(self, max_agents: Optional[int] = None) -> Data:
         """
@@ -602,21 +1244,15 @@ class AgentStateDataset:
         Returns:
             graph_data: PyTorch Geometric Data object representing the multi-agent graph
         """
-        if AgentStateToGraph is None:
-            raise ImportError("knowledge_graph module not available")
-
-        converter = AgentStateToGraph(include_relations=True, property_as_node=True)
+        converter = _graph_converter(include_relations=True, property_as_node=True)
 
         # Limit number of agents if specified
         agents_to_convert = self.states
         if max_agents is not None:
             agents_to_convert = agents_to_convert[:max_agents]
 
-        # Convert to multi-agent graph
-        nx_graph = converter.agents_to_graph(agents_to_convert)
-
-        # Convert to PyTorch Geometric Data
-        return converter.to_torch_geometric(nx_graph)
+        # Build the multi-agent graph directly as PyTorch Geometric tensors
+        return converter.agents_to_torch_geometric(agents_to_convert)
 
     def get_graph_batch(self, batch_size: Optional[int] = None) -> Union[Batch, Data]:
         """
@@ -659,13 +1295,9 @@ class AgentStateDataset:
         if self._current_idx >= len(self.states):
             self._current_idx = 0
 
-        # Convert each agent to a graph and batch
-        graph_list = []
-        for agent in agents_batch:
-            graph_data = agent.to_torch_geometric()
-            graph_list.append(graph_data)
-
-        return Batch.from_data_list(graph_list)
+        # Build the per-agent graphs directly as one batch
+        converter = _graph_converter(include_relations=True, property_as_node=True)
+        return converter.agents_to_torch_geometric_batch(agents_batch)
 
 
 # Helper functions
@@ -684,17 +1316,52 @@ def determine_role(record: Dict[str, Any]) -> str:
 # Functions for data serialization and loading
 
 
-def serialize_states(states: List[AgentState]) -> bytes:
-    """Serialize a list of agent states to binary format."""
-    # Convert states to list of dictionaries
-    state_dicts = [state.to_dict() for state in states]
+def serialize_states(states: Union[List[AgentState], AgentStateBatch]) -> bytes:
+    """
+    Serialize a list of agent states to the columnar archive format.
+
+    Args:
+        states: List of AgentState objects or a columnar batch
+
+    Returns:
+        Bytes of an uncompressed .npz archive readable without pickle
+    """
+    from .serialization import write_states
+
+    buffer = io.BytesIO()
+    write_states(buffer, states)
+    return buffer.getvalue()
 
-    # Use pickle for efficient binary serialization
-    return pickle.dumps(state_dicts)
 
+def deserialize_states(data: bytes, allow_pickle: bool = False) -> List[AgentState]:
+    """
+    Deserialize a list of agent states from binary format.
+
+    Columnar archives are read without pickle; legacy pickled lists of
+    state dictionaries are only accepted with allow_pickle=True.
+
+    Args:
+        data: Serialized agent states
+        allow_pickle: Whether to accept legacy pickled data. Unpickling can
+            execute arbitrary code, so only enable this for trusted data.
+
+    Returns:
+        List of AgentState objects
+
+    Raises:
+        ValueError: If the data is not a columnar archive and allow_pickle is False
+    """
+    from .serialization import is_columnar, read_states
+
+    if is_columnar(data):
+        return read_states(data)
+
+    if not allow_pickle:
+        raise ValueError(
+            "Data is not a columnar agent state archive; pass allow_pickle=True "
+            "to load legacy pickled states from a trusted source"
+        )
 
-def deserialize_states(data: bytes) -> List[AgentState]:
-    """Deserialize a list of agent states from binary format."""
     # Load state dictionaries from binary
     state_dicts = pickle.loads(data)
 
@@ -720,6 +1387,135 @@ def load_from_simulation_db(
     return dataset.states
 
 
+def _build_agent_states_query(
+    simulation_id: Optional[str] = None,
+    start_step: Optional[int] = None,
+    end_step: Optional[int] = None,
+    agent_ids: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+) -> Tuple[str, List[Any]]:
+    """
+    Build a parameterized agent_states query.
+
+    Step filters and ordering are served by ``idx_agent_states_step_number``;
+    agent filters by ``idx_agent_states_agent_step``.
+
+    Args:
+        simulation_id: Only select states from this simulation
+        start_step: First step number to select (inclusive)
+        end_step: Last step number to select (inclusive)
+        agent_ids: Only select states of these agents
+        limit: Maximum number of rows to select
+
+    Returns:
+        Tuple of (SQL query, query parameters)
+    """
+    query = f"SELECT {', '.join(AGENT_STATE_DB_COLUMNS)} FROM agent_states"
+    conditions = []
+    params: List[Any] = []
+
+    if start_step is not None:
+        conditions.append("step_number >= ?")
+        params.append(int(start_step))
+    if end_step is not None:
+        conditions.append("step_number <= ?")
+        params.append(int(end_step))
+    if agent_ids is not None:
+        conditions.append(f"agent_id IN ({', '.join('?' for _ in agent_ids)})")
+        params.extend(agent_ids)
+    if simulation_id is not None:
+        conditions.append("simulation_id = ?")
+        params.append(simulation_id)
+
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY step_number"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(int(limit))
+
+    return query, params
+
+
+def _iter_agent_state_rows(
+    db_path: str,
+    chunk_size: int = 10000,
+    **filters,
+) -> Iterator[List[Tuple]]:
+    """
+    Yield chunks of raw agent_states rows using a single cursor.
+
+    Args:
+        db_path: Path to the simulation.db file
+        chunk_size: Number of rows per chunk
+        **filters: Filters passed to ``_build_agent_states_query``
+
+    Yields:
+        Lists of row tuples ordered like ``AGENT_STATE_DB_COLUMNS``
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    query, params = _build_agent_states_query(**filters)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.arraysize = chunk_size
+        cursor.execute(query, params)
+
+        # Fetch bounded chunks until the cursor is exhausted
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            yield rows
+    finally:
+        conn.close()
+
+
+def iter_agent_state_chunks(
+    db_path: str,
+    chunk_size: int = 10000,
+    simulation_id: Optional[str] = None,
+    start_step: Optional[int] = None,
+    end_step: Optional[int] = None,
+    agent_ids: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    as_batch: bool = False,
+) -> Iterator[Union[torch.Tensor, AgentStateBatch]]:
+    """
+    Stream agent states from a simulation database in bounded chunks.
+
+    Each chunk is converted straight from database rows to columnar data,
+    so memory use depends on ``chunk_size`` rather than database size.
+
+    Args:
+        db_path: Path to the simulation.db file
+        chunk_size: Number of states per yielded chunk
+        simulation_id: Only load states from this simulation
+        start_step: First step number to load (inclusive)
+        end_step: Last step number to load (inclusive)
+        agent_ids: Only load states of these agents
+        limit: Maximum total number of states to load
+        as_batch: Yield AgentStateBatch objects instead of tensors
+
+    Yields:
+        Tensors of shape [chunk, 15], or AgentStateBatch chunks if as_batch is set
+    """
+    for rows in _iter_agent_state_rows(
+        db_path,
+        chunk_size=chunk_size,
+        simulation_id=simulation_id,
+        start_step=start_step,
+        end_step=end_step,
+        agent_ids=agent_ids,
+        limit=limit,
+    ):
+        batch = AgentStateBatch.from_db_rows(rows)
+        yield batch if as_batch else batch.to_tensor()
+
+
 def generate_agent_states(count: int = 10, random_seed: int = None) -> List[AgentState]:
     """Generate synthetic agent states for testing and development.
 
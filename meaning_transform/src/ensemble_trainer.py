@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Vectorized training of several small VAEs at once.
+
+This module provides:
+1. EnsembleLoss, the combined VAE loss evaluated for every ensemble member
+   with its own loss weights
+2. EnsembleLossAccumulator, on-device loss sums with one row per member
+3. EnsembleTrainer, which trains K same-architecture MeaningVAEs (e.g. one
+   per compression level) through a single batched forward and backward pass
+4. Per-member histories and checkpoints in the format of Trainer.train
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import torch
+import torch.nn as nn
+
+from .checkpoint_writer import CheckpointWriter
+from .config import Config
+from .data import AgentStateBatch
+from .loss import SemanticLoss
+from .models import EnsembleVAE, MeaningVAE
+from .train import LossAccumulator, Trainer
+
+# Per-member settings an ensemble variant may override
+VARIANT_KEYS = (
+    "name",
+    "compression_level",
+    "recon_loss_weight",
+    "kl_loss_weight",
+    "semantic_loss_weight",
+)
+
+
+class EnsembleLoss(nn.Module):
+    """
+    Combined VAE loss for every member of an EnsembleVAE.
+
+    Computes the same components as CombinedLoss with an MSE reconstruction
+    loss, but returns one value per member. Each weight is either one float
+    shared by all members or a sequence with one weight per member.
+    """
+
+    def __init__(
+        self,
+        recon_loss_weight: Union[float, Sequence[float]] = 1.0,
+        kl_loss_weight: Union[float, Sequence[float]] = 0.1,
+        semantic_loss_weight: Union[float, Sequence[float]] = 0.5,
+    ):
+        """
+        Initialize ensemble loss.
+
+        Args:
+            recon_loss_weight: Weight(s) for reconstruction loss
+            kl_loss_weight: Weight(s) for KL divergence loss
+            semantic_loss_weight: Weight(s) for semantic loss
+        """
+        super().__init__()
+
+        self.recon_loss_weight = recon_loss_weight
+        self.kl_loss_weight = kl_loss_weight
+        self.semantic_loss_weight = semantic_loss_weight
+
+        self.semantic_loss = SemanticLoss()
+
+    @staticmethod
+    def _weight(
+        weight: Union[float, Sequence[float]], like: torch.Tensor
+    ) -> Union[float, torch.Tensor]:
+        """Weight as a float or a per-member tensor matching ``like``."""
+        if isinstance(weight, (int, float)):
+            return weight
+        return torch.as_tensor(weight, dtype=like.dtype, device=like.device)
+
+    def forward(
+        self, model_output: Dict[str, Any], x_original: torch.Tensor
+    ) -> Dict[str, torch.Tensor]:
+        """
+        Compute the combined loss of every member.
+
+        Args:
+            model_output: Output from EnsembleVAE
+            x_original: Original input batch [B, D]
+
+        Returns:
+            loss_dict: Loss components per member [K]; only "loss" carries
+                gradients
+        """
+        x_reconstructed = model_output["reconstruction"]
+        mu = model_output["mu"]
+        log_var = model_output["log_var"]
+        x_original = x_original.expand_as(x_reconstructed)
+
+        recon_loss = (x_reconstructed - x_original).pow(2).sum(dim=(1, 2))
+        kl_loss = -0.5 * torch.sum(1 + log_var - mu.pow(2) - log_var.exp(), dim=(1, 2))
+        if self.semantic_loss.active_features:
+            semantic_loss = self.semantic_loss.feature_losses(
+                x_reconstructed, x_original
+            ).mean(dim=-1)
+        else:
+            semantic_loss = torch.zeros_like(recon_loss)
+        compression_loss = model_output.get("compression_loss", torch.zeros_like(recon_loss))
+
+        total_loss = (
+            self._weight(self.recon_loss_weight, recon_loss) * recon_loss
+            + self._weight(self.kl_loss_weight, kl_loss) * kl_loss
+            + self._weight(self.semantic_loss_weight, semantic_loss) * semantic_loss
+            + compression_loss
+        )
+
+        return {
+            "loss": total_loss,
+            "recon_loss": recon_loss.detach(),
+            "kl_loss": kl_loss.detach(),
+            "semantic_loss": semantic_loss.detach(),
+            "compression_loss": compression_loss.detach(),
+        }
+
+
+class EnsembleLossAccumulator(LossAccumulator):
+    """Running sums of loss components with one row per ensemble member."""
+
+    def __init__(
+        self, keys: List[str], num_models: int, device: Union[str, torch.device] = "cpu"
+    ):
+        """
+        Initialize the accumulator.
+
+        Args:
+            keys: Names of the loss components to accumulate
+            num_models: Number of ensemble members
+            device: Device holding the running sums
+        """
+        self.num_models = num_models
+        super().__init__(keys, device)
+
+    def reset(self) -> None:
+        """Zero the running sums."""
+        self.sums = torch.zeros(self.num_models, len(self.keys), device=self.device)
+        self.count = 0
+
+    def update(self, values: Dict[str, Any]) -> None:
+        """
+        Add one batch of per-member loss components.
+
+        Args:
+            values: Loss dictionary of [K] tensors; scalars apply to every
+                member and missing components count as zero
+        """
+        components = []
+        for key in self.keys:
+            value = values.get(key)
+            if isinstance(value, torch.Tensor):
+                value = value.detach().reshape(-1).to(self.device, torch.float32)
+                value = value.expand(self.num_models)
+            else:
+                value = torch.full(
+                    (self.num_models,), float(value or 0.0), device=self.device
+                )
+            components.append(value)
+
+        self.sums += torch.stack(components, dim=1)
+        self.count += 1
+
+    def compute(self) -> List[Dict[str, float]]:
+        """
+        Average each member's components over the batches since the last reset.
+
+        Returns:
+            averages: Mean value per key, one dictionary per member
+        """
+        rows = (self.sums / max(self.count, 1)).tolist()
+        return [dict(zip(self.keys, row)) for row in rows]
+
+
+class EnsembleTrainer(Trainer):
+    """
+    Trains several same-architecture MeaningVAEs as one batched model.
+
+    Each variant describes one member, overriding the configured compression
+    level and loss weights (see ``VARIANT_KEYS``). The members are stacked
+    into an EnsembleVAE: every batch runs through all of them in a single
+    forward pass, and the sum of their losses is optimized by one optimizer.
+    The members share no parameters, so each still receives exactly its own
+    gradients, and element-wise optimizers (Adam, SGD) update each member as
+    if it were trained alone.
+
+    Every member keeps its own history, best validation loss, patience
+    counter and checkpoint directory. ``train`` returns one result per
+    variant in the format of ``Trainer.train``. Stopped members are no longer
+    recorded or checkpointed while the rest of the ensemble keeps training.
+
+    Example:
+        trainer = EnsembleTrainer(
+            config, [{"compression_level": level} for level in (0.5, 1.0, 2.0, 5.0)]
+        )
+        results = trainer.train()
+    """
+
+    def __init__(
+        self, config: Config, variants: List[Dict[str, Any]], device: str = None
+    ):
+        """
+        Initialize trainer.
+
+        Args:
+            config: Configuration shared by all members
+            variants: Per-member overrides, one dictionary per member
+            device: Device to train on ('cuda', 'cpu', or None for auto-detection)
+        """
+        if getattr(config.model, "use_graph", False):
+            raise ValueError("EnsembleTrainer does not support graph-based models")
+        if not variants:
+            raise ValueError("EnsembleTrainer needs at least one variant")
+        for variant in variants:
+            unknown = set(variant) - set(VARIANT_KEYS)
+            if unknown:
+                raise ValueError(f"Unsupported ensemble variant settings: {sorted(unknown)}")
+
+        super().__init__(config, device)
+
+        self.variants = [dict(variant) for variant in variants]
+        self.member_names = [
+            str(variant.get("name", f"model_{k}")) for k, variant in enumerate(self.variants)
+        ]
+        if len(set(self.member_names)) != len(self.member_names):
+            raise ValueError(f"Ensemble variant names must be unique, got {self.member_names}")
+
+        # Member models, updated from the ensemble after every epoch
+        self.models = [self._create_member(variant) for variant in self.variants]
+        self.model = EnsembleVAE(self.models).to(self.device)
+
+        training = self.config.training
+        self.loss_fn = EnsembleLoss(
+            recon_loss_weight=[
+                v.get("recon_loss_weight", training.recon_loss_weight) for v in self.variants
+            ],
+            kl_loss_weight=[
+                v.get("kl_loss_weight", training.kl_loss_weight) for v in self.variants
+            ],
+            semantic_loss_weight=[
+                v.get("semantic_loss_weight", training.semantic_loss_weight)
+                for v in self.variants
+            ],
+        )
+
+        # Optimizer, scheduler and compiled callables for the stacked model
+        self.optimizer = self._create_optimizer(self.model.parameters())
+        self.scheduler = self._create_scheduler()
+        self._configure_execution()
+
+        # Per-member training state and checkpoint directories
+        self.histories = [
+            {"train_losses": [], "val_losses": [], "semantic_drift": []}
+            for _ in self.variants
+        ]
+        self.best_val_losses = [float("inf")] * self.num_models
+        self.patience_counters = [0] * self.num_models
+        self.active = [True] * self.num_models
+        self.member_dirs = [self.experiment_dir / name for name in self.member_names]
+        self.member_writers = [
+            CheckpointWriter(
+                member_dir, keep_every=10, keep_last=5, cleanup=not self.config.debug
+            )
+            for member_dir in self.member_dirs
+        ]
+
+    @property
+    def num_models(self) -> int:
+        """Number of ensemble members."""
+        return len(self.variants)
+
+    def _create_member(self, variant: Dict[str, Any]) -> MeaningVAE:
+        """
+        Create one member model.
+
+        Args:
+            variant: Per-member overrides
+
+        Returns:
+            model: MeaningVAE on the CPU
+        """
+        model_config = self.config.model
+        return MeaningVAE(
+            input_dim=model_config.input_dim,
+            latent_dim=model_config.latent_dim,
+            compression_type=model_config.compression_type,
+            compression_level=variant.get("compression_level", model_config.compression_level),
+            vq_num_embeddings=model_config.vq_num_embeddings,
+        )
+
+    def train_epoch(self) -> List[Dict[str, float]]:
+        """
+        Train every member for one epoch.
+
+        Returns:
+            metrics: Training metrics per member
+        """
+        self.model.train()
+
+        accumulator = EnsembleLossAccumulator(
+            self.LOSS_COMPONENTS, self.num_models, self.device
+        )
+        log_interval = getattr(self.config.training, "log_interval", 10)
+
+        train_loader = self._get_dataloader("train")
+        num_total_batches = len(train_loader)
+
+        start_time = time.time()
+
+        for batch_idx, batch in enumerate(train_loader):
+            batch = batch.to(self.device, non_blocking=self._pin_memory)
+
+            self.optimizer.zero_grad()
+            with self._autocast():
+                results = self.forward_fn(batch)
+            loss_results = self.compute_loss(self._float_outputs(results), batch)
+
+            # Members share no parameters, so the summed loss gives each its own gradients
+            loss = loss_results["loss"].sum()
+
+            self.scaler.scale(loss).backward()
+            self.scaler.step(self.optimizer)
+            self.scaler.update()
+
+            accumulator.update(loss_results)
+
+            if self.config.verbose and log_interval and batch_idx % log_interval == 0:
+                elapsed = time.time() - start_time
+                print(
+                    f"Batch {batch_idx + 1}/{num_total_batches} "
+                    f"[{(batch_idx + 1) / num_total_batches:.0%}] - "
+                    f"Mean Loss: {loss.item() / self.num_models:.4f} - "
+                    f"Elapsed: {elapsed:.0f}s"
+                )
+
+        return [self._epoch_metrics("train", averages) for averages in accumulator.compute()]
+
+    def validate(self) -> List[Dict[str, float]]:
+        """
+        Validate every member on the validation set.
+
+        Returns:
+            metrics: Validation metrics per member
+        """
+        self.model.eval()
+
+        accumulator = EnsembleLossAccumulator(
+            self.LOSS_COMPONENTS, self.num_models, self.device
+        )
+
+        with torch.no_grad():
+            for batch in self._get_dataloader("val"):
+                batch = batch.to(self.device, non_blocking=self._pin_memory)
+
+                with self._autocast():
+                    results = self.forward_fn(batch)
+                loss_results = self.compute_loss(self._float_outputs(results), batch)
+
+                accumulator.update(loss_results)
+
+        return [self._epoch_metrics("val", averages) for averages in accumulator.compute()]
+
+    def track_semantic_drift(self) -> List[Dict[str, Any]]:
+        """
+        Measure semantic drift of every member on the drift tracking states.
+
+        Returns:
+            drift_metrics: Drift metrics per member (empty without drift states)
+        """
+        if not getattr(self, "drift_tracking_states", None):
+            return [{} for _ in range(self.num_models)]
+
+        self.model.eval()
+
+        originals = getattr(self, "drift_tracking_tensor", None)
+        if originals is None:
+            originals = AgentStateBatch.from_states(self.drift_tracking_states).to_tensor()
+        with torch.no_grad():
+            reconstructions = self.forward_fn(originals.to(self.device))["reconstruction"].cpu()
+
+        return [self._drift_metrics(originals, reconstructions[k]) for k in range(self.num_models)]
+
+    def _save_member_checkpoint(
+        self, index: int, epoch: int, metrics: Dict[str, float], is_best: bool
+    ) -> None:
+        """
+        Queue a checkpoint of one member in its own directory.
+
+        Args:
+            index: Member index
+            epoch: Current epoch
+            metrics: The member's metrics for this epoch
+            is_best: Whether this is the member's best epoch so far
+        """
+        history = self.histories[index]
+        checkpoint = {
+            "epoch": epoch,
+            "model_state_dict": self.models[index].state_dict(),
+            "metrics": metrics,
+            "variant": self.variants[index],
+            "train_losses": history["train_losses"],
+            "val_losses": history["val_losses"],
+            "semantic_drift_history": history["semantic_drift"],
+            "best_val_loss": self.best_val_losses[index],
+            "patience_counter": self.patience_counters[index],
+        }
+        self.member_writers[index].save(epoch, checkpoint, is_best=is_best)
+
+    def _close_checkpoint_writers(self) -> None:
+        """Finish queued checkpoint writes and stop every member's writer thread."""
+        for writer in self.member_writers:
+            writer.close()
+        self.checkpoint_writer.close()
+
+    def _train(self, resume_from: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Train all members together (run through ``train``).
+
+        Args:
+            resume_from: Not supported; per-member checkpoints hold model
+                weights only, without the stacked optimizer state
+
+        Returns:
+            results: One training history per variant, in variant order, each
+                in the format returned by ``Trainer.train``
+        """
+        if resume_from:
+            raise ValueError("EnsembleTrainer cannot resume from a checkpoint")
+
+        self.prepare_data()
+
+        member_params = sum(p.numel() for p in self.models[0].parameters())
+        print(
+            f"Training {self.num_models} models as one ensemble "
+            f"({member_params:,} parameters each): {', '.join(self.member_names)}"
+        )
+
+        num_epochs = self.config.training.num_epochs
+        for epoch in range(num_epochs):
+            if not any(self.active):
+                break
+
+            self.current_epoch = epoch
+            epoch_start_time = time.time()
+
+            for hook in self.hooks["pre_epoch"]:
+                hook(self, epoch)
+
+            train_metrics = self.train_epoch()
+            val_metrics = self.validate()
+            drift_metrics = self.track_semantic_drift()
+
+            if self.scheduler is not None:
+                self.scheduler.step()
+
+            active = [k for k in range(self.num_models) if self.active[k]]
+
+            # Members hold the weights of their latest recorded epoch
+            self.model.write_back(active)
+
+            for k in active:
+                history = self.histories[k]
+                history["train_losses"].append(train_metrics[k])
+                history["val_losses"].append(val_metrics[k])
+                if drift_metrics[k]:
+                    history["semantic_drift"].append(drift_metrics[k])
+
+                is_best = val_metrics[k]["val_loss"] < self.best_val_losses[k]
+                if is_best:
+                    self.best_val_losses[k] = val_metrics[k]["val_loss"]
+                    self.patience_counters[k] = 0
+                else:
+                    self.patience_counters[k] += 1
+
+                self._save_member_checkpoint(
+                    k, epoch, {**train_metrics[k], **val_metrics[k]}, is_best
+                )
+
+            epoch_time = time.time() - epoch_start_time
+            val_summary = ", ".join(
+                f"{self.member_names[k]}: {val_metrics[k]['val_loss']:.4f}" for k in active
+            )
+            print(
+                f"Epoch {epoch+1}/{num_epochs} "
+                f"[{(epoch+1)/num_epochs:.0%}] - "
+                f"Val Loss: {val_summary} - "
+                f"Time: {epoch_time:.1f}s"
+            )
+
+            # Post-epoch hooks see one member at a time; any may stop that member
+            for k in active:
+                epoch_metrics = {
+                    **train_metrics[k],
+                    **val_metrics[k],
+                    **drift_metrics[k],
+                    "model_index": k,
+                }
+                stop_requests = [
+                    hook(self, epoch, epoch_metrics) for hook in self.hooks["post_epoch"]
+                ]
+                if any(stop_requests):
+                    print(f"{self.member_names[k]} stopped by scheduler after {epoch+1} epochs")
+                    self.active[k] = False
+                elif self.patience_counters[k] >= self.config.training.patience:
+                    print(f"Early stopping {self.member_names[k]} after {epoch+1} epochs")
+                    self.active[k] = False
+
+        for writer in self.member_writers:
+            writer.wait()
+
+        print(
+            "Training completed. Best validation losses: "
+            + ", ".join(
+                f"{name}: {loss:.4f}"
+                for name, loss in zip(self.member_names, self.best_val_losses)
+            )
+        )
+
+        return [
+            {
+                "train_losses": history["train_losses"],
+                "val_losses": history["val_losses"],
+                "semantic_drift": history["semantic_drift"],
+                "best_val_loss": best_val_loss,
+                "experiment_dir": str(member_dir),
+            }
+            for history, best_val_loss, member_dir in zip(
+                self.histories, self.best_val_losses, self.member_dirs
+            )
+        ]
@@ -189,6 +189,56 @@ class GraphEncoder(nn.Module):
         return node_embeddings, graph_embedding
 
 
+def sample_negative_edges(
+    edge_index: torch.Tensor,
+    num_nodes: int,
+    batch: Optional[torch.Tensor] = None,
+    num_samples: Optional[int] = None,
+) -> torch.Tensor:
+    """
+    Sample node pairs without an edge, restricted to pairs inside one graph.
+
+    Sources are drawn uniformly over all nodes and targets uniformly over the
+    nodes of the source's graph, so each graph of a batch receives negatives in
+    proportion to its size. Samples that hit an observed edge are dropped, so
+    slightly fewer than ``num_samples`` pairs may be returned.
+
+    Args:
+        edge_index: Observed edges [2, num_edges]
+        num_nodes: Total number of nodes
+        batch: Graph assignment of each node (nodes of a graph must be
+            contiguous, as in a PyTorch Geometric Batch); None for one graph
+        num_samples: Number of pairs to draw (defaults to the number of edges)
+
+    Returns:
+        negative_index: Sampled non-edges [2, num_negatives]
+    """
+    device = edge_index.device
+    if num_samples is None:
+        num_samples = edge_index.size(1)
+    if num_nodes == 0 or num_samples == 0:
+        return torch.empty((2, 0), dtype=torch.long, device=device)
+    if batch is None:
+        batch = torch.zeros(num_nodes, dtype=torch.long, device=device)
+
+    # Node offset and size of each graph
+    counts = torch.bincount(batch)
+    ptr = torch.cumsum(counts, dim=0) - counts
+
+    # Draw a source anywhere and a target inside the source's graph
+    src = torch.randint(num_nodes, (num_samples,), device=device)
+    graph = batch[src]
+    offset = (torch.rand(num_samples, device=device) * counts[graph]).long()
+    dst = ptr[graph] + torch.minimum(offset, counts[graph] - 1)
+
+    # Drop pairs that are observed edges
+    keys = src * num_nodes + dst
+    observed = edge_index[0] * num_nodes + edge_index[1]
+    keep = ~torch.isin(keys, observed)
+
+    return torch.stack([src[keep], dst[keep]])
+
+
 class GraphDecoder(nn.Module):
     """
     Graph decoder for reconstructing graphs from embeddings.
@@ -254,14 +304,38 @@ class GraphDecoder(nn.Module):
             nn.Linear(hidden_channels, 1 + edge_dim),  # 1 for existence + edge features
         )
 
+    def decode_edges(
+        self, node_embeddings: torch.Tensor, edge_pairs: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Score a sparse set of candidate node pairs.
+
+        Args:
+            node_embeddings: Node embeddings from encoder
+            edge_pairs: Candidate (source, target) pairs [2, num_pairs]
+
+        Returns:
+            edge_logits: Edge existence logits [num_pairs]
+            edge_features: Edge feature predictions [num_pairs, edge_dim]
+        """
+        edge_inputs = torch.cat(
+            [node_embeddings[edge_pairs[0]], node_embeddings[edge_pairs[1]]], dim=1
+        )
+        edge_outputs = self.edge_predictor(edge_inputs)
+
+        return edge_outputs[:, 0], edge_outputs[:, 1:]
+
     def forward(
-        self, node_embeddings: torch.Tensor
+        self, node_embeddings: torch.Tensor, edge_pairs: Optional[torch.Tensor] = None
     ) -> Tuple[torch.Tensor, torch.Tensor]:
         """
         Forward pass through graph decoder.
 
         Args:
             node_embeddings: Node embeddings from encoder
+            edge_pairs: Optional candidate pairs [2, num_pairs]. When given, only
+                these pairs are scored and edge outputs are per pair instead of
+                dense [num_nodes, num_nodes] matrices
 
         Returns:
             node_features: Reconstructed node features
@@ -270,6 +344,10 @@ class GraphDecoder(nn.Module):
         # Reconstruct node features
         node_features = self.node_decoder(node_embeddings)
 
+        # Sparse decoding scores only the requested pairs
+        if edge_pairs is not None:
+            return node_features, self.decode_edges(node_embeddings, edge_pairs)
+
         # Create all possible node pairs for edge prediction
         num_nodes = node_embeddings.size(0)
         node_i = node_embeddings.repeat_interleave(num_nodes, dim=0)
@@ -312,14 +390,93 @@ class GraphDecoder(nn.Module):
         # Create edge index from mask
         edge_index = torch.nonzero(edge_mask).t().contiguous()
 
-        # Get edge attributes for selected edges
-        if edge_index.size(1) > 0:
-            edge_attr = torch.stack([edge_features[i, j] for i, j in edge_index.t()])
-        else:
-            edge_attr = torch.empty((0, self.edge_dim), device=node_features.device)
+        # Gather edge attributes for selected edges
+        edge_attr = edge_features[edge_index[0], edge_index[1]]
 
         return node_features, edge_index, edge_attr
 
+    def reconstruct_batch(
+        self,
+        node_embeddings: torch.Tensor,
+        batch: torch.Tensor,
+        threshold: Union[float, torch.Tensor] = 0.5,
+        top_k: Optional[int] = None,
+    ) -> List[Data]:
+        """
+        Reconstruct every graph of a batch from its node embeddings.
+
+        Only pairs of nodes within the same graph are scored, and edges are
+        selected and split per graph with tensor operations.
+
+        Args:
+            node_embeddings: Node embeddings from encoder [num_nodes, embedding_dim]
+            batch: Graph assignment of each node (contiguous per graph)
+            threshold: Edge probability threshold, a float or one value per graph
+            top_k: Optional maximum number of edges kept per graph (highest
+                probability first)
+
+        Returns:
+            graphs: Reconstructed Data object per graph
+        """
+        device = node_embeddings.device
+        num_nodes = node_embeddings.size(0)
+
+        # Node offset and size of each graph
+        counts = torch.bincount(batch)
+        num_graphs = counts.size(0)
+        ptr = torch.cumsum(counts, dim=0) - counts
+
+        # All within-graph pairs in row-major order per graph
+        sizes = counts[batch]
+        src = torch.repeat_interleave(torch.arange(num_nodes, device=device), sizes)
+        pair_ptr = torch.cumsum(sizes, dim=0) - sizes
+        local = torch.arange(src.size(0), device=device) - pair_ptr[src]
+        dst = ptr[batch[src]] + local
+        edge_pairs = torch.stack([src, dst])
+
+        node_features, (edge_logits, edge_features) = self.forward(
+            node_embeddings, edge_pairs
+        )
+        edge_probs = torch.sigmoid(edge_logits)
+
+        # Per-graph thresholds
+        pair_graph = batch[src]
+        threshold = torch.as_tensor(threshold, dtype=edge_probs.dtype, device=device)
+        if threshold.dim() == 0:
+            edge_mask = edge_probs > threshold
+        else:
+            edge_mask = edge_probs > threshold[pair_graph]
+
+        # Keep the top-k most probable edges of each graph
+        if top_k is not None:
+            candidates = torch.nonzero(edge_mask).squeeze(1)
+            order = torch.argsort(edge_probs[candidates], descending=True, stable=True)
+            order = order[torch.argsort(pair_graph[candidates][order], stable=True)]
+            ranked = candidates[order]
+            ranked_graph = pair_graph[ranked]
+            ranked_counts = torch.bincount(ranked_graph, minlength=num_graphs)
+            graph_start = torch.cumsum(ranked_counts, dim=0) - ranked_counts
+            rank = torch.arange(ranked.size(0), device=device) - graph_start[ranked_graph]
+
+            edge_mask = torch.zeros_like(edge_mask)
+            edge_mask[ranked[rank < top_k]] = True
+
+        # Split selected edges per graph with graph-local node indices
+        selected_graph = pair_graph[edge_mask]
+        edge_index = edge_pairs[:, edge_mask] - ptr[selected_graph]
+        edge_attr = edge_features[edge_mask]
+
+        node_counts = counts.tolist()
+        edge_counts = torch.bincount(selected_graph, minlength=num_graphs).tolist()
+        return [
+            Data(x=x, edge_index=index, edge_attr=attr)
+            for x, index, attr in zip(
+                torch.split(node_features, node_counts),
+                torch.split(edge_index, edge_counts, dim=1),
+                torch.split(edge_attr, edge_counts),
+            )
+        ]
+
 
 class VGAE(nn.Module):
     """
@@ -341,6 +498,8 @@ class VGAE(nn.Module):
         gnn_type: str = "GCN",
         pool_type: str = "mean",
         use_edge_attr: bool = True,
+        sparse_edges: bool = False,
+        negative_ratio: float = 1.0,
     ):
         """
         Initialize VGAE model.
@@ -356,6 +515,9 @@ class VGAE(nn.Module):
             gnn_type: Type of GNN ('GCN', 'GAT', 'SAGE', 'GIN')
             pool_type: Graph pooling type ('mean', 'max', 'add')
             use_edge_attr: Whether to use edge attributes
+            sparse_edges: Decode only observed edges plus sampled negatives
+                instead of all node pairs (memory linear in the number of edges)
+            negative_ratio: Sampled negative pairs per observed edge in sparse mode
         """
         super().__init__()
 
@@ -364,6 +526,8 @@ class VGAE(nn.Module):
         self.latent_dim = latent_dim
         self.feature_dim = feature_dim
         self.edge_dim = edge_dim
+        self.sparse_edges = sparse_edges
+        self.negative_ratio = negative_ratio
 
         # Encoder for node embeddings
         self.encoder = GraphEncoder(
@@ -436,13 +600,14 @@ class VGAE(nn.Module):
             return mu
 
     def decode(
-        self, z: torch.Tensor
+        self, z: torch.Tensor, edge_pairs: Optional[torch.Tensor] = None
     ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
         """
         Decode latent vectors to reconstructed graph.
 
         Args:
             z: Latent vectors
+            edge_pairs: Optional candidate pairs [2, num_pairs] for sparse decoding
 
         Returns:
             node_features: Reconstructed node features
@@ -454,10 +619,42 @@ class VGAE(nn.Module):
         h = F.relu(h)
 
         # Decode to node features and edges
-        node_features, (edge_logits, edge_features) = self.decoder(h)
+        node_features, (edge_logits, edge_features) = self.decoder(h, edge_pairs)
 
         return node_features, edge_logits, edge_features
 
+    def sample_edge_pairs(
+        self, data: Union[Data, Batch]
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Candidate pairs for sparse decoding: observed edges then sampled negatives.
+
+        Negatives are drawn within each graph of a batch using its batch vector.
+
+        Args:
+            data: PyTorch Geometric Data or Batch
+
+        Returns:
+            edge_pairs: Candidate pairs [2, num_pairs], observed edges first
+            edge_labels: 1.0 for observed edges and 0.0 for negatives [num_pairs]
+        """
+        edge_index = data.edge_index
+        num_nodes = data.num_nodes
+        num_samples = max(int(self.negative_ratio * edge_index.size(1)), 1)
+
+        negatives = sample_negative_edges(
+            edge_index,
+            num_nodes,
+            batch=getattr(data, "batch", None),
+            num_samples=num_samples,
+        )
+        edge_pairs = torch.cat([edge_index, negatives], dim=1)
+
+        edge_labels = torch.zeros(edge_pairs.size(1), device=edge_index.device)
+        edge_labels[: edge_index.size(1)] = 1.0
+
+        return edge_pairs, edge_labels
+
     def forward(self, data: Union[Data, Batch]) -> Dict[str, torch.Tensor]:
         """
         Forward pass through VGAE.
@@ -473,6 +670,8 @@ class VGAE(nn.Module):
                 - node_features: Reconstructed node features
                 - edge_logits: Edge prediction logits
                 - edge_features: Edge feature predictions
+                - edge_pairs, edge_labels: Scored pairs and their targets
+                  (sparse mode only; edge outputs are then per pair)
         """
         # Encode
         mu, log_var, node_embeddings = self.encode(data)
@@ -481,9 +680,12 @@ class VGAE(nn.Module):
         z = self.reparameterize(mu, log_var)
 
         # Decode
-        node_features, edge_logits, edge_features = self.decode(z)
+        edge_pairs = edge_labels = None
+        if self.sparse_edges:
+            edge_pairs, edge_labels = self.sample_edge_pairs(data)
+        node_features, edge_logits, edge_features = self.decode(z, edge_pairs)
 
-        return {
+        outputs = {
             "mu": mu,
             "log_var": log_var,
             "z": z,
@@ -492,6 +694,11 @@ class VGAE(nn.Module):
             "edge_features": edge_features,
             "node_embeddings": node_embeddings,
         }
+        if self.sparse_edges:
+            outputs["edge_pairs"] = edge_pairs
+            outputs["edge_labels"] = edge_labels
+
+        return outputs
 
     def reconstruct_graph(
         self, data: Union[Data, Batch], threshold: float = 0.5
@@ -521,6 +728,37 @@ class VGAE(nn.Module):
 
         return reconstructed_data
 
+    def reconstruct_graphs(
+        self,
+        data: Union[Data, Batch],
+        threshold: Union[float, torch.Tensor] = 0.5,
+        top_k: Optional[int] = None,
+    ) -> List[Data]:
+        """
+        Reconstruct each graph of a batch separately.
+
+        Args:
+            data: Input graph data
+            threshold: Edge prediction threshold, a float or one value per graph
+            top_k: Optional maximum number of edges per graph
+
+        Returns:
+            reconstructed_graphs: Reconstructed Data object per input graph
+        """
+        # Only the node embeddings are needed; the full forward pass would
+        # score every node pair of the batch (or sample unused negatives)
+        _, _, node_embeddings = self.encode(data)
+
+        batch = getattr(data, "batch", None)
+        if batch is None:
+            batch = torch.zeros(
+                node_embeddings.size(0), dtype=torch.long, device=node_embeddings.device
+            )
+
+        return self.decoder.reconstruct_batch(
+            node_embeddings, batch, threshold=threshold, top_k=top_k
+        )
+
     def encode_graph(self, data: Union[Data, Batch]) -> torch.Tensor:
         """
         Encode graph to single graph-level embedding.
@@ -568,6 +806,7 @@ class GraphCompressionModel(nn.Module):
         gnn_type: str = "GCN",
         num_layers: int = 3,
         dropout: float = 0.1,
+        sparse_edges: bool = False,
     ):
         """
         Initialize graph compression model.
@@ -580,6 +819,8 @@ class GraphCompressionModel(nn.Module):
             gnn_type: Type of GNN to use
             num_layers: Number of GNN layers
             dropout: Dropout probability
+            sparse_edges: Decode observed edges plus sampled negatives instead
+                of all node pairs during training
         """
         super().__init__()
 
@@ -599,6 +840,7 @@ class GraphCompressionModel(nn.Module):
             dropout=dropout,
             gnn_type=gnn_type,
             use_edge_attr=True,
+            sparse_edges=sparse_edges,
         )
 
         # Additional adaptive components
@@ -728,6 +970,35 @@ class GraphCompressionModel(nn.Module):
 
             return graph_data
 
+    def decompress_batch(
+        self,
+        z: torch.Tensor,
+        batch: torch.Tensor,
+        threshold: Union[float, torch.Tensor] = 0.5,
+        top_k: Optional[int] = None,
+    ) -> List[Data]:
+        """
+        Decompress the latent vectors of a batch into one graph per input graph.
+
+        Args:
+            z: Latent vectors of all nodes
+            batch: Graph assignment of each node (contiguous per graph)
+            threshold: Edge prediction threshold, a float or one value per graph
+            top_k: Optional maximum number of edges per graph
+
+        Returns:
+            graphs: Reconstructed Data object per graph
+        """
+        with torch.no_grad():
+            self.eval()
+
+            # Project latent to node embeddings
+            h = F.relu(self.vgae.node_proj(z))
+
+            return self.vgae.decoder.reconstruct_batch(
+                h, batch, threshold=threshold, top_k=top_k
+            )
+
 
 # Losses for graph models
 
@@ -782,7 +1053,9 @@ class GraphVAELoss(nn.Module):
 
         Args:
             outputs: Dict of model outputs including
-                     x_reconstructed, edge_pred, edge_attr_pred, mu, log_var
+                     x_reconstructed, edge_pred, edge_attr_pred, mu, log_var.
+                     Sparse decoders also provide edge_pairs and edge_labels,
+                     with edge predictions per pair (observed edges first)
             data: PyTorch Geometric Data or Batch object
 
         Returns:
@@ -794,6 +1067,12 @@ class GraphVAELoss(nn.Module):
         edge_attr_pred = outputs.get("edge_attr_pred")
         mu = outputs.get("mu")
         log_var = outputs.get("log_var")
+        edge_labels = outputs.get("edge_labels")
+
+        # Sparse decoders score candidate pairs instead of all node pairs
+        if outputs.get("edge_pairs") is not None:
+            edge_pred = outputs.get("edge_pred", outputs.get("edge_logits"))
+            edge_attr_pred = outputs.get("edge_attr_pred", outputs.get("edge_features"))
 
         # Extract data
         x = data.x
@@ -810,7 +1089,11 @@ class GraphVAELoss(nn.Module):
             loss_dict["node_loss"] = torch.tensor(0.0, device=mu.device)
 
         # Edge prediction loss (BCE)
-        if edge_pred is not None and edge_index is not None:
+        if edge_pred is not None and edge_labels is not None:
+            # Loss over observed edges and sampled negatives only
+            edge_loss = F.binary_cross_entropy_with_logits(edge_pred, edge_labels)
+            loss_dict["edge_loss"] = edge_loss * self.edge_weight
+        elif edge_pred is not None and edge_index is not None:
             # Create target adjacency matrix
             num_nodes = x.size(0)
             adj_target = torch.zeros(
@@ -826,11 +1109,13 @@ class GraphVAELoss(nn.Module):
 
         # Edge attribute reconstruction loss (MSE)
         if edge_attr_pred is not None and edge_attr is not None:
-            # Create source and target node indices from edge_index
-            src, dst = edge_index[0], edge_index[1]
-
-            # Extract predicted edge attributes for actual edges
-            pred_edge_attr = edge_attr_pred[src, dst]
+            if edge_labels is not None:
+                # Sparse predictions start with the observed edges
+                pred_edge_attr = edge_attr_pred[: edge_index.size(1)]
+            else:
+                # Extract predicted edge attributes for actual edges
+                src, dst = edge_index[0], edge_index[1]
+                pred_edge_attr = edge_attr_pred[src, dst]
 
             # Compute edge attribute loss
             edge_attr_loss = F.mse_loss(pred_edge_attr, edge_attr)
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Batched inference server for meaning-preserving compression models.
+
+This module handles:
+1. Asyncio encode/decode requests for single agent states or latent vectors
+2. Coalescing of concurrent requests into micro-batches with a max-latency deadline
+3. Running micro-batches under torch.inference_mode on a dedicated model thread
+4. Queue-depth, batch-size and latency statistics
+5. Blocking entry points for simulation worker threads
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import torch
+
+from .data import AgentState
+from .models import MeaningVAE
+from .pipelines.pipeline import Pipeline
+
+
+class Histogram:
+    """Histogram over power-of-two buckets (1, 2-3, 4-7, ...)."""
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all recorded values."""
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value: Non-negative integer value
+        """
+        bucket = 0 if value <= 0 else 1 << (int(value).bit_length() - 1)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the histogram.
+
+        Returns:
+            summary: Count, mean, max and counts per bucket lower bound
+        """
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "buckets": dict(sorted(self.buckets.items())),
+        }
+
+
+class InferenceServer:
+    """
+    Coalesces single-item encode/decode requests into micro-batches.
+
+    Requests wait at most ``max_latency_ms`` for other requests to join their
+    batch, and a batch is dispatched as soon as it reaches ``max_batch_size``.
+    Batches run one at a time on a dedicated thread, so the event loop keeps
+    collecting the next batch while the model is busy.
+
+    Example:
+        async with InferenceServer(vae) as server:
+            z = await server.encode(agent_state)
+            reconstruction = await server.decode(z)
+    """
+
+    def __init__(
+        self,
+        model: MeaningVAE,
+        max_batch_size: int = 256,
+        max_latency_ms: float = 2.0,
+        device: Optional[Union[str, torch.device]] = None,
+        encoder_pipeline: Optional[Pipeline] = None,
+    ):
+        """
+        Initialize the inference server.
+
+        Args:
+            model: Trained MeaningVAE (switched to evaluation mode)
+            max_batch_size: Maximum number of requests per micro-batch
+            max_latency_ms: Maximum time a request waits for its batch to fill
+            device: Device to run the model on (defaults to the model's device)
+            encoder_pipeline: Optional pipeline used for encoding instead of
+                MeaningVAE.encode, whose evaluation mode returns the
+                deterministic mean latent
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be positive, got {max_batch_size}")
+        if max_latency_ms < 0:
+            raise ValueError(f"max_latency_ms must be non-negative, got {max_latency_ms}")
+        if getattr(model, "use_graph", False):
+            raise ValueError("InferenceServer supports tensor-based models only")
+
+        self.model = model.eval()
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+        self.device = torch.device(device) if device is not None else next(
+            model.parameters()
+        ).device
+
+        self.encoder_pipeline = encoder_pipeline
+        if encoder_pipeline is None:
+            encode = self.model.encode
+        else:
+            encode = lambda x: encoder_pipeline.process(x)[0]
+
+        self._operations: Dict[str, Callable[[torch.Tensor], torch.Tensor]] = {
+            "encode": encode,
+            "decode": self.model.decode,
+        }
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.queue_depth = Histogram()
+        self.batch_size = Histogram()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Reset the queue-depth, batch-size and latency statistics."""
+        self.queue_depth.reset()
+        self.batch_size.reset()
+        self.num_requests = 0
+        self.num_batches = 0
+        self.total_latency = 0.0
+        self.max_latency_seen = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether the batching tasks are running."""
+        return bool(self._tasks)
+
+    async def start(self) -> "InferenceServer":
+        """
+        Start the batching tasks on the running event loop.
+
+        Returns:
+            self: For use in ``await server.start()`` expressions
+        """
+        if self.running:
+            return self
+
+        self._loop = asyncio.get_running_loop()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="inference"
+        )
+        self._queues = {name: asyncio.Queue() for name in self._operations}
+        self._tasks = [
+            asyncio.create_task(self._batch_loop(name)) for name in self._operations
+        ]
+        return self
+
+    async def stop(self) -> None:
+        """Finish queued requests and stop the batching tasks."""
+        if not self.running:
+            return
+
+        for queue in self._queues.values():
+            queue.put_nowait(None)
+        await asyncio.gather(*self._tasks)
+
+        self._tasks = []
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    async def __aenter__(self) -> "InferenceServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def encode(self, state: Union[AgentState, torch.Tensor]) -> torch.Tensor:
+        """
+        Encode a single agent state.
+
+        Args:
+            state: AgentState or feature tensor [input_dim] / [1, input_dim]
+
+        Returns:
+            z: Latent vector [latent_dim]
+        """
+        if isinstance(state, AgentState):
+            state = state.to_tensor()
+        return await self._submit("encode", state, self.model.input_dim)
+
+    async def decode(self, z: torch.Tensor) -> torch.Tensor:
+        """
+        Decode a single latent vector.
+
+        Args:
+            z: Latent tensor [latent_dim] / [1, latent_dim]
+
+        Returns:
+            reconstruction: Reconstructed features [input_dim]
+        """
+        return await self._submit("decode", z, self.model.latent_dim)
+
+    async def _submit(self, operation: str, item: torch.Tensor, dim: int) -> torch.Tensor:
+        """Queue one request and wait for its result."""
+        if not self.running:
+            raise RuntimeError("InferenceServer is not running; call start() first")
+
+        item = item.reshape(-1)
+        if item.numel() != dim:
+            raise ValueError(f"Expected {dim} values for {operation}, got {item.numel()}")
+
+        future = self._loop.create_future()
+        self._queues[operation].put_nowait((item, future, time.perf_counter()))
+        return await future
+
+    async def _batch_loop(self, operation: str) -> None:
+        """Collect micro-batches for one operation and dispatch them."""
+        queue = self._queues[operation]
+        stopping = False
+
+        while not stopping:
+            request = await queue.get()
+            if request is None:
+                break
+
+            # Fill the batch until it is full or the first request's deadline
+            batch = [request]
+            deadline = self._loop.time() + self.max_latency
+            while len(batch) < self.max_batch_size:
+                if queue.empty():
+                    timeout = deadline - self._loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        request = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    request = queue.get_nowait()
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            self.queue_depth.record(queue.qsize())
+            self.batch_size.record(len(batch))
+            await self._run_batch(operation, batch)
+
+        # Fail anything submitted after stop()
+        while not queue.empty():
+            request = queue.get_nowait()
+            if request is not None and not request[1].done():
+                request[1].set_exception(RuntimeError("InferenceServer stopped"))
+
+    async def _run_batch(
+        self, operation: str, batch: List[Tuple[torch.Tensor, asyncio.Future, float]]
+    ) -> None:
+        """Run one micro-batch on the model thread and resolve its futures."""
+        inputs = torch.stack([item for item, _, _ in batch])
+
+        try:
+            outputs = await self._loop.run_in_executor(
+                self._executor, self._forward, operation, inputs
+            )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        now = time.perf_counter()
+        self.num_batches += 1
+        for (_, future, submitted), output in zip(batch, outputs):
+            latency = now - submitted
+            self.num_requests += 1
+            self.total_latency += latency
+            self.max_latency_seen = max(self.max_latency_seen, latency)
+            if not future.done():
+                future.set_result(output)
+
+    def _forward(self, operation: str, inputs: torch.Tensor) -> torch.Tensor:
+        """Run a batch through the model (called on the model thread)."""
+        with torch.inference_mode():
+            outputs = self._operations[operation](inputs.to(self.device))
+            return outputs.cpu()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize server activity since the last reset.
+
+        Returns:
+            stats: Request and batch counts, queue-depth and batch-size
+                histograms and request latency in milliseconds
+        """
+        return {
+            "num_requests": self.num_requests,
+            "num_batches": self.num_batches,
+            "queue_depth": self.queue_depth.to_dict(),
+            "batch_size": self.batch_size.to_dict(),
+            "mean_latency_ms": (
+                1000.0 * self.total_latency / self.num_requests
+                if self.num_requests
+                else 0.0
+            ),
+            "max_latency_ms": 1000.0 * self.max_latency_seen,
+        }
+
+    def start_in_thread(self) -> "InferenceServer":
+        """
+        Run the server on an event loop in a background thread.
+
+        Use this when callers are plain threads; they can then call
+        ``encode_sync`` and ``decode_sync``.
+
+        Returns:
+            self: The started server
+        """
+        if self._thread is not None:
+            return self
+
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start())
+            started.set()
+            loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="inference-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop_thread(self) -> None:
+        """Stop a server started with ``start_in_thread``."""
+        if self._thread is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    def encode_sync(
+        self, state: Union[AgentState, torch.Tensor], timeout: Optional[float] = None
+    ) -> torch.Tensor:
+        """
+        Encode a single agent state from a worker thread.
+
+        Args:
+            state: AgentState or feature tensor
+            timeout: Optional timeout in seconds
+
+        Returns:
+            z: Latent vector [latent_dim]
+        """
+        return self._call_from_thread(self.encode(state), timeout)
+
+    def decode_sync(
+        self, z: torch.Tensor, timeout: Optional[float] = None
+    ) -> torch.Tensor:
+        """
+        Decode a single latent vector from a worker thread.
+
+        Args:
+            z: Latent tensor
+            timeout: Optional timeout in seconds
+
+        Returns:
+            reconstruction: Reconstructed features [input_dim]
+        """
+        return self._call_from_thread(self.decode(z), timeout)
+
+    def _call_from_thread(self, coroutine, timeout: Optional[float]) -> torch.Tensor:
+        """Run a request coroutine on the server loop and wait for it."""
+        if self._loop is None or not self.running:
+            coroutine.close()
+            raise RuntimeError("InferenceServer is not running; call start_in_thread()")
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
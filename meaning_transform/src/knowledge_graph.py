@@ -20,16 +20,297 @@ import networkx as nx
 import numpy as np
 import rdflib
 import torch
+import torch_geometric
 from rdflib import Graph, Literal, Namespace, URIRef
+from scipy import sparse
+from scipy.spatial import cKDTree
 from torch_geometric.data import Batch, Data
 
-from .data import AgentState
+from .data import AGENT_ROLES, AgentState, AgentStateBatch
+
+# Batch.from_data_list in PyTorch Geometric 2.x records the per-graph slices in
+# private attributes (_num_graphs, _slice_dict, _inc_dict) that to_data_list()
+# and get_example() rely on. Directly built batches only fill them in for this
+# known layout and otherwise collate per-agent Data objects.
+PYG_VERSION = tuple(
+    int(v) for v in torch_geometric.__version__.split("+")[0].split(".")[:2]
+)
+DIRECT_BATCH_SUPPORTED = PYG_VERSION[0] == 2
 
 # Define namespaces for RDF
 AGENT = Namespace("http://agent-meaning.org/agent/")
 PROP = Namespace("http://agent-meaning.org/property/")
 REL = Namespace("http://agent-meaning.org/relation/")
 
+# Node type one-hot indices used in PyTorch Geometric node features
+NODE_TYPE_MAP = {
+    "agent": 0,
+    "property": 1,
+    "inventory_item": 2,
+    "goal": 3,
+    "unknown": 4,
+}
+
+# Relation one-hot indices used in PyTorch Geometric edge features
+RELATION_MAP = {
+    "has_health": 0,
+    "has_energy": 1,
+    "has_position": 2,
+    "has_role": 3,
+    "has_item": 4,
+    "has_goal": 5,
+    "proximity": 6,
+    "inventory_similarity": 7,
+    "cooperation": 8,
+    "unknown": 9,
+}
+
+# Scalar properties represented as property nodes, in insertion order
+SCALAR_PROPERTY_NODES = (
+    "health",
+    "energy",
+    "resource_level",
+    "current_health",
+    "age",
+    "total_reward",
+)
+
+# Inter-agent relations in the order they are evaluated for each agent pair
+AGENT_RELATIONS = ("proximity", "inventory_similarity", "cooperation")
+
+# Distance normalization of the proximity relation (assumed max world size)
+PROXIMITY_MAX_DISTANCE = 100.0
+
+# Fixed property node slots of an agent template: scalar properties,
+# then position and role
+_TEMPLATE_SLOTS = SCALAR_PROPERTY_NODES + ("position", "role")
+_TEMPLATE_RELATIONS = np.array(
+    [RELATION_MAP.get(f"has_{name}", RELATION_MAP["unknown"]) for name in _TEMPLATE_SLOTS]
+)
+
+
+def _ragged_arange(counts: np.ndarray) -> np.ndarray:
+    """
+    Concatenate aranges of the given lengths, e.g. [2, 3] -> [0, 1, 0, 1, 2].
+
+    Args:
+        counts: Length of each range
+
+    Returns:
+        Local index of every element within its range
+    """
+    starts = np.cumsum(counts) - counts
+    return np.arange(counts.sum()) - np.repeat(starts, counts)
+
+
+def _empty_pairs() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Empty (source, target, weight) arrays."""
+    return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+
+
+def _upper_pairs(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """All pairs i < j among the given (sorted) row indices."""
+    i, j = np.triu_indices(len(rows), k=1)
+    return rows[i], rows[j]
+
+
+def proximity_pairs(
+    positions: np.ndarray, threshold: float, has_position: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find agent pairs whose normalized distance is below a threshold.
+
+    Candidate pairs come from a KD-tree radius query and are then filtered
+    with the same formula as ``AgentStateToGraph._calculate_proximity``.
+
+    Args:
+        positions: Agent positions [N, 3]
+        threshold: Relationship threshold on the normalized distance
+        has_position: Optional mask of agents with a position
+
+    Returns:
+        sources: First agent of each pair (sources < targets)
+        targets: Second agent of each pair
+        weights: Edge weights (1 - proximity)
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if has_position is None:
+        has_position = np.ones(len(positions), dtype=bool)
+
+    if threshold <= 0.0:
+        return _empty_pairs()
+
+    if threshold > 1.0:
+        # Proximity is capped at 1, so every pair qualifies
+        i, j = _upper_pairs(np.flatnonzero(has_position))
+    else:
+        # Non-finite positions never come within a finite radius
+        rows = np.flatnonzero(has_position & np.isfinite(positions).all(axis=1))
+        if len(rows) < 2:
+            return _empty_pairs()
+
+        # Query a slightly larger radius; the exact test happens below
+        radius = threshold * PROXIMITY_MAX_DISTANCE
+        tree = cKDTree(positions[rows])
+        pairs = tree.query_pairs(radius * (1.0 + 1e-9), output_type="ndarray")
+        i = rows[np.minimum(pairs[:, 0], pairs[:, 1])]
+        j = rows[np.maximum(pairs[:, 0], pairs[:, 1])]
+
+    diff = positions[i] - positions[j]
+    distance = np.sqrt(diff[:, 0] ** 2 + diff[:, 1] ** 2 + diff[:, 2] ** 2)
+    proximity = np.minimum(distance / PROXIMITY_MAX_DISTANCE, 1.0)
+
+    keep = proximity < threshold
+    return i[keep], j[keep], 1.0 - proximity[keep]
+
+
+def jaccard_pairs(
+    sets: List[Any], threshold: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find pairs of non-empty sets whose Jaccard similarity exceeds a threshold.
+
+    Identical sets are grouped first, so similarities are computed once per
+    pair of distinct sets with a sparse incidence-matrix product and then
+    expanded to the member pairs.
+
+    Args:
+        sets: Collection of items per agent (e.g. inventory keys or goals)
+        threshold: Relationship threshold on the Jaccard similarity
+
+    Returns:
+        sources: First agent of each pair (sources < targets)
+        targets: Second agent of each pair
+        weights: Jaccard similarities
+    """
+    if threshold >= 1.0:
+        return _empty_pairs()
+
+    # Group agents with identical sets (-1 marks empty sets)
+    groups = {}
+    inverse = np.full(len(sets), -1, dtype=np.int64)
+    for idx, items in enumerate(sets):
+        if items:
+            inverse[idx] = groups.setdefault(frozenset(items), len(groups))
+    num_groups = len(groups)
+    if num_groups == 0:
+        return _empty_pairs()
+
+    # Sparse incidence matrix of distinct sets over the item vocabulary
+    vocabulary = {}
+    item_columns = [
+        vocabulary.setdefault(item, len(vocabulary)) for items in groups for item in items
+    ]
+    sizes = np.array([len(items) for items in groups], dtype=np.int64)
+    indptr = np.zeros(num_groups + 1, dtype=np.int64)
+    np.cumsum(sizes, out=indptr[1:])
+    incidence = sparse.csr_matrix(
+        (np.ones(len(item_columns), dtype=np.int64), item_columns, indptr),
+        shape=(num_groups, len(vocabulary)),
+    )
+
+    if threshold < 0.0:
+        # Disjoint sets qualify as well, so every group pair is a candidate
+        a, b = np.triu_indices(num_groups)
+        shared = (incidence @ incidence.T).toarray()[a, b]
+    else:
+        # Only groups sharing at least one item can exceed the threshold
+        overlap = sparse.triu(incidence @ incidence.T, k=0).tocoo()
+        a, b, shared = overlap.row, overlap.col, overlap.data
+
+    similarity = shared / (sizes[a] + sizes[b] - shared)
+    keep = similarity > threshold
+    a, b, similarity = a[keep], b[keep], similarity[keep]
+
+    # Members of each group in ascending agent order
+    grouped = np.flatnonzero(inverse >= 0)
+    members = grouped[np.argsort(inverse[grouped], kind="stable")]
+    counts = np.bincount(inverse[grouped], minlength=num_groups)
+    starts = np.cumsum(counts) - counts
+
+    # Pairs across two different groups: every member combination
+    cross = a != b
+    ca, cb = counts[a[cross]], counts[b[cross]]
+    pair_sizes = ca * cb
+    local = _ragged_arange(pair_sizes)
+    repeat_b = np.repeat(cb, pair_sizes)
+    p = members[np.repeat(starts[a[cross]], pair_sizes) + local // repeat_b]
+    q = members[np.repeat(starts[b[cross]], pair_sizes) + local % repeat_b]
+    sources = [np.minimum(p, q)]
+    targets = [np.maximum(p, q)]
+    weights = [np.repeat(similarity[cross], pair_sizes)]
+
+    # Pairs within one group (identical sets)
+    for group, value in zip(a[~cross], similarity[~cross]):
+        group_members = members[starts[group] : starts[group] + counts[group]]
+        i, j = _upper_pairs(group_members)
+        sources.append(i)
+        targets.append(j)
+        weights.append(np.full(len(i), value))
+
+    return np.concatenate(sources), np.concatenate(targets), np.concatenate(weights)
+
+
+def find_agent_relationships(
+    positions: np.ndarray,
+    inventories: List[Dict[str, Any]],
+    goals: List[List[str]],
+    agent_ids: List[Optional[str]],
+    threshold: float,
+    has_position: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find all inter-agent relationships without comparing every pair.
+
+    Produces the same relationships as the pairwise rules of
+    ``AgentStateToGraph``: proximity below the threshold, and inventory
+    or goal Jaccard similarity above it. Pairs with equal agent ids are
+    skipped.
+
+    Args:
+        positions: Agent positions [N, 3]
+        inventories: Inventory dictionary per agent
+        goals: Goal list per agent
+        agent_ids: Agent id per agent
+        threshold: Relationship threshold
+        has_position: Optional mask of agents with a position
+
+    Returns:
+        sources: First agent of each relationship
+        targets: Second agent of each relationship (sources < targets)
+        relations: Index into AGENT_RELATIONS
+        weights: Relationship weights
+
+        Relationships are sorted by (source, target, relation), which is the
+        order the pairwise loop evaluates them in.
+    """
+    found = [
+        proximity_pairs(positions, threshold, has_position),
+        jaccard_pairs([inventory.keys() for inventory in inventories], threshold),
+        jaccard_pairs(goals, threshold),
+    ]
+
+    sources = np.concatenate([pairs[0] for pairs in found])
+    targets = np.concatenate([pairs[1] for pairs in found])
+    weights = np.concatenate([pairs[2] for pairs in found])
+    relations = np.repeat(np.arange(len(found)), [len(pairs[0]) for pairs in found])
+
+    # Skip pairs of agents sharing an id
+    id_codes = {}
+    codes = np.array(
+        [id_codes.setdefault(agent_id, len(id_codes)) for agent_id in agent_ids],
+        dtype=np.int64,
+    )
+    keep = codes[sources] != codes[targets]
+
+    order = np.lexsort((relations[keep], targets[keep], sources[keep]))
+    return (
+        sources[keep][order],
+        targets[keep][order],
+        relations[keep][order],
+        weights[keep][order],
+    )
+
 
 class AgentStateToGraph:
     """
@@ -94,7 +375,20 @@ class AgentStateToGraph:
             G: NetworkX graph representation
         """
         G = nx.Graph()
+        self._add_agent(G, agent)
+        return G
 
+    def _add_agent(self, G: nx.Graph, agent: AgentState) -> None:
+        """
+        Add an agent node and its properties to an existing graph.
+
+        Nodes already in the graph (agents sharing an id) have their
+        attributes updated, as when composing per-agent graphs.
+
+        Args:
+            G: NetworkX graph to add to
+            agent: AgentState object
+        """
         # Create agent node
         agent_id = agent.agent_id or "agent_default"
         agent_uri = URIRef(f"{AGENT}{agent_id}")
@@ -113,8 +407,6 @@ class AgentStateToGraph:
                 if key not in ["agent_id", "step_number"]:
                     G.nodes[agent_uri][key] = value
 
-        return G
-
     def _extract_agent_features(self, agent: AgentState) -> np.ndarray:
         """
         Extract numerical features from agent state.
@@ -171,14 +463,7 @@ class AgentStateToGraph:
             agent_uri: URI reference for agent
         """
         # Add nodes for scalar properties
-        for prop_name in [
-            "health",
-            "energy",
-            "resource_level",
-            "current_health",
-            "age",
-            "total_reward",
-        ]:
+        for prop_name in SCALAR_PROPERTY_NODES:
             if hasattr(agent, prop_name) and getattr(agent, prop_name) is not None:
                 prop_value = getattr(agent, prop_name)
                 prop_uri = URIRef(f"{PROP}{prop_name}_{agent.agent_id}")
@@ -213,12 +498,14 @@ class AgentStateToGraph:
                 G.add_node(goal_uri, type="goal", description=goal)
                 G.add_edge(agent_uri, goal_uri, relation="has_goal")
 
-    def agents_to_graph(self, agents: List[AgentState]) -> nx.Graph:
+    def agents_to_graph(
+        self, agents: Union[List[AgentState], AgentStateBatch]
+    ) -> nx.Graph:
         """
         Convert multiple agent states to a unified graph representation.
 
         Args:
-            agents: List of AgentState objects
+            agents: List of AgentState objects or a columnar AgentStateBatch
 
         Returns:
             G: NetworkX graph representation with agent relationships
@@ -226,10 +513,10 @@ class AgentStateToGraph:
         # Create initial graph with all agents
         G = nx.Graph()
 
-        # Add each agent to the graph
+        # Add each agent to the graph in a single pass (composing per-agent
+        # graphs would copy the accumulated graph for every agent)
         for agent in agents:
-            agent_graph = self.agent_to_graph(agent)
-            G = nx.compose(G, agent_graph)
+            self._add_agent(G, agent)
 
         # Add relationships between agents if enabled
         if self.include_relations:
@@ -237,71 +524,115 @@ class AgentStateToGraph:
 
         return G
 
-    def _add_agent_relationships(self, G: nx.Graph, agents: List[AgentState]) -> None:
+    def _relationship_columns(
+        self, agents: Union[List[AgentState], AgentStateBatch]
+    ) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]], List[List[str]], List[Optional[str]]]:
         """
-        Add relationships between agents based on various metrics.
+        Gather the agent attributes used for inter-agent relationships.
 
         Args:
-            G: NetworkX graph
-            agents: List of AgentState objects
-        """
-        # Get list of agent nodes (filtering out property nodes)
-        agent_nodes = [
-            node for node, data in G.nodes(data=True) if data.get("type") == "agent"
-        ]
+            agents: List of AgentState objects or a columnar AgentStateBatch
 
-        for i, agent1 in enumerate(agents):
-            agent1_uri = URIRef(f"{AGENT}{agent1.agent_id or 'agent_default'}")
+        Returns:
+            positions: Agent positions [N, 3] (NaN for missing coordinates)
+            has_position: Mask of agents with a position
+            inventories: Inventory dictionary per agent
+            goals: Goal list per agent
+            agent_ids: Agent id per agent
+        """
+        num_agents = len(agents)
+
+        if isinstance(agents, AgentStateBatch):
+            return (
+                agents.position,
+                np.ones(num_agents, dtype=bool),
+                [inventory or {} for inventory in (agents.inventories or [None] * num_agents)],
+                [goal_list or [] for goal_list in (agents.goals or [None] * num_agents)],
+                list(agents.agent_ids or [None] * num_agents),
+            )
+
+        positions = np.full((num_agents, 3), np.nan)
+        for i, agent in enumerate(agents):
+            if agent.position:
+                positions[i, : len(agent.position)] = [
+                    np.nan if p is None else p for p in agent.position[:3]
+                ]
+        return (
+            positions,
+            np.array([bool(agent.position) for agent in agents], dtype=bool),
+            [agent.inventory or {} for agent in agents],
+            [agent.goals or [] for agent in agents],
+            [agent.agent_id for agent in agents],
+        )
 
-            for j, agent2 in enumerate(agents[i + 1 :], start=i + 1):
-                agent2_uri = URIRef(f"{AGENT}{agent2.agent_id or 'agent_default'}")
+    def find_relationships(
+        self, agents: Union[List[AgentState], AgentStateBatch]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find relationships between agents using spatial and set indexes.
 
-                # Skip self-relationships
-                if agent1.agent_id == agent2.agent_id:
-                    continue
+        Args:
+            agents: List of AgentState objects or a columnar AgentStateBatch
 
-                # Calculate proximity if positions are available
-                if agent1.position and agent2.position:
-                    proximity = self._calculate_proximity(
-                        agent1.position, agent2.position
-                    )
+        Returns:
+            sources, targets, relations, weights as returned by
+            ``find_agent_relationships``
+        """
+        positions, has_position, inventories, goals, agent_ids = (
+            self._relationship_columns(agents)
+        )
+        return find_agent_relationships(
+            positions,
+            inventories,
+            goals,
+            agent_ids,
+            self.relationship_threshold,
+            has_position=has_position,
+        )
 
-                    # Add proximity edge if close enough
-                    if proximity < self.relationship_threshold:
-                        G.add_edge(
-                            agent1_uri,
-                            agent2_uri,
-                            relation="proximity",
-                            weight=1.0 - proximity,
-                        )
+    def _add_agent_relationships(
+        self, G: nx.Graph, agents: Union[List[AgentState], AgentStateBatch]
+    ) -> None:
+        """
+        Add relationships between agents based on various metrics.
 
-                # Calculate inventory similarity
-                if agent1.inventory and agent2.inventory:
-                    similarity = self._calculate_inventory_similarity(
-                        agent1.inventory, agent2.inventory
-                    )
+        Proximity edges come from a KD-tree radius query and inventory/goal
+        similarity edges from sparse set overlaps, so agent pairs without a
+        relationship are never visited.
 
-                    if similarity > self.relationship_threshold:
-                        G.add_edge(
-                            agent1_uri,
-                            agent2_uri,
-                            relation="inventory_similarity",
-                            weight=similarity,
-                        )
+        Args:
+            G: NetworkX graph
+            agents: List of AgentState objects or a columnar AgentStateBatch
+        """
+        positions, has_position, inventories, goals, agent_ids = (
+            self._relationship_columns(agents)
+        )
+        sources, targets, relations, weights = find_agent_relationships(
+            positions,
+            inventories,
+            goals,
+            agent_ids,
+            self.relationship_threshold,
+            has_position=has_position,
+        )
+        if len(sources) == 0:
+            return
 
-                # Check for cooperation based on shared goals
-                if agent1.goals and agent2.goals:
-                    cooperation = self._calculate_goal_overlap(
-                        agent1.goals, agent2.goals
-                    )
+        agent_uris = [
+            URIRef(f"{AGENT}{agent_id or 'agent_default'}") for agent_id in agent_ids
+        ]
 
-                    if cooperation > self.relationship_threshold:
-                        G.add_edge(
-                            agent1_uri,
-                            agent2_uri,
-                            relation="cooperation",
-                            weight=cooperation,
-                        )
+        # Edges are added in pairwise-loop order, so a pair with several
+        # relations keeps the last one, as before
+        for i, j, relation, weight in zip(
+            sources.tolist(), targets.tolist(), relations.tolist(), weights.tolist()
+        ):
+            G.add_edge(
+                agent_uris[i],
+                agent_uris[j],
+                relation=AGENT_RELATIONS[relation],
+                weight=weight,
+            )
 
     def _calculate_proximity(
         self, pos1: Tuple[float, float, float], pos2: Tuple[float, float, float]
@@ -392,13 +723,7 @@ class AgentStateToGraph:
         node_types = [G.nodes[node].get("type", "unknown") for node in nodes]
 
         # Create node type mapping
-        node_type_map = {
-            "agent": 0,
-            "property": 1,
-            "inventory_item": 2,
-            "goal": 3,
-            "unknown": 4,
-        }
+        node_type_map = NODE_TYPE_MAP
 
         # Initialize feature matrix - for now using fixed size feature vector
         node_features = []
@@ -439,10 +764,12 @@ class AgentStateToGraph:
         edge_index = []
         edge_attr = []
 
+        # Map node IDs to indices (a list lookup per edge is quadratic)
+        node_index = {node: i for i, node in enumerate(nodes)}
+
         for source, target, data in G.edges(data=True):
-            # Map node IDs to indices
-            source_idx = nodes.index(source)
-            target_idx = nodes.index(target)
+            source_idx = node_index[source]
+            target_idx = node_index[target]
 
             # Add edge in both directions (undirected graph)
             edge_index.append([source_idx, target_idx])
@@ -453,18 +780,7 @@ class AgentStateToGraph:
             weight = data.get("weight", 1.0)
 
             # Relation type mapping
-            relation_map = {
-                "has_health": 0,
-                "has_energy": 1,
-                "has_position": 2,
-                "has_role": 3,
-                "has_item": 4,
-                "has_goal": 5,
-                "proximity": 6,
-                "inventory_similarity": 7,
-                "cooperation": 8,
-                "unknown": 9,
-            }
+            relation_map = RELATION_MAP
 
             # Create one-hot encoding for relation type
             relation_one_hot = np.zeros(len(relation_map))
@@ -486,6 +802,336 @@ class AgentStateToGraph:
 
         return data
 
+    def _template_columns(
+        self, agents: Union[List[AgentState], AgentStateBatch]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]], List[List[str]]]:
+        """
+        Gather the per-agent template data used by the direct graph builder.
+
+        Values follow what ``agent_to_graph`` sees for the same agents,
+        including the ``AgentState`` constructor defaults applied to batch rows.
+
+        Args:
+            agents: List of AgentState objects or a columnar AgentStateBatch
+
+        Returns:
+            agent_features: Agent node features [N, 15]
+            slot_values: Values of the fixed property slots [N, 8]
+            slot_mask: Which fixed property slots exist [N, 8]
+            inventories: Inventory dictionary per agent
+            goals: Goal list per agent
+        """
+        num_agents = len(agents)
+        num_slots = len(_TEMPLATE_SLOTS)
+
+        if isinstance(agents, AgentStateBatch):
+            # Rows materialize through the AgentState constructor, whose
+            # falsy-value defaults are applied here column-wise
+            health = np.where(agents.health == 0, 1.0, agents.health)
+            energy = np.where(agents.energy == 0, 1.0, agents.energy)
+            current_health = np.where(
+                agents.current_health == 0, health, agents.current_health
+            )
+            age = agents.age.astype(np.float64)
+
+            # Role codes to converter role indices (unknown roles default to explorer)
+            role_lookup = np.array(
+                [self.role_map.get(role, 0) for role in AGENT_ROLES]
+                + [self.role_map.get("explorer", 0)]
+            )
+            role_idx = role_lookup[agents.role_codes.astype(np.int64)]
+
+            agent_features = np.zeros((num_agents, 15))
+            agent_features[:, 0:3] = agents.position
+            agent_features[:, 3] = health
+            agent_features[:, 4] = energy
+            agent_features[np.arange(num_agents), 5 + role_idx] = 1.0
+            agent_features[:, 10] = agents.resource_level
+            agent_features[:, 11] = current_health
+            agent_features[:, 12] = agents.is_defending
+            agent_features[:, 13] = age
+            agent_features[:, 14] = agents.total_reward
+
+            # Position and role nodes have non-numeric values (feature 0.0)
+            slot_values = np.zeros((num_agents, num_slots))
+            slot_values[:, :6] = np.stack(
+                [health, energy, agents.resource_level, current_health, age, agents.total_reward],
+                axis=1,
+            )
+            slot_mask = np.ones((num_agents, num_slots), dtype=bool)
+
+            inventories = [
+                inventory or {} for inventory in (agents.inventories or [None] * num_agents)
+            ]
+            goals = [goal_list or [] for goal_list in (agents.goals or [None] * num_agents)]
+            return agent_features, slot_values, slot_mask, inventories, goals
+
+        agent_features = np.zeros((num_agents, 15))
+        slot_values = np.zeros((num_agents, num_slots))
+        slot_mask = np.zeros((num_agents, num_slots), dtype=bool)
+        inventories = []
+        goals = []
+
+        for i, agent in enumerate(agents):
+            agent_features[i] = self._extract_agent_features(agent)
+            for k, prop_name in enumerate(SCALAR_PROPERTY_NODES):
+                value = getattr(agent, prop_name, None)
+                slot_mask[i, k] = value is not None
+                if isinstance(value, (int, float)):
+                    slot_values[i, k] = value
+            slot_mask[i, 6] = bool(agent.position)
+            slot_mask[i, 7] = bool(agent.role)
+            inventories.append(agent.inventory or {})
+            goals.append(agent.goals or [])
+
+        return agent_features, slot_values, slot_mask, inventories, goals
+
+    def agents_to_torch_geometric_batch(
+        self, agents: Union[List[AgentState], AgentStateBatch]
+    ) -> Batch:
+        """
+        Build a batch of per-agent graphs directly as PyTorch Geometric tensors.
+
+        Produces the same ``x``, ``edge_index`` and ``edge_attr`` as batching
+        ``to_torch_geometric(agent_to_graph(agent))`` for every agent, without
+        building NetworkX graphs. Each agent graph follows a fixed template
+        (agent node, scalar property nodes, position and role nodes, then
+        inventory and goal nodes), so node and edge positions are computed
+        with vectorized offset arithmetic.
+
+        Args:
+            agents: List of AgentState objects or a columnar AgentStateBatch
+
+        Returns:
+            batch: PyTorch Geometric Batch with one graph per agent
+        """
+        if not self.property_as_node:
+            # Agents without property nodes are single attribute-rich nodes
+            return Batch.from_data_list(
+                [self.to_torch_geometric(self.agent_to_graph(agent)) for agent in agents]
+            )
+
+        x, edge_index, edge_attr, ptr, edge_ptr = self._template_arrays(agents)
+        num_agents = len(ptr) - 1
+
+        x = torch.tensor(x, dtype=torch.float)
+        edge_index = torch.from_numpy(edge_index)
+        edge_attr = torch.tensor(edge_attr, dtype=torch.float)
+        ptr = torch.from_numpy(ptr)
+        edge_ptr = torch.from_numpy(edge_ptr)
+
+        if not DIRECT_BATCH_SUPPORTED:
+            # Collate views of the per-agent slices through the public API
+            return Batch.from_data_list(
+                [
+                    Data(
+                        x=x[ptr[i] : ptr[i + 1]],
+                        edge_index=edge_index[:, edge_ptr[i] : edge_ptr[i + 1]] - ptr[i],
+                        edge_attr=edge_attr[edge_ptr[i] : edge_ptr[i + 1]],
+                    )
+                    for i in range(num_agents)
+                ]
+            )
+
+        batch = Batch(
+            x=x,
+            edge_index=edge_index,
+            edge_attr=edge_attr,
+            batch=torch.repeat_interleave(ptr.diff()),
+            ptr=ptr,
+        )
+
+        # Bookkeeping normally filled in by Batch.from_data_list, so that
+        # to_data_list() and get_example() work on the result (PyG 2.x layout,
+        # checked against Batch.from_data_list in the tests)
+        batch._num_graphs = num_agents
+        batch._slice_dict = {"x": ptr, "edge_index": edge_ptr, "edge_attr": edge_ptr}
+        batch._inc_dict = {
+            "x": torch.zeros(num_agents, dtype=torch.long),
+            "edge_index": ptr[:-1],
+            "edge_attr": torch.zeros(num_agents, dtype=torch.long),
+        }
+
+        return batch
+
+    def _template_arrays(
+        self, agents: Union[List[AgentState], AgentStateBatch]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Lay out the per-agent node templates of a set of agents.
+
+        Args:
+            agents: List of AgentState objects or a columnar AgentStateBatch
+
+        Returns:
+            x: Node features [num_nodes, 20]
+            edge_index: Agent-property edges in both directions [2, num_edges]
+            edge_attr: Edge features [num_edges, 11]
+            ptr: Node offset of each agent graph [N + 1]
+            edge_ptr: Edge offset of each agent graph [N + 1]
+        """
+        agent_features, slot_values, slot_mask, inventories, goals = (
+            self._template_columns(agents)
+        )
+        num_agents = len(agent_features)
+        agent_range = np.arange(num_agents)
+
+        inventory_counts = np.array([len(inv) for inv in inventories], dtype=np.int64)
+        goal_counts = np.array([len(g) for g in goals], dtype=np.int64)
+        inventory_values = np.array(
+            [
+                float(quantity) if isinstance(quantity, (int, float)) else 0.0
+                for inventory in inventories
+                for quantity in inventory.values()
+            ],
+            dtype=np.float64,
+        )
+        slot_counts = slot_mask.sum(axis=1)
+
+        # Node offsets of each agent graph (the batch ptr)
+        num_children = slot_counts + inventory_counts + goal_counts
+        ptr = np.zeros(num_agents + 1, dtype=np.int64)
+        np.cumsum(num_children + 1, out=ptr[1:])
+        agent_nodes = ptr[:-1]
+
+        # Children in template order: fixed slots, inventory items, goals
+        slot_rows, slot_cols = np.nonzero(slot_mask)
+        slot_pos = (np.cumsum(slot_mask, axis=1) - 1)[slot_rows, slot_cols]
+        inventory_rows = np.repeat(agent_range, inventory_counts)
+        inventory_pos = slot_counts[inventory_rows] + _ragged_arange(inventory_counts)
+        goal_rows = np.repeat(agent_range, goal_counts)
+        goal_pos = (
+            slot_counts[goal_rows] + inventory_counts[goal_rows] + _ragged_arange(goal_counts)
+        )
+
+        child_rows = np.concatenate([slot_rows, inventory_rows, goal_rows])
+        child_nodes = agent_nodes[child_rows] + 1 + np.concatenate(
+            [slot_pos, inventory_pos, goal_pos]
+        )
+        child_types = np.concatenate(
+            [
+                np.full(len(slot_rows), NODE_TYPE_MAP["property"]),
+                np.full(len(inventory_rows), NODE_TYPE_MAP["inventory_item"]),
+                np.full(len(goal_rows), NODE_TYPE_MAP["goal"]),
+            ]
+        )
+        child_values = np.concatenate(
+            [slot_values[slot_rows, slot_cols], inventory_values, np.zeros(len(goal_rows))]
+        )
+        child_relations = np.concatenate(
+            [
+                _TEMPLATE_RELATIONS[slot_cols],
+                np.full(len(inventory_rows), RELATION_MAP["has_item"]),
+                np.full(len(goal_rows), RELATION_MAP["has_goal"]),
+            ]
+        )
+
+        # Node features: type one-hot followed by 15 features
+        x = np.zeros((ptr[-1], 5 + agent_features.shape[1]))
+        x[agent_nodes, NODE_TYPE_MAP["agent"]] = 1.0
+        x[agent_nodes, 5:] = agent_features
+        x[child_nodes, child_types] = 1.0
+        x[child_nodes, 5] = child_values
+
+        # Edges are ordered like their child nodes (one agent node precedes
+        # each graph's children), each as agent->child then child->agent
+        edge_slots = child_nodes - child_rows - 1
+        num_edges = 2 * len(edge_slots)
+        edge_index = np.empty((2, num_edges), dtype=np.int64)
+        edge_index[0, 2 * edge_slots] = agent_nodes[child_rows]
+        edge_index[1, 2 * edge_slots] = child_nodes
+        edge_index[0, 2 * edge_slots + 1] = child_nodes
+        edge_index[1, 2 * edge_slots + 1] = agent_nodes[child_rows]
+
+        relations = np.empty(len(edge_slots), dtype=np.int64)
+        relations[edge_slots] = child_relations
+        edge_attr = np.zeros((num_edges, len(RELATION_MAP) + 1))
+        edge_attr[np.arange(num_edges), np.repeat(relations, 2)] = 1.0
+        edge_attr[:, -1] = 1.0  # weight
+
+        edge_ptr = np.zeros(num_agents + 1, dtype=np.int64)
+        np.cumsum(2 * num_children, out=edge_ptr[1:])
+
+        return x, edge_index, edge_attr, ptr, edge_ptr
+
+    def agents_to_torch_geometric(
+        self, agents: Union[List[AgentState], AgentStateBatch]
+    ) -> Data:
+        """
+        Build a multi-agent graph directly as PyTorch Geometric tensors.
+
+        Produces the same tensors as ``to_torch_geometric(agents_to_graph(agents))``
+        in linear time: agent templates are laid out as in
+        ``agents_to_torch_geometric_batch`` and inter-agent relationships from
+        ``find_relationships`` are placed after the property edges of their
+        first agent. Agents sharing ids are merged into one node by the
+        NetworkX graph, so such inputs fall back to that path.
+
+        Args:
+            agents: List of AgentState objects or a columnar AgentStateBatch
+
+        Returns:
+            data: PyTorch Geometric Data of the multi-agent graph
+        """
+        if isinstance(agents, AgentStateBatch):
+            agent_ids = list(agents.agent_ids or [None] * len(agents))
+        else:
+            agent_ids = [agent.agent_id for agent in agents]
+
+        # Node URIs use both the raw id and its default, both must be unique
+        unique_ids = len(set(map(str, agent_ids))) == len(agent_ids) and len(
+            {agent_id or "agent_default" for agent_id in agent_ids}
+        ) == len(agent_ids)
+        if not (self.property_as_node and unique_ids and len(agent_ids) > 0):
+            return self.to_torch_geometric(self.agents_to_graph(agents))
+
+        x, template_index, template_attr, ptr, edge_ptr = self._template_arrays(agents)
+        num_agents = len(ptr) - 1
+
+        if self.include_relations:
+            sources, targets, relations, weights = self.find_relationships(agents)
+        else:
+            sources = targets = relations = np.zeros(0, dtype=np.int64)
+            weights = np.zeros(0)
+
+        # A pair with several relations keeps the last one (one graph edge)
+        last = np.ones(len(sources), dtype=bool)
+        last[:-1] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+        sources, targets = sources[last], targets[last]
+        relations, weights = relations[last], weights[last]
+
+        # Relationship edges of earlier agents shift each template block
+        relation_counts = np.bincount(sources, minlength=num_agents)
+        relation_ptr = np.cumsum(relation_counts) - relation_counts
+        template_agents = np.repeat(np.arange(num_agents), np.diff(edge_ptr))
+        template_pos = np.arange(len(template_agents)) + 2 * relation_ptr[template_agents]
+
+        # Relationship edges follow the property edges of their source agent
+        relation_pos = edge_ptr[sources + 1] + 2 * np.arange(len(sources))
+
+        num_edges = len(template_agents) + 2 * len(sources)
+        edge_index = np.empty((2, num_edges), dtype=np.int64)
+        edge_attr = np.zeros((num_edges, template_attr.shape[1]))
+        edge_index[:, template_pos] = template_index
+        edge_attr[template_pos] = template_attr
+
+        relation_columns = np.array(
+            [RELATION_MAP[relation] for relation in AGENT_RELATIONS], dtype=np.int64
+        )[relations]
+        for direction, (first, second) in enumerate(
+            [(ptr[sources], ptr[targets]), (ptr[targets], ptr[sources])]
+        ):
+            edge_index[0, relation_pos + direction] = first
+            edge_index[1, relation_pos + direction] = second
+            edge_attr[relation_pos + direction, relation_columns] = 1.0
+            edge_attr[relation_pos + direction, -1] = weights
+
+        return Data(
+            x=torch.tensor(x, dtype=torch.float),
+            edge_index=torch.from_numpy(edge_index),
+            edge_attr=torch.tensor(edge_attr, dtype=torch.float),
+        )
+
     def to_rdf(self, G: nx.Graph, format: str = "turtle") -> str:
         """
         Convert NetworkX graph to RDF representation.
@@ -14,7 +14,7 @@ This module defines:
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple
 import math
 
 
@@ -143,6 +143,21 @@ class KLDivergenceLoss(nn.Module):
         return kl_loss
 
 
+# Column spans of each semantic feature in the fused feature matrix
+SEMANTIC_FEATURE_COLUMNS = {
+    "position": (0, 2),
+    "health": (2, 3),
+    "has_target": (3, 4),
+    "energy": (4, 5),
+    "is_alive": (5, 6),
+    "role": (6, 7),
+    "threatened": (7, 8),
+}
+
+# Semantic features compared with binary cross-entropy (all others use MSE)
+BINARY_SEMANTIC_FEATURES = ("has_target", "is_alive", "threatened")
+
+
 class SemanticLoss(nn.Module):
     """Loss for measuring semantic preservation between original and reconstructed states."""
     
@@ -158,6 +173,149 @@ class SemanticLoss(nn.Module):
         self.feature_extractors = feature_extractors or ["position", "health", "has_target", 
                                                          "energy", "is_alive", "role", "threatened"]
         self.similarity_type = similarity_type
+
+        # Features that contribute to the loss, in extractor order
+        self.active_features = [
+            name for name in self.feature_extractors if name in SEMANTIC_FEATURE_COLUMNS
+        ]
+
+        # Per-device cache of the index/mask tensors used by the fused loss
+        self._layout_cache = {}
+
+    def _fused_layout(self, device: torch.device) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Get the precomputed index and mask tensors for the fused loss.
+
+        Args:
+            device: Device the tensors should live on
+
+        Returns:
+            binary_columns: Bool mask [C] of feature-matrix columns using BCE
+            column_feature: Long index [C] mapping each column to its active feature
+                (columns of inactive features map to an extra discard slot)
+            column_counts: Number of columns per active feature [F]
+        """
+        if device not in self._layout_cache:
+            num_columns = max(end for _, end in SEMANTIC_FEATURE_COLUMNS.values())
+            discard_slot = len(self.active_features)
+            binary_columns = torch.zeros(num_columns, dtype=torch.bool)
+            column_feature = torch.full((num_columns,), discard_slot, dtype=torch.long)
+            column_counts = torch.zeros(len(self.active_features))
+
+            for name, (start, end) in SEMANTIC_FEATURE_COLUMNS.items():
+                binary_columns[start:end] = name in BINARY_SEMANTIC_FEATURES
+                if name in self.active_features:
+                    slot = self.active_features.index(name)
+                    column_feature[start:end] = slot
+                    column_counts[slot] = end - start
+
+            self._layout_cache[device] = (
+                binary_columns.to(device),
+                column_feature.to(device),
+                column_counts.to(device),
+            )
+        return self._layout_cache[device]
+
+    def semantic_feature_matrix(self, state_tensor: torch.Tensor) -> torch.Tensor:
+        """
+        Extract all semantic features into a single matrix.
+
+        Computes the same values as ``extract_semantic_features`` laid out as
+        columns according to ``SEMANTIC_FEATURE_COLUMNS``.
+
+        Args:
+            state_tensor: The serialized agent state tensor [..., B, D]
+
+        Returns:
+            features: Semantic feature matrix [..., B, 8]
+        """
+        health = state_tensor[..., 2] * 100.0  # denormalized
+        has_target = state_tensor[..., 3]
+        energy = state_tensor[..., 4] * 100.0  # denormalized
+        role_idx = torch.argmax(state_tensor[..., 5:10], dim=-1)
+
+        return torch.stack(
+            [
+                state_tensor[..., 0],
+                state_tensor[..., 1],
+                health / 100.0,
+                has_target,
+                energy / 100.0,
+                (health > 10).to(state_tensor.dtype),
+                role_idx.to(state_tensor.dtype) / 5.0,
+                ((has_target == 1.0) & (health < 30)).to(state_tensor.dtype),
+            ],
+            dim=-1,
+        )
+
+    def feature_losses(self,
+                       x_reconstructed: torch.Tensor,
+                       x_original: torch.Tensor) -> torch.Tensor:
+        """
+        Compute every per-feature semantic loss in one fused pass.
+
+        Original and reconstructed batches are featurized together, BCE and
+        MSE are evaluated elementwise and selected with a column mask, and
+        column means are reduced to features with a single index_add.
+        Leading dimensions (e.g. one per ensemble member) are kept, so stacked
+        batches get one loss row each.
+
+        Args:
+            x_reconstructed: Reconstructed tensor [..., B, D]
+            x_original: Original tensor [..., B, D]
+
+        Returns:
+            losses: Loss per active feature [..., F], ordered like ``active_features``
+        """
+        batch_size = x_original.shape[-2]
+        features = self.semantic_feature_matrix(
+            torch.cat([x_original, x_reconstructed], dim=-2)
+        )
+        original, reconstructed = features[..., :batch_size, :], features[..., batch_size:, :]
+
+        binary_columns, column_feature, column_counts = self._fused_layout(features.device)
+
+        # Binary features use BCE on values clamped to [0, 1]
+        bce = F.binary_cross_entropy(
+            torch.clamp(reconstructed, 0.0, 1.0),
+            torch.clamp(original, 0.0, 1.0),
+            reduction="none",
+        )
+
+        # Continuous features use MSE
+        mse = (original - reconstructed) ** 2
+
+        column_means = torch.where(binary_columns, bce, mse).mean(dim=-2)
+
+        # Average columns belonging to the same feature (slot F collects inactive columns)
+        sums = column_means.new_zeros(
+            *column_means.shape[:-1], len(self.active_features) + 1
+        ).index_add(column_means.dim() - 1, column_feature, column_means)
+        return sums[..., :-1] / column_counts
+
+    def forward_with_breakdown(self,
+                               x_reconstructed: torch.Tensor,
+                               x_original: torch.Tensor) -> Tuple[torch.Tensor, Dict[str, torch.Tensor]]:
+        """
+        Compute semantic loss together with its per-feature breakdown.
+
+        No values are copied to the host, so this is safe to call every step.
+
+        Args:
+            x_reconstructed: Reconstructed tensor
+            x_original: Original tensor
+
+        Returns:
+            loss: Semantic loss (mean over active features)
+            breakdown: Detached 0-dim loss tensor per feature
+        """
+        if not self.active_features:
+            return x_original.new_zeros(()), {}
+
+        losses = self.feature_losses(x_reconstructed, x_original)
+        detached = losses.detach()
+        breakdown = {name: detached[i] for i, name in enumerate(self.active_features)}
+        return losses.mean(), breakdown
     
     def extract_semantic_features(self, state_tensor: torch.Tensor) -> Dict[str, torch.Tensor]:
         """
@@ -237,45 +395,8 @@ class SemanticLoss(nn.Module):
         Returns:
             loss: Semantic loss
         """
-        # Extract semantic features
-        original_features = self.extract_semantic_features(x_original)
-        reconstructed_features = self.extract_semantic_features(x_reconstructed)
-        
-        # Compute similarity for each feature type
-        losses = {}
-        total_loss = 0.0
-        
-        for feature_name in self.feature_extractors:
-            if feature_name not in original_features:
-                continue
-                
-            # Select appropriate loss function based on feature type
-            if feature_name in ["has_target", "is_alive", "threatened"]:
-                # Binary features use BCE - clamp values to [0, 1] for safety
-                reconstructed_value = torch.clamp(reconstructed_features[feature_name], 0.0, 1.0)
-                original_value = torch.clamp(original_features[feature_name], 0.0, 1.0)
-                feature_loss = F.binary_cross_entropy(
-                    reconstructed_value, 
-                    original_value
-                )
-            elif feature_name in ["position", "health", "energy", "role"]:
-                # Continuous features use MSE
-                feature_loss = F.mse_loss(
-                    original_features[feature_name], 
-                    reconstructed_features[feature_name]
-                )
-            else:
-                # Default to similarity metric for other features
-                feature_loss = self.compute_similarity(
-                    original_features[feature_name], 
-                    reconstructed_features[feature_name]
-                )
-                
-            losses[feature_name] = feature_loss
-            total_loss += feature_loss
-        
-        # Average across all feature types
-        return total_loss / len(losses)
+        loss, _ = self.forward_with_breakdown(x_reconstructed, x_original)
+        return loss
     
     def detailed_breakdown(self, 
                           x_reconstructed: torch.Tensor, 
@@ -290,42 +411,12 @@ class SemanticLoss(nn.Module):
         Returns:
             losses: Dictionary of loss components
         """
-        # Extract semantic features
-        original_features = self.extract_semantic_features(x_original)
-        reconstructed_features = self.extract_semantic_features(x_reconstructed)
-        
-        # Compute detailed loss breakdown
-        losses = {}
-        
-        for feature_name in self.feature_extractors:
-            if feature_name not in original_features:
-                continue
-                
-            # Select appropriate loss function based on feature type
-            if feature_name in ["has_target", "is_alive", "threatened"]:
-                # Binary features use BCE - clamp values to [0, 1] for safety
-                reconstructed_value = torch.clamp(reconstructed_features[feature_name], 0.0, 1.0)
-                original_value = torch.clamp(original_features[feature_name], 0.0, 1.0)
-                feature_loss = F.binary_cross_entropy(
-                    reconstructed_value,
-                    original_value
-                ).item()
-            elif feature_name in ["position", "health", "energy", "role"]:
-                # Continuous features use MSE
-                feature_loss = F.mse_loss(
-                    original_features[feature_name], 
-                    reconstructed_features[feature_name]
-                ).item()
-            else:
-                # Default to similarity metric for other features
-                feature_loss = self.compute_similarity(
-                    original_features[feature_name], 
-                    reconstructed_features[feature_name]
-                ).item()
-                
-            losses[feature_name] = feature_loss
-        
-        return losses
+        if not self.active_features:
+            return {}
+
+        # Single host transfer for all features
+        losses = self.feature_losses(x_reconstructed, x_original).detach().tolist()
+        return dict(zip(self.active_features, losses))
 
 
 class CombinedLoss(nn.Module):
@@ -382,7 +473,9 @@ class CombinedLoss(nn.Module):
         # Compute individual loss components
         recon_loss = self.recon_loss(x_reconstructed, x_original)
         kld_loss = self.kl_loss(mu, log_var)
-        sem_loss = self.semantic_loss(x_reconstructed, x_original)
+        sem_loss, semantic_breakdown = self.semantic_loss.forward_with_breakdown(
+            x_reconstructed, x_original
+        )
         
         # Make sure all losses are detached for logging purposes
         recon_loss_detached = recon_loss.detach().clone()
@@ -398,12 +491,6 @@ class CombinedLoss(nn.Module):
             compression_loss  # Compression loss is applied directly
         )
         
-        # Optional: Calculate semantic breakdown for logging/analysis
-        if self.training and torch.rand(1).item() < 0.1:  # Only sometimes to save computation
-            semantic_breakdown = self.semantic_loss.detailed_breakdown(x_reconstructed, x_original)
-        else:
-            semantic_breakdown = {}
-        
         return {
             "loss": total_loss,
             "reconstruction_loss": recon_loss_detached,
@@ -656,46 +743,20 @@ class FeatureWeightedLoss(CombinedLoss):
         recon_loss = self.recon_loss(x_reconstructed, x_original)
         kld_loss = self.kl_loss(mu, log_var)
         
-        # Extract semantic features
-        original_features = self.semantic_loss.extract_semantic_features(x_original)
-        reconstructed_features = self.semantic_loss.extract_semantic_features(x_reconstructed)
-        
-        # Compute weighted semantic loss for each feature type
-        semantic_losses = {}
-        weighted_semantic_loss = 0.0
-        
-        for feature_name in self.semantic_loss.feature_extractors:
-            if feature_name not in original_features:
-                continue
-                
-            # Select appropriate loss function based on feature type
-            if feature_name in ["has_target", "is_alive", "threatened"]:
-                # Binary features use BCE
-                reconstructed_value = torch.clamp(reconstructed_features[feature_name], 0.0, 1.0)
-                original_value = torch.clamp(original_features[feature_name], 0.0, 1.0)
-                feature_loss = F.binary_cross_entropy(
-                    reconstructed_value, 
-                    original_value
-                )
-            elif feature_name in ["position", "health", "energy", "role"]:
-                # Continuous features use MSE
-                feature_loss = F.mse_loss(
-                    original_features[feature_name], 
-                    reconstructed_features[feature_name]
-                )
-            else:
-                # Default to similarity metric for other features
-                feature_loss = self.semantic_loss.compute_similarity(
-                    original_features[feature_name], 
-                    reconstructed_features[feature_name]
-                )
-                
-            # Apply feature-specific weight
-            feature_weight = self.feature_weights.get(feature_name, 1.0)
-            weighted_feature_loss = feature_weight * feature_loss
-            
-            semantic_losses[feature_name] = feature_loss.detach().clone()
-            weighted_semantic_loss += weighted_feature_loss
+        # Compute all per-feature semantic losses in one fused pass
+        active_features = self.semantic_loss.active_features
+        if active_features:
+            feature_losses = self.semantic_loss.feature_losses(x_reconstructed, x_original)
+            weights = torch.tensor(
+                [self.feature_weights.get(name, 1.0) for name in active_features],
+                dtype=feature_losses.dtype,
+            ).to(feature_losses.device, non_blocking=True)
+            weighted_semantic_loss = (feature_losses * weights).sum()
+            detached = feature_losses.detach()
+            semantic_losses = {name: detached[i] for i, name in enumerate(active_features)}
+        else:
+            weighted_semantic_loss = x_original.new_zeros(())
+            semantic_losses = {}
         
         # Make sure all losses are detached for logging purposes
         recon_loss_detached = recon_loss.detach().clone()
@@ -711,9 +772,10 @@ class FeatureWeightedLoss(CombinedLoss):
             compression_loss  # Compression loss is applied directly
         )
         
-        # Update stability scores if enabled
-        if self.feature_stability_adjustment and self.training:
-            self.update_stability_scores({k: v.item() for k, v in semantic_losses.items()})
+        # Update stability scores if enabled (needs host values)
+        if self.feature_stability_adjustment and self.training and semantic_losses:
+            values = torch.stack(list(semantic_losses.values())).tolist()
+            self.update_stability_scores(dict(zip(semantic_losses, values)))
         
         return {
             "loss": total_loss,
@@ -721,7 +783,7 @@ class FeatureWeightedLoss(CombinedLoss):
             "kl_loss": kld_loss_detached,
             "semantic_loss": sem_loss_detached,
             "compression_loss": comp_loss_detached,
-            "semantic_breakdown": {k: v.item() for k, v in semantic_losses.items()},
+            "semantic_breakdown": semantic_losses,
             "feature_weights": self.feature_weights.copy()
         }
 
@@ -21,15 +21,319 @@ import pandas as pd
 import torch
 import torch.nn.functional as F
 from sklearn.manifold import TSNE
-from sklearn.metrics import (
-    accuracy_score,
-    confusion_matrix,
-    f1_score,
-    precision_score,
-    recall_score,
-)
 
-from .loss import SemanticLoss
+from .loss import SEMANTIC_FEATURE_COLUMNS, SemanticLoss
+
+# Semantic features reported as binary classification metrics
+BINARY_METRIC_FEATURES = ("has_target", "is_alive", "threatened")
+
+# Semantic features reported as numeric reconstruction errors
+NUMERIC_METRIC_FEATURES = ("position", "health", "energy")
+
+# Number of agent roles in the one-hot role encoding (state columns 5-9)
+NUM_ROLES = 5
+
+# Epsilon guarding the MAPE denominator against division by zero
+MAPE_EPSILON = 1e-6
+
+
+def confusion_counts(
+    targets: torch.Tensor, predictions: torch.Tensor, num_classes: int
+) -> torch.Tensor:
+    """
+    Compute a confusion matrix on the tensors' device with a single bincount.
+
+    Args:
+        targets: Integer (or boolean) true labels
+        predictions: Integer (or boolean) predicted labels
+        num_classes: Number of classes
+
+    Returns:
+        counts: Long tensor [num_classes, num_classes], rows are true labels
+    """
+    index = targets.reshape(-1).long() * num_classes + predictions.reshape(-1).long()
+    return torch.bincount(index, minlength=num_classes * num_classes).reshape(
+        num_classes, num_classes
+    )
+
+
+def confusion_to_list(confusion: Union[torch.Tensor, np.ndarray]) -> List[List[int]]:
+    """
+    Convert a confusion matrix to a JSON-serializable nested list.
+
+    Like sklearn's ``confusion_matrix``, only labels that occur in either
+    the true or the predicted labels are kept.
+
+    Args:
+        confusion: Square confusion matrix
+
+    Returns:
+        Nested list of counts over the observed labels
+    """
+    if isinstance(confusion, torch.Tensor):
+        confusion = confusion.cpu().numpy()
+    confusion = np.asarray(confusion, dtype=np.int64)
+    present = np.flatnonzero(confusion.sum(axis=0) + confusion.sum(axis=1))
+    return confusion[np.ix_(present, present)].tolist()
+
+
+def _safe_ratio(numerator: float, denominator: float, zero_division: float) -> float:
+    """Divide, returning zero_division when the denominator is zero."""
+    return float(numerator / denominator) if denominator > 0 else zero_division
+
+
+def binary_classification_scores(
+    confusion: Union[torch.Tensor, np.ndarray]
+) -> Dict[str, float]:
+    """
+    Derive accuracy, precision, recall and F1 from a 2x2 confusion matrix.
+
+    Undefined precision, recall and F1 are reported as 1.0, matching the
+    ``zero_division=1.0`` behaviour of the sklearn scores.
+
+    Args:
+        confusion: Confusion matrix [[tn, fp], [fn, tp]]
+
+    Returns:
+        scores: Dictionary with accuracy, precision, recall and f1
+    """
+    if isinstance(confusion, torch.Tensor):
+        confusion = confusion.cpu().numpy()
+    tn, fp, fn, tp = np.asarray(confusion, dtype=np.int64).ravel().tolist()
+
+    return {
+        "accuracy": _safe_ratio(tp + tn, tp + tn + fp + fn, 0.0),
+        "precision": _safe_ratio(tp, tp + fp, 1.0),
+        "recall": _safe_ratio(tp, tp + fn, 1.0),
+        "f1": _safe_ratio(2 * tp, 2 * tp + fp + fn, 1.0),
+    }
+
+
+def _tensor_version(tensor: torch.Tensor) -> Optional[int]:
+    """Get the in-place modification counter of a tensor, if it is tracked."""
+    try:
+        return tensor._version
+    except RuntimeError:
+        # Inference-mode tensors do not track versions
+        return None
+
+
+class SemanticStatistics:
+    """
+    Sufficient statistics of a semantic comparison between two state batches.
+
+    Every SemanticMetrics score is derived from these sums and confusion
+    counts, so they are computed in a single pass on the device and copied
+    to the host once.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        loss_sums: np.ndarray,
+        abs_error_sums: np.ndarray,
+        squared_error_sums: np.ndarray,
+        percentage_error_sums: np.ndarray,
+        binary_confusion: np.ndarray,
+        role_confusion: np.ndarray,
+    ):
+        """
+        Initialize semantic statistics.
+
+        Args:
+            count: Number of compared states
+            loss_sums: Per-column sums of the semantic loss (BCE or MSE) [C]
+            abs_error_sums: Per-column sums of absolute errors [C]
+            squared_error_sums: Per-column sums of squared errors [C]
+            percentage_error_sums: Per-column sums of absolute relative errors [C]
+            binary_confusion: Confusion counts per binary feature [B, 2, 2]
+            role_confusion: Role confusion counts [NUM_ROLES, NUM_ROLES]
+        """
+        self.count = count
+        self.loss_sums = loss_sums
+        self.abs_error_sums = abs_error_sums
+        self.squared_error_sums = squared_error_sums
+        self.percentage_error_sums = percentage_error_sums
+        self.binary_confusion = binary_confusion
+        self.role_confusion = role_confusion
+
+    @staticmethod
+    def _layout() -> Tuple[int, int]:
+        """Number of feature-matrix columns and of binary metric features."""
+        num_columns = max(end for _, end in SEMANTIC_FEATURE_COLUMNS.values())
+        return num_columns, len(BINARY_METRIC_FEATURES)
+
+    @classmethod
+    def empty(cls) -> "SemanticStatistics":
+        """
+        Create statistics of an empty comparison.
+
+        Returns:
+            stats: Zero sums and counts
+        """
+        num_columns, num_binary = cls._layout()
+        return cls(
+            count=0,
+            loss_sums=np.zeros(num_columns),
+            abs_error_sums=np.zeros(num_columns),
+            squared_error_sums=np.zeros(num_columns),
+            percentage_error_sums=np.zeros(num_columns),
+            binary_confusion=np.zeros((num_binary, 2, 2), dtype=np.int64),
+            role_confusion=np.zeros((NUM_ROLES, NUM_ROLES), dtype=np.int64),
+        )
+
+    @classmethod
+    def device_sums(
+        cls,
+        original: torch.Tensor,
+        reconstructed: torch.Tensor,
+        semantic_loss: SemanticLoss,
+    ) -> torch.Tensor:
+        """
+        Compute all sums and counts of a comparison as one packed device tensor.
+
+        Packed tensors of different batches can be added on the device and
+        unpacked with ``from_packed`` once at the end.
+
+        Args:
+            original: Original agent states [B, D]
+            reconstructed: Reconstructed agent states [B, D]
+            semantic_loss: SemanticLoss used for feature extraction
+
+        Returns:
+            packed: Float64 tensor of per-column sums followed by confusion counts
+        """
+        count = original.shape[0]
+        num_columns, num_binary = cls._layout()
+        binary_columns = [SEMANTIC_FEATURE_COLUMNS[f][0] for f in BINARY_METRIC_FEATURES]
+
+        with torch.no_grad():
+            # Featurize both batches together in double precision
+            states = torch.cat([original, reconstructed], dim=0)
+            features = semantic_loss.semantic_feature_matrix(states).double()
+            roles = torch.argmax(states[:, 5 : 5 + NUM_ROLES], dim=1)
+            orig_features, recon_features = features[:count], features[count:]
+
+            bce_mask = torch.zeros(num_columns, dtype=torch.bool, device=features.device)
+            bce_mask[binary_columns] = True
+
+            bce = F.binary_cross_entropy(
+                torch.clamp(recon_features, 0.0, 1.0),
+                torch.clamp(orig_features, 0.0, 1.0),
+                reduction="none",
+            )
+            error = orig_features - recon_features
+            squared_error = error**2
+
+            # Confusion counts of all binary features in one bincount
+            orig_binary = (orig_features[:, binary_columns] > 0.5).long()
+            recon_binary = (recon_features[:, binary_columns] > 0.5).long()
+            offsets = 4 * torch.arange(num_binary, device=features.device)
+            binary_confusion = torch.bincount(
+                (offsets + 2 * orig_binary + recon_binary).reshape(-1),
+                minlength=4 * num_binary,
+            )
+            role_confusion = confusion_counts(roles[:count], roles[count:], NUM_ROLES)
+
+            # Counts are exact in float64
+            return torch.cat(
+                [
+                    torch.where(bce_mask, bce, squared_error).sum(dim=0),
+                    error.abs().sum(dim=0),
+                    squared_error.sum(dim=0),
+                    (error / (orig_features + MAPE_EPSILON)).abs().sum(dim=0),
+                    binary_confusion.double(),
+                    role_confusion.reshape(-1).double(),
+                ]
+            )
+
+    @classmethod
+    def from_packed(
+        cls, count: int, packed: Union[torch.Tensor, np.ndarray]
+    ) -> "SemanticStatistics":
+        """
+        Unpack statistics produced by ``device_sums``.
+
+        Args:
+            count: Number of compared states
+            packed: Packed sums and counts (copied to the host if on a device)
+
+        Returns:
+            stats: Statistics of the comparison
+        """
+        if isinstance(packed, torch.Tensor):
+            packed = packed.cpu().numpy()
+        num_columns, num_binary = cls._layout()
+
+        sums = packed[: 4 * num_columns].reshape(4, num_columns)
+        counts = np.rint(packed[4 * num_columns :]).astype(np.int64)
+        return cls(
+            count=count,
+            loss_sums=sums[0],
+            abs_error_sums=sums[1],
+            squared_error_sums=sums[2],
+            percentage_error_sums=sums[3],
+            binary_confusion=counts[: 4 * num_binary].reshape(num_binary, 2, 2),
+            role_confusion=counts[4 * num_binary :].reshape(NUM_ROLES, NUM_ROLES),
+        )
+
+    @classmethod
+    def from_tensors(
+        cls,
+        original: torch.Tensor,
+        reconstructed: torch.Tensor,
+        semantic_loss: SemanticLoss,
+    ) -> "SemanticStatistics":
+        """
+        Compute statistics for a pair of state batches.
+
+        Args:
+            original: Original agent states [B, D]
+            reconstructed: Reconstructed agent states [B, D]
+            semantic_loss: SemanticLoss used for feature extraction
+
+        Returns:
+            stats: Statistics of the comparison
+        """
+        # Single host transfer of all sums and counts
+        packed = cls.device_sums(original, reconstructed, semantic_loss)
+        return cls.from_packed(original.shape[0], packed)
+
+    def merge(self, other: "SemanticStatistics") -> "SemanticStatistics":
+        """
+        Combine statistics of two disjoint sets of states.
+
+        Args:
+            other: Statistics to combine with
+
+        Returns:
+            stats: Statistics of the union of both sets
+        """
+        return SemanticStatistics(
+            count=self.count + other.count,
+            loss_sums=self.loss_sums + other.loss_sums,
+            abs_error_sums=self.abs_error_sums + other.abs_error_sums,
+            squared_error_sums=self.squared_error_sums + other.squared_error_sums,
+            percentage_error_sums=self.percentage_error_sums + other.percentage_error_sums,
+            binary_confusion=self.binary_confusion + other.binary_confusion,
+            role_confusion=self.role_confusion + other.role_confusion,
+        )
+
+    __add__ = merge
+
+    def feature_mean(self, sums: np.ndarray, feature: str) -> float:
+        """
+        Average per-column sums over the states and columns of a feature.
+
+        Args:
+            sums: Per-column sums [C]
+            feature: Semantic feature name
+
+        Returns:
+            Mean value for the feature
+        """
+        start, end = SEMANTIC_FEATURE_COLUMNS[feature]
+        return _safe_ratio(sums[start:end].sum(), self.count * (end - start), 0.0)
 
 
 class SemanticMetrics:
@@ -53,6 +357,9 @@ class SemanticMetrics:
         ]
         self.semantic_loss = SemanticLoss(self.feature_extractors)
 
+        # Most recently computed statistics, keyed by tensor identity and version
+        self._statistics_cache = []
+
     def extract_features(self, state_tensor: torch.Tensor) -> Dict[str, torch.Tensor]:
         """
         Extract semantic features from agent state tensor.
@@ -65,6 +372,47 @@ class SemanticMetrics:
         """
         return self.semantic_loss.extract_semantic_features(state_tensor)
 
+    def statistics(
+        self, original: torch.Tensor, reconstructed: torch.Tensor
+    ) -> SemanticStatistics:
+        """
+        Get the semantic statistics for an (original, reconstructed) pair.
+
+        Statistics are memoized for the two most recent pairs, so metric
+        methods called on the same tensors share one feature extraction.
+        The cache is invalidated when either tensor is modified in place.
+
+        Args:
+            original: Original agent states
+            reconstructed: Reconstructed agent states
+
+        Returns:
+            stats: Statistics of the comparison
+        """
+        versions = (_tensor_version(original), _tensor_version(reconstructed))
+        for cached_original, cached_reconstructed, cached_versions, stats in (
+            self._statistics_cache
+        ):
+            if (
+                cached_original is original
+                and cached_reconstructed is reconstructed
+                and cached_versions == versions
+            ):
+                return stats
+
+        stats = SemanticStatistics.from_tensors(
+            original, reconstructed, self.semantic_loss
+        )
+        if None not in versions:
+            self._statistics_cache = [
+                (original, reconstructed, versions, stats)
+            ] + self._statistics_cache[:1]
+        return stats
+
+    def clear_cache(self) -> None:
+        """Drop memoized statistics and the tensor references they hold."""
+        self._statistics_cache = []
+
     def compute_equivalence_scores(
         self, original: torch.Tensor, reconstructed: torch.Tensor
     ) -> Dict[str, float]:
@@ -78,8 +426,17 @@ class SemanticMetrics:
         Returns:
             scores: Dictionary of semantic equivalence scores
         """
-        # Get detailed breakdown of semantic loss components
-        loss_breakdown = self.semantic_loss.detailed_breakdown(reconstructed, original)
+        return self._equivalence_scores(self.statistics(original, reconstructed))
+
+    def _equivalence_scores(self, stats: SemanticStatistics) -> Dict[str, float]:
+        """Derive semantic equivalence scores from statistics."""
+        # Semantic loss of each active feature
+        loss_breakdown = {
+            feature: stats.feature_mean(stats.loss_sums, feature)
+            for feature in self.semantic_loss.active_features
+        }
+        if not loss_breakdown:
+            return {"overall": 0.0}
 
         # Convert losses to similarity scores using a modified transformation
         # Instead of a pure exponential decay (exp(-loss)), use a more balanced approach
@@ -130,37 +487,19 @@ class SemanticMetrics:
         Returns:
             accuracies: Dictionary of accuracy scores for binary features
         """
-        original_features = self.extract_features(original)
-        reconstructed_features = self.extract_features(reconstructed)
+        return self._binary_accuracies(self.statistics(original, reconstructed))
 
-        binary_features = ["has_target", "is_alive", "threatened"]
+    def _binary_accuracies(self, stats: SemanticStatistics) -> Dict[str, float]:
+        """Derive binary feature metrics from statistics."""
         accuracies = {}
 
-        for feature in binary_features:
-            if feature not in original_features:
-                continue
+        for feature, confusion in zip(BINARY_METRIC_FEATURES, stats.binary_confusion):
+            # Precision/recall/F1 from the confusion counts (values > 0.5 are positive)
+            for name, score in binary_classification_scores(confusion).items():
+                accuracies[f"{feature}_{name}"] = score
 
-            # Convert to binary predictions
-            orig_binary = (original_features[feature] > 0.5).cpu().numpy().flatten()
-            recon_binary = (
-                (reconstructed_features[feature] > 0.5).cpu().numpy().flatten()
-            )
-
-            # Compute metrics
-            acc = accuracy_score(orig_binary, recon_binary)
-            precision = precision_score(orig_binary, recon_binary, zero_division=1.0)
-            recall = recall_score(orig_binary, recon_binary, zero_division=1.0)
-            f1 = f1_score(orig_binary, recon_binary, zero_division=1.0)
-
-            accuracies[f"{feature}_accuracy"] = acc
-            accuracies[f"{feature}_precision"] = precision
-            accuracies[f"{feature}_recall"] = recall
-            accuracies[f"{feature}_f1"] = f1
-
-            # Compute confusion matrix
-            cm = confusion_matrix(orig_binary, recon_binary)
             # Store as list for JSON serialization
-            accuracies[f"{feature}_confusion_matrix"] = cm.tolist()
+            accuracies[f"{feature}_confusion_matrix"] = confusion_to_list(confusion)
 
         return accuracies
 
@@ -177,19 +516,14 @@ class SemanticMetrics:
         Returns:
             metrics: Dictionary of role accuracy metrics
         """
-        # Extract role indices (assumes one-hot encoding in positions 5-9)
-        original_roles = torch.argmax(original[:, 5:10], dim=1).cpu().numpy()
-        reconstructed_roles = torch.argmax(reconstructed[:, 5:10], dim=1).cpu().numpy()
-
-        # Compute metrics
-        accuracy = accuracy_score(original_roles, reconstructed_roles)
-
-        # Compute confusion matrix
-        conf_matrix = confusion_matrix(original_roles, reconstructed_roles)
+        return self._role_accuracy(self.statistics(original, reconstructed))
 
+    def _role_accuracy(self, stats: SemanticStatistics) -> Dict[str, float]:
+        """Derive role metrics from statistics (roles are one-hot in positions 5-9)."""
+        confusion = stats.role_confusion
         return {
-            "role_accuracy": accuracy,
-            "role_confusion_matrix": conf_matrix.tolist(),
+            "role_accuracy": _safe_ratio(np.trace(confusion), confusion.sum(), 0.0),
+            "role_confusion_matrix": confusion_to_list(confusion),
         }
 
     def numeric_feature_errors(
@@ -205,30 +539,23 @@ class SemanticMetrics:
         Returns:
             errors: Dictionary of error metrics for numeric features
         """
-        original_features = self.extract_features(original)
-        reconstructed_features = self.extract_features(reconstructed)
+        return self._numeric_errors(self.statistics(original, reconstructed))
 
-        numeric_features = ["position", "health", "energy"]
+    def _numeric_errors(self, stats: SemanticStatistics) -> Dict[str, float]:
+        """Derive numeric feature errors from statistics."""
         errors = {}
 
-        for feature in numeric_features:
-            if feature not in original_features:
-                continue
-
-            orig = original_features[feature].cpu().numpy()
-            recon = reconstructed_features[feature].cpu().numpy()
-
+        for feature in NUMERIC_METRIC_FEATURES:
             # Mean Absolute Error
-            mae = np.mean(np.abs(orig - recon))
+            errors[f"{feature}_mae"] = stats.feature_mean(stats.abs_error_sums, feature)
             # Root Mean Squared Error
-            rmse = np.sqrt(np.mean(np.square(orig - recon)))
+            errors[f"{feature}_rmse"] = float(
+                np.sqrt(stats.feature_mean(stats.squared_error_sums, feature))
+            )
             # Mean Absolute Percentage Error (with epsilon to avoid division by zero)
-            epsilon = 1e-6
-            mape = np.mean(np.abs((orig - recon) / (orig + epsilon))) * 100
-
-            errors[f"{feature}_mae"] = float(mae)
-            errors[f"{feature}_rmse"] = float(rmse)
-            errors[f"{feature}_mape"] = float(mape)
+            errors[f"{feature}_mape"] = (
+                stats.feature_mean(stats.percentage_error_sums, feature) * 100
+            )
 
         return errors
 
@@ -242,6 +569,18 @@ class SemanticMetrics:
             original: Original agent states
             reconstructed: Reconstructed agent states
 
+        Returns:
+            evaluation: Dictionary of all evaluation metrics
+        """
+        return self.evaluate_statistics(self.statistics(original, reconstructed))
+
+    def evaluate_statistics(self, stats: SemanticStatistics) -> Dict[str, Any]:
+        """
+        Comprehensive evaluation from precomputed (or accumulated) statistics.
+
+        Args:
+            stats: Statistics of the comparison
+
         Returns:
             evaluation: Dictionary of all evaluation metrics
         """
@@ -249,20 +588,132 @@ class SemanticMetrics:
         evaluation = {}
 
         # Overall equivalence scores
-        evaluation.update(self.compute_equivalence_scores(original, reconstructed))
+        evaluation.update(self._equivalence_scores(stats))
 
         # Binary feature accuracy
-        evaluation.update(self.binary_feature_accuracy(original, reconstructed))
+        evaluation.update(self._binary_accuracies(stats))
 
         # Role accuracy
-        evaluation.update(self.role_accuracy(original, reconstructed))
+        evaluation.update(self._role_accuracy(stats))
 
         # Numeric feature errors
-        evaluation.update(self.numeric_feature_errors(original, reconstructed))
+        evaluation.update(self._numeric_errors(stats))
 
         return evaluation
 
 
+class MetricsAccumulator:
+    """
+    Streaming evaluation over batches of original and reconstructed states.
+
+    Keeps running loss and error sums and confusion counts on the device,
+    so evaluation sets of any size can be processed batch by batch.
+    Accumulators of different shards (e.g. evaluated in other processes)
+    can be merged before computing the final metrics.
+    """
+
+    def __init__(self, metrics: Optional[SemanticMetrics] = None):
+        """
+        Initialize the accumulator.
+
+        Args:
+            metrics: Metrics used to compute results; its ``evaluate_statistics``
+                defines the output format (defaults to SemanticMetrics)
+        """
+        self.metrics = metrics or SemanticMetrics()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all accumulated statistics."""
+        self._device_sums = None
+        self._device_count = 0
+        self._merged = SemanticStatistics.empty()
+
+    def __len__(self) -> int:
+        """Number of states accumulated so far."""
+        return self._device_count + self._merged.count
+
+    def update(self, original: torch.Tensor, reconstructed: torch.Tensor) -> None:
+        """
+        Add a batch of original and reconstructed states.
+
+        No values are copied to the host.
+
+        Args:
+            original: Original agent states [B, D]
+            reconstructed: Reconstructed agent states [B, D]
+        """
+        sums = SemanticStatistics.device_sums(
+            original, reconstructed, self.metrics.semantic_loss
+        )
+        if self._device_sums is None or self._device_sums.device != sums.device:
+            self._flush()
+            self._device_sums = sums
+        else:
+            self._device_sums += sums
+        self._device_count += original.shape[0]
+
+    def _flush(self) -> None:
+        """Move running device sums into the host statistics."""
+        if self._device_sums is not None:
+            self._merged = self._merged.merge(
+                SemanticStatistics.from_packed(self._device_count, self._device_sums)
+            )
+        self._device_sums = None
+        self._device_count = 0
+
+    def statistics(self) -> SemanticStatistics:
+        """
+        Get the statistics of all accumulated states.
+
+        Returns:
+            stats: Accumulated statistics (host copy)
+        """
+        self._flush()
+        return self._merged
+
+    def merge(
+        self, other: Union["MetricsAccumulator", SemanticStatistics]
+    ) -> "MetricsAccumulator":
+        """
+        Add the statistics of another shard.
+
+        Args:
+            other: Accumulator or statistics of a disjoint set of states
+
+        Returns:
+            self, to allow chaining
+        """
+        if isinstance(other, MetricsAccumulator):
+            other = other.statistics()
+        self._flush()
+        self._merged = self._merged.merge(other)
+        return self
+
+    def compute(
+        self, baseline: Optional[Union["MetricsAccumulator", SemanticStatistics]] = None
+    ) -> Dict[str, Any]:
+        """
+        Compute metrics over all accumulated states.
+
+        Results equal those of ``metrics.evaluate`` on the concatenated
+        batches, up to floating-point rounding of the running sums.
+
+        Args:
+            baseline: Optional baseline statistics for drift measurement
+                (requires StandardizedMetrics)
+
+        Returns:
+            evaluation: Dictionary of evaluation metrics
+        """
+        if baseline is None:
+            return self.metrics.evaluate_statistics(self.statistics())
+
+        if isinstance(baseline, MetricsAccumulator):
+            baseline = baseline.statistics()
+        return self.metrics.evaluate_statistics(self.statistics(), baseline)
+
+
 class DriftTracker:
     """Tool for tracking semantic drift over time or compression levels."""
 
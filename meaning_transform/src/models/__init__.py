@@ -11,12 +11,20 @@ from meaning_transform.src.models.adaptive_entropy_bottleneck import (
 from meaning_transform.src.models.adaptive_meaning_vae import AdaptiveMeaningVAE
 from meaning_transform.src.models.decoder import Decoder
 from meaning_transform.src.models.encoder import Encoder
+from meaning_transform.src.models.ensemble_vae import EnsembleVAE
 from meaning_transform.src.models.entropy_bottleneck import EntropyBottleneck
 from meaning_transform.src.models.feature_grouped_vae import FeatureGroupedVAE
+from meaning_transform.src.models.latent_codec import (
+    EntropyCodec,
+    LatentCodec,
+    VQCodec,
+    create_latent_codec,
+)
 from meaning_transform.src.models.meaning_vae import MeaningVAE
 from meaning_transform.src.models.utils import (
     BaseModelIO,
     CompressionBase,
+    NoiseGenerator,
     set_temp_seed,
 )
 from meaning_transform.src.models.vector_quantizer import VectorQuantizer
@@ -30,7 +38,13 @@ __all__ = [
     "MeaningVAE",
     "AdaptiveMeaningVAE",
     "FeatureGroupedVAE",
+    "EnsembleVAE",
+    "LatentCodec",
+    "EntropyCodec",
+    "VQCodec",
+    "create_latent_codec",
     "BaseModelIO",
     "CompressionBase",
+    "NoiseGenerator",
     "set_temp_seed",
 ]
@@ -5,7 +5,11 @@ import numpy as np
 import torch
 import torch.nn as nn
 
-from meaning_transform.src.models.utils import CompressionBase, set_temp_seed
+from meaning_transform.src.models.utils import (
+    CompressionBase,
+    NoiseGenerator,
+    set_temp_seed,
+)
 
 
 class AdaptiveEntropyBottleneck(CompressionBase):
@@ -37,7 +41,10 @@ class AdaptiveEntropyBottleneck(CompressionBase):
             raise ValueError(f"compression_level must be positive, got {compression_level}")
             
         self.seed = seed
-        
+
+        # Quantization noise during training, seeded once
+        self.noise = NoiseGenerator(seed, stream="adaptive_entropy_bottleneck")
+
         # Register buffer to track compressed values
         self.register_buffer("_compression_epsilon", torch.tensor(1e-6))
 
@@ -101,8 +108,7 @@ class AdaptiveEntropyBottleneck(CompressionBase):
         # Add noise for quantization in the effective space
         if self.training:
             # Reparameterization trick during training
-            with set_temp_seed(self.seed):
-                epsilon = torch.randn_like(mu)
+            epsilon = self.noise.randn_like(mu)
             z_compressed_effective = mu + torch.exp(log_scale) * epsilon
         else:
             # Deterministic rounding during inference
@@ -123,6 +129,34 @@ class AdaptiveEntropyBottleneck(CompressionBase):
 
         return z_compressed, compression_loss
 
+    def quantize(self, z: torch.Tensor) -> torch.Tensor:
+        """
+        Integer symbols of z in the effective space, as rounded at inference.
+
+        Args:
+            z: Latent representation [B, D]
+
+        Returns:
+            symbols: Integer symbols [B, effective_dim]
+        """
+        mu = self.nonlin(self.proj_down(z)) + self.compress_mu
+        return torch.round(mu).long()
+
+    def dequantize(self, symbols: torch.Tensor) -> torch.Tensor:
+        """
+        Compressed latent representation from effective-space symbols.
+
+        Args:
+            symbols: Integer symbols [B, effective_dim]
+
+        Returns:
+            z_compressed: Compressed latent representation [B, D], equal to
+                forward() in evaluation mode
+        """
+        projected = self.proj_up(symbols.to(self.compress_mu.dtype))
+        mu_full, _ = torch.chunk(projected, 2, dim=-1)
+        return mu_full
+
     def get_parameter_count(self) -> int:
         """
         Calculate the total number of parameters in the bottleneck.
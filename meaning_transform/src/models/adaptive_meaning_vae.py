@@ -8,7 +8,7 @@ from meaning_transform.src.models.adaptive_entropy_bottleneck import (
 )
 from meaning_transform.src.models.decoder import Decoder
 from meaning_transform.src.models.encoder import Encoder
-from meaning_transform.src.models.utils import BaseModelIO, set_temp_seed
+from meaning_transform.src.models.utils import BaseModelIO, NoiseGenerator
 
 
 class AdaptiveMeaningVAE(nn.Module, BaseModelIO):
@@ -43,6 +43,9 @@ class AdaptiveMeaningVAE(nn.Module, BaseModelIO):
         self.seed = seed
         self.use_batch_norm = use_batch_norm
 
+        # Noise for the reparameterization trick, seeded once
+        self.noise = NoiseGenerator(seed, stream="reparameterize")
+
         # Create encoder and decoder
         self.encoder = Encoder(input_dim, latent_dim, use_batch_norm=use_batch_norm)
         self.decoder = Decoder(latent_dim, input_dim, use_batch_norm=use_batch_norm)
@@ -66,8 +69,7 @@ class AdaptiveMeaningVAE(nn.Module, BaseModelIO):
         std = torch.exp(0.5 * log_var)
 
         if self.training:
-            with set_temp_seed(self.seed):
-                eps = torch.randn_like(std)
+            eps = self.noise.randn_like(std)
             z = mu + eps * std
             return z
         else:
@@ -0,0 +1,334 @@
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+import torch
+import torch.nn as nn
+
+from meaning_transform.src.models.entropy_bottleneck import EntropyBottleneck
+from meaning_transform.src.models.meaning_vae import MeaningVAE
+
+
+class EnsembleLinear(nn.Module):
+    """K independent linear layers evaluated with one batched matmul."""
+
+    def __init__(self, layers: Sequence[nn.Linear]):
+        """
+        Initialize from the corresponding layer of each ensemble member.
+
+        Args:
+            layers: One nn.Linear per member, all with the same shape
+        """
+        super().__init__()
+        with torch.no_grad():
+            # [K, in, out] so the forward pass is a plain batched matmul
+            self.weight = nn.Parameter(
+                torch.stack([layer.weight.transpose(0, 1) for layer in layers])
+            )
+            self.bias = nn.Parameter(
+                torch.stack([layer.bias for layer in layers]).unsqueeze(1)
+            )
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        Apply every member's layer to its own batch.
+
+        Args:
+            x: Stacked inputs [K, B, in]
+
+        Returns:
+            y: Stacked outputs [K, B, out]
+        """
+        return torch.baddbmm(self.bias, x, self.weight)
+
+    def copy_to(self, layers: Sequence[nn.Linear], indices: Sequence[int]) -> None:
+        """Copy the weights of the given members back into their layers."""
+        with torch.no_grad():
+            for k in indices:
+                layers[k].weight.copy_(self.weight[k].transpose(0, 1))
+                layers[k].bias.copy_(self.bias[k, 0])
+
+
+class EnsembleBatchNorm(nn.Module):
+    """
+    K independent BatchNorm1d layers evaluated as one.
+
+    The members' features are laid side by side as the channels of a single
+    BatchNorm1d, so every member keeps its own batch statistics, affine
+    parameters and running estimates.
+    """
+
+    def __init__(self, layers: Sequence[nn.BatchNorm1d]):
+        """
+        Initialize from the corresponding layer of each ensemble member.
+
+        Args:
+            layers: One nn.BatchNorm1d per member, all with the same settings
+        """
+        super().__init__()
+        self.num_models = len(layers)
+        self.num_features = layers[0].num_features
+        self.norm = nn.BatchNorm1d(
+            self.num_models * self.num_features,
+            eps=layers[0].eps,
+            momentum=layers[0].momentum,
+        )
+        with torch.no_grad():
+            self.norm.weight.copy_(torch.cat([layer.weight for layer in layers]))
+            self.norm.bias.copy_(torch.cat([layer.bias for layer in layers]))
+            self.norm.running_mean.copy_(torch.cat([layer.running_mean for layer in layers]))
+            self.norm.running_var.copy_(torch.cat([layer.running_var for layer in layers]))
+            self.norm.num_batches_tracked.copy_(layers[0].num_batches_tracked)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        Normalize every member's batch with its own statistics.
+
+        Args:
+            x: Stacked inputs [K, B, H]
+
+        Returns:
+            y: Stacked normalized outputs [K, B, H]
+        """
+        num_models, batch_size, num_features = x.shape
+        y = self.norm(x.transpose(0, 1).reshape(batch_size, num_models * num_features))
+        return y.reshape(batch_size, num_models, num_features).transpose(0, 1)
+
+    def copy_to(self, layers: Sequence[nn.BatchNorm1d], indices: Sequence[int]) -> None:
+        """Copy the parameters and running statistics of the given members back."""
+        with torch.no_grad():
+            for name in ("weight", "bias", "running_mean", "running_var"):
+                per_model = getattr(self.norm, name).view(self.num_models, self.num_features)
+                for k in indices:
+                    getattr(layers[k], name).copy_(per_model[k])
+            for k in indices:
+                layers[k].num_batches_tracked.copy_(self.norm.num_batches_tracked)
+
+
+def _stack_modules(modules: Sequence[nn.Module]) -> nn.Module:
+    """Build the batched equivalent of the same submodule of every member."""
+    first = modules[0]
+    if isinstance(first, nn.Linear):
+        return EnsembleLinear(modules)
+    if isinstance(first, nn.BatchNorm1d):
+        return EnsembleBatchNorm(modules)
+    if isinstance(first, nn.LeakyReLU):
+        return nn.LeakyReLU(first.negative_slope)
+    if isinstance(first, nn.Sequential):
+        return nn.Sequential(
+            *[_stack_modules(children) for children in zip(*(m.children() for m in modules))]
+        )
+    raise ValueError(f"Cannot stack {type(first).__name__} layers into an ensemble")
+
+
+def _copy_modules(stacked: nn.Module, modules: Sequence[nn.Module], indices: Sequence[int]) -> None:
+    """Copy batched weights back into the same submodule of the given members."""
+    if isinstance(stacked, (EnsembleLinear, EnsembleBatchNorm)):
+        stacked.copy_to(modules, indices)
+    elif isinstance(stacked, nn.Sequential):
+        for position, child in enumerate(stacked.children()):
+            _copy_modules(child, [list(m.children())[position] for m in modules], indices)
+
+
+class EnsembleVAE(nn.Module):
+    """
+    K MeaningVAEs with the same architecture trained as one batched model.
+
+    Every linear layer of the members is stacked into a single batched
+    matmul, so one forward pass runs all K models on the same input batch
+    while each keeps its own weights, batch normalization statistics,
+    compression level and noise stream. Small models that underuse the
+    hardware individually then train in roughly the time of one.
+
+    Members must be tensor (non-graph) MeaningVAEs with identical dimensions
+    using entropy-bottleneck compression or none. Trained weights are copied
+    back into the member models with ``write_back``.
+    """
+
+    def __init__(self, models: Sequence[MeaningVAE]):
+        """
+        Initialize the ensemble from its member models.
+
+        Args:
+            models: MeaningVAE instances with the same architecture
+        """
+        super().__init__()
+        self._validate_members(models)
+
+        # Plain list so the members' parameters are not registered twice
+        self.members: List[MeaningVAE] = list(models)
+        self.num_models = len(models)
+        self.input_dim = models[0].input_dim
+        self.latent_dim = models[0].latent_dim
+
+        # Noise streams stay with the members, as if each trained on its own
+        self.noise = nn.ModuleList([m.noise for m in models])
+
+        self.encoder = _stack_modules([m.encoder.encoder for m in models])
+        self.mu = _stack_modules([m.encoder.mu for m in models])
+        self.log_var = _stack_modules([m.encoder.log_var for m in models])
+
+        self.decoder = _stack_modules([m.decoder.decoder for m in models])
+        self.final_layer = _stack_modules([m.decoder.final_layer for m in models])
+
+        # Entropy bottleneck with one compression level per member
+        self.use_compression = models[0].compression is not None
+        if self.use_compression:
+            bottlenecks = [m.compression for m in models]
+            with torch.no_grad():
+                self.compress_mu = nn.Parameter(
+                    torch.stack([b.compress_mu for b in bottlenecks]).unsqueeze(1)
+                )
+                self.compress_log_scale = nn.Parameter(
+                    torch.stack([b.compress_log_scale for b in bottlenecks]).unsqueeze(1)
+                )
+            self.proj_compress = _stack_modules([b.proj_compress for b in bottlenecks])
+            self.compression_noise = nn.ModuleList([b.noise for b in bottlenecks])
+            self.register_buffer(
+                "compression_level",
+                torch.tensor([float(b.compression_level) for b in bottlenecks]).view(-1, 1, 1),
+            )
+
+    @staticmethod
+    def _validate_members(models: Sequence[MeaningVAE]) -> None:
+        """Raise ValueError unless the models can be stacked."""
+        if not models:
+            raise ValueError("EnsembleVAE needs at least one model")
+
+        first = models[0]
+        for model in models:
+            if not isinstance(model, MeaningVAE):
+                raise ValueError(f"Expected MeaningVAE members, got {type(model).__name__}")
+            if model.use_graph:
+                raise ValueError("Graph-based MeaningVAEs cannot be stacked into an ensemble")
+            if model.compression is not None and type(model.compression) is not EntropyBottleneck:
+                raise ValueError(
+                    f"Unsupported compression type for an ensemble: {model.compression_type}"
+                )
+
+            architecture = (
+                model.input_dim,
+                model.latent_dim,
+                model.use_batch_norm,
+                model.compression is None,
+                tuple(model.encoder.hidden_dims),
+                tuple(model.decoder.hidden_dims),
+            )
+            expected = (
+                first.input_dim,
+                first.latent_dim,
+                first.use_batch_norm,
+                first.compression is None,
+                tuple(first.encoder.hidden_dims),
+                tuple(first.decoder.hidden_dims),
+            )
+            if architecture != expected:
+                raise ValueError(
+                    f"Ensemble members must share one architecture, got {architecture} and {expected}"
+                )
+
+    @staticmethod
+    def _noise(generators: nn.ModuleList, like: torch.Tensor) -> torch.Tensor:
+        """
+        Standard normal noise for every member, drawn from its own generator.
+
+        Args:
+            generators: One NoiseGenerator per member
+            like: Stacked reference tensor [K, ...]
+
+        Returns:
+            noise: Noise shaped like ``like``
+        """
+        if all(g.seed is None for g in generators):
+            return torch.randn_like(like)
+        return torch.stack([g.randn_like(like[k]) for k, g in enumerate(generators)])
+
+    def forward(self, x: torch.Tensor) -> Dict[str, Any]:
+        """
+        Forward pass through every member.
+
+        Args:
+            x: Input batch [B, D] shared by all members, or per-member
+                batches [K, B, D]
+
+        Returns:
+            results: Dictionary of stacked results, like MeaningVAE.forward
+                with a leading member dimension
+                - mu, log_var, z: Latent statistics and sample [K, B, L]
+                - z_compressed: Compressed latent (if compression is used) [K, B, L]
+                - reconstruction: Reconstructed agent states [K, B, D]
+                - kl_loss: Batch-normalized KL divergence per member [K]
+                - compression_loss: Compression loss per member (if applicable) [K]
+        """
+        if x.dim() == 2:
+            x = x.unsqueeze(0).expand(self.num_models, -1, -1)
+        if x.dim() != 3 or x.size(0) != self.num_models or x.size(2) != self.input_dim:
+            raise ValueError(
+                f"Expected tensor shape (batch_size, {self.input_dim}) or "
+                f"({self.num_models}, batch_size, {self.input_dim}), got {x.shape}"
+            )
+
+        results = {}
+
+        h = self.encoder(x)
+        mu = self.mu(h)
+        log_var = self.log_var(h)
+        results["mu"] = mu
+        results["log_var"] = log_var
+
+        kl_loss = -0.5 * torch.sum(1 + log_var - mu.pow(2) - log_var.exp(), dim=(1, 2))
+        results["kl_loss"] = kl_loss / mu.size(1)  # Normalize by batch size
+
+        # Reparameterization trick (the mean during evaluation)
+        if self.training:
+            std = torch.exp(0.5 * log_var)
+            z = mu + self._noise(self.noise, std) * std
+        else:
+            z = mu
+        results["z"] = z
+
+        if self.use_compression:
+            # Same computation as EntropyBottleneck, with per-member levels
+            projection = self.proj_compress(z)
+            compress_mu, log_scale = torch.chunk(projection, 2, dim=-1)
+            mu_scaled = (compress_mu + self.compress_mu) / self.compression_level
+            log_scale_adjusted = (log_scale + self.compress_log_scale) - torch.log(
+                self.compression_level
+            )
+
+            if self.training:
+                epsilon = self._noise(self.compression_noise, mu_scaled)
+                z_compressed = mu_scaled + torch.exp(log_scale_adjusted) * epsilon
+            else:
+                z_compressed = torch.round(mu_scaled)
+
+            compression_loss = 0.5 * log_scale_adjusted.mul(2).exp() + 0.5 * math.log(2 * math.pi)
+            results["z_compressed"] = z_compressed
+            results["compression_loss"] = compression_loss.mean(dim=(1, 2))
+        else:
+            z_compressed = z
+
+        results["reconstruction"] = self.final_layer(self.decoder(z_compressed))
+        return results
+
+    def write_back(self, indices: Optional[Sequence[int]] = None) -> None:
+        """
+        Copy trained weights and batch norm statistics into the member models.
+
+        Args:
+            indices: Members to update (all members when None)
+        """
+        indices = range(self.num_models) if indices is None else list(indices)
+
+        _copy_modules(self.encoder, [m.encoder.encoder for m in self.members], indices)
+        _copy_modules(self.mu, [m.encoder.mu for m in self.members], indices)
+        _copy_modules(self.log_var, [m.encoder.log_var for m in self.members], indices)
+        _copy_modules(self.decoder, [m.decoder.decoder for m in self.members], indices)
+        _copy_modules(self.final_layer, [m.decoder.final_layer for m in self.members], indices)
+
+        if self.use_compression:
+            bottlenecks = [m.compression for m in self.members]
+            _copy_modules(self.proj_compress, [b.proj_compress for b in bottlenecks], indices)
+            with torch.no_grad():
+                for k in indices:
+                    bottlenecks[k].compress_mu.copy_(self.compress_mu[k, 0])
+                    bottlenecks[k].compress_log_scale.copy_(self.compress_log_scale[k, 0])
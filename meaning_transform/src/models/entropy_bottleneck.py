@@ -4,7 +4,7 @@ import numpy as np
 import torch
 import torch.nn as nn
 
-from meaning_transform.src.models.utils import CompressionBase, set_temp_seed
+from meaning_transform.src.models.utils import CompressionBase, NoiseGenerator
 
 
 class EntropyBottleneck(CompressionBase):
@@ -24,6 +24,9 @@ class EntropyBottleneck(CompressionBase):
         super().__init__(latent_dim, compression_level)
         self.seed = seed
 
+        # Quantization noise during training, seeded once
+        self.noise = NoiseGenerator(seed, stream="entropy_bottleneck")
+
         # Learnable parameters for the bottleneck
         self.compress_mu = nn.Parameter(torch.zeros(latent_dim))
         self.compress_log_scale = nn.Parameter(torch.zeros(latent_dim))
@@ -54,26 +57,12 @@ class EntropyBottleneck(CompressionBase):
                 f"Expected shape (batch_size, {self.latent_dim}), got {z.shape}"
             )
 
-        # Project to get adaptive mu and log_scale
-        projection = self.proj_compress(z)
-        mu, log_scale = torch.chunk(projection, 2, dim=-1)
-
-        # Apply base parameters with adaptive adjustments
-        mu = mu + self.compress_mu
-        log_scale = log_scale + self.compress_log_scale
-
-        # Apply compression level to both mu and log_scale for consistency
-        # Scale based on compression_level: higher level = more compression
-        mu_scaled = mu / self.compression_level
-        log_scale_adjusted = log_scale - torch.log(
-            torch.tensor(self.compression_level, device=z.device)
-        )
+        mu_scaled, log_scale_adjusted = self._scaled_params(z)
 
         # Add noise for quantization
         if self.training:
             # Reparameterization trick during training
-            with set_temp_seed(self.seed):
-                epsilon = torch.randn_like(mu_scaled)
+            epsilon = self.noise.randn_like(mu_scaled)
             z_compressed = mu_scaled + torch.exp(log_scale_adjusted) * epsilon
         else:
             # Deterministic rounding during inference
@@ -88,3 +77,57 @@ class EntropyBottleneck(CompressionBase):
         compression_loss = compression_loss.mean()
 
         return z_compressed, compression_loss
+
+    def _scaled_params(self, z: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Compute the compression-level scaled mean and log scale of z.
+
+        Args:
+            z: Latent representation [B, D]
+
+        Returns:
+            mu_scaled: Scaled mean (rounded to integers at inference)
+            log_scale_adjusted: Scaled log standard deviation
+        """
+        # Project to get adaptive mu and log_scale
+        projection = self.proj_compress(z)
+        mu, log_scale = torch.chunk(projection, 2, dim=-1)
+
+        # Apply base parameters with adaptive adjustments
+        mu = mu + self.compress_mu
+        log_scale = log_scale + self.compress_log_scale
+
+        # Apply compression level to both mu and log_scale for consistency
+        # Scale based on compression_level: higher level = more compression
+        mu_scaled = mu / self.compression_level
+        log_scale_adjusted = log_scale - torch.log(
+            torch.tensor(self.compression_level, device=z.device)
+        )
+
+        return mu_scaled, log_scale_adjusted
+
+    def quantize(self, z: torch.Tensor) -> torch.Tensor:
+        """
+        Integer symbols of z as produced by inference-time rounding.
+
+        Args:
+            z: Latent representation [B, D]
+
+        Returns:
+            symbols: Integer symbols [B, D]
+        """
+        mu_scaled, _ = self._scaled_params(z)
+        return torch.round(mu_scaled).long()
+
+    def dequantize(self, symbols: torch.Tensor) -> torch.Tensor:
+        """
+        Compressed latent representation from integer symbols.
+
+        Args:
+            symbols: Integer symbols [B, D]
+
+        Returns:
+            z_compressed: Compressed latent representation, equal to forward()
+                in evaluation mode
+        """
+        return symbols.float()
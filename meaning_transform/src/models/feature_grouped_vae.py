@@ -9,7 +9,7 @@ from meaning_transform.src.models.adaptive_entropy_bottleneck import (
 )
 from meaning_transform.src.models.decoder import Decoder
 from meaning_transform.src.models.encoder import Encoder
-from meaning_transform.src.models.utils import BaseModelIO
+from meaning_transform.src.models.utils import BaseModelIO, NoiseGenerator
 
 
 class FeatureGroupedVAE(nn.Module, BaseModelIO):
@@ -48,6 +48,9 @@ class FeatureGroupedVAE(nn.Module, BaseModelIO):
         self.base_compression_level = base_compression_level
         self.seed = seed
         self.use_batch_norm = use_batch_norm
+
+        # Noise for the reparameterization trick, seeded once
+        self.noise = NoiseGenerator(seed, stream="reparameterize")
         self.min_group_dim = max(1, min_group_dim)  # Ensure minimum is at least 1
 
         # Set random seed if provided
@@ -184,10 +187,7 @@ class FeatureGroupedVAE(nn.Module, BaseModelIO):
         std = torch.exp(0.5 * log_var)
 
         if self.training:
-            # Always use the set_temp_seed context manager for consistency
-            from meaning_transform.src.models.utils import set_temp_seed
-            with set_temp_seed(self.seed):
-                eps = torch.randn_like(std)
+            eps = self.noise.randn_like(std)
             z = mu + eps * std
             return z
         else:
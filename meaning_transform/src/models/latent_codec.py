@@ -0,0 +1,631 @@
+import math
+import struct
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import torch
+
+from meaning_transform.src.models.adaptive_entropy_bottleneck import (
+    AdaptiveEntropyBottleneck,
+)
+from meaning_transform.src.models.entropy_bottleneck import EntropyBottleneck
+from meaning_transform.src.models.vector_quantizer import VectorQuantizer
+
+# Bitstream layout: magic, format version, codec kind, number of states, symbols per state
+CODEC_MAGIC = b"MTLC"
+CODEC_VERSION = 1
+CODEC_HEADER = struct.Struct("<4sBBIH")
+ENTROPY_CODEC = 0
+VQ_CODEC = 1
+
+# rANS coder parameters: 16-bit frequency precision, 32-bit state, 16-bit word output
+PROB_BITS = 16
+PROB_SCALE = 1 << PROB_BITS
+RANS_LOWER = 1 << 16
+RANS_WORD_BITS = 16
+
+# Interleaved rANS lanes: states are dealt round-robin to up to MAX_LANES
+# independent coders that are stepped together as NumPy arrays. Each lane
+# costs a 4-byte final state, so small batches use fewer lanes.
+MAX_LANES = 1024
+STATES_PER_LANE = 32
+
+# Entropy stream layout after the header: lanes, number of escaped symbols,
+# escaped symbols as int32, lane states as uint32, then the rANS words
+LANE_HEADER = struct.Struct("<HI")
+MAX_BINS = 4096
+
+
+def quantize_frequencies(counts: np.ndarray) -> np.ndarray:
+    """
+    Scale symbol counts to integer frequencies summing to PROB_SCALE.
+
+    Every bin keeps a frequency of at least 1 so any symbol stays codable.
+
+    Args:
+        counts: Non-negative counts per symbol bin
+
+    Returns:
+        freqs: Integer frequencies (int64) summing to PROB_SCALE
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    if len(counts) > PROB_SCALE:
+        raise ValueError(f"At most {PROB_SCALE} bins are supported, got {len(counts)}")
+
+    total = counts.sum()
+    if total <= 0:
+        counts = np.ones_like(counts)
+        total = counts.sum()
+
+    freqs = np.maximum(1, np.floor(counts / total * PROB_SCALE)).astype(np.int64)
+
+    # Give the rounding error to (or take it from) the most frequent bins
+    excess = int(freqs.sum()) - PROB_SCALE
+    order = np.argsort(-freqs, kind="stable")
+    i = 0
+    while excess != 0:
+        bin_index = order[i % len(order)]
+        if excess > 0:
+            take = min(excess, int(freqs[bin_index]) - 1)
+            freqs[bin_index] -= take
+            excess -= take
+        else:
+            freqs[bin_index] -= excess
+            excess = 0
+        i += 1
+
+    return freqs
+
+
+def num_lanes(num_states: int) -> int:
+    """Number of interleaved rANS lanes used for a batch of states."""
+    return min(MAX_LANES, max(1, num_states // STATES_PER_LANE))
+
+
+def rans_encode(freqs: np.ndarray, cums: np.ndarray, lanes: int) -> bytes:
+    """
+    Range-code symbols of many states with interleaved rANS lanes.
+
+    State ``i`` is coded by lane ``i % lanes``; all lanes advance one symbol
+    per step, so the Python loop runs once per (row of lanes, dimension)
+    instead of once per symbol.
+
+    Args:
+        freqs: Frequency of each symbol [N, width] (out of PROB_SCALE)
+        cums: Cumulative frequency of each symbol [N, width]
+        lanes: Number of interleaved lanes
+
+    Returns:
+        data: Final lane states (uint32) followed by the renormalization words
+            (uint16), both little-endian
+    """
+    freqs = np.asarray(freqs, dtype=np.int64)
+    cums = np.asarray(cums, dtype=np.int64)
+    num_states, width = freqs.shape
+    states = np.full(lanes, RANS_LOWER, dtype=np.int64)
+    renorm = (RANS_LOWER >> PROB_BITS) << RANS_WORD_BITS
+    words = []
+
+    # rANS is last-in first-out: encode in reverse so decoding runs forward
+    for start in reversed(range(0, num_states, lanes)):
+        count = min(lanes, num_states - start)
+        for d in reversed(range(width)):
+            freq = freqs[start : start + count, d]
+            lane_states = states[:count]
+            flush = lane_states >= renorm * freq
+            words.append(lane_states[flush] & ((1 << RANS_WORD_BITS) - 1))
+            lane_states = np.where(flush, lane_states >> RANS_WORD_BITS, lane_states)
+            states[:count] = (
+                ((lane_states // freq) << PROB_BITS)
+                + lane_states % freq
+                + cums[start : start + count, d]
+            )
+
+    words.reverse()
+    stream = np.concatenate(words) if words else np.zeros(0, dtype=np.int64)
+    return states.astype("<u4").tobytes() + stream.astype("<u2").tobytes()
+
+
+class RansDecoder:
+    """Interleaved decoder for streams written by ``rans_encode``."""
+
+    def __init__(self, data: Union[bytes, memoryview], offset: int, lanes: int):
+        """
+        Initialize the decoder.
+
+        Args:
+            data: Encoded bytes
+            offset: Position of the stream in data
+            lanes: Number of interleaved lanes
+        """
+        words_offset = offset + 4 * lanes
+        if len(data) < words_offset or (len(data) - words_offset) % 2:
+            raise ValueError("Truncated entropy-coded stream")
+        self.states = np.frombuffer(data, dtype="<u4", count=lanes, offset=offset).astype(
+            np.int64
+        )
+        self.words = np.frombuffer(data, dtype="<u2", offset=words_offset).astype(np.int64)
+        self.position = 0
+
+    def peek(self, count: int) -> np.ndarray:
+        """Cumulative-frequency slots of the next symbol of the first ``count`` lanes."""
+        return self.states[:count] & (PROB_SCALE - 1)
+
+    def advance(self, freq: np.ndarray, cum: np.ndarray) -> None:
+        """
+        Consume one symbol in each of the first ``len(freq)`` lanes.
+
+        Args:
+            freq: Frequencies of the decoded symbols
+            cum: Cumulative frequencies of the decoded symbols
+        """
+        count = len(freq)
+        states = self.states[:count]
+        states = freq * (states >> PROB_BITS) + (states & (PROB_SCALE - 1)) - cum
+
+        refill = np.flatnonzero(states < RANS_LOWER)
+        end = self.position + len(refill)
+        if end > len(self.words):
+            raise ValueError("Truncated entropy-coded stream")
+        states[refill] = (states[refill] << RANS_WORD_BITS) | self.words[self.position : end]
+        self.position = end
+        self.states[:count] = states
+
+
+def pack_indices(indices: np.ndarray, bits: int) -> bytes:
+    """
+    Pack non-negative integers into fixed-width bit fields.
+
+    Args:
+        indices: Integers below 2**bits
+        bits: Bits per integer
+
+    Returns:
+        data: Packed bytes (big-endian bit order, zero padded)
+    """
+    indices = np.asarray(indices, dtype=np.uint64).reshape(-1)
+    if bits == 0 or len(indices) == 0:
+        return b""
+
+    shifts = np.arange(bits - 1, -1, -1, dtype=np.uint64)
+    bit_matrix = ((indices[:, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+    return np.packbits(bit_matrix.reshape(-1)).tobytes()
+
+
+def unpack_indices(data: Union[bytes, memoryview], count: int, bits: int) -> np.ndarray:
+    """
+    Unpack integers written by ``pack_indices``.
+
+    Args:
+        data: Packed bytes
+        count: Number of integers
+        bits: Bits per integer
+
+    Returns:
+        indices: Unpacked integers (int64) [count]
+    """
+    if bits == 0:
+        return np.zeros(count, dtype=np.int64)
+    if len(data) * 8 < count * bits:
+        raise ValueError("Truncated index stream")
+
+    bit_array = np.unpackbits(np.frombuffer(data, dtype=np.uint8))[: count * bits]
+    weights = np.uint64(1) << np.arange(bits - 1, -1, -1, dtype=np.uint64)
+    return (bit_array.reshape(count, bits).astype(np.uint64) @ weights).astype(np.int64)
+
+
+class LatentCodec:
+    """
+    Base class for serializing latent vectors into a compact bitstream.
+
+    Subclasses turn latents into integer symbols with the model's compression
+    module and write those symbols with a lossless code.
+    """
+
+    kind = None
+
+    def __init__(self, compression: torch.nn.Module):
+        """
+        Initialize the codec.
+
+        Args:
+            compression: Compression module providing quantize/dequantize
+        """
+        self.compression = compression
+
+    def encode(self, z: torch.Tensor) -> bytes:
+        """
+        Serialize a batch of latent vectors.
+
+        Args:
+            z: Latent vectors [B, latent_dim] (compression module input)
+
+        Returns:
+            data: Bitstream holding every vector of the batch
+        """
+        with torch.no_grad():
+            symbols = self.compression.quantize(z)
+        return self.encode_symbols(symbols.cpu().numpy())
+
+    def decode(
+        self, data: Union[bytes, memoryview], device: Optional[torch.device] = None
+    ) -> torch.Tensor:
+        """
+        Restore compressed latent vectors from a bitstream.
+
+        Args:
+            data: Bitstream written by ``encode``
+            device: Device of the returned tensor (defaults to the module's)
+
+        Returns:
+            z_compressed: Compressed latents, equal to the compression module
+                output in evaluation mode
+        """
+        if device is None:
+            device = next(self.compression.parameters()).device
+        symbols = torch.from_numpy(self.decode_symbols(data)).to(device)
+        with torch.no_grad():
+            return self.compression.dequantize(symbols)
+
+    def encode_batches(self, batches: List[torch.Tensor]) -> List[bytes]:
+        """
+        Serialize several batches, one bitstream each.
+
+        Args:
+            batches: Latent batches [B_i, latent_dim]
+
+        Returns:
+            streams: Bitstream per batch
+        """
+        return [self.encode(z) for z in batches]
+
+    def decode_batches(self, streams: List[bytes]) -> List[torch.Tensor]:
+        """
+        Restore several bitstreams.
+
+        Args:
+            streams: Bitstreams written by ``encode`` or ``encode_batches``
+
+        Returns:
+            batches: Compressed latents per stream
+        """
+        return [self.decode(data) for data in streams]
+
+    def encode_symbols(self, symbols: np.ndarray) -> bytes:
+        """Write integer symbols to a bitstream."""
+        raise NotImplementedError
+
+    def decode_symbols(self, data: Union[bytes, memoryview]) -> np.ndarray:
+        """Read integer symbols from a bitstream."""
+        raise NotImplementedError
+
+    def _header(self, num_states: int, width: int) -> bytes:
+        """Bitstream header for a batch."""
+        return CODEC_HEADER.pack(CODEC_MAGIC, CODEC_VERSION, self.kind, num_states, width)
+
+    def _read_header(self, data: Union[bytes, memoryview]) -> Tuple[int, int]:
+        """Validate a bitstream header and return (num_states, width)."""
+        if len(data) < CODEC_HEADER.size:
+            raise ValueError("Bitstream too short for a header")
+        magic, version, kind, num_states, width = CODEC_HEADER.unpack_from(data)
+        if magic != CODEC_MAGIC:
+            raise ValueError("Not a latent code bitstream")
+        if version != CODEC_VERSION:
+            raise ValueError(f"Unsupported latent code version {version}")
+        if kind != self.kind:
+            raise ValueError(f"Bitstream codec kind {kind} does not match {self.kind}")
+        return num_states, width
+
+    def measure(self, z: torch.Tensor) -> Dict[str, float]:
+        """
+        Measure the actual size of a batch of latents in this format.
+
+        Args:
+            z: Latent vectors [B, latent_dim]
+
+        Returns:
+            report: Bytes written, measured bits per state (with and without
+                the header), float32 bits per latent vector and the ratio
+                between the two
+        """
+        data = self.encode(z)
+        num_states = z.size(0)
+        payload_bits = 8 * (len(data) - CODEC_HEADER.size)
+        float_bits = 32 * z.size(1)
+        bits_per_state = 8 * len(data) / num_states if num_states else 0.0
+
+        return {
+            "num_states": num_states,
+            "num_bytes": len(data),
+            "bits_per_state": bits_per_state,
+            "payload_bits_per_state": payload_bits / num_states if num_states else 0.0,
+            "float32_bits_per_state": float_bits,
+            "compression_ratio": float_bits / bits_per_state if bits_per_state else 0.0,
+        }
+
+
+class EntropyCodec(LatentCodec):
+    """
+    rANS range coder for entropy-bottleneck symbols.
+
+    Each symbol dimension has its own empirical distribution, fitted on a
+    sample of latents with ``fit``. Symbols outside a dimension's fitted range
+    are written through an escape bin followed by their raw value.
+    """
+
+    kind = ENTROPY_CODEC
+
+    def __init__(
+        self, compression: Union[EntropyBottleneck, AdaptiveEntropyBottleneck]
+    ):
+        """
+        Initialize the codec.
+
+        Args:
+            compression: EntropyBottleneck or AdaptiveEntropyBottleneck
+        """
+        super().__init__(compression)
+        self.low: Optional[np.ndarray] = None
+        self.freqs: List[np.ndarray] = []
+        self.cums: List[np.ndarray] = []
+        self._slot_tables: List[np.ndarray] = []
+        self._freq_table: Optional[np.ndarray] = None
+        self._cum_table: Optional[np.ndarray] = None
+
+    @property
+    def is_fitted(self) -> bool:
+        """Whether symbol distributions have been fitted."""
+        return self.low is not None
+
+    def fit(self, z: torch.Tensor, smoothing: float = 0.5) -> "EntropyCodec":
+        """
+        Fit per-dimension symbol distributions on sample latents.
+
+        Args:
+            z: Sample latent vectors [N, latent_dim]
+            smoothing: Pseudo-count added to every bin within the fitted range
+
+        Returns:
+            self: For method chaining
+        """
+        with torch.no_grad():
+            symbols = self.compression.quantize(z)
+        return self.fit_symbols(symbols.cpu().numpy(), smoothing=smoothing)
+
+    def fit_symbols(self, symbols: np.ndarray, smoothing: float = 0.5) -> "EntropyCodec":
+        """
+        Fit per-dimension symbol distributions on sample symbols.
+
+        Args:
+            symbols: Integer symbols [N, width]
+            smoothing: Pseudo-count added to every bin within the fitted range
+
+        Returns:
+            self: For method chaining
+        """
+        symbols = np.asarray(symbols, dtype=np.int64)
+        if symbols.ndim != 2 or symbols.shape[0] == 0:
+            raise ValueError(f"Expected a non-empty [N, width] symbol array, got {symbols.shape}")
+
+        low = symbols.min(axis=0)
+        high = symbols.max(axis=0)
+
+        # Very wide dimensions keep the central range and escape the tails
+        wide = high - low + 1 > MAX_BINS - 1
+        if wide.any():
+            center = np.median(symbols, axis=0).astype(np.int64)
+            low = np.where(wide, center - (MAX_BINS - 1) // 2, low)
+            high = np.where(wide, low + MAX_BINS - 2, high)
+
+        counts = []
+        for d in range(symbols.shape[1]):
+            bins = high[d] - low[d] + 1
+            column = symbols[:, d] - low[d]
+            in_range = (column >= 0) & (column < bins)
+            histogram = np.bincount(column[in_range], minlength=bins).astype(np.float64)
+            escapes = float((~in_range).sum())
+            # Last bin is the escape symbol
+            counts.append(np.append(histogram + smoothing, escapes + smoothing))
+
+        return self.set_distributions(low, counts)
+
+    def set_distributions(self, low: np.ndarray, counts: List[np.ndarray]) -> "EntropyCodec":
+        """
+        Set per-dimension symbol distributions directly.
+
+        Args:
+            low: Smallest in-range symbol per dimension [width]
+            counts: Per dimension, counts of symbols low, low + 1, ... followed
+                by the escape count
+
+        Returns:
+            self: For method chaining
+        """
+        self.low = np.asarray(low, dtype=np.int64)
+        self.freqs = [quantize_frequencies(c) for c in counts]
+        self.cums = [np.concatenate([[0], np.cumsum(f)[:-1]]) for f in self.freqs]
+        self._slot_tables = [
+            np.repeat(np.arange(len(f)), f).astype(np.int32) for f in self.freqs
+        ]
+
+        # Padded [width, max_bins] tables for gathering every symbol at once
+        max_bins = max((len(f) for f in self.freqs), default=0)
+        self._freq_table = np.ones((len(self.freqs), max_bins), dtype=np.int64)
+        self._cum_table = np.zeros((len(self.freqs), max_bins), dtype=np.int64)
+        for d, (freq, cum) in enumerate(zip(self.freqs, self.cums)):
+            self._freq_table[d, : len(freq)] = freq
+            self._cum_table[d, : len(cum)] = cum
+        return self
+
+    def state_dict(self) -> Dict[str, Any]:
+        """
+        Fitted distributions, needed to decode streams later.
+
+        Returns:
+            state: Lower bounds and integer frequencies per dimension
+        """
+        if not self.is_fitted:
+            raise RuntimeError("EntropyCodec has not been fitted")
+        return {"low": self.low.tolist(), "freqs": [f.tolist() for f in self.freqs]}
+
+    def load_state_dict(self, state: Dict[str, Any]) -> "EntropyCodec":
+        """
+        Restore distributions saved with ``state_dict``.
+
+        Args:
+            state: Saved codec state
+
+        Returns:
+            self: For method chaining
+        """
+        return self.set_distributions(state["low"], [np.asarray(f) for f in state["freqs"]])
+
+    def encode_symbols(self, symbols: np.ndarray) -> bytes:
+        """
+        Range-code integer symbols.
+
+        Args:
+            symbols: Integer symbols [N, width]
+
+        Returns:
+            data: Header followed by the rANS stream
+        """
+        if not self.is_fitted:
+            raise RuntimeError("EntropyCodec has not been fitted; call fit() first")
+
+        symbols = np.asarray(symbols, dtype=np.int64)
+        num_states, width = symbols.shape
+        if width != len(self.low):
+            raise ValueError(f"Expected {len(self.low)} symbols per state, got {width}")
+
+        # Map symbols to bins, routing out-of-range symbols to the escape bin
+        escape_bins = np.array([len(f) - 1 for f in self.freqs])
+        bins = symbols - self.low
+        escaped = (bins < 0) | (bins >= escape_bins)
+        bins = np.where(escaped, escape_bins, bins)
+
+        # Escaped symbols are stored raw as int32, in row-major order
+        raw = symbols[escaped]
+        out_of_range = (raw < -(1 << 31)) | (raw >= 1 << 31)
+        if out_of_range.any():
+            raise ValueError(f"Symbol {raw[out_of_range][0]} outside the int32 range")
+
+        dims = np.arange(width)
+        lanes = num_lanes(num_states)
+        return (
+            self._header(num_states, width)
+            + LANE_HEADER.pack(lanes, len(raw))
+            + raw.astype("<i4").tobytes()
+            + rans_encode(self._freq_table[dims, bins], self._cum_table[dims, bins], lanes)
+        )
+
+    def decode_symbols(self, data: Union[bytes, memoryview]) -> np.ndarray:
+        """
+        Decode integer symbols written by ``encode_symbols``.
+
+        Args:
+            data: Bitstream
+
+        Returns:
+            symbols: Integer symbols [N, width]
+        """
+        if not self.is_fitted:
+            raise RuntimeError("EntropyCodec has not been fitted")
+
+        num_states, width = self._read_header(data)
+        if width != len(self.low):
+            raise ValueError(f"Bitstream has {width} symbols per state, codec has {len(self.low)}")
+
+        offset = CODEC_HEADER.size + LANE_HEADER.size
+        if len(data) < offset:
+            raise ValueError("Truncated entropy-coded stream")
+        lanes, num_escaped = LANE_HEADER.unpack_from(data, CODEC_HEADER.size)
+        if lanes == 0 or len(data) < offset + 4 * num_escaped:
+            raise ValueError("Truncated entropy-coded stream")
+        raw = np.frombuffer(data, dtype="<i4", count=num_escaped, offset=offset)
+
+        decoder = RansDecoder(data, offset + 4 * num_escaped, lanes)
+        bins = np.empty((num_states, width), dtype=np.int64)
+        for start in range(0, num_states, lanes):
+            count = min(lanes, num_states - start)
+            for d in range(width):
+                bin_index = self._slot_tables[d][decoder.peek(count)]
+                decoder.advance(self.freqs[d][bin_index], self.cums[d][bin_index])
+                bins[start : start + count, d] = bin_index
+
+        escaped = bins == np.array([len(f) - 1 for f in self.freqs])
+        if escaped.sum() != num_escaped:
+            raise ValueError("Corrupt entropy-coded stream: escape count mismatch")
+        symbols = bins + self.low
+        symbols[escaped] = raw
+        return symbols
+
+
+class VQCodec(LatentCodec):
+    """Fixed-width packing of vector-quantizer codebook indices."""
+
+    kind = VQ_CODEC
+
+    def __init__(self, compression: VectorQuantizer):
+        """
+        Initialize the codec.
+
+        Args:
+            compression: VectorQuantizer whose indices are packed
+        """
+        super().__init__(compression)
+        self.bits = math.ceil(math.log2(compression.num_embeddings))
+
+    def encode_symbols(self, symbols: np.ndarray) -> bytes:
+        """
+        Pack codebook indices into ceil(log2(num_embeddings)) bits each.
+
+        Args:
+            symbols: Codebook indices [N]
+
+        Returns:
+            data: Header followed by the packed indices
+        """
+        symbols = np.asarray(symbols, dtype=np.int64).reshape(-1)
+        if len(symbols) and (
+            symbols.min() < 0 or symbols.max() >= self.compression.num_embeddings
+        ):
+            raise ValueError("Codebook index out of range")
+        return self._header(len(symbols), self.bits) + pack_indices(symbols, self.bits)
+
+    def decode_symbols(self, data: Union[bytes, memoryview]) -> np.ndarray:
+        """
+        Unpack codebook indices written by ``encode_symbols``.
+
+        Args:
+            data: Bitstream
+
+        Returns:
+            symbols: Codebook indices [N]
+        """
+        num_states, bits = self._read_header(data)
+        if bits != self.bits:
+            raise ValueError(f"Bitstream uses {bits}-bit indices, codec uses {self.bits}")
+        return unpack_indices(memoryview(data)[CODEC_HEADER.size :], num_states, bits)
+
+
+def create_latent_codec(model: torch.nn.Module) -> LatentCodec:
+    """
+    Create the latent codec matching a model's compression module.
+
+    Entropy codecs still need ``fit`` on sample latents before encoding.
+
+    Args:
+        model: Model with a ``compression`` module (e.g. MeaningVAE)
+
+    Returns:
+        codec: EntropyCodec or VQCodec
+    """
+    compression = getattr(model, "compression", None)
+    if isinstance(compression, VectorQuantizer):
+        return VQCodec(compression)
+    if isinstance(compression, (EntropyBottleneck, AdaptiveEntropyBottleneck)):
+        return EntropyCodec(compression)
+    raise ValueError(
+        f"No latent codec for compression module {type(compression).__name__}"
+    )
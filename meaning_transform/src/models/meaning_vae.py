@@ -14,7 +14,7 @@ from meaning_transform.src.models.adaptive_entropy_bottleneck import (
 from meaning_transform.src.models.decoder import Decoder
 from meaning_transform.src.models.encoder import Encoder
 from meaning_transform.src.models.entropy_bottleneck import EntropyBottleneck
-from meaning_transform.src.models.utils import BaseModelIO, set_temp_seed
+from meaning_transform.src.models.utils import BaseModelIO, NoiseGenerator
 from meaning_transform.src.models.vector_quantizer import VectorQuantizer
 
 
@@ -61,6 +61,9 @@ class MeaningVAE(nn.Module, BaseModelIO):
         self.use_graph = use_graph
         self.seed = seed
 
+        # Noise for the reparameterization trick, seeded once
+        self.noise = NoiseGenerator(seed, stream="reparameterize")
+
         # Standard vector encoder/decoder for non-graph inputs
         self.encoder = Encoder(
             input_dim=input_dim,
@@ -148,8 +151,7 @@ class MeaningVAE(nn.Module, BaseModelIO):
         std = torch.exp(0.5 * log_var)
 
         if self.training:
-            with set_temp_seed(self.seed):
-                eps = torch.randn_like(std)
+            eps = self.noise.randn_like(std)
             z = mu + eps * std
             return z
         else:
@@ -351,6 +353,43 @@ class MeaningVAE(nn.Module, BaseModelIO):
 
         return self.decoder(z)
 
+    def encode_indices(self, x: torch.Tensor, compact: bool = True) -> torch.Tensor:
+        """
+        Encode inputs straight to VQ codebook indices.
+
+        Args:
+            x: Input tensor [batch_size, input_dim]
+            compact: Return int16/int32 indices for storage instead of int64
+
+        Returns:
+            indices: Codebook index per input [batch_size]
+        """
+        if self.compression_type != "vq":
+            raise ValueError(
+                f"encode_indices requires compression_type 'vq', got {self.compression_type}"
+            )
+
+        mu, log_var = self.encoder(x)
+        z = self.reparameterize(mu, log_var)
+        return self.compression.quantize(z, compact=compact)
+
+    def decode_indices(self, indices: torch.Tensor) -> torch.Tensor:
+        """
+        Decode stored VQ codebook indices.
+
+        Args:
+            indices: Codebook indices of any integer dtype [batch_size]
+
+        Returns:
+            reconstruction: Reconstructed output
+        """
+        if self.compression_type != "vq":
+            raise ValueError(
+                f"decode_indices requires compression_type 'vq', got {self.compression_type}"
+            )
+
+        return self.decoder(self.compression.dequantize(indices))
+
     def get_compression_rate(self) -> float:
         """Get the effective compression rate."""
         if self.compression is None:
@@ -1,5 +1,6 @@
 import contextlib
 import warnings
+import zlib
 from typing import Any, Dict, Union
 
 import torch
@@ -27,6 +28,99 @@ def set_temp_seed(seed=None):
         torch.set_rng_state(state)
 
 
+class NoiseGenerator(nn.Module):
+    """
+    Random number generator owned by a module.
+
+    The generator is seeded once from the module seed, instead of swapping the
+    global RNG state on every call, and its state is stored in the owning
+    model's state_dict so resumed training continues the same noise sequence.
+    It is created lazily on the device of the tensors it draws noise for;
+    moving the model to another device starts a freshly seeded generator
+    there. Without a seed, noise comes from the global RNG.
+    """
+
+    def __init__(self, seed: int = None, stream: str = ""):
+        """
+        Initialize the generator.
+
+        Args:
+            seed: Random seed (None uses the global RNG)
+            stream: Name mixed into the seed so modules sharing a seed draw
+                independent noise
+        """
+        super().__init__()
+        self.seed = None
+        if seed is not None:
+            self.seed = (seed + zlib.crc32(stream.encode())) % 2**63
+        self.generator = None
+        # Generator state from a state_dict, applied when the generator is
+        # created on the device it was saved from
+        self._pending_state = None
+
+    def _generator_for(self, device: torch.device) -> torch.Generator:
+        """Return the seeded generator on a device, creating it if needed."""
+        if self.generator is None or self.generator.device != device:
+            self.generator = torch.Generator(device=device)
+            self.generator.manual_seed(self.seed)
+            if self._pending_state is not None:
+                saved_device, state = self._pending_state
+                if torch.device(saved_device) == self.generator.device:
+                    self.generator.set_state(state)
+            self._pending_state = None
+        return self.generator
+
+    def randn_like(self, tensor: torch.Tensor) -> torch.Tensor:
+        """
+        Standard normal noise shaped like a tensor.
+
+        Args:
+            tensor: Reference tensor for shape, dtype and device
+
+        Returns:
+            noise: Standard normal noise
+        """
+        if self.seed is None:
+            return torch.randn_like(tensor)
+        return torch.randn(
+            tensor.shape,
+            generator=self._generator_for(tensor.device),
+            device=tensor.device,
+            dtype=tensor.dtype,
+        )
+
+    def get_extra_state(self) -> Dict[str, Any]:
+        """Generator state saved with the state_dict."""
+        if self.generator is not None:
+            return {
+                "generator_state": self.generator.get_state(),
+                "device": str(self.generator.device),
+            }
+        if self._pending_state is not None:
+            device, state = self._pending_state
+            return {"generator_state": state, "device": device}
+        return {}
+
+    def set_extra_state(self, state: Dict[str, Any]) -> None:
+        """Restore the generator state from a state_dict."""
+        if state and "generator_state" in state:
+            # Checkpoints from before generators followed the module's
+            # device hold CPU generator states
+            self._pending_state = (state.get("device", "cpu"), state["generator_state"])
+            self.generator = None
+
+    def _load_from_state_dict(
+        self, state_dict, prefix, local_metadata, strict, missing_keys, unexpected_keys, error_msgs
+    ):
+        super()._load_from_state_dict(
+            state_dict, prefix, local_metadata, strict, missing_keys, unexpected_keys, error_msgs
+        )
+        # Checkpoints written before generators were saved keep loading
+        extra_state_key = prefix + "_extra_state"
+        if extra_state_key in missing_keys:
+            missing_keys.remove(extra_state_key)
+
+
 class BaseModelIO:
     """Base class with standardized save/load methods for models."""
 
@@ -1,10 +1,10 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
 
-from meaning_transform.src.models.utils import CompressionBase, set_temp_seed
+from meaning_transform.src.models.utils import CompressionBase
 
 
 class VectorQuantizer(CompressionBase):
@@ -16,6 +16,7 @@ class VectorQuantizer(CompressionBase):
         num_embeddings: int,
         commitment_cost: float = 0.25,
         seed: int = None,
+        search_chunk_size: Optional[int] = None,
     ):
         """
         Initialize vector quantizer.
@@ -25,6 +26,9 @@ class VectorQuantizer(CompressionBase):
             num_embeddings: Number of embedding vectors
             commitment_cost: Weight for commitment loss
             seed: Random seed for reproducibility
+            search_chunk_size: Codebook entries compared per step in the
+                nearest-code search (None compares the whole codebook at once);
+                bounds the distance matrix for very large codebooks
         """
         # Initialize with compression level 1.0, it's not used directly in VQ
         super().__init__(latent_dim, compression_level=1.0)
@@ -32,16 +36,21 @@ class VectorQuantizer(CompressionBase):
         self.num_embeddings = num_embeddings
         self.commitment_cost = commitment_cost
         self.seed = seed
+        self.search_chunk_size = search_chunk_size
 
         # For VQ, effective dimension is set to latent_dim since we don't reduce dimensions
         self.effective_dim = latent_dim
 
-        # Initialize embedding table with deterministic seed if provided
-        with set_temp_seed(seed):
-            self.embedding = nn.Embedding(num_embeddings, latent_dim)
-            self.embedding.weight.data.uniform_(-1 / num_embeddings, 1 / num_embeddings)
+        # Initialize embedding table from a local generator if a seed is provided
+        generator = torch.Generator().manual_seed(seed) if seed is not None else None
+        self.embedding = nn.Embedding(num_embeddings, latent_dim)
+        self.embedding.weight.data.uniform_(
+            -1 / num_embeddings, 1 / num_embeddings, generator=generator
+        )
 
-    def forward(self, z: torch.Tensor) -> Tuple[torch.Tensor, float, float]:
+    def forward(
+        self, z: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
         """
         Quantize latent vectors.
 
@@ -65,28 +74,24 @@ class VectorQuantizer(CompressionBase):
         input_shape = z.shape
         flat_z = z.reshape(-1, self.latent_dim)
 
-        # Calculate distances using cdist with p=2 for squared Euclidean distance
-        # Note: cdist with p=2 already gives us the squared distances, no need for .pow(2)
-        distances = torch.cdist(flat_z, self.embedding.weight, p=2)
-
         # Get the indices of the closest embedding vectors
-        encoding_indices = torch.argmin(distances, dim=1)
+        encoding_indices = self._nearest_indices(flat_z.detach())
+
+        # Compute the perplexity (measure of codebook usage) from code counts
+        counts = torch.bincount(encoding_indices, minlength=self.num_embeddings)
+        avg_probs = counts.to(flat_z.dtype) / max(encoding_indices.numel(), 1)
 
-        # Compute the perplexity (measure of codebook usage)
-        encodings = F.one_hot(encoding_indices, self.num_embeddings).float()
-        avg_probs = torch.mean(encodings, dim=0)
-        
         # Calculate perplexity with improved numerical stability
         eps = 1e-10  # Small epsilon to avoid log(0)
-        
-        # Handle non-zero probabilities 
+
+        # Handle non-zero probabilities
         avg_probs_filtered = avg_probs + eps
         avg_probs_normalized = avg_probs_filtered / torch.sum(avg_probs_filtered)
-        
+
         # Calculate entropy using a more stable approach
         entropy = -torch.sum(avg_probs * torch.log2(avg_probs_normalized + eps))
-        perplexity = torch.exp(torch.tensor(entropy, device=z.device))
-        
+        perplexity = torch.exp(entropy)
+
         # If perplexity is NaN or infinite, set to a reasonable default
         if torch.isnan(perplexity) or torch.isinf(perplexity):
             perplexity = torch.tensor(1.0, device=z.device)
@@ -103,6 +108,85 @@ class VectorQuantizer(CompressionBase):
 
         return quantized, vq_loss, perplexity
 
+    def _nearest_indices(
+        self, flat_z: torch.Tensor, chunk_size: Optional[int] = None
+    ) -> torch.Tensor:
+        """
+        Find the nearest codebook entry of each vector.
+
+        Squared distances are expanded as ||z||^2 - 2 z.e + ||e||^2 so the
+        search is a single matrix multiply per codebook chunk.
+
+        Args:
+            flat_z: Latent vectors [N, D]
+            chunk_size: Codebook entries per step (defaults to search_chunk_size)
+
+        Returns:
+            encoding_indices: Index of the nearest embedding per vector [N]
+        """
+        if chunk_size is None:
+            chunk_size = self.search_chunk_size
+        codebook = self.embedding.weight.detach()
+        if chunk_size is None or chunk_size >= self.num_embeddings:
+            chunk_size = self.num_embeddings
+
+        z_sq = flat_z.pow(2).sum(dim=1, keepdim=True)
+        best_distance = None
+        best_index = None
+
+        for start in range(0, self.num_embeddings, chunk_size):
+            chunk = codebook[start : start + chunk_size]
+            distances = torch.addmm(
+                z_sq + chunk.pow(2).sum(dim=1), flat_z, chunk.t(), alpha=-2.0
+            )
+            chunk_distance, chunk_index = torch.min(distances, dim=1)
+
+            if best_distance is None:
+                best_distance, best_index = chunk_distance, chunk_index
+            else:
+                # Strict comparison keeps the first index on ties, like argmin
+                closer = chunk_distance < best_distance
+                best_distance = torch.where(closer, chunk_distance, best_distance)
+                best_index = torch.where(closer, chunk_index + start, best_index)
+
+        return best_index
+
+    @property
+    def index_dtype(self) -> torch.dtype:
+        """Smallest integer dtype holding every codebook index."""
+        return torch.int16 if self.num_embeddings <= 2**15 else torch.int32
+
+    def quantize(
+        self, z: torch.Tensor, chunk_size: Optional[int] = None, compact: bool = False
+    ) -> torch.Tensor:
+        """
+        Codebook indices of the nearest embedding vectors (index-only inference).
+
+        Args:
+            z: Latent vectors [B, D]
+            chunk_size: Codebook entries compared per step (defaults to
+                search_chunk_size)
+            compact: Return indices as ``index_dtype`` (int16/int32) for storage
+
+        Returns:
+            encoding_indices: Index of the nearest embedding per vector [B]
+        """
+        with torch.no_grad():
+            indices = self._nearest_indices(z.reshape(-1, self.latent_dim), chunk_size)
+        return indices.to(self.index_dtype) if compact else indices
+
+    def dequantize(self, encoding_indices: torch.Tensor) -> torch.Tensor:
+        """
+        Quantized latent vectors looked up from stored codebook indices.
+
+        Args:
+            encoding_indices: Codebook indices of any integer dtype [B]
+
+        Returns:
+            quantized: Embedding vectors [B, D]
+        """
+        return self.embedding(encoding_indices.long())
+
     def get_compression_rate(self) -> float:
         """
         Calculate effective compression rate for VQ.
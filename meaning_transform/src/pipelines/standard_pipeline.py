@@ -21,7 +21,7 @@ from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import torch
 
 from meaning_transform.src.config import Config
-from meaning_transform.src.data import AgentState
+from meaning_transform.src.data import AgentState, AgentStateBatch
 from meaning_transform.src.knowledge_graph import AgentStateToGraph
 from meaning_transform.src.models import MeaningVAE, AdaptiveMeaningVAE
 from meaning_transform.src.pipelines.pipeline import (
@@ -104,7 +104,16 @@ class AgentStateToTensorComponent(PipelineComponent):
         # Handle list of agent states
         elif isinstance(data, list) and all(isinstance(item, AgentState) for item in data):
             try:
-                # Convert each state to tensor
+                # Encode the whole list in one vectorized pass
+                tensor = AgentStateBatch.from_states(data).to_tensor()
+                if self.device is not None:
+                    tensor = tensor.to(self.device)
+                return tensor, context
+            except Exception as e:
+                print(f"Error converting AgentState batch to tensor: {e}")
+
+            try:
+                # Fall back to converting each state to tensor
                 tensors = []
                 for state in data:
                     try:
@@ -0,0 +1,782 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compact binary serialization for agent states.
+
+This module provides:
+1. A fixed-width packed record format backed by a NumPy structured dtype
+2. A side channel for variable-size fields (agent id, inventory, goals, extra properties)
+3. Bulk pack_many/unpack_many functions operating on whole buffers
+4. Zero-copy decoding of the fixed fields into an AgentStateBatch via memoryview
+5. A leading version byte so legacy JSON blobs remain readable
+6. A columnar, appendable .npz archive format for bulk state lists that
+   loads without pickle
+
+Buffer layout (all little-endian):
+    header   : version (u1), 3 padding bytes, record count (u4), side channel size (u4)
+    records  : count x RECORD_DTYPE
+    side     : concatenated UTF-8 JSON objects referenced by (side_offset, side_length)
+"""
+
+import io
+import json
+import os
+import struct
+import zipfile
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .data import AGENT_ROLES, AgentState, AgentStateBatch
+
+# Version byte written at the start of every packed buffer. Legacy buffers
+# start with a big-endian JSON length, whose first byte is 0 for any state
+# under 16 MiB, so they never collide with this value.
+PACKED_FORMAT_VERSION = 2
+
+# Header preceding the packed records
+_HEADER = struct.Struct("<B3xII")
+
+# Fixed-width record layout (96 bytes, 8-byte aligned)
+RECORD_DTYPE = np.dtype(
+    [
+        ("position", "<f8", (3,)),
+        ("health", "<f8"),
+        ("energy", "<f8"),
+        ("resource_level", "<f8"),
+        ("current_health", "<f8"),
+        ("total_reward", "<f8"),
+        ("age", "<i8"),
+        ("step_number", "<i8"),
+        ("side_offset", "<u4"),
+        ("side_length", "<u4"),
+        ("flags", "u1"),
+        ("role_code", "i1"),
+        ("_padding", "V6"),
+    ]
+)
+
+# Bit flags stored in the record's flags field
+FLAG_IS_DEFENDING = 1
+FLAG_HAS_RESOURCE_LEVEL = 2
+FLAG_HAS_STEP_NUMBER = 4
+
+_ROLE_CODES = {role: code for code, role in enumerate(AGENT_ROLES)}
+
+BufferLike = Union[bytes, bytearray, memoryview]
+
+
+def is_packed(data: BufferLike) -> bool:
+    """
+    Check whether a buffer uses the packed record format.
+
+    Args:
+        data: Serialized agent state buffer
+
+    Returns:
+        True for packed buffers, False for legacy JSON buffers
+    """
+    return len(data) >= _HEADER.size and memoryview(data)[0] == PACKED_FORMAT_VERSION
+
+
+def _side_record(state: AgentState, role_code: int) -> Dict[str, Any]:
+    """Collect the variable-size fields of a state that need the side channel."""
+    side = {}
+    if state.agent_id is not None:
+        side["agent_id"] = state.agent_id
+    if state.inventory:
+        side["inventory"] = state.inventory
+    if state.goals:
+        side["goals"] = state.goals
+    if state.properties:
+        side["properties"] = state.properties
+    if role_code < 0:
+        side["role"] = state.role
+    return side
+
+
+def pack_many(states: Sequence[AgentState]) -> bytes:
+    """
+    Pack agent states into a single buffer.
+
+    Position components that are None are stored as NaN.
+
+    Args:
+        states: Agent states to serialize
+
+    Returns:
+        Packed buffer holding all states
+    """
+    records = np.zeros(len(states), dtype=RECORD_DTYPE)
+    positions, flags, role_codes = [], [], []
+    side_offsets, side_lengths, side_chunks = [], [], []
+    side_offset = 0
+
+    # Gather fixed fields as Python lists and assign each column in bulk
+    for state in states:
+        positions.append(
+            [np.nan if p is None else p for p in (state.position or (0.0, 0.0, 0.0))]
+        )
+        state_flags = FLAG_IS_DEFENDING if state.is_defending else 0
+        if state.resource_level is not None:
+            state_flags |= FLAG_HAS_RESOURCE_LEVEL
+        if state.step_number is not None:
+            state_flags |= FLAG_HAS_STEP_NUMBER
+        flags.append(state_flags)
+
+        role_code = _ROLE_CODES.get(state.role, -1)
+        role_codes.append(role_code)
+
+        # Variable-size fields go to the side channel only when present
+        side = _side_record(state, role_code)
+        encoded = (
+            json.dumps(side, separators=(",", ":")).encode("utf-8") if side else b""
+        )
+        side_offsets.append(side_offset)
+        side_lengths.append(len(encoded))
+        side_chunks.append(encoded)
+        side_offset += len(encoded)
+
+    records["position"] = positions
+    records["health"] = [state.health for state in states]
+    records["energy"] = [state.energy for state in states]
+    records["resource_level"] = [
+        state.resource_level if state.resource_level is not None else 0.0
+        for state in states
+    ]
+    records["current_health"] = [state.current_health for state in states]
+    records["total_reward"] = [state.total_reward for state in states]
+    records["age"] = [state.age for state in states]
+    records["step_number"] = [
+        state.step_number if state.step_number is not None else -1 for state in states
+    ]
+    records["side_offset"] = side_offsets
+    records["side_length"] = side_lengths
+    records["flags"] = flags
+    records["role_code"] = role_codes
+
+    header = _HEADER.pack(PACKED_FORMAT_VERSION, len(states), side_offset)
+    return b"".join([header, records.tobytes(), *side_chunks])
+
+
+def _parse_header(data: BufferLike) -> tuple:
+    """Validate a packed buffer and return (records view, side channel view)."""
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError(f"Packed buffer too short: {len(view)} bytes")
+
+    version, count, side_size = _HEADER.unpack_from(view)
+    if version != PACKED_FORMAT_VERSION:
+        raise ValueError(f"Unsupported packed format version: {version}")
+
+    records_end = _HEADER.size + count * RECORD_DTYPE.itemsize
+    if len(view) < records_end + side_size:
+        raise ValueError(
+            f"Packed buffer truncated: expected {records_end + side_size} bytes, got {len(view)}"
+        )
+
+    # Zero-copy view over the fixed-width records
+    records = np.frombuffer(view, dtype=RECORD_DTYPE, count=count, offset=_HEADER.size)
+    return records, view[records_end : records_end + side_size]
+
+
+def _decode_side(records: np.ndarray, side: memoryview) -> List[Dict[str, Any]]:
+    """Decode the side channel entry of every record."""
+    return [
+        json.loads(bytes(side[offset : offset + length]))
+        if length
+        else {}
+        for offset, length in zip(
+            records["side_offset"].tolist(), records["side_length"].tolist()
+        )
+    ]
+
+
+def unpack_many(data: BufferLike) -> List[AgentState]:
+    """
+    Unpack all agent states from a packed buffer.
+
+    Args:
+        data: Buffer produced by pack_many
+
+    Returns:
+        List of reconstructed AgentState objects
+    """
+    records, side = _parse_header(data)
+    side_records = _decode_side(records, side)
+
+    # Convert columns to Python scalars in bulk rather than per field
+    positions = records["position"].tolist()
+    columns = {
+        name: records[name].tolist()
+        for name in (
+            "health",
+            "energy",
+            "resource_level",
+            "current_health",
+            "total_reward",
+            "age",
+            "step_number",
+            "flags",
+            "role_code",
+        )
+    }
+
+    states = []
+    for i, extra in enumerate(side_records):
+        flags = columns["flags"][i]
+        role_code = columns["role_code"][i]
+        states.append(
+            AgentState(
+                position=tuple(None if np.isnan(p) else p for p in positions[i]),
+                health=columns["health"][i],
+                energy=columns["energy"][i],
+                inventory=extra.get("inventory"),
+                role=AGENT_ROLES[role_code] if role_code >= 0 else extra.get("role"),
+                goals=extra.get("goals"),
+                agent_id=extra.get("agent_id"),
+                step_number=(
+                    columns["step_number"][i] if flags & FLAG_HAS_STEP_NUMBER else None
+                ),
+                resource_level=(
+                    columns["resource_level"][i]
+                    if flags & FLAG_HAS_RESOURCE_LEVEL
+                    else None
+                ),
+                current_health=columns["current_health"][i],
+                is_defending=bool(flags & FLAG_IS_DEFENDING),
+                age=columns["age"][i],
+                total_reward=columns["total_reward"][i],
+                **extra.get("properties", {}),
+            )
+        )
+
+    return states
+
+
+def unpack_batch(data: BufferLike, include_side: bool = True) -> AgentStateBatch:
+    """
+    Unpack a packed buffer straight into a columnar batch.
+
+    Fixed-width float and integer columns are strided views over the buffer,
+    so no per-state objects are created and most numeric data is not copied.
+
+    Args:
+        data: Buffer produced by pack_many
+        include_side: Also decode agent ids, inventories and goals
+
+    Returns:
+        Columnar batch of the packed states
+    """
+    records, side = _parse_header(data)
+    flags = records["flags"]
+
+    agent_ids = inventories = goals = None
+    if include_side:
+        side_records = _decode_side(records, side)
+        agent_ids = [extra.get("agent_id") for extra in side_records]
+        inventories = [extra.get("inventory", {}) for extra in side_records]
+        goals = [extra.get("goals", []) for extra in side_records]
+
+    return AgentStateBatch(
+        position=np.nan_to_num(records["position"], nan=0.0),
+        health=records["health"],
+        energy=records["energy"],
+        resource_level=np.where(
+            flags & FLAG_HAS_RESOURCE_LEVEL, records["resource_level"], 0.0
+        ),
+        current_health=records["current_health"],
+        is_defending=(flags & FLAG_IS_DEFENDING).astype(bool),
+        age=records["age"],
+        total_reward=records["total_reward"],
+        role_codes=records["role_code"],
+        agent_ids=agent_ids,
+        step_numbers=np.where(flags & FLAG_HAS_STEP_NUMBER, records["step_number"], -1),
+        inventories=inventories,
+        goals=goals,
+    )
+
+
+def pack_state(state: AgentState) -> bytes:
+    """Pack a single agent state."""
+    return pack_many([state])
+
+
+def unpack_state(data: BufferLike) -> AgentState:
+    """
+    Unpack a single agent state from a packed buffer.
+
+    Args:
+        data: Buffer holding exactly one packed state
+
+    Returns:
+        Reconstructed AgentState
+    """
+    states = unpack_many(data)
+    if len(states) != 1:
+        raise ValueError(f"Expected one packed state, found {len(states)}")
+    return states[0]
+
+
+# ---------------------------------------------------------------------------
+# Columnar bulk format
+# ---------------------------------------------------------------------------
+
+# Version of the columnar .npz layout, stored in the archive's format member
+COLUMNAR_FORMAT_VERSION = 2
+
+# Name of the archive member identifying the columnar format
+_FORMAT_MEMBER = "format.npy"
+
+# Zip local file header signature used to detect columnar archives
+_ZIP_MAGIC = b"PK\x03\x04"
+
+PathOrBuffer = Union[str, os.PathLike, io.BytesIO]
+
+
+def is_columnar(data: Union[BufferLike, str, os.PathLike]) -> bool:
+    """
+    Check whether bytes or a file use the columnar archive format.
+
+    Args:
+        data: Serialized bytes or path to a file
+
+    Returns:
+        True if the data is a columnar agent state archive
+    """
+    if isinstance(data, (str, os.PathLike)):
+        with open(data, "rb") as f:
+            data = f.read(len(_ZIP_MAGIC))
+    return bytes(memoryview(data)[: len(_ZIP_MAGIC)]) == _ZIP_MAGIC
+
+
+def _encode_strings(values: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack strings as a UTF-8 byte buffer plus int64 offsets."""
+    encoded = [value.encode("utf-8") for value in values]
+    return (
+        np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        _ragged_offsets([len(value) for value in encoded]),
+    )
+
+
+def _set_strings(columns: Dict[str, np.ndarray], name: str, values: Sequence[str]) -> None:
+    """Store strings as the ``<name>_bytes`` and ``<name>_offsets`` columns."""
+    columns[f"{name}_bytes"], columns[f"{name}_offsets"] = _encode_strings(values)
+
+
+def _get_strings(columns: Dict[str, np.ndarray], name: str) -> List[str]:
+    """Decode strings stored by _set_strings."""
+    data = columns[f"{name}_bytes"].tobytes()
+    offsets = columns[f"{name}_offsets"].tolist()
+    return [data[start:end].decode("utf-8") for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def _set_dictionary(
+    columns: Dict[str, np.ndarray], prefix: str, values: Sequence[str]
+) -> None:
+    """Dictionary-encode strings as a ``<prefix>_vocab`` and int32 ``<prefix>_codes``."""
+    index: Dict[str, int] = {}
+    columns[f"{prefix}_codes"] = np.fromiter(
+        (index.setdefault(value, len(index)) for value in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    _set_strings(columns, f"{prefix}_vocab", list(index))
+
+
+def _get_dictionary(columns: Dict[str, np.ndarray], prefix: str) -> List[str]:
+    """Decode one string per code of a dictionary-encoded column."""
+    vocabulary = _get_strings(columns, f"{prefix}_vocab")
+    return [vocabulary[code] for code in columns[f"{prefix}_codes"].tolist()]
+
+
+def _ragged_offsets(lengths: List[int]) -> np.ndarray:
+    """Build CSR-style offsets from per-row lengths."""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def states_to_columns(
+    states: Union[Sequence[AgentState], AgentStateBatch]
+) -> Dict[str, np.ndarray]:
+    """
+    Convert agent states to plain NumPy columns.
+
+    Strings (roles, agent ids, goals, inventory keys) are dictionary encoded,
+    vocabularies and extra properties are stored as UTF-8 bytes plus offsets
+    and ragged fields use offset arrays, so no object or fixed-width string
+    arrays are produced.
+
+    Args:
+        states: List of AgentState objects or a columnar batch
+
+    Returns:
+        Dictionary of column name to array
+    """
+    if isinstance(states, AgentStateBatch):
+        return _batch_to_columns(states)
+
+    num_states = len(states)
+    columns = {
+        "position": np.array(
+            [
+                [np.nan if p is None else p for p in (s.position or (0.0, 0.0, 0.0))]
+                for s in states
+            ],
+            dtype=np.float64,
+        ).reshape(num_states, 3),
+        "health": np.array([s.health for s in states], dtype=np.float64),
+        "energy": np.array([s.energy for s in states], dtype=np.float64),
+        "current_health": np.array([s.current_health for s in states], dtype=np.float64),
+        "total_reward": np.array([s.total_reward for s in states], dtype=np.float64),
+        "age": np.array([s.age for s in states], dtype=np.int64),
+        "is_defending": np.array([bool(s.is_defending) for s in states], dtype=bool),
+    }
+
+    # Nullable numeric fields are stored with a validity mask
+    resource_levels = [s.resource_level for s in states]
+    columns["resource_level_valid"] = np.array(
+        [r is not None for r in resource_levels], dtype=bool
+    )
+    columns["resource_level"] = np.array(
+        [0.0 if r is None else r for r in resource_levels], dtype=np.float64
+    )
+    step_numbers = [s.step_number for s in states]
+    columns["step_number_valid"] = np.array(
+        [n is not None for n in step_numbers], dtype=bool
+    )
+    columns["step_number"] = np.array(
+        [-1 if n is None else n for n in step_numbers], dtype=np.int64
+    )
+
+    # Dictionary-encoded strings
+    agent_ids = [s.agent_id for s in states]
+    columns["agent_id_valid"] = np.array([a is not None for a in agent_ids], dtype=bool)
+    _set_dictionary(columns, "agent_id", ["" if a is None else str(a) for a in agent_ids])
+    _set_dictionary(columns, "role", [s.role for s in states])
+
+    # Ragged goal lists
+    goals = [s.goals or [] for s in states]
+    columns["goal_offsets"] = _ragged_offsets([len(g) for g in goals])
+    _set_dictionary(columns, "goal", [goal for row in goals for goal in row])
+
+    # Ragged inventories as (key code, quantity) pairs
+    inventories = [s.inventory or {} for s in states]
+    columns["inventory_offsets"] = _ragged_offsets([len(inv) for inv in inventories])
+    _set_dictionary(columns, "inventory", [key for inv in inventories for key in inv])
+    columns["inventory_quantities"] = np.array(
+        [qty for inv in inventories for qty in inv.values()], dtype=np.int64
+    )
+
+    # Free-form extra properties as one JSON document per row ("" when empty)
+    _set_strings(
+        columns,
+        "properties",
+        [json.dumps(s.properties, separators=(",", ":")) if s.properties else "" for s in states],
+    )
+
+    return columns
+
+
+def _batch_to_columns(batch: AgentStateBatch) -> Dict[str, np.ndarray]:
+    """Convert a columnar batch to archive columns without per-row objects."""
+    num_rows = len(batch)
+    agent_ids = batch.agent_ids if batch.agent_ids is not None else [None] * num_rows
+    step_numbers = (
+        batch.step_numbers
+        if batch.step_numbers is not None
+        else np.full(num_rows, -1, dtype=np.int64)
+    )
+    goals = batch.goals if batch.goals is not None else [[]] * num_rows
+    inventories = batch.inventories if batch.inventories is not None else [{}] * num_rows
+
+    # Unknown role codes map to an empty role name, read back as the default role
+    role_codes = np.where(batch.role_codes >= 0, batch.role_codes, len(AGENT_ROLES))
+
+    columns = {
+        "position": batch.position.astype(np.float64),
+        "health": batch.health.astype(np.float64),
+        "energy": batch.energy.astype(np.float64),
+        "current_health": batch.current_health.astype(np.float64),
+        "total_reward": batch.total_reward.astype(np.float64),
+        "age": batch.age.astype(np.int64),
+        "is_defending": batch.is_defending.astype(bool),
+        "resource_level": batch.resource_level.astype(np.float64),
+        "resource_level_valid": np.ones(num_rows, dtype=bool),
+        "step_number": step_numbers.astype(np.int64),
+        "step_number_valid": step_numbers >= 0,
+        "agent_id_valid": np.array([a is not None for a in agent_ids], dtype=bool),
+        "role_codes": role_codes.astype(np.int32),
+        "goal_offsets": _ragged_offsets([len(g) for g in goals]),
+        "inventory_offsets": _ragged_offsets([len(inv) for inv in inventories]),
+        "inventory_quantities": np.array(
+            [qty for inv in inventories for qty in inv.values()], dtype=np.int64
+        ),
+        "properties_bytes": np.zeros(0, dtype=np.uint8),
+        "properties_offsets": np.zeros(num_rows + 1, dtype=np.int64),
+    }
+    _set_strings(columns, "role_vocab", list(AGENT_ROLES) + [""])
+    _set_dictionary(columns, "agent_id", ["" if a is None else str(a) for a in agent_ids])
+    _set_dictionary(columns, "goal", [goal for row in goals for goal in row])
+    _set_dictionary(columns, "inventory", [key for inv in inventories for key in inv])
+    return columns
+
+
+def _concatenate_columns(chunks: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Merge column chunks, re-encoding dictionaries and shifting offsets."""
+    if len(chunks) == 1:
+        return chunks[0]
+
+    merged = {}
+    plain = [
+        "position",
+        "health",
+        "energy",
+        "current_health",
+        "total_reward",
+        "age",
+        "is_defending",
+        "resource_level",
+        "resource_level_valid",
+        "step_number",
+        "step_number_valid",
+        "agent_id_valid",
+        "inventory_quantities",
+        "properties_bytes",
+    ]
+    for name in plain:
+        merged[name] = np.concatenate([chunk[name] for chunk in chunks])
+
+    # Dictionary-encoded columns: decode per chunk, then re-encode jointly
+    for prefix in ("agent_id", "role", "goal", "inventory"):
+        values = [value for chunk in chunks for value in _get_dictionary(chunk, prefix)]
+        _set_dictionary(merged, prefix, values)
+
+    # Ragged offsets: drop each chunk's leading zero and shift by running totals
+    for name in ("goal_offsets", "inventory_offsets", "properties_offsets"):
+        parts = [np.zeros(1, dtype=np.int64)]
+        total = 0
+        for chunk in chunks:
+            parts.append(chunk[name][1:] + total)
+            total += chunk[name][-1]
+        merged[name] = np.concatenate(parts)
+
+    return merged
+
+
+def columns_to_batch(columns: Dict[str, np.ndarray]) -> AgentStateBatch:
+    """
+    Build a columnar batch from archive columns.
+
+    Args:
+        columns: Columns produced by states_to_columns or read from an archive
+
+    Returns:
+        Columnar batch (extra properties are not carried over)
+    """
+    # Map archive role strings onto the tensor role vocabulary
+    role_lookup = np.array(
+        [
+            _ROLE_CODES.get(role if role else "explorer", -1)
+            for role in _get_strings(columns, "role_vocab")
+        ],
+        dtype=np.int8,
+    )
+    role_codes = (
+        role_lookup[columns["role_codes"]]
+        if len(role_lookup)
+        else np.zeros(0, dtype=np.int8)
+    )
+
+    agent_ids = _get_dictionary(columns, "agent_id")
+    valid_ids = columns["agent_id_valid"].tolist()
+
+    return AgentStateBatch(
+        position=np.nan_to_num(columns["position"], nan=0.0),
+        health=columns["health"],
+        energy=columns["energy"],
+        resource_level=np.where(
+            columns["resource_level_valid"], columns["resource_level"], 0.0
+        ),
+        current_health=columns["current_health"],
+        is_defending=columns["is_defending"],
+        age=columns["age"],
+        total_reward=columns["total_reward"],
+        role_codes=role_codes,
+        agent_ids=[a if valid else None for a, valid in zip(agent_ids, valid_ids)],
+        step_numbers=np.where(columns["step_number_valid"], columns["step_number"], -1),
+        inventories=_ragged_inventories(columns),
+        goals=_ragged_goals(columns),
+    )
+
+
+def _ragged_goals(columns: Dict[str, np.ndarray]) -> List[List[str]]:
+    """Rebuild per-row goal lists from codes and offsets."""
+    goals = _get_dictionary(columns, "goal")
+    offsets = columns["goal_offsets"].tolist()
+    return [goals[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def _ragged_inventories(columns: Dict[str, np.ndarray]) -> List[Dict[str, int]]:
+    """Rebuild per-row inventory dicts from codes, quantities and offsets."""
+    keys = _get_dictionary(columns, "inventory")
+    quantities = columns["inventory_quantities"].tolist()
+    offsets = columns["inventory_offsets"].tolist()
+    return [
+        dict(zip(keys[start:end], quantities[start:end]))
+        for start, end in zip(offsets[:-1], offsets[1:])
+    ]
+
+
+def columns_to_states(columns: Dict[str, np.ndarray]) -> List[AgentState]:
+    """
+    Rebuild AgentState objects from archive columns.
+
+    Args:
+        columns: Columns produced by states_to_columns or read from an archive
+
+    Returns:
+        List of AgentState objects
+    """
+    positions = columns["position"].tolist()
+    health = columns["health"].tolist()
+    energy = columns["energy"].tolist()
+    current_health = columns["current_health"].tolist()
+    total_reward = columns["total_reward"].tolist()
+    age = columns["age"].tolist()
+    is_defending = columns["is_defending"].tolist()
+    resource_level = columns["resource_level"].tolist()
+    resource_valid = columns["resource_level_valid"].tolist()
+    step_number = columns["step_number"].tolist()
+    step_valid = columns["step_number_valid"].tolist()
+    agent_ids = _get_dictionary(columns, "agent_id")
+    agent_valid = columns["agent_id_valid"].tolist()
+    roles = _get_dictionary(columns, "role")
+    properties = _get_strings(columns, "properties")
+    goals = _ragged_goals(columns)
+    inventories = _ragged_inventories(columns)
+
+    return [
+        AgentState(
+            position=tuple(None if p != p else p for p in positions[i]),
+            health=health[i],
+            energy=energy[i],
+            inventory=inventories[i],
+            role=roles[i] or None,
+            goals=goals[i],
+            agent_id=agent_ids[i] if agent_valid[i] else None,
+            step_number=step_number[i] if step_valid[i] else None,
+            resource_level=resource_level[i] if resource_valid[i] else None,
+            current_health=current_health[i],
+            is_defending=is_defending[i],
+            age=age[i],
+            total_reward=total_reward[i],
+            **(json.loads(properties[i]) if properties[i] else {}),
+        )
+        for i in range(len(positions))
+    ]
+
+
+def _next_chunk_index(archive: zipfile.ZipFile) -> int:
+    """Return the index for the next chunk written to an archive."""
+    indices = {
+        int(name.split("/", 1)[0].split("_", 1)[1])
+        for name in archive.namelist()
+        if name.startswith("chunk_")
+    }
+    return max(indices) + 1 if indices else 0
+
+
+def write_states(
+    target: PathOrBuffer,
+    states: Union[Sequence[AgentState], AgentStateBatch],
+    append: bool = False,
+) -> None:
+    """
+    Write agent states to a columnar .npz archive.
+
+    Each call stores one chunk of uncompressed .npy members, so appending
+    never rewrites existing data. Archives load with ``allow_pickle=False``.
+
+    Args:
+        target: File path or binary buffer to write to
+        states: List of AgentState objects or a columnar batch
+        append: Add a new chunk to an existing archive instead of overwriting
+    """
+    if append and isinstance(target, (str, os.PathLike)) and not os.path.exists(target):
+        append = False
+    if append and not isinstance(target, (str, os.PathLike)):
+        target.seek(0)
+
+    columns = states_to_columns(states)
+
+    with zipfile.ZipFile(target, mode="a" if append else "w") as archive:
+        if not append:
+            with archive.open(_FORMAT_MEMBER, "w") as f:
+                np.lib.format.write_array(
+                    f, np.array([COLUMNAR_FORMAT_VERSION], dtype=np.int64)
+                )
+        elif _FORMAT_MEMBER not in archive.namelist():
+            raise ValueError("Cannot append to an archive that is not a columnar state file")
+        else:
+            with archive.open(_FORMAT_MEMBER) as f:
+                version = int(np.lib.format.read_array(f, allow_pickle=False)[0])
+            if version != COLUMNAR_FORMAT_VERSION:
+                raise ValueError(f"Cannot append to columnar format version {version}")
+
+        prefix = f"chunk_{_next_chunk_index(archive):06d}"
+        for name, values in columns.items():
+            with archive.open(f"{prefix}/{name}.npy", "w", force_zip64=True) as f:
+                np.lib.format.write_array(f, np.ascontiguousarray(values), allow_pickle=False)
+
+
+def append_states(
+    target: PathOrBuffer, states: Union[Sequence[AgentState], AgentStateBatch]
+) -> None:
+    """Append agent states as a new chunk of a columnar archive."""
+    write_states(target, states, append=True)
+
+
+def read_columns(source: Union[PathOrBuffer, BufferLike]) -> Dict[str, np.ndarray]:
+    """
+    Read all chunks of a columnar archive into merged columns.
+
+    Args:
+        source: File path, binary buffer or raw bytes of an archive
+
+    Returns:
+        Dictionary of column name to array
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(bytes(source))
+
+    with np.load(source, allow_pickle=False) as archive:
+        if "format" not in archive.files:
+            raise ValueError("Not a columnar agent state archive")
+        version = int(archive["format"][0])
+        if version != COLUMNAR_FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format version: {version}")
+
+        # Group members by chunk prefix, keeping chunk order
+        chunks: Dict[str, Dict[str, np.ndarray]] = {}
+        for name in sorted(archive.files):
+            if "/" not in name:
+                continue
+            prefix, column = name.split("/", 1)
+            chunks.setdefault(prefix, {})[column] = archive[name]
+
+    if not chunks:
+        return states_to_columns([])
+    return _concatenate_columns([chunks[prefix] for prefix in sorted(chunks)])
+
+
+def read_states(source: Union[PathOrBuffer, BufferLike]) -> List[AgentState]:
+    """Read a columnar archive as a list of AgentState objects."""
+    return columns_to_states(read_columns(source))
+
+
+def read_batch(source: Union[PathOrBuffer, BufferLike]) -> AgentStateBatch:
+    """Read a columnar archive as an AgentStateBatch without per-row objects."""
+    return columns_to_batch(read_columns(source))
@@ -21,7 +21,7 @@ import pandas as pd
 import torch
 
 from .loss import SemanticLoss
-from .metrics import SemanticMetrics
+from .metrics import SemanticMetrics, SemanticStatistics
 
 
 class StandardizedMetrics(SemanticMetrics):
@@ -115,8 +115,12 @@ class StandardizedMetrics(SemanticMetrics):
         Returns:
             preservation_metrics: Dictionary of preservation metrics
         """
+        return self._preservation(self.statistics(original, reconstructed))
+
+    def _preservation(self, stats: SemanticStatistics) -> Dict[str, float]:
+        """Derive preservation metrics from statistics."""
         # Get similarity scores from base class
-        similarity_scores = self.compute_equivalence_scores(original, reconstructed)
+        similarity_scores = self._equivalence_scores(stats)
 
         # Group features by category and apply standard weights
         group_scores = {}
@@ -178,11 +182,15 @@ class StandardizedMetrics(SemanticMetrics):
         Returns:
             fidelity_metrics: Dictionary of fidelity metrics
         """
+        return self._fidelity(self.statistics(original, reconstructed))
+
+    def _fidelity(self, stats: SemanticStatistics) -> Dict[str, float]:
+        """Derive fidelity metrics from statistics."""
         # Combine binary accuracy, role accuracy, and numeric feature metrics
         fidelity_metrics = {}
 
         # Get binary feature metrics
-        binary_metrics = self.binary_feature_accuracy(original, reconstructed)
+        binary_metrics = self._binary_accuracies(stats)
         for feature in ["has_target", "is_alive", "threatened"]:
             if f"{feature}_accuracy" in binary_metrics:
                 fidelity_metrics[f"{feature}_fidelity"] = binary_metrics[
@@ -190,12 +198,12 @@ class StandardizedMetrics(SemanticMetrics):
                 ]
 
         # Get role accuracy
-        role_metrics = self.role_accuracy(original, reconstructed)
+        role_metrics = self._role_accuracy(stats)
         if "role_accuracy" in role_metrics:
             fidelity_metrics["role_fidelity"] = role_metrics["role_accuracy"]
 
         # Get numeric feature errors and convert to fidelity scores
-        numeric_errors = self.numeric_feature_errors(original, reconstructed)
+        numeric_errors = self._numeric_errors(stats)
         for feature in ["position", "health", "energy"]:
             error_key = f"{feature}_rmse"
             if error_key in numeric_errors:
@@ -271,8 +279,21 @@ class StandardizedMetrics(SemanticMetrics):
         Returns:
             drift_metrics: Dictionary of drift metrics
         """
-        # If no baseline provided, return zero drift
         if baseline_original is None or baseline_reconstructed is None:
+            baseline_stats = None
+        else:
+            baseline_stats = self.statistics(baseline_original, baseline_reconstructed)
+
+        return self._drift(self.statistics(original, reconstructed), baseline_stats)
+
+    def _drift(
+        self,
+        stats: SemanticStatistics,
+        baseline_stats: Optional[SemanticStatistics] = None,
+    ) -> Dict[str, float]:
+        """Derive drift metrics from current and baseline statistics."""
+        # If no baseline provided, return zero drift
+        if baseline_stats is None:
             return {
                 "overall_drift": 0.0,
                 "spatial_drift": 0.0,
@@ -283,12 +304,10 @@ class StandardizedMetrics(SemanticMetrics):
             }
 
         # Measure current preservation
-        current_preservation = self.measure_preservation(original, reconstructed)
+        current_preservation = self._preservation(stats)
 
         # Measure baseline preservation
-        baseline_preservation = self.measure_preservation(
-            baseline_original, baseline_reconstructed
-        )
+        baseline_preservation = self._preservation(baseline_stats)
 
         # Calculate drift as the difference in preservation
         drift_metrics = {}
@@ -331,13 +350,36 @@ class StandardizedMetrics(SemanticMetrics):
         Returns:
             evaluation: Dictionary of all evaluation metrics organized by category
         """
-        # Measure all metrics
-        preservation_metrics = self.measure_preservation(original, reconstructed)
-        fidelity_metrics = self.measure_fidelity(original, reconstructed)
-        drift_metrics = self.measure_drift(
-            original, reconstructed, baseline_original, baseline_reconstructed
+        # All categories are derived from one statistics pass per tensor pair
+        if baseline_original is None or baseline_reconstructed is None:
+            baseline_stats = None
+        else:
+            baseline_stats = self.statistics(baseline_original, baseline_reconstructed)
+
+        return self.evaluate_statistics(
+            self.statistics(original, reconstructed), baseline_stats
         )
 
+    def evaluate_statistics(
+        self,
+        stats: SemanticStatistics,
+        baseline_stats: Optional[SemanticStatistics] = None,
+    ) -> Dict[str, Any]:
+        """
+        Standardized evaluation from precomputed (or accumulated) statistics.
+
+        Args:
+            stats: Statistics of the comparison
+            baseline_stats: Optional baseline statistics for drift measurement
+
+        Returns:
+            evaluation: Dictionary of all evaluation metrics organized by category
+        """
+        # Measure all metrics
+        preservation_metrics = self._preservation(stats)
+        fidelity_metrics = self._fidelity(stats)
+        drift_metrics = self._drift(stats, baseline_stats)
+
         # Build comprehensive evaluation with clear categories
         evaluation = {
             "preservation": preservation_metrics,
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Memory-mapped tensor cache for prepared agent state datasets.
+
+This module provides:
+1. A raw float32 .npy cache of the encoded [N, 15] feature matrix
+2. A small JSON header with schema version, source hash, query parameters
+   and train/validation split indices
+3. Zero-copy loading through np.load(mmap_mode=...) and torch.from_numpy
+4. Automatic invalidation when the source database or query changes
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import torch
+
+# Bump when the encoded feature layout or header format changes
+CACHE_SCHEMA_VERSION = 1
+
+# Number of bytes hashed from each end of a source file
+_FINGERPRINT_BLOCK_SIZE = 1 << 20
+
+
+def source_fingerprint(path: Union[str, Path]) -> str:
+    """
+    Compute a cheap fingerprint of a source file.
+
+    Hashes the file size, modification time and the first and last
+    megabyte, so multi-gigabyte databases are fingerprinted without
+    reading them in full.
+
+    Args:
+        path: Path to the source file (e.g. simulation.db)
+
+    Returns:
+        Hex digest identifying the current file contents
+    """
+    path = Path(path)
+    stat = path.stat()
+
+    digest = hashlib.sha256()
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(path, "rb") as f:
+        digest.update(f.read(_FINGERPRINT_BLOCK_SIZE))
+        if stat.st_size > _FINGERPRINT_BLOCK_SIZE:
+            f.seek(max(stat.st_size - _FINGERPRINT_BLOCK_SIZE, _FINGERPRINT_BLOCK_SIZE))
+            digest.update(f.read(_FINGERPRINT_BLOCK_SIZE))
+
+    return digest.hexdigest()
+
+
+def _encode_indices(indices: Union[range, Sequence[int], np.ndarray]) -> Dict[str, Any]:
+    """Encode split indices compactly, as a range when contiguous."""
+    indices = np.asarray(indices, dtype=np.int64)
+    if len(indices) == 0:
+        return {"start": 0, "stop": 0}
+    if np.array_equal(indices, np.arange(indices[0], indices[0] + len(indices))):
+        return {"start": int(indices[0]), "stop": int(indices[0] + len(indices))}
+    return {"indices": indices.tolist()}
+
+
+def _decode_indices(encoded: Dict[str, Any]) -> Union[slice, torch.Tensor]:
+    """Decode split indices to a slice (zero-copy view) or an index tensor."""
+    if "indices" in encoded:
+        return torch.tensor(encoded["indices"], dtype=torch.long)
+    return slice(encoded["start"], encoded["stop"])
+
+
+class TensorCache:
+    """On-disk cache of an encoded feature matrix and its split."""
+
+    def __init__(self, cache_dir: Union[str, Path], name: str = "agent_states"):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache files
+            name: Base name of the cache files
+        """
+        self.cache_dir = Path(cache_dir)
+        self.name = name
+
+    @property
+    def data_path(self) -> Path:
+        """Path of the raw feature matrix."""
+        return self.cache_dir / f"{self.name}.npy"
+
+    @property
+    def header_path(self) -> Path:
+        """Path of the JSON header."""
+        return self.cache_dir / f"{self.name}.json"
+
+    def read_header(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the cache header.
+
+        Returns:
+            Header dictionary, or None if the cache is missing or unreadable
+        """
+        if not self.header_path.exists() or not self.data_path.exists():
+            return None
+        try:
+            with open(self.header_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def is_valid(self, source_hash: str, query_params: Dict[str, Any]) -> bool:
+        """
+        Check whether the cache matches the given source and query.
+
+        Args:
+            source_hash: Fingerprint of the data source
+            query_params: Parameters used to select and split the data
+
+        Returns:
+            True if the cache can be used as-is
+        """
+        header = self.read_header()
+        if header is None:
+            return False
+
+        # Round-trip through JSON so tuples and lists compare equal
+        query_params = json.loads(json.dumps(query_params))
+        return (
+            header.get("schema_version") == CACHE_SCHEMA_VERSION
+            and header.get("source_hash") == source_hash
+            and header.get("query_params") == query_params
+        )
+
+    def save(
+        self,
+        features: Union[torch.Tensor, np.ndarray],
+        source_hash: str,
+        query_params: Dict[str, Any],
+        train_indices: Union[range, Sequence[int], np.ndarray],
+        val_indices: Union[range, Sequence[int], np.ndarray],
+    ) -> Dict[str, Any]:
+        """
+        Write the feature matrix and header.
+
+        Both files are written to temporary names and renamed into place,
+        header last, so a partially written cache is never considered valid.
+
+        Args:
+            features: Encoded feature matrix of shape [N, D]
+            source_hash: Fingerprint of the data source
+            query_params: Parameters used to select and split the data
+            train_indices: Row indices of the training split
+            val_indices: Row indices of the validation split
+
+        Returns:
+            The written header
+        """
+        if isinstance(features, torch.Tensor):
+            features = features.detach().cpu().numpy()
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        if features.ndim != 2:
+            raise ValueError(f"Expected a 2D feature matrix, got shape {features.shape}")
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Invalidate the old cache before touching the data file
+        if self.header_path.exists():
+            self.header_path.unlink()
+
+        tmp_data_path = self.data_path.with_suffix(".npy.tmp")
+        with open(tmp_data_path, "wb") as f:
+            np.save(f, features)
+        os.replace(tmp_data_path, self.data_path)
+
+        header = {
+            "schema_version": CACHE_SCHEMA_VERSION,
+            "source_hash": source_hash,
+            "query_params": json.loads(json.dumps(query_params)),
+            "shape": list(features.shape),
+            "dtype": "float32",
+            "train": _encode_indices(train_indices),
+            "val": _encode_indices(val_indices),
+        }
+        tmp_header_path = self.header_path.with_suffix(".json.tmp")
+        with open(tmp_header_path, "w") as f:
+            json.dump(header, f, indent=2)
+        os.replace(tmp_header_path, self.header_path)
+
+        return header
+
+    def load(self) -> Tuple[torch.Tensor, Dict[str, Any]]:
+        """
+        Load the cached feature matrix without copying it into memory.
+
+        The file is mapped copy-on-write, so the returned tensor shares pages
+        with the file and in-place edits never reach the cache on disk.
+
+        Returns:
+            Tuple of (feature tensor, header)
+        """
+        header = self.read_header()
+        if header is None:
+            raise FileNotFoundError(f"No valid tensor cache at {self.cache_dir}")
+
+        features = np.load(self.data_path, mmap_mode="c")
+        if list(features.shape) != header["shape"]:
+            raise ValueError(
+                f"Cache shape {features.shape} does not match header {header['shape']}"
+            )
+
+        return torch.from_numpy(features), header
+
+    def load_split(self) -> Tuple[torch.Tensor, torch.Tensor, Dict[str, Any]]:
+        """
+        Load the cached train and validation feature matrices.
+
+        Contiguous splits are returned as views of the memory map.
+
+        Returns:
+            Tuple of (train features, validation features, header)
+        """
+        features, header = self.load()
+        train = features[_decode_indices(header["train"])]
+        val = features[_decode_indices(header["val"])]
+        return train, val, header
+
+    def get_or_build(
+        self,
+        source_hash: str,
+        query_params: Dict[str, Any],
+        build_fn: Callable[[], Tuple[torch.Tensor, Sequence[int], Sequence[int]]],
+    ) -> Tuple[torch.Tensor, torch.Tensor, Dict[str, Any]]:
+        """
+        Load the cached split, rebuilding it first if the source changed.
+
+        Args:
+            source_hash: Fingerprint of the data source
+            query_params: Parameters used to select and split the data
+            build_fn: Callable returning (features, train_indices, val_indices)
+
+        Returns:
+            Tuple of (train features, validation features, header)
+        """
+        if not self.is_valid(source_hash, query_params):
+            features, train_indices, val_indices = build_fn()
+            self.save(features, source_hash, query_params, train_indices, val_indices)
+        return self.load_split()
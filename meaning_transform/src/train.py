@@ -9,36 +9,111 @@ This module defines:
 2. Logging and checkpointing
 3. Semantic drift tracking
 4. Graph-based training support
+5. On-device accumulation of per-batch loss metrics
+6. Mixed-precision and torch.compile execution modes
+7. Per-epoch hooks for schedulers that adjust or stop training
 """
 
+import contextlib
+import inspect
 import json
 import os
 import shutil
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
 import torch
 import torch.optim as optim
 from torch.optim.lr_scheduler import CosineAnnealingLR, StepLR
+from torch.utils.data import DataLoader
 from torch_geometric.data import Batch, Data
 import pandas as pd
 
+from .checkpoint_writer import CheckpointWriter
 from .config import Config
-from .data import AgentState, AgentStateDataset
+from .data import AgentState, AgentStateBatch, AgentStateDataset
 from .graph_model import GraphVAELoss
 from .loss import CombinedLoss
 from .metrics import DriftTracker, generate_t_sne_visualization
 from .models import MeaningVAE
 from .standardized_metrics import StandardizedMetrics
+from .tensor_cache import TensorCache, source_fingerprint
+
+
+class LossAccumulator:
+    """
+    Running sums of loss components kept on the training device.
+
+    Adding a batch does not synchronize with the device; ``compute`` copies
+    all averages to the host in a single transfer.
+    """
+
+    def __init__(self, keys: List[str], device: Union[str, torch.device] = "cpu"):
+        """
+        Initialize the accumulator.
+
+        Args:
+            keys: Names of the loss components to accumulate
+            device: Device holding the running sums
+        """
+        self.keys = list(keys)
+        self.device = torch.device(device)
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero the running sums."""
+        self.sums = torch.zeros(len(self.keys), device=self.device)
+        self.count = 0
+
+    def update(self, values: Dict[str, Any]) -> None:
+        """
+        Add one batch of loss components.
+
+        Args:
+            values: Loss dictionary; missing components count as zero
+        """
+        components = []
+        for key in self.keys:
+            value = values.get(key)
+            if isinstance(value, torch.Tensor):
+                value = value.detach().reshape(()).to(self.device, torch.float32)
+            else:
+                value = torch.tensor(
+                    float(value or 0.0), dtype=torch.float32, device=self.device
+                )
+            components.append(value)
+
+        self.sums += torch.stack(components)
+        self.count += 1
+
+    def compute(self) -> Dict[str, float]:
+        """
+        Average each component over the batches added since the last reset.
+
+        Returns:
+            averages: Mean value per key
+        """
+        averages = (self.sums / max(self.count, 1)).tolist()
+        return dict(zip(self.keys, averages))
 
 
 class Trainer:
     """Training infrastructure for the meaning-preserving transformation system."""
 
+    # Loss components averaged into the train_*/val_* epoch metrics
+    LOSS_COMPONENTS = [
+        "loss",
+        "recon_loss",
+        "kl_loss",
+        "semantic_loss",
+        "compression_loss",
+        "edge_loss",
+    ]
+
     def __init__(self, config: Config, device: str = None):
         """
         Initialize trainer.
@@ -90,36 +165,12 @@ class Trainer:
                 semantic_loss_weight=self.config.training.semantic_loss_weight,
             )
 
-        # Create optimizer
-        if self.config.training.optimizer == "adam":
-            self.optimizer = optim.Adam(
-                self.model.parameters(),
-                lr=self.config.training.learning_rate,
-                weight_decay=self.config.training.weight_decay,
-            )
-        elif self.config.training.optimizer == "sgd":
-            self.optimizer = optim.SGD(
-                self.model.parameters(),
-                lr=self.config.training.learning_rate,
-                weight_decay=self.config.training.weight_decay,
-                momentum=0.9,
-            )
-        else:
-            raise ValueError(f"Unsupported optimizer: {self.config.training.optimizer}")
+        # Create optimizer and learning rate scheduler
+        self.optimizer = self._create_optimizer(self.model.parameters())
+        self.scheduler = self._create_scheduler()
 
-        # Create learning rate scheduler
-        if self.config.training.scheduler == "cosine":
-            self.scheduler = CosineAnnealingLR(
-                self.optimizer, T_max=self.config.training.num_epochs
-            )
-        elif self.config.training.scheduler == "step":
-            self.scheduler = StepLR(
-                self.optimizer,
-                step_size=self.config.training.scheduler_step_size,
-                gamma=self.config.training.scheduler_gamma,
-            )
-        else:
-            self.scheduler = None
+        # Configure precision and compilation
+        self._configure_execution()
 
         # Create checkpoint directory
         self.checkpoint_dir = Path(self.config.training.checkpoint_dir)
@@ -132,12 +183,20 @@ class Trainer:
         self.best_val_loss = float("inf")
         self.patience_counter = 0
 
+        # Callbacks run around each epoch (see register_hook)
+        self.hooks: Dict[str, List[Callable]] = {"pre_epoch": [], "post_epoch": []}
+
         # Create timestamped experiment directory
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.experiment_name = f"{self.config.experiment_name}_{timestamp}"
         self.experiment_dir = self.checkpoint_dir / self.experiment_name
         self.experiment_dir.mkdir(parents=True, exist_ok=True)
 
+        # Checkpoints are written in the background; retention is skipped in debug mode
+        self.checkpoint_writer = CheckpointWriter(
+            self.experiment_dir, keep_every=10, keep_last=5, cleanup=not self.config.debug
+        )
+
         # Initialize semantic metrics and drift tracker
         self.drift_tracker = DriftTracker(
             log_dir=str(self.experiment_dir / "drift_tracking")
@@ -153,6 +212,171 @@ class Trainer:
         # Save config
         self.save_config()
 
+    def register_hook(self, event: str, hook: Callable) -> None:
+        """
+        Register a callback run by ``train`` around each epoch.
+
+        Events:
+            "pre_epoch": ``hook(trainer, epoch)`` before the epoch is trained
+            "post_epoch": ``hook(trainer, epoch, metrics)`` after validation,
+                drift tracking and checkpointing, where ``metrics`` holds the
+                train_*/val_* losses and the epoch's drift metrics. Returning
+                True stops training after this epoch.
+
+        Args:
+            event: "pre_epoch" or "post_epoch"
+            hook: Callback to run
+        """
+        if event not in self.hooks:
+            raise ValueError(f"Unsupported hook event: {event}")
+        self.hooks[event].append(hook)
+
+    def _create_optimizer(self, parameters) -> optim.Optimizer:
+        """
+        Create the configured optimizer.
+
+        Args:
+            parameters: Parameters to optimize
+
+        Returns:
+            optimizer: Adam or SGD optimizer
+        """
+        if self.config.training.optimizer == "adam":
+            adam_kwargs = {}
+            if getattr(self.config.training, "fused_optimizer", False):
+                if self._fused_adam_supported():
+                    adam_kwargs["fused"] = True
+                else:
+                    print(
+                        f"Warning: fused Adam is not available on {self.device.type}; "
+                        "using the default implementation"
+                    )
+            return optim.Adam(
+                parameters,
+                lr=self.config.training.learning_rate,
+                weight_decay=self.config.training.weight_decay,
+                **adam_kwargs,
+            )
+        elif self.config.training.optimizer == "sgd":
+            return optim.SGD(
+                parameters,
+                lr=self.config.training.learning_rate,
+                weight_decay=self.config.training.weight_decay,
+                momentum=0.9,
+            )
+        else:
+            raise ValueError(f"Unsupported optimizer: {self.config.training.optimizer}")
+
+    def _create_scheduler(self):
+        """
+        Create the configured learning rate scheduler for ``self.optimizer``.
+
+        Returns:
+            scheduler: Cosine or step scheduler, or None
+        """
+        if self.config.training.scheduler == "cosine":
+            return CosineAnnealingLR(
+                self.optimizer, T_max=self.config.training.num_epochs
+            )
+        elif self.config.training.scheduler == "step":
+            return StepLR(
+                self.optimizer,
+                step_size=self.config.training.scheduler_step_size,
+                gamma=self.config.training.scheduler_gamma,
+            )
+        return None
+
+    def _fused_adam_supported(self) -> bool:
+        """Whether this torch build offers fused Adam for the training device."""
+        if "fused" not in inspect.signature(optim.Adam).parameters:
+            return False
+        if self.device.type == "cuda":
+            return True
+        # CPU fused kernels arrived later than the fused flag itself (torch 2.4)
+        version = tuple(int(v) for v in torch.__version__.split("+")[0].split(".")[:2])
+        return self.device.type == "cpu" and version >= (2, 4)
+
+    def _configure_execution(self):
+        """
+        Set up autocast, gradient scaling and compiled forward/loss callables.
+
+        Unsupported combinations fall back instead of failing: fp16 autocast on
+        CPU runs in bf16 (CPU autocast supports it and needs no GradScaler),
+        autocast is disabled on devices without it, and torch.compile is skipped
+        when unavailable. Falling back to fp32 eager keeps numerics testable.
+        """
+        precision = getattr(self.config.training, "precision", "fp32")
+        dtypes = {"fp32": None, "bf16": torch.bfloat16, "fp16": torch.float16}
+        if precision not in dtypes:
+            raise ValueError(f"Unsupported precision: {precision}")
+
+        self.autocast_dtype = dtypes[precision]
+        if self.autocast_dtype is not None and self.device.type not in ("cuda", "cpu"):
+            print(f"Warning: autocast is not supported on {self.device.type}; using fp32")
+            self.autocast_dtype = None
+        elif self.autocast_dtype == torch.float16 and self.device.type == "cpu":
+            print("Warning: fp16 autocast is not supported on CPU; using bf16")
+            self.autocast_dtype = torch.bfloat16
+
+        # Loss scaling only matters for fp16 gradients on CUDA
+        use_scaler = self.autocast_dtype == torch.float16
+        if hasattr(torch.amp, "GradScaler"):
+            self.scaler = torch.amp.GradScaler(self.device.type, enabled=use_scaler)
+        else:
+            self.scaler = torch.cuda.amp.GradScaler(enabled=use_scaler)
+
+        # Compiled callables share parameters with self.model and self.loss_fn,
+        # so checkpoints keep the uncompiled state_dict keys
+        self._compiled_model = None
+        self._compiled_loss = None
+        if getattr(self.config.training, "compile", False):
+            if hasattr(torch, "compile"):
+                self._compiled_model = torch.compile(self.model)
+                self._compiled_loss = torch.compile(self.loss_fn)
+            else:
+                print("Warning: torch.compile is not available; running eagerly")
+
+    @property
+    def forward_fn(self) -> Callable:
+        """Model forward used for training and validation (compiled if configured)."""
+        return self._compiled_model if self._compiled_model is not None else self.model
+
+    @property
+    def compute_loss(self) -> Callable:
+        """Loss used for training and validation (compiled if configured)."""
+        return self._compiled_loss if self._compiled_loss is not None else self.loss_fn
+
+    def _autocast(self):
+        """Autocast context for the configured precision (no-op for fp32)."""
+        if self.autocast_dtype is None:
+            return contextlib.nullcontext()
+        return torch.autocast(device_type=self.device.type, dtype=self.autocast_dtype)
+
+    def _float_outputs(self, results: Any) -> Any:
+        """
+        Cast reduced-precision model outputs back to float32 for the loss.
+
+        The loss runs outside autocast: CUDA autocast rejects ops such as
+        ``F.binary_cross_entropy``, and losses are more stable in float32.
+
+        Args:
+            results: Model outputs (tensors, or dicts/lists/tuples of them)
+
+        Returns:
+            results: The same structure with floating point tensors in float32
+        """
+        if self.autocast_dtype is None:
+            return results
+        if isinstance(results, torch.Tensor):
+            return results.float() if results.is_floating_point() else results
+        if isinstance(results, dict):
+            return type(results)(
+                (key, self._float_outputs(value)) for key, value in results.items()
+            )
+        if isinstance(results, (list, tuple)):
+            return type(results)(self._float_outputs(value) for value in results)
+        return results
+
     def save_config(self):
         """Save configuration to JSON file."""
         config_dict = {
@@ -196,14 +420,23 @@ class Trainer:
 
     def prepare_data(self):
         """Prepare training and validation datasets."""
-        if self.train_dataset is not None and self.val_dataset is not None:
+        if (
+            getattr(self, "train_dataset", None) is not None
+            and getattr(self, "val_dataset", None) is not None
+        ):
             return  # Data already prepared
 
+        # Check if simulation.db exists and use it if available
+        db_path = "simulation.db"
+
+        # Reuse the memory-mapped tensor cache when it matches the source
+        cache_dir = getattr(self.config.data, "cache_dir", None)
+        if cache_dir and self._load_cached_data(cache_dir, db_path):
+            return
+
         # Generate or load agent states
         dataset = AgentStateDataset(batch_size=self.config.training.batch_size)
 
-        # Check if simulation.db exists and use it if available
-        db_path = "simulation.db"
         if os.path.exists(db_path):
             if self.config.debug:
                 print(f"Loading agent states from {db_path}...")
@@ -243,6 +476,23 @@ class Trainer:
 
         # Set aside a small set of states for tracking semantic drift
         self.drift_tracking_states = val_states[: min(10, len(val_states))]
+        self.drift_tracking_tensor = None
+
+        # Write the encoded split to the tensor cache for later runs
+        # (empty splits have no states_tensor)
+        split_tensors = [
+            split.states_tensor
+            for split in (self.train_dataset, self.val_dataset)
+            if split.states_tensor is not None
+        ]
+        if cache_dir and split_tensors:
+            TensorCache(cache_dir).save(
+                torch.cat(split_tensors),
+                self._data_source_hash(db_path),
+                self._data_query_params(db_path),
+                train_indices=range(train_size),
+                val_indices=range(train_size, total_states),
+            )
 
         # If using graph-based representation, prepare graph versions as well
         if self.use_graph:
@@ -262,6 +512,116 @@ class Trainer:
                 print(f"Warning: Could not create graph representations: {e}")
                 self.drift_tracking_graphs = None
 
+    def _data_source_hash(self, db_path: str) -> str:
+        """Fingerprint of the data source used for cache invalidation."""
+        if os.path.exists(db_path):
+            return source_fingerprint(db_path)
+        return f"synthetic:{self.config.seed}"
+
+    def _data_query_params(self, db_path: str) -> Dict[str, Any]:
+        """Parameters that determine which states end up in each split."""
+        return {
+            "db_path": os.path.abspath(db_path) if os.path.exists(db_path) else None,
+            "num_states": self.config.data.num_states,
+            "validation_split": self.config.data.validation_split,
+            "seed": self.config.seed,
+        }
+
+    def _load_cached_data(self, cache_dir: str, db_path: str) -> bool:
+        """
+        Load train and validation datasets from the tensor cache.
+
+        Args:
+            cache_dir: Directory holding the tensor cache
+            db_path: Path to the source database
+
+        Returns:
+            True if the datasets were loaded from a valid cache
+        """
+        cache = TensorCache(cache_dir)
+        if not cache.is_valid(
+            self._data_source_hash(db_path), self._data_query_params(db_path)
+        ):
+            return False
+
+        train_tensor, val_tensor, _ = cache.load_split()
+        batch_size = self.config.training.batch_size
+        self.train_dataset = AgentStateDataset.from_tensor(train_tensor, batch_size)
+        self.val_dataset = AgentStateDataset.from_tensor(val_tensor, batch_size)
+
+        if self.config.debug:
+            print(f"Loaded cached tensors from {cache.data_path}")
+            print(f"Training set: {len(self.train_dataset)} states")
+            print(f"Validation set: {len(self.val_dataset)} states")
+
+        # Set aside a small set of states for tracking semantic drift, keeping
+        # the exact cached encodings so drift is measured against them
+        num_drift_states = min(10, len(val_tensor))
+        self.drift_tracking_states = self.val_dataset.states[:num_drift_states]
+        self.drift_tracking_tensor = val_tensor[:num_drift_states]
+
+        if self.use_graph:
+            try:
+                self.drift_tracking_graphs = [
+                    state.to_torch_geometric() for state in self.drift_tracking_states
+                ]
+            except Exception as e:
+                print(f"Warning: Could not create graph representations: {e}")
+                self.drift_tracking_graphs = None
+
+        return True
+
+    @property
+    def _pin_memory(self) -> bool:
+        """Whether host batches are pinned for asynchronous device copies."""
+        return (
+            getattr(self.config.training, "pin_memory", False)
+            and self.device.type == "cuda"
+        )
+
+    def _get_dataloader(self, split: str) -> DataLoader:
+        """
+        Get the DataLoader for a dataset split, creating it on first use.
+
+        Loaders are rebuilt when the split's dataset object is replaced.
+        Full batches only are used (as in the original fixed batch count)
+        unless the split is smaller than one batch.
+
+        Args:
+            split: "train" or "val"
+
+        Returns:
+            DataLoader over the split
+        """
+        dataset = self.train_dataset if split == "train" else self.val_dataset
+        if not hasattr(self, "_dataloaders"):
+            self._dataloaders = {}
+
+        cached = self._dataloaders.get(split)
+        if cached is not None and cached[0] is dataset:
+            return cached[1]
+
+        batch_size = self.config.training.batch_size
+        num_workers = getattr(self.config.training, "num_workers", 0)
+
+        # Seeded generator so the shuffle order is reproducible
+        generator = torch.Generator()
+        generator.manual_seed(self.config.seed)
+
+        loader = dataset.get_dataloader(
+            batch_size=batch_size,
+            shuffle=split == "train",
+            drop_last=len(dataset) >= batch_size,
+            num_workers=num_workers,
+            pin_memory=self._pin_memory,
+            prefetch_factor=getattr(self.config.training, "prefetch_factor", 2),
+            persistent_workers=num_workers > 0,
+            graph=self.use_graph,
+            generator=generator,
+        )
+        self._dataloaders[split] = (dataset, loader)
+        return loader
+
     def train_epoch(self) -> Dict[str, float]:
         """
         Train model for one epoch.
@@ -271,86 +631,40 @@ class Trainer:
         """
         self.model.train()
 
-        # Track metrics
-        total_loss = 0.0
-        recon_loss_total = 0.0
-        kl_loss_total = 0.0
-        semantic_loss_total = 0.0
-        compression_loss_total = 0.0
-        edge_loss_total = 0.0  # For graph models
-        num_batches = 0
-
-        # Shuffle at the start of each epoch
-        random_idx = torch.randperm(len(self.train_dataset.states))
-        self.train_dataset.states = [self.train_dataset.states[i] for i in random_idx]
-
-        # Reset dataset index
-        self.train_dataset._current_idx = 0
-
-        # Calculate number of batches
-        num_total_batches = (
-            len(self.train_dataset.states) // self.config.training.batch_size
-        )
-        if num_total_batches <= 0:
-            num_total_batches = 1  # Ensure at least one batch
+        # Track metrics on the device; losses reach the host once per epoch
+        accumulator = LossAccumulator(self.LOSS_COMPONENTS, self.device)
+        log_interval = getattr(self.config.training, "log_interval", 10)
+
+        # Indices are reshuffled by the loader's sampler at the start of each epoch
+        train_loader = self._get_dataloader("train")
+        num_total_batches = len(train_loader)
 
         start_time = time.time()
 
-        # Change from while loop to for loop with fixed iterations
-        for batch_idx in range(num_total_batches):
-            # Get batch - either graph or tensor based on configuration
-            if self.use_graph:
-                batch = self.train_dataset.get_graph_batch()
-            else:
-                batch = self.train_dataset.get_batch()
-
-            # Move batch to device
-            if isinstance(batch, (Data, Batch)):
-                # Graph data needs special handling to move to device
-                batch = batch.to(self.device)
-            else:
-                # Standard tensor data
-                batch = batch.to(self.device)
+        for batch_idx, batch in enumerate(train_loader):
+            # Move batch to device (graph and tensor batches both support .to)
+            batch = batch.to(self.device, non_blocking=self._pin_memory)
 
             # Forward pass
             self.optimizer.zero_grad()
-            results = self.model(batch)
+            with self._autocast():
+                results = self.forward_fn(batch)
 
-            # Compute loss
-            if self.use_graph:
-                # Graph-specific loss calculation
-                loss_results = self.loss_fn(results, batch)
-            else:
-                # Standard tensor loss calculation
-                loss_results = self.loss_fn(results, batch)
+            # Compute loss in float32 (GraphVAELoss for graph models, CombinedLoss otherwise)
+            loss_results = self.compute_loss(self._float_outputs(results), batch)
 
             loss = loss_results["loss"]
 
-            # Backward pass
-            loss.backward()
-            self.optimizer.step()
+            # Backward pass (the scaler is a pass-through unless training in fp16)
+            self.scaler.scale(loss).backward()
+            self.scaler.step(self.optimizer)
+            self.scaler.update()
 
             # Update metrics
-            total_loss += loss.item()
-
-            # Standard metrics
-            if "recon_loss" in loss_results:
-                recon_loss_total += loss_results["recon_loss"].item()
-            if "kl_loss" in loss_results:
-                kl_loss_total += loss_results["kl_loss"].item()
-            if "semantic_loss" in loss_results:
-                semantic_loss_total += loss_results["semantic_loss"].item()
-            if "compression_loss" in loss_results:
-                compression_loss_total += loss_results["compression_loss"].item()
-
-            # Graph-specific metrics
-            if "edge_loss" in loss_results:
-                edge_loss_total += loss_results["edge_loss"].item()
-
-            num_batches += 1
-
-            # Progress update
-            if self.config.verbose and batch_idx % 10 == 0:
+            accumulator.update(loss_results)
+
+            # Progress update (the only per-batch host sync)
+            if self.config.verbose and log_interval and batch_idx % log_interval == 0:
                 elapsed = time.time() - start_time
                 progress = (batch_idx + 1) / num_total_batches
                 remaining = elapsed / progress - elapsed if progress > 0 else 0
@@ -363,20 +677,7 @@ class Trainer:
                     f"Remaining: {remaining:.0f}s"
                 )
 
-        # Compute average metrics
-        metrics = {
-            "train_loss": total_loss / num_batches,
-            "train_recon_loss": recon_loss_total / num_batches,
-            "train_kl_loss": kl_loss_total / num_batches,
-            "train_semantic_loss": semantic_loss_total / num_batches,
-            "train_compression_loss": compression_loss_total / num_batches,
-        }
-
-        # Add graph-specific metrics if available
-        if self.use_graph:
-            metrics["train_edge_loss"] = edge_loss_total / num_batches
-
-        return metrics
+        return self._epoch_metrics("train", accumulator.compute())
 
     def validate(self) -> Dict[str, float]:
         """
@@ -387,86 +688,51 @@ class Trainer:
         """
         self.model.eval()
 
-        # Track metrics
-        total_loss = 0.0
-        recon_loss_total = 0.0
-        kl_loss_total = 0.0
-        semantic_loss_total = 0.0
-        compression_loss_total = 0.0
-        edge_loss_total = 0.0  # For graph models
-        num_batches = 0
-
-        # Reset dataset index
-        self.val_dataset._current_idx = 0
-
-        # Calculate number of batches
-        num_total_batches = (
-            len(self.val_dataset.states) // self.config.training.batch_size
-        )
-        if num_total_batches <= 0:
-            num_total_batches = 1  # Ensure at least one batch
-
-        with torch.no_grad():
-            # Change from while loop to for loop with fixed iterations
-            for _ in range(num_total_batches):
-                # Get batch - either graph or tensor based on configuration
-                if self.use_graph:
-                    batch = self.val_dataset.get_graph_batch()
-                else:
-                    batch = self.val_dataset.get_batch()
-
-                # Move batch to device
-                if isinstance(batch, (Data, Batch)):
-                    # Graph data needs special handling to move to device
-                    batch = batch.to(self.device)
-                else:
-                    # Standard tensor data
-                    batch = batch.to(self.device)
+        # Track metrics on the device; losses reach the host once per epoch
+        accumulator = LossAccumulator(self.LOSS_COMPONENTS, self.device)
 
-                # Forward pass
-                results = self.model(batch)
+        val_loader = self._get_dataloader("val")
 
-                # Compute loss
-                if self.use_graph:
-                    # Graph-specific loss calculation
-                    loss_results = self.loss_fn(results, batch)
-                else:
-                    # Standard tensor loss calculation
-                    loss_results = self.loss_fn(results, batch)
+        with torch.no_grad():
+            for batch in val_loader:
+                # Move batch to device (graph and tensor batches both support .to)
+                batch = batch.to(self.device, non_blocking=self._pin_memory)
 
-                loss = loss_results["loss"]
+                # Forward pass under autocast, loss in float32
+                with self._autocast():
+                    results = self.forward_fn(batch)
+                loss_results = self.compute_loss(self._float_outputs(results), batch)
 
                 # Update metrics
-                total_loss += loss.item()
-
-                # Standard metrics
-                if "recon_loss" in loss_results:
-                    recon_loss_total += loss_results["recon_loss"].item()
-                if "kl_loss" in loss_results:
-                    kl_loss_total += loss_results["kl_loss"].item()
-                if "semantic_loss" in loss_results:
-                    semantic_loss_total += loss_results["semantic_loss"].item()
-                if "compression_loss" in loss_results:
-                    compression_loss_total += loss_results["compression_loss"].item()
+                accumulator.update(loss_results)
 
-                # Graph-specific metrics
-                if "edge_loss" in loss_results:
-                    edge_loss_total += loss_results["edge_loss"].item()
+        return self._epoch_metrics("val", accumulator.compute())
+
+    def _epoch_metrics(
+        self, prefix: str, averages: Dict[str, float]
+    ) -> Dict[str, float]:
+        """
+        Name an epoch's averaged losses as epoch metrics.
 
-                num_batches += 1
+        Args:
+            prefix: Metric name prefix ("train" or "val")
+            averages: Average loss components from ``LossAccumulator.compute``
 
-        # Compute average metrics
+        Returns:
+            metrics: Average loss components keyed as ``{prefix}_loss``,
+                ``{prefix}_recon_loss``, ...
+        """
         metrics = {
-            "val_loss": total_loss / num_batches,
-            "val_recon_loss": recon_loss_total / num_batches,
-            "val_kl_loss": kl_loss_total / num_batches,
-            "val_semantic_loss": semantic_loss_total / num_batches,
-            "val_compression_loss": compression_loss_total / num_batches,
+            f"{prefix}_loss": averages["loss"],
+            f"{prefix}_recon_loss": averages["recon_loss"],
+            f"{prefix}_kl_loss": averages["kl_loss"],
+            f"{prefix}_semantic_loss": averages["semantic_loss"],
+            f"{prefix}_compression_loss": averages["compression_loss"],
         }
 
         # Add graph-specific metrics if available
         if self.use_graph:
-            metrics["val_edge_loss"] = edge_loss_total / num_batches
+            metrics[f"{prefix}_edge_loss"] = averages["edge_loss"]
 
         return metrics
 
@@ -497,6 +763,36 @@ class Trainer:
             
         return drift_metrics
 
+    def _drift_metrics(
+        self, originals: torch.Tensor, reconstructions: torch.Tensor
+    ) -> Dict[str, Any]:
+        """
+        Summarize standardized drift metrics for one set of reconstructions.
+
+        Args:
+            originals: Original state tensors
+            reconstructions: Reconstructed state tensors
+
+        Returns:
+            drift_metrics: Overall drift, preservation, fidelity, drift category
+                and the feature group drifts that are available
+        """
+        evaluation_results = self.semantic_metrics.evaluate(originals, reconstructions)
+
+        drift_metrics = {
+            "overall_drift": evaluation_results["drift"]["overall_drift"],
+            "preservation": evaluation_results["preservation"]["overall_preservation"],
+            "fidelity": evaluation_results["fidelity"]["overall_fidelity"],
+            "drift_category": evaluation_results["drift"]["drift_category"],
+        }
+
+        # Feature group specific metrics
+        for group in ["spatial", "resources", "performance", "role"]:
+            if f"{group}_drift" in evaluation_results["drift"]:
+                drift_metrics[f"{group}_drift"] = evaluation_results["drift"][f"{group}_drift"]
+
+        return drift_metrics
+
     def _track_tensor_semantic_drift(self):
         """Track semantic drift using tensor representation."""
         if not self.drift_tracking_states:
@@ -505,42 +801,19 @@ class Trainer:
         # Set model to evaluation mode
         self.model.eval()
 
-        # Lists to store batch inputs and outputs
-        original_tensors = []
-        reconstructed_tensors = []
-
-        # Process all drift tracking states
+        # Encode all drift tracking states at once and run a single forward pass
+        originals = getattr(self, "drift_tracking_tensor", None)
+        if originals is None:
+            originals = AgentStateBatch.from_states(self.drift_tracking_states).to_tensor()
         with torch.no_grad():
-            for state in self.drift_tracking_states:
-                x = state.to_tensor().unsqueeze(0).to(self.device)
-                model_output = self.model(x)
-                x_reconstructed = model_output["reconstruction"]
-
-                # Store the original and reconstructed tensors
-                original_tensors.append(x.cpu())
-                reconstructed_tensors.append(x_reconstructed.cpu())
+            model_output = self.model(originals.to(self.device))
+            reconstructions = model_output["reconstruction"].cpu()
 
-        # Combine into batches
-        if original_tensors and reconstructed_tensors:
-            originals = torch.cat(original_tensors, dim=0)
-            reconstructions = torch.cat(reconstructed_tensors, dim=0)
+        if len(originals) > 0:
 
             # Use standardized metrics for comprehensive evaluation
-            evaluation_results = self.semantic_metrics.evaluate(originals, reconstructions)
-            
-            # Log the main metrics
-            drift_metrics = {
-                "overall_drift": evaluation_results["drift"]["overall_drift"],
-                "preservation": evaluation_results["preservation"]["overall_preservation"],
-                "fidelity": evaluation_results["fidelity"]["overall_fidelity"],
-                "drift_category": evaluation_results["drift"]["drift_category"],
-            }
-
-            # Log feature group specific metrics
-            for group in ["spatial", "resources", "performance", "role"]:
-                if f"{group}_drift" in evaluation_results["drift"]:
-                    drift_metrics[f"{group}_drift"] = evaluation_results["drift"][f"{group}_drift"]
-                    
+            drift_metrics = self._drift_metrics(originals, reconstructions)
+
             # Add to drift tracking history
             self.semantic_drift_history.append(drift_metrics)
             
@@ -595,21 +868,8 @@ class Trainer:
             reconstructed_tensors = torch.stack([g.x for g in reconstructed_graphs])
             
             # Use the same standardized metrics for evaluation
-            evaluation_results = self.semantic_metrics.evaluate(original_tensors, reconstructed_tensors)
-            
-            # Log the main metrics
-            drift_metrics = {
-                "overall_drift": evaluation_results["drift"]["overall_drift"],
-                "preservation": evaluation_results["preservation"]["overall_preservation"],
-                "fidelity": evaluation_results["fidelity"]["overall_fidelity"],
-                "drift_category": evaluation_results["drift"]["drift_category"],
-            }
-
-            # Log feature group specific metrics
-            for group in ["spatial", "resources", "performance", "role"]:
-                if f"{group}_drift" in evaluation_results["drift"]:
-                    drift_metrics[f"{group}_drift"] = evaluation_results["drift"][f"{group}_drift"]
-            
+            drift_metrics = self._drift_metrics(original_tensors, reconstructed_tensors)
+
             # Additional graph-specific metrics (edge preservation, etc.)
             # Could be implemented here
             
@@ -626,82 +886,46 @@ class Trainer:
         return {}
 
     def save_checkpoint(
-        self, epoch: int, metrics: Dict[str, float], is_best: bool = False
+        self,
+        epoch: int,
+        metrics: Dict[str, float],
+        is_best: bool = False,
+        blocking: bool = True,
     ):
         """
         Save model checkpoint.
 
+        The state is snapshotted to CPU immediately and written by
+        ``self.checkpoint_writer`` on a background thread, which also keeps
+        best_model.pt/latest_model.pt linked and applies checkpoint retention.
+
         Args:
             epoch: Current epoch
             metrics: Dictionary of metrics
             is_best: Whether this is the best model so far
+            blocking: Wait until the checkpoint is on disk
         """
         checkpoint = {
             "epoch": epoch,
             "model_state_dict": self.model.state_dict(),
             "optimizer_state_dict": self.optimizer.state_dict(),
             "metrics": metrics,
+            "train_losses": self.train_losses,
+            "val_losses": self.val_losses,
+            "semantic_drift_history": self.semantic_drift_history,
+            "best_val_loss": self.best_val_loss,
+            "patience_counter": self.patience_counter,
         }
 
         if self.scheduler is not None:
             checkpoint["scheduler_state_dict"] = self.scheduler.state_dict()
 
-        # Save checkpoint
-        checkpoint_path = self.experiment_dir / f"checkpoint_epoch_{epoch}.pt"
-        torch.save(checkpoint, checkpoint_path)
-
-        # Save as best model if applicable
-        if is_best:
-            best_path = self.experiment_dir / "best_model.pt"
-            torch.save(checkpoint, best_path)
+        if self.scaler.is_enabled():
+            checkpoint["scaler_state_dict"] = self.scaler.state_dict()
 
-        # Save the most recent model
-        latest_path = self.experiment_dir / "latest_model.pt"
-        torch.save(checkpoint, latest_path)
-
-        # Cleanup old checkpoints if needed
-        if not self.config.debug:
-            self._cleanup_checkpoints(epoch)
-
-    def _cleanup_checkpoints(self, current_epoch: int):
-        """
-        Clean up old checkpoints, keeping only the last few and checkpoints at regular intervals.
-
-        Args:
-            current_epoch: Current epoch
-        """
-        # Keep:
-        # 1. Latest checkpoint
-        # 2. Best model
-        # 3. One checkpoint every 10 epochs
-        # 4. The 5 most recent checkpoints
-
-        keep_epochs = set()
-
-        # Keep one checkpoint every 10 epochs
-        for e in range(0, current_epoch + 1, 10):
-            keep_epochs.add(e)
-
-        # Keep the 5 most recent checkpoints
-        for e in range(max(0, current_epoch - 4), current_epoch + 1):
-            keep_epochs.add(e)
-
-        # Find all checkpoint files
-        checkpoint_files = list(self.experiment_dir.glob("checkpoint_epoch_*.pt"))
-
-        for checkpoint_file in checkpoint_files:
-            # Extract epoch number from filename
-            filename = checkpoint_file.name
-            try:
-                epoch_str = filename.split("_")[-1].split(".")[0]
-                epoch = int(epoch_str)
-
-                # Remove if not in the set of epochs to keep
-                if epoch not in keep_epochs:
-                    checkpoint_file.unlink()
-            except (IndexError, ValueError):
-                # Skip files with unexpected naming
-                continue
+        self.checkpoint_writer.save(epoch, checkpoint, is_best=is_best)
+        if blocking:
+            self.checkpoint_writer.wait()
 
     def plot_training_curves(self):
         """Plot training and validation loss curves."""
@@ -842,6 +1066,25 @@ class Trainer:
         """
         Train the model.
 
+        Checkpoint writer threads are stopped when training ends, including
+        on errors, so sweeps creating many trainers do not leave idle threads.
+
+        Args:
+            resume_from: Path to checkpoint to resume from
+        """
+        try:
+            return self._train(resume_from)
+        finally:
+            self._close_checkpoint_writers()
+
+    def _close_checkpoint_writers(self) -> None:
+        """Finish queued checkpoint writes and stop the writer threads."""
+        self.checkpoint_writer.close()
+
+    def _train(self, resume_from: Optional[str] = None):
+        """
+        Run the training loop (see ``train``).
+
         Args:
             resume_from: Path to checkpoint to resume from
         """
@@ -854,6 +1097,8 @@ class Trainer:
             checkpoint = torch.load(resume_from, map_location=self.device)
             self.model.load_state_dict(checkpoint["model_state_dict"])
             self.optimizer.load_state_dict(checkpoint["optimizer_state_dict"])
+            if "scaler_state_dict" in checkpoint and self.scaler.is_enabled():
+                self.scaler.load_state_dict(checkpoint["scaler_state_dict"])
             start_epoch = checkpoint["epoch"] + 1
             self.train_losses = checkpoint["train_losses"]
             self.val_losses = checkpoint["val_losses"]
@@ -879,6 +1124,10 @@ class Trainer:
         print(f"  - Batch size: {self.config.training.batch_size}")
         print(f"  - Learning rate: {self.config.training.learning_rate}")
         print(f"  - Using graph: {self.use_graph}")
+        print(
+            f"  - Precision: {self.autocast_dtype or torch.float32} - "
+            f"Compiled: {self._compiled_model is not None}"
+        )
         if self.use_graph:
             print(f"  - GNN type: {getattr(self.config.model, 'gnn_type', 'GCN')}")
             print(
@@ -892,6 +1141,9 @@ class Trainer:
             
             epoch_start_time = time.time()
 
+            for hook in self.hooks["pre_epoch"]:
+                hook(self, epoch)
+
             # Train for one epoch
             train_metrics = self.train_epoch()
 
@@ -899,7 +1151,7 @@ class Trainer:
             val_metrics = self.validate()
 
             # Track semantic drift
-            self.track_semantic_drift()
+            drift_metrics = self.track_semantic_drift()
 
             # Update learning rate
             if self.scheduler is not None:
@@ -955,11 +1207,10 @@ class Trainer:
             else:
                 self.patience_counter += 1
 
-            # Save checkpoint
-            self.save_checkpoint(epoch, {**train_metrics, **val_metrics}, is_best)
-
-            # Cleanup old checkpoints
-            self._cleanup_checkpoints(epoch)
+            # Save checkpoint without waiting for the disk
+            self.save_checkpoint(
+                epoch, {**train_metrics, **val_metrics}, is_best, blocking=False
+            )
 
             # Plot training curves - use default value of 10 if visualization_interval is not defined
             visualization_interval = getattr(self.config.metrics, "visualization_interval", 10)
@@ -1015,6 +1266,15 @@ class Trainer:
                         title=f"t-SNE of Latent Space (Epoch {epoch+1})",
                     )
 
+            # Let schedulers stop the run (all hooks run, any of them may stop it)
+            epoch_metrics = {**train_metrics, **val_metrics, **(drift_metrics or {})}
+            stop_requests = [
+                hook(self, epoch, epoch_metrics) for hook in self.hooks["post_epoch"]
+            ]
+            if any(stop_requests):
+                print(f"Training stopped by scheduler after {epoch+1} epochs")
+                break
+
             # Early stopping
             if self.patience_counter >= self.config.training.patience:
                 print(f"Early stopping triggered after {epoch+1} epochs")
@@ -1027,6 +1287,7 @@ class Trainer:
                 epoch,
                 self.val_losses[-1],
                 is_best=(self.val_losses[-1]["val_loss"] < self.best_val_loss),
+                blocking=False,
             )
 
             print(f"Training completed. Best validation loss: {self.best_val_loss:.4f}")
@@ -1035,6 +1296,9 @@ class Trainer:
                 "No training was performed (num_epochs may be less than or equal to start_epoch)"
             )
 
+        # Make sure every queued checkpoint is on disk before returning
+        self.checkpoint_writer.wait()
+
         # Return training history
         return {
             "train_losses": self.train_losses,
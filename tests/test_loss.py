@@ -130,6 +130,46 @@ def test_semantic_loss():
         assert feature in breakdown, f"Expected feature '{feature}' not in breakdown"
 
 
+def test_fused_semantic_loss_matches_reference():
+    """Test that the fused semantic loss matches per-feature loss calls."""
+    torch.manual_seed(0)
+    x_original = torch.rand(64, 15)
+    x_original[:, 3] = (x_original[:, 3] > 0.5).float()
+    x_reconstructed = (x_original + 0.2 * torch.randn(64, 15)).requires_grad_(True)
+
+    sem_loss = SemanticLoss()
+    loss, breakdown = sem_loss.forward_with_breakdown(x_reconstructed, x_original)
+
+    # Reference: one BCE/MSE call per extracted feature
+    original_features = sem_loss.extract_semantic_features(x_original)
+    reconstructed_features = sem_loss.extract_semantic_features(x_reconstructed)
+    reference = {}
+    for name in sem_loss.feature_extractors:
+        if name in ["has_target", "is_alive", "threatened"]:
+            reference[name] = torch.nn.functional.binary_cross_entropy(
+                torch.clamp(reconstructed_features[name], 0.0, 1.0),
+                torch.clamp(original_features[name], 0.0, 1.0),
+            )
+        else:
+            reference[name] = torch.nn.functional.mse_loss(
+                original_features[name], reconstructed_features[name]
+            )
+
+    for name, value in reference.items():
+        assert torch.allclose(breakdown[name], value, atol=1e-5), f"Mismatch for {name}"
+    assert torch.allclose(loss, torch.stack(list(reference.values())).mean(), atol=1e-5)
+    assert all(not value.requires_grad for value in breakdown.values())
+
+    # Gradients stay finite even where reconstructions are clamped
+    loss.backward()
+    assert torch.isfinite(x_reconstructed.grad).all()
+
+    # Float breakdown and plain forward agree with the fused result
+    floats = sem_loss.detailed_breakdown(x_reconstructed, x_original)
+    assert set(floats) == set(reference)
+    assert torch.allclose(sem_loss(x_reconstructed, x_original), loss)
+
+
 def test_combined_loss():
     """Test the combined loss function."""
     batch_size = 32
@@ -243,6 +283,9 @@ if __name__ == "__main__":
     print("\n=== Testing Semantic Loss ===")
     test_semantic_loss()
     
+    print("\n=== Testing Fused Semantic Loss ===")
+    test_fused_semantic_loss_matches_reference()
+    
     print("\n=== Testing Combined Loss ===")
     test_combined_loss()
     
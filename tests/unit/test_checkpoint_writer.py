@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the background checkpoint writer.
+
+This script tests:
+- Snapshots that are unaffected by later in-place updates
+- best_model.pt / latest_model.pt links to epoch checkpoints
+- The keep-every-10 / keep-last-5 retention policy
+- Retention of epoch files written before a resumed run
+- Starting and stopping the worker thread
+"""
+
+import os
+
+import torch
+
+from meaning_transform.src.checkpoint_writer import CheckpointWriter, snapshot_to_cpu
+
+
+class TestCheckpointWriter:
+    """Tests for the CheckpointWriter class."""
+
+    def test_snapshot(self):
+        """Test that snapshots copy tensors and nested containers."""
+        state = {"weights": torch.ones(3), "history": [{"loss": 1.0}]}
+        snapshot = snapshot_to_cpu(state)
+
+        state["weights"].add_(1)
+        state["history"].append({"loss": 0.5})
+        assert torch.equal(snapshot["weights"], torch.ones(3))
+        assert len(snapshot["history"]) == 1
+
+    def test_links_and_retention(self, tmp_path):
+        """Test best/latest links and which epoch files are kept."""
+        writer = CheckpointWriter(tmp_path)
+        weights = torch.zeros(2)
+        for epoch in range(12):
+            weights.fill_(epoch)
+            writer.save(epoch, {"epoch": epoch, "weights": weights}, is_best=epoch == 3)
+        writer.close()
+
+        kept = sorted(int(p.stem.split("_")[-1]) for p in tmp_path.glob("checkpoint_epoch_*.pt"))
+        assert kept == [0, 7, 8, 9, 10, 11]
+        assert not list(tmp_path.glob("*.tmp"))
+
+        assert os.path.samefile(tmp_path / "latest_model.pt", writer.epoch_path(11))
+        best = torch.load(tmp_path / "best_model.pt")
+        assert best["epoch"] == 3
+        assert torch.equal(best["weights"], torch.full((2,), 3.0))
+
+    def test_retention_after_resume(self, tmp_path):
+        """Test that epoch files from an earlier run are pruned after resuming."""
+        writer = CheckpointWriter(tmp_path, cleanup=False)
+        for epoch in range(8):
+            writer.save(epoch, {"epoch": epoch})
+        writer.close()
+
+        resumed = CheckpointWriter(tmp_path)
+        for epoch in range(8, 12):
+            resumed.save(epoch, {"epoch": epoch})
+        resumed.close()
+
+        kept = sorted(int(p.stem.split("_")[-1]) for p in tmp_path.glob("checkpoint_epoch_*.pt"))
+        assert kept == [0, 7, 8, 9, 10, 11]
+
+    def test_close_and_reuse(self, tmp_path):
+        """Test that the worker thread only runs between the first save and close."""
+        writer = CheckpointWriter(tmp_path)
+        assert writer._executor is None
+
+        writer.save(0, {"epoch": 0})
+        writer.close()
+        assert writer._executor is None
+        assert writer.epoch_path(0).exists()
+
+        # Saving after close starts a new worker
+        writer.save(1, {"epoch": 1})
+        writer.close()
+        assert torch.load(tmp_path / "latest_model.pt")["epoch"] == 1
@@ -13,6 +13,7 @@ This script tests the functionality of the data module, including:
 """
 
 import os
+import sqlite3
 import sys
 import tempfile
 from pathlib import Path
@@ -29,11 +30,14 @@ project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 from meaning_transform.src.data import (
+    AGENT_STATE_DB_COLUMNS,
     AgentState,
+    AgentStateBatch,
     AgentStateDataset,
     deserialize_states,
     determine_role,
     generate_agent_states,
+    iter_agent_state_chunks,
     serialize_states,
 )
 
@@ -245,6 +249,106 @@ class TestAgentState:
             pytest.skip("torch_geometric or knowledge_graph module not available")
 
 
+# Test AgentStateBatch class
+class TestAgentStateBatch:
+    """Tests for the columnar AgentStateBatch class."""
+
+    def test_to_tensor_matches_per_state(self):
+        """Test that vectorized encoding matches AgentState.to_tensor."""
+        states = generate_agent_states(count=30, random_seed=7)
+        states.append(AgentState(role="unknown_role", age=5000, total_reward=-500.0))
+
+        batch = AgentStateBatch.from_states(states)
+        expected = torch.stack([state.to_tensor() for state in states])
+
+        assert len(batch) == len(states)
+        assert batch.to_tensor().dtype == torch.float32
+        assert torch.equal(batch.to_tensor(), expected)
+
+    def test_row_access_and_slicing(self):
+        """Test lazy row materialization and sub-batch selection."""
+        states = generate_agent_states(count=10, random_seed=3)
+        batch = AgentStateBatch.from_states(states)
+
+        row = batch[4]
+        assert isinstance(row, AgentState)
+        assert row.agent_id == states[4].agent_id
+        assert row.role == states[4].role
+        assert row.inventory == states[4].inventory
+        assert torch.equal(row.to_tensor(), states[4].to_tensor())
+
+        sub_batch = batch[2:6]
+        assert isinstance(sub_batch, AgentStateBatch)
+        assert len(sub_batch) == 4
+        assert torch.equal(sub_batch.to_tensor(), batch.to_tensor()[2:6])
+
+        selected = batch[np.array([9, 0])]
+        assert [s.agent_id for s in selected] == [states[9].agent_id, states[0].agent_id]
+
+    def test_concatenate(self):
+        """Test concatenating batches."""
+        states = generate_agent_states(count=8, random_seed=1)
+        first = AgentStateBatch.from_states(states[:5])
+        second = AgentStateBatch.from_states(states[5:])
+
+        combined = AgentStateBatch.concatenate([first, second])
+        assert len(combined) == 8
+        assert combined.agent_ids == [s.agent_id for s in states]
+        assert torch.equal(
+            combined.to_tensor(), AgentStateBatch.from_states(states).to_tensor()
+        )
+
+    def test_from_tensor_matches_per_state(self):
+        """Test that batched decoding matches AgentState.from_tensor row by row."""
+        torch.manual_seed(0)
+        tensor = torch.randn(25, 15)
+
+        batch = AgentStateBatch.from_tensor(tensor)
+        assert len(batch) == 25
+
+        for i in range(25):
+            expected = AgentState.from_tensor(tensor[i])
+            decoded = batch[i]
+            assert decoded.role == expected.role
+            assert decoded.age == expected.age
+            assert decoded.is_defending == expected.is_defending
+            assert decoded.total_reward == pytest.approx(expected.total_reward)
+            assert decoded.position == pytest.approx(expected.position)
+
+    def test_from_tensor_round_trip(self):
+        """Test that encoding then decoding preserves the tensor."""
+        states = generate_agent_states(count=15, random_seed=11)
+        tensor = AgentStateBatch.from_states(states).to_tensor()
+
+        decoded = AgentStateBatch.from_tensor(tensor)
+        assert decoded.roles == [state.role for state in states]
+        assert torch.allclose(decoded.to_tensor(), tensor, atol=1e-3)
+
+    def test_to_dataframe(self):
+        """Test conversion of a decoded batch to a DataFrame."""
+        pd = pytest.importorskip("pandas")
+
+        batch = AgentStateBatch.from_tensor(torch.randn(6, 15))
+        frame = batch.to_dataframe()
+
+        assert isinstance(frame, pd.DataFrame)
+        assert len(frame) == 6
+        assert list(frame["role"].astype(str)) == batch.roles
+
+    def test_dataset_accepts_batch(self):
+        """Test that AgentStateDataset works with a columnar batch."""
+        states = generate_agent_states(count=20, random_seed=5)
+        dataset = AgentStateDataset(
+            states=AgentStateBatch.from_states(states), batch_size=8
+        )
+
+        assert len(dataset) == 20
+        assert dataset.get_batch().shape == (8, 15)
+        assert torch.equal(
+            dataset.states_tensor, torch.stack([s.to_tensor() for s in states])
+        )
+
+
 # Test AgentStateDataset class
 class TestAgentStateDataset:
     """Tests for the AgentStateDataset class."""
@@ -260,6 +364,39 @@ class TestAgentStateDataset:
         assert batch.shape[0] == 16  # Batch size
         assert batch.shape[1] == 15  # Feature count
 
+    def test_get_dataloader(self):
+        """Test index-shuffled DataLoader batches over the state tensor."""
+        states = generate_agent_states(count=50, random_seed=2)
+        dataset = AgentStateDataset(states=states, batch_size=16)
+        original_tensor = dataset.states_tensor.clone()
+
+        generator = torch.Generator()
+        generator.manual_seed(0)
+        loader = dataset.get_dataloader(shuffle=True, generator=generator)
+        batches = list(loader)
+
+        assert len(loader) == 4
+        assert [len(batch) for batch in batches] == [16, 16, 16, 2]
+        assert all(batch.shape[1] == 15 for batch in batches)
+
+        # Every row appears exactly once and the underlying tensor is untouched
+        rows = torch.cat(batches)
+        assert not torch.equal(rows, original_tensor)
+        assert torch.equal(
+            rows[torch.argsort(rows[:, 0])],
+            original_tensor[torch.argsort(original_tensor[:, 0])],
+        )
+        assert torch.equal(dataset.states_tensor, original_tensor)
+
+    def test_get_dataloader_sequential_drop_last(self):
+        """Test sequential batches with the last partial batch dropped."""
+        states = generate_agent_states(count=20, random_seed=2)
+        dataset = AgentStateDataset(states=states, batch_size=8)
+
+        batches = list(dataset.get_dataloader(shuffle=False, drop_last=True))
+        assert len(batches) == 2
+        assert torch.equal(torch.cat(batches), dataset.states_tensor[:16])
+
     def test_loading_saving(self, tmp_path):
         """Test saving and loading agent states."""
         # Create temporary file
@@ -336,6 +473,114 @@ class TestAgentStateDataset:
             pytest.skip("torch_geometric or knowledge_graph module not available")
 
 
+@pytest.fixture
+def simulation_db(tmp_path):
+    """Create a small simulation database with an agent_states table."""
+    db_path = tmp_path / "simulation.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        CREATE TABLE agent_states (
+            id TEXT PRIMARY KEY, simulation_id TEXT, step_number INTEGER,
+            agent_id TEXT, position_x REAL, position_y REAL, position_z REAL,
+            resource_level REAL, current_health REAL, is_defending BOOLEAN,
+            total_reward REAL, age INTEGER
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX idx_agent_states_step_number ON agent_states (step_number)"
+    )
+    conn.execute(
+        "CREATE INDEX idx_agent_states_agent_step ON agent_states (agent_id, step_number)"
+    )
+
+    rows = []
+    for step in range(10):
+        for agent in range(5):
+            rows.append(
+                (
+                    f"agent_{agent}-{step}",
+                    "sim_a" if agent < 3 else "sim_b",
+                    step,
+                    f"agent_{agent}",
+                    float(agent),
+                    float(step),
+                    None if agent == 0 else 0.5,
+                    0.0 if agent == 1 else 10.0 * agent,
+                    None if agent == 2 else 0.2 * agent,
+                    agent % 2,
+                    float(step * agent),
+                    step * 100,
+                )
+            )
+    conn.executemany(
+        "INSERT INTO agent_states VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+    )
+    conn.commit()
+    conn.close()
+    return str(db_path)
+
+
+# Test streaming database loading
+class TestDatabaseStreaming:
+    """Tests for chunked loading from simulation databases."""
+
+    def test_chunks_match_load_from_db(self, simulation_db):
+        """Test that streamed tensors and loaded datasets match per-record states."""
+        with sqlite3.connect(simulation_db) as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(AGENT_STATE_DB_COLUMNS)} FROM agent_states "
+                "ORDER BY step_number"
+            ).fetchall()
+        records = [
+            AgentState.from_db_record(dict(zip(AGENT_STATE_DB_COLUMNS, row))) for row in rows
+        ]
+        expected = torch.stack([state.to_tensor() for state in records])
+
+        chunks = list(iter_agent_state_chunks(simulation_db, chunk_size=8))
+        assert [len(chunk) for chunk in chunks] == [8] * 6 + [2]
+        assert torch.equal(torch.cat(chunks), expected)
+
+        # Datasets hold columnar chunks and create AgentState objects per row
+        dataset = AgentStateDataset()
+        dataset.load_from_db(simulation_db, chunk_size=8)
+        assert isinstance(dataset.states, AgentStateBatch)
+        assert torch.equal(dataset.states_tensor, expected)
+        assert dataset.states[3].agent_id == records[3].agent_id
+        assert dataset.states[3].step_number == records[3].step_number
+
+    def test_filters_and_limit(self, simulation_db):
+        """Test simulation, step range, agent and limit filters."""
+        batches = list(
+            iter_agent_state_chunks(
+                simulation_db,
+                chunk_size=4,
+                simulation_id="sim_a",
+                start_step=2,
+                end_step=5,
+                as_batch=True,
+            )
+        )
+        batch = AgentStateBatch.concatenate(batches)
+        assert len(batch) == 12
+        assert set(batch.agent_ids) == {"agent_0", "agent_1", "agent_2"}
+        assert batch.step_numbers.min() == 2 and batch.step_numbers.max() == 5
+
+        agent_chunks = list(
+            iter_agent_state_chunks(simulation_db, agent_ids=["agent_4"], as_batch=True)
+        )
+        assert agent_chunks[0].agent_ids == ["agent_4"] * 10
+
+        limited = list(iter_agent_state_chunks(simulation_db, chunk_size=3, limit=7))
+        assert sum(len(chunk) for chunk in limited) == 7
+
+    def test_invalid_chunk_size(self, simulation_db):
+        """Test that a non-positive chunk size is rejected."""
+        with pytest.raises(ValueError):
+            next(iter_agent_state_chunks(simulation_db, chunk_size=0))
+
+
 # Test helper functions
 class TestHelperFunctions:
     """Tests for helper functions in the data module."""
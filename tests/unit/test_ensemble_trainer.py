@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for vectorized ensemble training.
+
+This script tests:
+- EnsembleVAE outputs matching each member MeaningVAE in training and evaluation
+- Copying trained ensemble weights back into the member models
+- Per-member losses matching CombinedLoss with each member's weights
+- EnsembleTrainer returning one Trainer.train-style history per variant
+"""
+
+from pathlib import Path
+
+import pytest
+import torch
+
+from meaning_transform.src.config import Config
+from meaning_transform.src.data import AgentStateDataset, generate_agent_states
+from meaning_transform.src.ensemble_trainer import EnsembleLoss, EnsembleTrainer
+from meaning_transform.src.loss import CombinedLoss
+from meaning_transform.src.models import EnsembleVAE, MeaningVAE
+
+LEVELS = [0.5, 1.0, 2.0]
+
+
+def create_models(seed=0):
+    """Seeded members differing only in compression level."""
+    return [
+        MeaningVAE(input_dim=15, latent_dim=8, compression_level=level, seed=seed + i)
+        for i, level in enumerate(LEVELS)
+    ]
+
+
+def create_batch():
+    """Batch of agent state tensors."""
+    states = generate_agent_states(count=16, random_seed=0)
+    return AgentStateDataset(states, batch_size=16).states_tensor
+
+
+class TestEnsembleVAE:
+    """Tests for the EnsembleVAE class."""
+
+    @pytest.mark.parametrize("training", [True, False])
+    def test_matches_members(self, training):
+        """Test that every ensemble row equals its member's own forward pass."""
+        # Identical copies: same initial weights and noise seeds
+        torch.manual_seed(0)
+        models = create_models()
+        torch.manual_seed(0)
+        ensemble = EnsembleVAE(create_models())
+        ensemble.train(training)
+        x = create_batch()
+
+        stacked = ensemble(x)
+        for k, model in enumerate(models):
+            model.train(training)
+            results = model(x)
+            for key in ("mu", "z", "z_compressed", "reconstruction"):
+                assert torch.allclose(stacked[key][k], results[key], atol=1e-5), key
+            assert torch.allclose(stacked["kl_loss"][k], results["kl_loss"], atol=1e-4)
+            assert torch.allclose(
+                stacked["compression_loss"][k], results["compression_loss"], atol=1e-5
+            )
+
+    def test_write_back(self):
+        """Test that trained weights and batch statistics reach the members."""
+        models = create_models()
+        ensemble = EnsembleVAE(models)
+        optimizer = torch.optim.Adam(ensemble.parameters(), lr=1e-2)
+        x = create_batch()
+
+        ensemble.train()
+        optimizer.zero_grad()
+        ensemble(x)["reconstruction"].pow(2).sum().backward()
+        optimizer.step()
+        ensemble.write_back()
+
+        ensemble.eval()
+        reconstructions = ensemble(x)["reconstruction"]
+        for k, model in enumerate(models):
+            model.eval()
+            assert torch.allclose(reconstructions[k], model(x)["reconstruction"], atol=1e-5)
+
+    def test_rejects_mixed_architectures(self):
+        """Test that members with different dimensions cannot be stacked."""
+        models = [MeaningVAE(input_dim=15, latent_dim=8), MeaningVAE(input_dim=15, latent_dim=16)]
+        with pytest.raises(ValueError):
+            EnsembleVAE(models)
+
+
+class TestEnsembleLoss:
+    """Tests for the EnsembleLoss class."""
+
+    def test_matches_combined_loss(self):
+        """Test per-member totals against CombinedLoss with the same weights."""
+        models = create_models()
+        ensemble = EnsembleVAE(models).eval()
+        x = create_batch()
+        kl_weights = [0.1, 0.2, 0.3]
+
+        losses = EnsembleLoss(kl_loss_weight=kl_weights)(ensemble(x), x)
+
+        for k, model in enumerate(models):
+            expected = CombinedLoss(kl_loss_weight=kl_weights[k])(model.eval()(x), x)
+            assert torch.allclose(losses["loss"][k], expected["loss"], rtol=1e-4)
+            assert torch.allclose(
+                losses["recon_loss"][k], expected["reconstruction_loss"], rtol=1e-4
+            )
+
+
+class TestEnsembleTrainer:
+    """Tests for the EnsembleTrainer class."""
+
+    def test_train(self, tmp_path):
+        """Test per-member histories, checkpoints and trained member models."""
+        config = Config()
+        config.verbose = False
+        config.model.input_dim = 15
+        config.model.latent_dim = 8
+        config.training.batch_size = 16
+        config.training.num_epochs = 2
+        config.training.checkpoint_dir = str(tmp_path)
+
+        variants = [
+            {"name": f"compression_{level}", "compression_level": level} for level in LEVELS
+        ]
+        variants[0]["semantic_loss_weight"] = 0.0
+        trainer = EnsembleTrainer(config, variants, device="cpu")
+        states = generate_agent_states(count=64, random_seed=0)
+        trainer.train_dataset = AgentStateDataset(states[:48], batch_size=16)
+        trainer.val_dataset = AgentStateDataset(states[48:], batch_size=16)
+        trainer.drift_tracking_states = states[48:53]
+
+        results = trainer.train()
+
+        assert len(results) == len(LEVELS)
+        for k, result in enumerate(results):
+            assert set(result) == {
+                "train_losses",
+                "val_losses",
+                "semantic_drift",
+                "best_val_loss",
+                "experiment_dir",
+            }
+            assert len(result["train_losses"]) == 2
+            assert len(result["semantic_drift"]) == 2
+            assert "train_recon_loss" in result["train_losses"][0]
+            assert result["best_val_loss"] == min(m["val_loss"] for m in result["val_losses"])
+            assert (Path(result["experiment_dir"]) / "best_model.pt").exists()
+            assert trainer.models[k].compression_level == LEVELS[k]
+
+        # Every checkpoint writer thread is stopped once training ends
+        assert all(w._executor is None for w in trainer.member_writers)
+        assert trainer.checkpoint_writer._executor is None
+
+        # Members hold the trained weights
+        x = trainer.val_dataset.states_tensor[:16]
+        trainer.model.eval()
+        reconstructions = trainer.model(x)["reconstruction"]
+        for k, model in enumerate(trainer.models):
+            model.eval()
+            assert torch.allclose(reconstructions[k], model(x)["reconstruction"], atol=1e-5)
+
+    def test_unknown_variant_setting(self, tmp_path):
+        """Test that unsupported variant settings are rejected."""
+        config = Config()
+        config.training.checkpoint_dir = str(tmp_path)
+        with pytest.raises(ValueError):
+            EnsembleTrainer(config, [{"latent_dim": 4}], device="cpu")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the graph autoencoder models.
+
+This script tests:
+- Negative edge sampling restricted to the graphs of a batch
+- Sparse edge decoding against the dense pair expansion
+- The sparse graph VAE loss
+- Batched graph reconstruction with per-graph thresholds and top-k
+"""
+
+import pytest
+import torch
+
+pytest.importorskip("torch_geometric")
+from torch_geometric.data import Batch, Data
+
+from meaning_transform.src.graph_model import (
+    VGAE,
+    GraphDecoder,
+    GraphVAELoss,
+    sample_negative_edges,
+)
+
+
+def create_graph(num_nodes, num_edges, feature_dim=20, edge_dim=11, seed=0):
+    """Create a random graph with node and edge features."""
+    generator = torch.Generator().manual_seed(seed)
+    return Data(
+        x=torch.rand(num_nodes, feature_dim, generator=generator),
+        edge_index=torch.randint(num_nodes, (2, num_edges), generator=generator),
+        edge_attr=torch.rand(num_edges, edge_dim, generator=generator),
+    )
+
+
+class TestNegativeSampling:
+    """Tests for sample_negative_edges."""
+
+    def test_pairs_stay_within_graphs(self):
+        """Test that negatives never cross graphs or hit observed edges."""
+        torch.manual_seed(0)
+        batch = Batch.from_data_list(
+            [create_graph(n, 2 * n, seed=n) for n in [3, 10, 1, 25]]
+        )
+
+        negatives = sample_negative_edges(
+            batch.edge_index, batch.num_nodes, batch=batch.batch, num_samples=500
+        )
+
+        assert negatives.size(0) == 2 and 0 < negatives.size(1) <= 500
+        assert torch.equal(batch.batch[negatives[0]], batch.batch[negatives[1]])
+
+        observed = set(map(tuple, batch.edge_index.t().tolist()))
+        assert not observed & set(map(tuple, negatives.t().tolist()))
+
+    def test_empty_inputs(self):
+        """Test that nothing is sampled for empty graphs."""
+        edge_index = torch.empty((2, 0), dtype=torch.long)
+        assert sample_negative_edges(edge_index, 0).shape == (2, 0)
+        assert sample_negative_edges(edge_index, 5).shape == (2, 0)
+
+
+class TestSparseDecoding:
+    """Tests for sparse edge decoding and its loss."""
+
+    def test_matches_dense_decoding(self):
+        """Test that sparse pair scores equal the dense pair expansion."""
+        torch.manual_seed(0)
+        decoder = GraphDecoder(
+            embedding_dim=8, hidden_channels=16, feature_dim=20, edge_dim=11
+        ).eval()
+        embeddings = torch.randn(12, 8)
+        pairs = torch.randint(12, (2, 30))
+
+        _, (dense_logits, dense_features) = decoder(embeddings)
+        _, (logits, features) = decoder(embeddings, pairs)
+
+        assert logits.shape == (30,) and features.shape == (30, 11)
+        assert torch.allclose(logits, dense_logits[pairs[0], pairs[1]], atol=1e-6)
+        assert torch.allclose(features, dense_features[pairs[0], pairs[1]], atol=1e-6)
+
+    def test_vgae_sparse_loss(self):
+        """Test a sparse forward/backward pass on a batch of graphs."""
+        torch.manual_seed(0)
+        batch = Batch.from_data_list([create_graph(40, 80, seed=i) for i in range(4)])
+        model = VGAE(
+            in_channels=20,
+            hidden_channels=16,
+            latent_dim=8,
+            feature_dim=20,
+            edge_dim=11,
+            sparse_edges=True,
+            negative_ratio=2.0,
+        )
+
+        outputs = model(batch)
+        num_edges = batch.edge_index.size(1)
+        assert torch.equal(outputs["edge_pairs"][:, :num_edges], batch.edge_index)
+        assert outputs["edge_labels"][:num_edges].eq(1).all()
+        assert outputs["edge_labels"][num_edges:].eq(0).all()
+        assert outputs["edge_logits"].shape == outputs["edge_labels"].shape
+
+        loss_fn = GraphVAELoss(semantic_weight=0.0)
+        losses = loss_fn(outputs, batch)
+        assert losses["edge_loss"] > 0 and losses["edge_attr_loss"] > 0
+
+        losses["loss"].backward()
+        assert model.decoder.edge_predictor[0].weight.grad is not None
+
+
+class TestBatchedReconstruction:
+    """Tests for GraphDecoder.reconstruct_graph and reconstruct_batch."""
+
+    def create_decoder(self):
+        """Create a decoder in evaluation mode."""
+        torch.manual_seed(0)
+        return GraphDecoder(
+            embedding_dim=8, hidden_channels=16, feature_dim=20, edge_dim=11
+        ).eval()
+
+    def test_reconstruct_graph_gather(self):
+        """Test that gathered edge attributes match a per-edge lookup."""
+        decoder = self.create_decoder()
+        embeddings = torch.randn(10, 8)
+
+        _, edge_index, edge_attr = decoder.reconstruct_graph(embeddings, threshold=0.5)
+        _, (_, edge_features) = decoder(embeddings)
+
+        assert edge_attr.shape == (edge_index.size(1), 11)
+        for k, (i, j) in enumerate(edge_index.t().tolist()):
+            assert torch.equal(edge_attr[k], edge_features[i, j])
+
+    def test_matches_per_graph_reconstruction(self):
+        """Test that each batched graph equals reconstructing it alone."""
+        decoder = self.create_decoder()
+        sizes = [4, 9, 1, 6]
+        embeddings = torch.randn(sum(sizes), 8)
+        batch = torch.repeat_interleave(torch.arange(len(sizes)), torch.tensor(sizes))
+
+        graphs = decoder.reconstruct_batch(embeddings, batch, threshold=0.5)
+
+        assert len(graphs) == len(sizes)
+        for graph, part in zip(graphs, torch.split(embeddings, sizes)):
+            x, edge_index, edge_attr = decoder.reconstruct_graph(part, threshold=0.5)
+            assert torch.allclose(graph.x, x, atol=1e-6)
+            assert torch.equal(graph.edge_index, edge_index)
+            assert torch.allclose(graph.edge_attr, edge_attr, atol=1e-6)
+
+    def test_thresholds_and_top_k(self):
+        """Test per-graph thresholds and top-k edge selection."""
+        decoder = self.create_decoder()
+        sizes = [5, 7, 3]
+        embeddings = torch.randn(sum(sizes), 8)
+        batch = torch.repeat_interleave(torch.arange(len(sizes)), torch.tensor(sizes))
+
+        graphs = decoder.reconstruct_batch(
+            embeddings, batch, threshold=torch.tensor([0.0, 1.0, 0.0]), top_k=4
+        )
+
+        assert [g.edge_index.size(1) for g in graphs] == [4, 0, 4]
+        for graph, part in zip(graphs, torch.split(embeddings, sizes)):
+            _, (logits, _) = decoder(part)
+            probs = torch.sigmoid(logits)
+            if graph.edge_index.size(1) > 0:
+                kept = probs[graph.edge_index[0], graph.edge_index[1]]
+                assert kept.min() >= probs.flatten().topk(4).values.min()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the batched inference server.
+
+This script tests:
+- Coalescing of concurrent single-item requests into micro-batches
+- Agreement of batched results with direct model calls
+- Queue-depth and batch-size statistics
+- Blocking calls from worker threads
+"""
+
+import asyncio
+import threading
+
+import pytest
+import torch
+
+from meaning_transform.src.data import generate_agent_states
+from meaning_transform.src.inference_server import Histogram, InferenceServer
+from meaning_transform.src.models import MeaningVAE
+
+
+@pytest.fixture
+def vae():
+    """Small MeaningVAE in evaluation mode."""
+    torch.manual_seed(0)
+    return MeaningVAE(input_dim=15, latent_dim=8, seed=42).eval()
+
+
+class TestHistogram:
+    """Tests for the power-of-two Histogram."""
+
+    def test_buckets(self):
+        """Test bucket assignment and summary values."""
+        histogram = Histogram()
+        for value in [0, 1, 2, 3, 4, 7, 8, 100]:
+            histogram.record(value)
+
+        summary = histogram.to_dict()
+        assert summary["buckets"] == {0: 1, 1: 1, 2: 2, 4: 2, 8: 1, 64: 1}
+        assert summary["count"] == 8
+        assert summary["max"] == 100
+
+
+class TestInferenceServer:
+    """Tests for the InferenceServer class."""
+
+    def test_decode_matches_batch(self, vae):
+        """Test that coalesced decodes equal one direct batched decode."""
+        z = torch.randn(64, 8)
+
+        async def run():
+            async with InferenceServer(vae, max_batch_size=16, max_latency_ms=50) as server:
+                outputs = await asyncio.gather(*(server.decode(row) for row in z))
+                return outputs, server.stats()
+
+        outputs, stats = asyncio.run(run())
+
+        with torch.no_grad():
+            expected = vae.decode(z)
+        assert torch.allclose(torch.stack(outputs), expected, atol=1e-5)
+        assert stats["num_requests"] == 64
+        assert stats["batch_size"]["max"] == 16
+        assert stats["num_batches"] < 64
+
+    def test_encode_agent_states(self, vae):
+        """Test encoding AgentState requests."""
+        states = generate_agent_states(count=10, random_seed=1)
+
+        async def run():
+            async with InferenceServer(vae, max_latency_ms=20) as server:
+                return await asyncio.gather(*(server.encode(s) for s in states))
+
+        latents = asyncio.run(run())
+        assert all(z.shape == (8,) for z in latents)
+
+        # Deterministic and equal to one direct batched encode
+        batch = torch.stack([state.to_tensor() for state in states])
+        with torch.no_grad():
+            expected = vae.encode(batch)
+        assert torch.allclose(torch.stack(latents), expected, atol=1e-5)
+
+    def test_invalid_requests(self, vae):
+        """Test wrong shapes and requests on a stopped server."""
+        server = InferenceServer(vae)
+
+        async def run():
+            with pytest.raises(RuntimeError):
+                await server.decode(torch.zeros(8))
+            async with server:
+                with pytest.raises(ValueError):
+                    await server.decode(torch.zeros(5))
+
+        asyncio.run(run())
+
+        with pytest.raises(ValueError):
+            InferenceServer(vae, max_batch_size=0)
+
+    def test_worker_threads(self, vae):
+        """Test blocking calls from many threads sharing one server."""
+        server = InferenceServer(vae, max_latency_ms=20).start_in_thread()
+        z = torch.randn(32, 8)
+        results = [None] * len(z)
+
+        def worker(i):
+            results[i] = server.decode_sync(z[i], timeout=30)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(z))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        server.stop_thread()
+
+        with torch.no_grad():
+            expected = vae.decode(z)
+        assert torch.allclose(torch.stack(results), expected, atol=1e-5)
+        assert server.stats()["num_requests"] == 32
@@ -31,11 +31,19 @@ except ImportError:
 
 knowledge_graph_available = True
 try:
+    from meaning_transform.src import knowledge_graph
     from meaning_transform.src.knowledge_graph import (
+        AGENT,
         AgentStateToGraph,
-        deserialize_knowledge_graph
+        deserialize_knowledge_graph,
+        jaccard_pairs,
+        proximity_pairs,
+    )
+    from meaning_transform.src.data import (
+        AgentState,
+        AgentStateBatch,
+        generate_agent_states,
     )
-    from meaning_transform.src.data import AgentState, generate_agent_states
 except ImportError:
     knowledge_graph_available = False
 
@@ -173,6 +181,281 @@ class TestAgentStateToGraph:
         assert len(property_nodes) > 0
 
 
+def assert_graph_batches_equal(left, right):
+    """Assert that two PyTorch Geometric batches hold identical tensors."""
+    assert left.num_graphs == right.num_graphs
+    assert torch.equal(left.x, right.x)
+    assert torch.equal(left.edge_index, right.edge_index)
+    assert torch.equal(left.edge_attr, right.edge_attr)
+    assert torch.equal(left.batch, right.batch)
+    assert torch.equal(left.ptr, right.ptr)
+
+
+def networkx_batch(converter, agents):
+    """Reference batch built through NetworkX graphs."""
+    return Batch.from_data_list(
+        [converter.to_torch_geometric(converter.agent_to_graph(agent)) for agent in agents]
+    )
+
+
+@skip_if_dependencies_missing
+class TestDirectGraphBuilder:
+    """Tests for AgentStateToGraph.agents_to_torch_geometric_batch."""
+
+    def test_matches_networkx_path(self):
+        """Test identical tensors for a list of agent states."""
+        agents = generate_agent_states(count=20, random_seed=42)
+        agents.append(
+            AgentState(
+                position=(1.0, 2.0, 3.0),
+                role="leader",
+                inventory={"wood": 5, "gem": "rare"},
+                goals=["explore", "explore"],
+                resource_level=None,
+            )
+        )
+        converter = AgentStateToGraph(include_relations=True, property_as_node=True)
+
+        assert_graph_batches_equal(
+            converter.agents_to_torch_geometric_batch(agents),
+            networkx_batch(converter, agents),
+        )
+
+    def test_matches_networkx_path_for_columnar_batch(self):
+        """Test identical tensors for a columnar AgentStateBatch."""
+        batch = AgentStateBatch.from_states(generate_agent_states(count=15, random_seed=7))
+        batch.health[0] = 0.0  # exercises the AgentState constructor defaults
+        batch.role_codes[1] = -1
+        converter = AgentStateToGraph(include_relations=True, property_as_node=True)
+
+        assert_graph_batches_equal(
+            converter.agents_to_torch_geometric_batch(batch),
+            networkx_batch(converter, list(batch)),
+        )
+
+    def test_to_data_list(self):
+        """Test that the built batch splits back into per-agent graphs."""
+        agents = generate_agent_states(count=5, random_seed=3)
+        converter = AgentStateToGraph(include_relations=True, property_as_node=True)
+
+        built = converter.agents_to_torch_geometric_batch(agents).to_data_list()
+        for agent, data in zip(agents, built):
+            expected = converter.to_torch_geometric(converter.agent_to_graph(agent))
+            assert torch.equal(data.x, expected.x)
+            assert torch.equal(data.edge_index, expected.edge_index)
+            assert torch.equal(data.edge_attr, expected.edge_attr)
+
+    def test_batch_internals_match_from_data_list(self):
+        """Test the slice bookkeeping against Batch.from_data_list."""
+        agents = generate_agent_states(count=6, random_seed=11)
+        converter = AgentStateToGraph(include_relations=True, property_as_node=True)
+
+        built = converter.agents_to_torch_geometric_batch(agents)
+        reference = networkx_batch(converter, agents)
+
+        assert_graph_batches_equal(built, reference)
+        if knowledge_graph.DIRECT_BATCH_SUPPORTED:
+            for key in ("x", "edge_index", "edge_attr"):
+                assert torch.equal(built._slice_dict[key], reference._slice_dict[key]), key
+                assert torch.equal(built._inc_dict[key], reference._inc_dict[key]), key
+        example = built.get_example(2)
+        assert torch.equal(example.edge_index, reference.get_example(2).edge_index)
+
+    def test_public_api_fallback(self, monkeypatch):
+        """Test the Batch.from_data_list path used for other PyG versions."""
+        agents = generate_agent_states(count=6, random_seed=11)
+        converter = AgentStateToGraph(include_relations=True, property_as_node=True)
+        monkeypatch.setattr(knowledge_graph, "DIRECT_BATCH_SUPPORTED", False)
+
+        assert_graph_batches_equal(
+            converter.agents_to_torch_geometric_batch(agents),
+            networkx_batch(converter, agents),
+        )
+
+    def test_agent_state_graph_conversion(self):
+        """Test that AgentState graph methods resolve the converter."""
+        agent = generate_agent_states(count=1, random_seed=0)[0]
+        data = agent.to_torch_geometric()
+        assert data.x.shape[1] == 20
+
+
+def assert_graph_data_equal(left, right):
+    """Assert that two PyTorch Geometric graphs hold identical tensors."""
+    assert torch.equal(left.x, right.x)
+    assert torch.equal(left.edge_index, right.edge_index)
+    assert torch.equal(left.edge_attr, right.edge_attr)
+
+
+def composed_graph(converter, agents):
+    """Reference multi-agent graph built by composing per-agent graphs."""
+    G = nx.Graph()
+    for agent in agents:
+        G = nx.compose(G, converter.agent_to_graph(agent))
+    if converter.include_relations:
+        converter._add_agent_relationships(G, agents)
+    return G
+
+
+def assert_attributes_equal(attributes, expected):
+    """Compare attribute dictionaries, using np.array_equal for array values."""
+    assert attributes.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, (np.ndarray, torch.Tensor)):
+            assert np.array_equal(attributes[key], value), key
+        else:
+            assert attributes[key] == value, key
+
+
+@skip_if_dependencies_missing
+class TestMultiAgentGraphBuilder:
+    """Tests for single-pass multi-agent graph construction."""
+
+    def test_agents_to_graph_matches_compose(self):
+        """Test the same nodes, edges and attributes as composing graphs."""
+        agents = generate_agent_states(count=25, random_seed=42)
+        converter = AgentStateToGraph(relationship_threshold=0.3)
+
+        graph = converter.agents_to_graph(agents)
+        reference = composed_graph(converter, agents)
+
+        assert list(graph.nodes) == list(reference.nodes)
+        for node in reference.nodes:
+            assert_attributes_equal(graph.nodes[node], reference.nodes[node])
+
+        assert list(graph.edges) == list(reference.edges)
+        for u, v in reference.edges:
+            assert_attributes_equal(graph.edges[u, v], reference.edges[u, v])
+
+    @pytest.mark.parametrize("threshold", [0.0, 0.3, 0.6, 1.5])
+    def test_agents_to_torch_geometric_matches_networkx_path(self, threshold):
+        """Test identical tensors to converting the NetworkX graph."""
+        agents = generate_agent_states(count=40, random_seed=42)
+        agents[3].inventory = {}
+        agents[4].goals = []
+        agents[5].resource_level = None
+        converter = AgentStateToGraph(relationship_threshold=threshold)
+
+        assert_graph_data_equal(
+            converter.agents_to_torch_geometric(agents),
+            converter.to_torch_geometric(converter.agents_to_graph(agents)),
+        )
+
+    def test_agents_to_torch_geometric_options(self):
+        """Test columnar batches, disabled relations and shared agent ids."""
+        agents = generate_agent_states(count=20, random_seed=5)
+        batch = AgentStateBatch.from_states(agents)
+        converter = AgentStateToGraph(relationship_threshold=0.4)
+        assert_graph_data_equal(
+            converter.agents_to_torch_geometric(batch),
+            converter.to_torch_geometric(converter.agents_to_graph(agents)),
+        )
+
+        no_relations = AgentStateToGraph(include_relations=False)
+        assert_graph_data_equal(
+            no_relations.agents_to_torch_geometric(agents),
+            no_relations.to_torch_geometric(no_relations.agents_to_graph(agents)),
+        )
+
+        # Shared ids merge nodes in the NetworkX graph
+        agents[2].agent_id = agents[1].agent_id
+        assert_graph_data_equal(
+            converter.agents_to_torch_geometric(agents),
+            converter.to_torch_geometric(converter.agents_to_graph(agents)),
+        )
+
+
+def pairwise_relationships(converter, agents):
+    """Reference graph of inter-agent relationships from the pairwise rules."""
+    G = nx.Graph()
+    for i, agent1 in enumerate(agents):
+        uri1 = f"{AGENT}{agent1.agent_id or 'agent_default'}"
+        for agent2 in agents[i + 1 :]:
+            uri2 = f"{AGENT}{agent2.agent_id or 'agent_default'}"
+            if agent1.agent_id == agent2.agent_id:
+                continue
+
+            proximity = converter._calculate_proximity(agent1.position, agent2.position)
+            if proximity < converter.relationship_threshold:
+                G.add_edge(uri1, uri2, relation="proximity", weight=1.0 - proximity)
+
+            if agent1.inventory and agent2.inventory:
+                similarity = converter._calculate_inventory_similarity(
+                    agent1.inventory, agent2.inventory
+                )
+                if similarity > converter.relationship_threshold:
+                    G.add_edge(
+                        uri1, uri2, relation="inventory_similarity", weight=similarity
+                    )
+
+            if agent1.goals and agent2.goals:
+                overlap = converter._calculate_goal_overlap(agent1.goals, agent2.goals)
+                if overlap > converter.relationship_threshold:
+                    G.add_edge(uri1, uri2, relation="cooperation", weight=overlap)
+    return G
+
+
+def relationship_edges(G):
+    """Edges of a graph with string endpoints and float weights."""
+    return [
+        (str(u), str(v), data["relation"], float(data["weight"]))
+        for u, v, data in G.edges(data=True)
+    ]
+
+
+@skip_if_dependencies_missing
+class TestRelationshipEngine:
+    """Tests for the indexed inter-agent relationship construction."""
+
+    @pytest.mark.parametrize("threshold", [-0.1, 0.0, 0.05, 0.3, 0.5, 0.99, 1.0, 1.5])
+    def test_matches_pairwise_rules(self, threshold):
+        """Test the same edges, attributes and order as the pairwise loop."""
+        agents = generate_agent_states(count=60, random_seed=42)
+        agents[5].agent_id = agents[9].agent_id  # shared ids are skipped
+        agents[7].inventory = {}
+        agents[8].goals = []
+        converter = AgentStateToGraph(relationship_threshold=threshold)
+
+        G = nx.Graph()
+        converter._add_agent_relationships(G, agents)
+
+        assert relationship_edges(G) == relationship_edges(
+            pairwise_relationships(converter, agents)
+        )
+
+    def test_columnar_batch(self):
+        """Test that a columnar batch yields the same relationships as its rows."""
+        batch = AgentStateBatch.from_states(generate_agent_states(count=30, random_seed=1))
+        converter = AgentStateToGraph(relationship_threshold=0.4)
+
+        from_batch = nx.Graph()
+        converter._add_agent_relationships(from_batch, batch)
+        from_rows = nx.Graph()
+        converter._add_agent_relationships(from_rows, list(batch))
+
+        assert relationship_edges(from_batch) == relationship_edges(from_rows)
+
+    def test_proximity_pairs(self):
+        """Test the KD-tree proximity query on a small layout."""
+        positions = np.array([[0.0, 0.0, 0.0], [3.0, 4.0, 0.0], [50.0, 0.0, 0.0]])
+        sources, targets, weights = proximity_pairs(positions, threshold=0.06)
+
+        assert sources.tolist() == [0]
+        assert targets.tolist() == [1]
+        assert weights[0] == pytest.approx(0.95)
+
+    def test_jaccard_pairs_groups_identical_sets(self):
+        """Test Jaccard pairs within and across groups of identical sets."""
+        sets = [{"a", "b"}, {"a", "b"}, set(), {"a", "b", "c"}, {"d"}]
+        sources, targets, weights = jaccard_pairs(sets, threshold=0.5)
+
+        pairs = sorted(zip(sources.tolist(), targets.tolist(), weights.tolist()))
+        assert pairs == [
+            (0, 1, 1.0),
+            (0, 3, pytest.approx(2 / 3)),
+            (1, 3, pytest.approx(2 / 3)),
+        ]
+
+
 class TestGraphSerialization:
     """Tests for graph serialization functions."""
     
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the latent bitstream codecs.
+
+This script tests:
+- rANS round trips, including escaped out-of-range symbols
+- Interleaved rANS lanes over batches that do not fill the last row of lanes
+- Fixed-width packing of codebook indices
+- Entropy and VQ codec round trips against the compression modules
+- Measured bits per state
+"""
+
+import math
+
+import numpy as np
+import pytest
+import torch
+
+from meaning_transform.src.models import (
+    AdaptiveEntropyBottleneck,
+    EntropyBottleneck,
+    EntropyCodec,
+    MeaningVAE,
+    VectorQuantizer,
+    VQCodec,
+    create_latent_codec,
+)
+from meaning_transform.src.models.latent_codec import (
+    CODEC_HEADER,
+    LANE_HEADER,
+    MAX_LANES,
+    PROB_SCALE,
+    num_lanes,
+    pack_indices,
+    quantize_frequencies,
+    unpack_indices,
+)
+
+
+class TestCodingPrimitives:
+    """Tests for frequency tables and index packing."""
+
+    def test_quantize_frequencies(self):
+        """Test that frequencies sum to the probability scale and stay positive."""
+        freqs = quantize_frequencies(np.array([1e6, 1.0, 0.0, 3.0]))
+        assert freqs.sum() == PROB_SCALE
+        assert (freqs >= 1).all()
+
+    @pytest.mark.parametrize("bits", [1, 3, 8, 13, 16, 20])
+    def test_pack_indices(self, bits):
+        """Test packing round trips and the packed size."""
+        rng = np.random.default_rng(bits)
+        indices = rng.integers(0, 2**bits, size=101)
+
+        data = pack_indices(indices, bits)
+        assert len(data) == math.ceil(101 * bits / 8)
+        assert np.array_equal(unpack_indices(data, 101, bits), indices)
+
+
+class TestEntropyCodec:
+    """Tests for the rANS entropy codec."""
+
+    def test_symbol_round_trip_with_escapes(self):
+        """Test that fitted and out-of-range symbols decode exactly."""
+        rng = np.random.default_rng(0)
+        symbols = np.round(rng.normal(0, 2, size=(300, 6))).astype(np.int64)
+        codec = EntropyCodec(EntropyBottleneck(latent_dim=6)).fit_symbols(symbols)
+
+        unseen = symbols.copy()
+        unseen[::17, 2] = 10_000
+        unseen[5, 0] = -(2**31)
+
+        assert np.array_equal(codec.decode_symbols(codec.encode_symbols(unseen)), unseen)
+
+    @pytest.mark.parametrize("num_states", [0, 1, 31, 97, 40_000])
+    def test_interleaved_lanes(self, num_states):
+        """Test round trips for batches spread unevenly over the rANS lanes."""
+        rng = np.random.default_rng(num_states)
+        symbols = rng.integers(-3, 4, size=(max(num_states, 1), 5))
+        codec = EntropyCodec(EntropyBottleneck(latent_dim=5)).fit_symbols(symbols)
+
+        data = codec.encode_symbols(symbols[:num_states])
+        lanes, _ = LANE_HEADER.unpack_from(data, CODEC_HEADER.size)
+        assert lanes == num_lanes(num_states) <= MAX_LANES
+        assert np.array_equal(codec.decode_symbols(data), symbols[:num_states])
+
+    @pytest.mark.parametrize("bottleneck_class", [EntropyBottleneck, AdaptiveEntropyBottleneck])
+    def test_matches_inference_output(self, bottleneck_class):
+        """Test that decoded latents equal the bottleneck output in eval mode."""
+        torch.manual_seed(0)
+        bottleneck = bottleneck_class(latent_dim=8, compression_level=0.5).eval()
+        z = torch.randn(200, 8)
+        codec = EntropyCodec(bottleneck).fit(z)
+
+        with torch.no_grad():
+            expected, _ = bottleneck(z)
+        assert torch.allclose(codec.decode(codec.encode(z)), expected, atol=1e-6)
+
+    def test_state_dict_and_measure(self):
+        """Test restoring fitted tables and the size report."""
+        torch.manual_seed(0)
+        bottleneck = EntropyBottleneck(latent_dim=8).eval()
+        z = torch.randn(500, 8)
+        codec = EntropyCodec(bottleneck).fit(z)
+        data = codec.encode(z)
+
+        restored = EntropyCodec(bottleneck).load_state_dict(codec.state_dict())
+        assert torch.equal(restored.decode(data), codec.decode(data))
+
+        report = codec.measure(z)
+        assert report["num_bytes"] == len(data)
+        assert report["float32_bits_per_state"] == 256
+        assert report["bits_per_state"] < report["float32_bits_per_state"]
+
+    def test_requires_fit(self):
+        """Test that encoding before fitting is rejected."""
+        codec = EntropyCodec(EntropyBottleneck(latent_dim=4))
+        with pytest.raises(RuntimeError):
+            codec.encode(torch.randn(3, 4))
+
+
+class TestVQCodec:
+    """Tests for the VQ index codec."""
+
+    def test_round_trip_and_bits(self):
+        """Test index packing width and decoded embeddings."""
+        torch.manual_seed(0)
+        quantizer = VectorQuantizer(latent_dim=8, num_embeddings=100).eval()
+        z = torch.randn(64, 8)
+        codec = VQCodec(quantizer)
+
+        assert codec.bits == 7
+        with torch.no_grad():
+            expected, _, _ = quantizer(z)
+        assert torch.allclose(codec.decode(codec.encode(z)), expected, atol=1e-6)
+        assert codec.measure(z)["payload_bits_per_state"] == 7
+
+    def test_batches_and_header_checks(self):
+        """Test batch APIs and rejection of foreign bitstreams."""
+        quantizer = VectorQuantizer(latent_dim=4, num_embeddings=16, seed=1)
+        codec = VQCodec(quantizer)
+        batches = [torch.randn(5, 4), torch.randn(0, 4), torch.randn(9, 4)]
+
+        decoded = codec.decode_batches(codec.encode_batches(batches))
+        assert [len(d) for d in decoded] == [5, 0, 9]
+
+        entropy_codec = EntropyCodec(EntropyBottleneck(latent_dim=4)).fit_symbols(
+            np.zeros((2, 4), dtype=np.int64)
+        )
+        with pytest.raises(ValueError):
+            entropy_codec.decode_symbols(codec.encode(batches[0]))
+        with pytest.raises(ValueError):
+            codec.decode_symbols(b"not a bitstream")
+
+
+class TestCreateLatentCodec:
+    """Tests for create_latent_codec."""
+
+    def test_codec_per_compression_type(self):
+        """Test that each compression type gets its codec."""
+        assert isinstance(
+            create_latent_codec(MeaningVAE(input_dim=15, latent_dim=8)), EntropyCodec
+        )
+        assert isinstance(
+            create_latent_codec(
+                MeaningVAE(input_dim=15, latent_dim=8, compression_type="vq")
+            ),
+            VQCodec,
+        )
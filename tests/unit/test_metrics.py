@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the torch-native semantic metrics.
+
+This script tests:
+- bincount confusion matrices and the scores derived from them
+- Agreement of binary and role metrics with sklearn
+- Memoization of semantic statistics per (original, reconstructed) pair
+- Standardized evaluation on top of the shared statistics
+- Streaming accumulators and merging of sharded statistics
+"""
+
+import numpy as np
+import pytest
+import torch
+
+from meaning_transform.src.metrics import (
+    MetricsAccumulator,
+    SemanticMetrics,
+    binary_classification_scores,
+    confusion_counts,
+    confusion_to_list,
+)
+from meaning_transform.src.standardized_metrics import StandardizedMetrics
+
+
+def create_state_pair(batch_size=64, input_dim=15, seed=0):
+    """Create original states and a noisy reconstruction."""
+    generator = torch.Generator().manual_seed(seed)
+    original = torch.rand(batch_size, input_dim, generator=generator)
+    original[:, 3] = (original[:, 3] > 0.5).float()
+    roles = torch.randint(0, 5, (batch_size,), generator=generator)
+    original[:, 5:10] = torch.eye(5)[roles]
+
+    noise = 0.2 * torch.randn(batch_size, input_dim, generator=generator)
+    reconstructed = torch.clamp(original + noise, 0.0, 1.0)
+    return original, reconstructed
+
+
+class TestConfusionCounts:
+    """Tests for the confusion matrix helpers."""
+
+    def test_confusion_counts(self):
+        """Test bincount confusion matrices against a manual count."""
+        targets = torch.tensor([0, 1, 2, 2, 1])
+        predictions = torch.tensor([0, 2, 2, 1, 1])
+
+        counts = confusion_counts(targets, predictions, 3)
+        expected = torch.zeros(3, 3, dtype=torch.long)
+        for t, p in zip(targets, predictions):
+            expected[t, p] += 1
+
+        assert torch.equal(counts, expected)
+
+    def test_confusion_to_list_keeps_observed_labels(self):
+        """Test that unobserved labels are dropped like sklearn does."""
+        counts = confusion_counts(torch.tensor([1, 3, 3]), torch.tensor([1, 3, 1]), 5)
+        assert confusion_to_list(counts) == [[1, 0], [1, 1]]
+
+    def test_binary_scores_zero_division(self):
+        """Test that undefined precision/recall/F1 are reported as 1.0."""
+        scores = binary_classification_scores(np.array([[10, 0], [0, 0]]))
+        assert scores == {"accuracy": 1.0, "precision": 1.0, "recall": 1.0, "f1": 1.0}
+
+        scores = binary_classification_scores(np.array([[2, 1], [1, 2]]))
+        assert scores["precision"] == pytest.approx(2 / 3)
+        assert scores["f1"] == pytest.approx(2 / 3)
+
+
+class TestSemanticMetrics:
+    """Tests for the SemanticMetrics class."""
+
+    def test_matches_sklearn(self):
+        """Test binary and role metrics against sklearn."""
+        sklearn_metrics = pytest.importorskip("sklearn.metrics")
+        original, reconstructed = create_state_pair()
+        metrics = SemanticMetrics()
+
+        binary = metrics.binary_feature_accuracy(original, reconstructed)
+        features = metrics.extract_features(original)
+        recon_features = metrics.extract_features(reconstructed)
+        for feature in ["has_target", "is_alive", "threatened"]:
+            y_true = (features[feature] > 0.5).numpy().flatten()
+            y_pred = (recon_features[feature] > 0.5).numpy().flatten()
+
+            assert binary[f"{feature}_accuracy"] == pytest.approx(
+                sklearn_metrics.accuracy_score(y_true, y_pred)
+            )
+            assert binary[f"{feature}_precision"] == pytest.approx(
+                sklearn_metrics.precision_score(y_true, y_pred, zero_division=1.0)
+            )
+            assert binary[f"{feature}_recall"] == pytest.approx(
+                sklearn_metrics.recall_score(y_true, y_pred, zero_division=1.0)
+            )
+            assert binary[f"{feature}_f1"] == pytest.approx(
+                sklearn_metrics.f1_score(y_true, y_pred, zero_division=1.0)
+            )
+            assert (
+                binary[f"{feature}_confusion_matrix"]
+                == sklearn_metrics.confusion_matrix(y_true, y_pred).tolist()
+            )
+
+        roles = metrics.role_accuracy(original, reconstructed)
+        orig_roles = torch.argmax(original[:, 5:10], dim=1).numpy()
+        recon_roles = torch.argmax(reconstructed[:, 5:10], dim=1).numpy()
+        assert roles["role_accuracy"] == pytest.approx(
+            sklearn_metrics.accuracy_score(orig_roles, recon_roles)
+        )
+        assert (
+            roles["role_confusion_matrix"]
+            == sklearn_metrics.confusion_matrix(orig_roles, recon_roles).tolist()
+        )
+
+    def test_numeric_errors(self):
+        """Test numeric errors against a direct NumPy computation."""
+        original, reconstructed = create_state_pair()
+        metrics = SemanticMetrics()
+
+        errors = metrics.numeric_feature_errors(original, reconstructed)
+        orig = metrics.extract_features(original)["position"].double().numpy()
+        recon = metrics.extract_features(reconstructed)["position"].double().numpy()
+
+        assert errors["position_mae"] == pytest.approx(np.mean(np.abs(orig - recon)))
+        assert errors["position_rmse"] == pytest.approx(
+            np.sqrt(np.mean(np.square(orig - recon)))
+        )
+        assert errors["position_mape"] == pytest.approx(
+            np.mean(np.abs((orig - recon) / (orig + 1e-6))) * 100
+        )
+
+    def test_equivalence_matches_semantic_loss(self):
+        """Test equivalence scores against the semantic loss breakdown."""
+        original, reconstructed = create_state_pair()
+        metrics = SemanticMetrics()
+
+        scores = metrics.compute_equivalence_scores(original, reconstructed)
+        breakdown = metrics.semantic_loss.detailed_breakdown(reconstructed, original)
+        for feature, loss in breakdown.items():
+            assert scores[feature] == pytest.approx(1.0 / (1.0 + np.sqrt(loss)), rel=1e-5)
+
+    def test_statistics_memoized(self):
+        """Test that statistics are shared per pair and invalidated on mutation."""
+        original, reconstructed = create_state_pair()
+        metrics = SemanticMetrics()
+
+        stats = metrics.statistics(original, reconstructed)
+        assert metrics.statistics(original, reconstructed) is stats
+        assert metrics.statistics(original.clone(), reconstructed) is not stats
+
+        reconstructed.mul_(0.5)
+        assert metrics.statistics(original, reconstructed) is not stats
+
+        metrics.clear_cache()
+        assert metrics._statistics_cache == []
+
+    def test_evaluate_single_pass(self, monkeypatch):
+        """Test that a standardized evaluation featurizes each pair once."""
+        original, reconstructed = create_state_pair(seed=1)
+        baseline_original, baseline_reconstructed = create_state_pair(seed=2)
+        metrics = StandardizedMetrics()
+
+        calls = []
+        extract = metrics.semantic_loss.semantic_feature_matrix
+        monkeypatch.setattr(
+            metrics.semantic_loss,
+            "semantic_feature_matrix",
+            lambda states: calls.append(1) or extract(states),
+        )
+
+        evaluation = metrics.evaluate(
+            original, reconstructed, baseline_original, baseline_reconstructed
+        )
+
+        assert len(calls) == 2
+        assert 0.0 <= evaluation["overall_preservation"] <= 1.0
+        assert 0.0 <= evaluation["overall_fidelity"] <= 1.0
+        assert evaluation["overall_drift"] >= 0.0
+
+
+def assert_metrics_close(streamed, batch):
+    """Assert that two (possibly nested) metric dictionaries agree."""
+    assert streamed.keys() == batch.keys()
+    for key, value in batch.items():
+        if isinstance(value, dict):
+            assert_metrics_close(streamed[key], value)
+        elif isinstance(value, float):
+            assert streamed[key] == pytest.approx(value, rel=1e-12, abs=1e-12)
+        else:
+            assert streamed[key] == value
+
+
+class TestMetricsAccumulator:
+    """Tests for the MetricsAccumulator class."""
+
+    def test_matches_batch_evaluation(self):
+        """Test that streamed batches reproduce the batch API."""
+        original, reconstructed = create_state_pair(batch_size=100)
+        metrics = SemanticMetrics()
+
+        accumulator = MetricsAccumulator(metrics)
+        for start in range(0, 100, 32):
+            accumulator.update(original[start : start + 32], reconstructed[start : start + 32])
+
+        assert len(accumulator) == 100
+        assert_metrics_close(
+            accumulator.compute(), metrics.evaluate(original, reconstructed)
+        )
+
+    def test_merge_shards(self):
+        """Test that merged shard accumulators equal a single accumulator."""
+        original, reconstructed = create_state_pair(batch_size=90, seed=3)
+        metrics = StandardizedMetrics()
+
+        shards = [MetricsAccumulator(metrics) for _ in range(3)]
+        for i, shard in enumerate(shards):
+            shard.update(original[i * 30 : (i + 1) * 30], reconstructed[i * 30 : (i + 1) * 30])
+
+        merged = MetricsAccumulator(metrics)
+        merged.merge(shards[0]).merge(shards[1].statistics()).merge(shards[2])
+
+        assert_metrics_close(merged.compute(), metrics.evaluate(original, reconstructed))
+
+    def test_baseline_drift(self):
+        """Test drift measurement against a baseline accumulator."""
+        original, reconstructed = create_state_pair(seed=4)
+        baseline_original, baseline_reconstructed = create_state_pair(seed=5)
+        metrics = StandardizedMetrics()
+
+        current = MetricsAccumulator(metrics)
+        current.update(original, reconstructed)
+        baseline = MetricsAccumulator(metrics)
+        baseline.update(baseline_original, baseline_reconstructed)
+
+        assert_metrics_close(
+            current.compute(baseline),
+            metrics.evaluate(
+                original, reconstructed, baseline_original, baseline_reconstructed
+            ),
+        )
+
+    def test_reset(self):
+        """Test that reset discards accumulated statistics."""
+        original, reconstructed = create_state_pair()
+        accumulator = MetricsAccumulator()
+        accumulator.update(original, reconstructed)
+        accumulator.reset()
+
+        assert len(accumulator) == 0
+        assert accumulator.statistics().count == 0
@@ -31,6 +31,7 @@ from meaning_transform.src.models import (
     EntropyBottleneck,
     FeatureGroupedVAE,
     MeaningVAE,
+    NoiseGenerator,
     VectorQuantizer,
 )
 
@@ -241,6 +242,48 @@ class TestVectorQuantizer:
         # Perplexity should be low (close to 1) as we're using few codebook entries
         assert 1 <= perplexity.item() <= 5  # Should be much lower than num_embeddings
 
+    def test_nearest_code_search(self):
+        """Test matmul and chunked searches against cdist."""
+        torch.manual_seed(0)
+        vq = VectorQuantizer(latent_dim=8, num_embeddings=1000)
+        vq.embedding.weight.data.normal_()
+        z = torch.randn(64, 8)
+
+        expected = torch.argmin(torch.cdist(z, vq.embedding.weight), dim=1)
+        assert torch.equal(vq.quantize(z), expected)
+        assert torch.equal(vq.quantize(z, chunk_size=77), expected)
+
+        chunked = VectorQuantizer(latent_dim=8, num_embeddings=1000, search_chunk_size=128)
+        chunked.load_state_dict(vq.state_dict())
+        quantized, _, _ = chunked(z)
+        assert torch.allclose(quantized, vq.embedding.weight[expected], atol=1e-6)
+
+    def test_perplexity_from_counts(self):
+        """Test perplexity against the one-hot formulation."""
+        torch.manual_seed(0)
+        vq = VectorQuantizer(latent_dim=4, num_embeddings=32)
+        vq.embedding.weight.data.normal_()
+        z = torch.randn(50, 4)
+
+        _, _, perplexity = vq(z)
+        indices = vq.quantize(z)
+        avg_probs = torch.nn.functional.one_hot(indices, 32).float().mean(dim=0)
+        normalized = (avg_probs + 1e-10) / torch.sum(avg_probs + 1e-10)
+        entropy = -torch.sum(avg_probs * torch.log2(normalized + 1e-10))
+        assert perplexity.item() == pytest.approx(torch.exp(entropy).item(), rel=1e-5)
+
+    def test_index_only_round_trip(self):
+        """Test compact index storage and decoding from stored indices."""
+        vq = VectorQuantizer(latent_dim=4, num_embeddings=100, seed=0)
+        z = torch.randn(10, 4)
+
+        indices = vq.quantize(z, compact=True)
+        assert indices.dtype == torch.int16
+        assert VectorQuantizer(4, 40000).index_dtype == torch.int32
+
+        quantized, _, _ = vq.eval()(z)
+        assert torch.allclose(vq.dequantize(indices), quantized, atol=1e-6)
+
 
 class TestEntropyBottleneck:
     """Tests for the Entropy Bottleneck."""
@@ -368,6 +411,68 @@ class TestMeaningVAE:
         z2 = vae.reparameterize(mu, log_var)
         assert not torch.allclose(z, z2)
 
+    def test_seeded_noise(self):
+        """Test seeded noise independent of the global RNG and resumable."""
+        mu = torch.zeros(4, 8)
+        log_var = torch.zeros(4, 8)
+
+        vae = MeaningVAE(input_dim=15, latent_dim=8, seed=7)
+        torch.manual_seed(0)
+        first = vae.reparameterize(mu, log_var)
+        state = vae.state_dict()
+        second = vae.reparameterize(mu, log_var)
+        assert not torch.allclose(first, second)
+
+        # A fresh model with the same seed draws the same sequence
+        torch.manual_seed(1000)
+        assert torch.equal(
+            MeaningVAE(input_dim=15, latent_dim=8, seed=7).reparameterize(mu, log_var),
+            first,
+        )
+
+        # Restoring a checkpoint resumes the sequence
+        resumed = MeaningVAE(input_dim=15, latent_dim=8, seed=7)
+        resumed.load_state_dict(state)
+        assert torch.equal(resumed.reparameterize(mu, log_var), second)
+
+        # Checkpoints without generator state still load
+        legacy = {k: v for k, v in state.items() if not k.endswith("_extra_state")}
+        MeaningVAE(input_dim=15, latent_dim=8, seed=7).load_state_dict(legacy)
+
+    def test_seeded_noise_device(self):
+        """Test lazy generator creation on the noise device and state round trips."""
+        noise = NoiseGenerator(seed=3, stream="test")
+        assert noise.generator is None
+        assert noise.get_extra_state() == {}
+
+        reference = torch.zeros(5)
+        first = noise.randn_like(reference)
+        assert noise.generator.device == reference.device
+        state = noise.get_extra_state()
+        second = noise.randn_like(reference)
+
+        # Restored state applies when the generator is created, and survives
+        # saving again before any noise is drawn
+        restored = NoiseGenerator(seed=3, stream="test")
+        restored.set_extra_state(state)
+        assert restored.get_extra_state()["device"] == "cpu"
+        assert torch.equal(restored.randn_like(reference), second)
+        assert not torch.equal(first, second)
+
+    @pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA not available")
+    def test_seeded_noise_cuda(self):
+        """Test that noise for CUDA tensors is drawn by a CUDA generator."""
+        mu = torch.zeros(4, 8, device="cuda")
+        vae = MeaningVAE(input_dim=15, latent_dim=8, seed=7).cuda()
+        first = vae.reparameterize(mu, mu)
+        assert vae.noise.generator.device.type == "cuda"
+
+        # Seeded CUDA noise is reproducible and resumable
+        resumed = MeaningVAE(input_dim=15, latent_dim=8, seed=7).cuda()
+        assert torch.equal(resumed.reparameterize(mu, mu), first)
+        resumed.load_state_dict(vae.state_dict())
+        assert torch.equal(resumed.reparameterize(mu, mu), vae.reparameterize(mu, mu))
+
     def test_forward_tensor_entropy(self):
         """Test forward pass with tensor input and entropy bottleneck."""
         input_dim = 15
@@ -585,6 +690,21 @@ class TestMeaningVAE:
             assert "z_compressed" in eval_result
             assert eval_result["z_compressed"].shape == (batch_size, latent_dim)
 
+    def test_index_encoding(self):
+        """Test encoding to and decoding from VQ codebook indices."""
+        vae = MeaningVAE(input_dim=15, latent_dim=8, compression_type="vq", seed=0).eval()
+        x = torch.rand(6, 15)
+
+        indices = vae.encode_indices(x)
+        assert indices.shape == (6,) and indices.dtype == torch.int16
+
+        with torch.no_grad():
+            expected = vae(x)["reconstruction"]
+        assert torch.allclose(vae.decode_indices(indices), expected, atol=1e-6)
+
+        with pytest.raises(ValueError):
+            MeaningVAE(input_dim=15, latent_dim=8).encode_indices(x)
+
 
 class TestAdaptiveEntropyBottleneck:
     """Tests for the AdaptiveEntropyBottleneck."""
@@ -1003,8 +1123,10 @@ class TestFeatureGroupedVAE:
         batch_size = 4
         seed = 42
 
-        # Create model with seed
+        # Create two models with the same seed
         vae = FeatureGroupedVAE(input_dim=input_dim, latent_dim=latent_dim, seed=seed)
+        vae2 = FeatureGroupedVAE(input_dim=input_dim, latent_dim=latent_dim, seed=seed)
+        vae2.load_state_dict(vae.state_dict())
 
         # Create random input
         x = torch.randn(batch_size, input_dim)
@@ -1013,9 +1135,9 @@ class TestFeatureGroupedVAE:
         torch.manual_seed(0)  # Reset global seed
         first_output = vae(x)
 
-        # Second pass should be the same even if global seed changes
+        # Same pass on the second model should match even if global seed changes
         torch.manual_seed(1000)  # Change global seed dramatically
-        second_output = vae(x)
+        second_output = vae2(x)
 
         # Results should be identical due to internal seed
         # Compare specific tensors from the output dictionaries
@@ -1026,6 +1148,9 @@ class TestFeatureGroupedVAE:
         assert torch.allclose(first_output["log_var"], second_output["log_var"])
         assert torch.allclose(first_output["z"], second_output["z"])
 
+        # Successive batches draw fresh noise
+        assert not torch.allclose(vae(x)["z"], first_output["z"])
+
     def test_forward_input_validation(self):
         """Test input validation in forward method."""
         input_dim = 15
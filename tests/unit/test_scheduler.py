@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the ASHA early-stopping scheduler.
+
+This script tests:
+- Rung budgets derived from the grace period and reduction factor
+- Promotion of the top trials and early stopping of the rest
+- Scores combining val_loss and semantic drift
+- Rung records shared between scheduler instances through a file
+- The --asha wiring of the compression and hyperparameter tuning drivers
+"""
+
+import importlib.util
+import math
+import sys
+from pathlib import Path
+
+from meaning_transform.experiment.compression import run_compression_experiments
+from meaning_transform.experiment.scheduler import ASHAScheduler
+from meaning_transform.src.data import AgentStateDataset, generate_agent_states
+
+TUNING_SCRIPT = (
+    Path(__file__).resolve().parents[2] / "experiments" / "run_hyperparameter_tuning.py"
+)
+
+
+def run_trial(scheduler, trial_id, val_loss, max_epochs=30):
+    """Report a constant val_loss until the scheduler stops the trial."""
+    for epoch in range(max_epochs):
+        if scheduler.on_epoch_end(trial_id, epoch, {"val_loss": val_loss}):
+            return epoch + 1
+    return max_epochs
+
+
+def load_tuning_script():
+    """Import the hyperparameter tuning driver from its script path."""
+    spec = importlib.util.spec_from_file_location("run_hyperparameter_tuning", TUNING_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def create_dataset():
+    """Small train/validation split with drift tracking states."""
+    states = generate_agent_states(count=64, random_seed=0)
+    return {
+        "train": AgentStateDataset(states[:48], batch_size=16),
+        "val": AgentStateDataset(states[48:], batch_size=16),
+        "drift_tracking": states[48:53],
+    }
+
+
+def losing_scheduler():
+    """Scheduler whose first rung already holds two better scores."""
+    scheduler = ASHAScheduler(max_epochs=3, reduction_factor=2)
+    scheduler.on_epoch_end("x", 0, {"val_loss": -2.0})
+    scheduler.on_epoch_end("y", 0, {"val_loss": -1.0})
+    return scheduler
+
+
+class TestASHAScheduler:
+    """Tests for the ASHAScheduler class."""
+
+    def test_rungs(self):
+        """Test rung budgets below the full budget."""
+        assert ASHAScheduler(max_epochs=30).rungs == [1, 3, 9, 27]
+        assert ASHAScheduler(max_epochs=20, grace_period=2, reduction_factor=2).rungs == [
+            2,
+            4,
+            8,
+            16,
+        ]
+
+    def test_stops_losing_trials(self):
+        """Test that worse trials stop at the first rung and better ones continue."""
+        scheduler = ASHAScheduler(max_epochs=30)
+        epochs = {
+            trial_id: run_trial(scheduler, trial_id, loss)
+            for trial_id, loss in [("a", 1.0), ("b", 0.5), ("c", 2.0), ("d", 0.1)]
+        }
+
+        assert epochs == {"a": 30, "b": 30, "c": 1, "d": 30}
+        assert scheduler.stopped == {"c": 1}
+
+    def test_waits_for_full_rung(self):
+        """Test that no trial stops before a rung holds reduction_factor scores."""
+        scheduler = ASHAScheduler(max_epochs=9)
+
+        assert not scheduler.on_epoch_end("a", 0, {"val_loss": 0.1})
+        assert not scheduler.on_epoch_end("b", 0, {"val_loss": 5.0})
+        assert scheduler.on_epoch_end("c", 0, {"val_loss": 3.0})
+        assert scheduler.stopped == {"c": 1}
+
+    def test_score(self):
+        """Test drift weighting and missing or NaN metrics."""
+        scheduler = ASHAScheduler(max_epochs=10, drift_weight=2.0)
+
+        assert scheduler.score({"val_loss": 1.0, "overall_drift": 0.25}) == 1.5
+        assert scheduler.score({"val_loss": float("nan")}) == math.inf
+        assert scheduler.score({}) == math.inf
+
+    def test_shared_state(self, tmp_path):
+        """Test that schedulers sharing a state file see each other's records."""
+        state_path = tmp_path / "rungs.jsonl"
+        first = ASHAScheduler(max_epochs=9, state_path=state_path)
+        second = ASHAScheduler(max_epochs=9, state_path=state_path)
+
+        assert not first.on_epoch_end("a", 0, {"val_loss": 0.1})
+        assert not second.on_epoch_end("b", 0, {"val_loss": 0.2})
+        assert second.on_epoch_end("c", 0, {"val_loss": 0.3})
+        assert first.rung_records()[1] == {"a": 0.1, "b": 0.2, "c": 0.3}
+
+
+class TestDriverWiring:
+    """Tests for the --asha options of the experiment drivers."""
+
+    ASHA_ARGS = [
+        "--asha",
+        "--asha-grace-period",
+        "2",
+        "--asha-reduction-factor",
+        "2",
+        "--asha-drift-weight",
+        "0.5",
+        "--epochs",
+        "8",
+    ]
+
+    def check_scheduler(self, scheduler):
+        """Test the scheduler built from ASHA_ARGS."""
+        assert isinstance(scheduler, ASHAScheduler)
+        assert scheduler.max_epochs == 8
+        assert scheduler.rungs == [2, 4]
+        assert scheduler.drift_weight == 0.5
+
+    def test_compression_cli(self, tmp_path, monkeypatch):
+        """Test that --asha reaches the CompressionExperiment."""
+        experiments = []
+        monkeypatch.setattr(
+            run_compression_experiments.CompressionExperiment,
+            "run_experiments",
+            lambda self: experiments.append(self),
+        )
+        monkeypatch.setattr(
+            sys, "argv", ["run", "--output-dir", str(tmp_path), *self.ASHA_ARGS]
+        )
+
+        run_compression_experiments.main()
+
+        self.check_scheduler(experiments[0].scheduler)
+
+    def test_tuning_cli(self, tmp_path, monkeypatch):
+        """Test that --asha reaches the HyperparameterTuningExperiment."""
+        tuning = load_tuning_script()
+        experiments = []
+        monkeypatch.setattr(
+            tuning.HyperparameterTuningExperiment,
+            "run_experiments",
+            lambda self: experiments.append(self),
+        )
+        monkeypatch.setattr(
+            sys, "argv", ["run", "--output-dir", str(tmp_path), *self.ASHA_ARGS]
+        )
+
+        tuning.main()
+
+        self.check_scheduler(experiments[0].scheduler)
+
+    def test_compression_trial_stopped(self, tmp_path):
+        """Test that a losing compression level stops at the first rung."""
+        scheduler = losing_scheduler()
+        experiment = run_compression_experiments.CompressionExperiment(
+            output_dir=str(tmp_path), use_beta_annealing=False, scheduler=scheduler
+        )
+        experiment.base_config.verbose = False
+        experiment.base_config.model.input_dim = 15
+        experiment.base_config.model.latent_dim = 8
+        experiment.base_config.training.num_epochs = 3
+        experiment.base_config.training.batch_size = 16
+
+        config = experiment._create_config_for_level(1.0)
+        model = experiment._create_model(config, 1.0)
+        results = experiment._train_model(model, config, create_dataset())
+
+        assert len(results["val_losses"]) == 1
+        assert scheduler.stopped == {config.experiment_name: 1}
+
+    def test_tuning_trial_stopped(self, tmp_path):
+        """Test that a losing tuning trial records epochs_trained and early_stopped."""
+        tuning = load_tuning_script()
+        scheduler = losing_scheduler()
+        experiment = tuning.HyperparameterTuningExperiment(
+            output_dir=str(tmp_path), scheduler=scheduler
+        )
+        experiment.base_config.verbose = False
+        experiment.base_config.model.input_dim = 15
+        experiment.base_config.training.num_epochs = 3
+        experiment.base_config.training.batch_size = 16
+
+        result = experiment._run_trial(
+            "trial",
+            {"latent_dim": 8, "compression_level": 1.0, "semantic_weight": 0.5},
+            create_dataset(),
+        )
+
+        assert result["epochs_trained"] == 1
+        assert result["early_stopped"]
+        assert scheduler.stopped == {"trial": 1}
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the binary and columnar serialization of agent states.
+
+This script tests:
+- Round trips through pack_many/unpack_many
+- Zero-copy unpacking into AgentStateBatch
+- Backward compatibility with legacy JSON binary blobs
+- Columnar .npz archives for bulk state lists, including appends
+- Variable-length UTF-8 string columns in columnar archives
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+import torch
+
+from meaning_transform.src.data import (
+    AgentState,
+    AgentStateBatch,
+    AgentStateDataset,
+    deserialize_states,
+    generate_agent_states,
+    serialize_states,
+)
+from meaning_transform.src.serialization import (
+    PACKED_FORMAT_VERSION,
+    RECORD_DTYPE,
+    append_states,
+    is_columnar,
+    is_packed,
+    pack_many,
+    read_batch,
+    read_states,
+    unpack_batch,
+    unpack_many,
+    write_states,
+)
+
+
+def assert_states_equal(left, right):
+    """Assert that two agent states hold the same attributes."""
+    assert left.to_dict() == right.to_dict()
+
+
+class TestPackedFormat:
+    """Tests for the packed record format."""
+
+    def test_pack_unpack_many(self):
+        """Test that bulk packing preserves every attribute."""
+        states = generate_agent_states(count=25, random_seed=42)
+        buffer = pack_many(states)
+
+        assert buffer[0] == PACKED_FORMAT_VERSION
+        assert is_packed(buffer)
+
+        unpacked = unpack_many(buffer)
+        assert len(unpacked) == len(states)
+        for original, restored in zip(states, unpacked):
+            assert_states_equal(original, restored)
+
+    def test_optional_fields_and_unknown_role(self):
+        """Test None fields and roles outside the one-hot vocabulary."""
+        state = AgentState(position=(1.0, None, 3.0), role="scout", leader=True)
+        restored = unpack_many(pack_many([state]))[0]
+
+        assert restored.position == (1.0, None, 3.0)
+        assert restored.role == "scout"
+        assert restored.resource_level is None
+        assert restored.step_number is None
+        assert restored.agent_id is None
+        assert restored.properties == {"leader": True}
+
+    def test_unpack_from_memoryview(self):
+        """Test unpacking from a memoryview slice of a larger buffer."""
+        states = generate_agent_states(count=5, random_seed=1)
+        payload = pack_many(states)
+        framed = memoryview(b"\xff" * 7 + payload + b"\xff" * 3)[7 : 7 + len(payload)]
+
+        for original, restored in zip(states, unpack_many(framed)):
+            assert_states_equal(original, restored)
+
+    def test_unpack_batch(self):
+        """Test unpacking directly into a columnar batch."""
+        states = generate_agent_states(count=12, random_seed=3)
+        buffer = pack_many(states)
+
+        batch = unpack_batch(buffer)
+        assert isinstance(batch, AgentStateBatch)
+        assert batch.agent_ids == [state.agent_id for state in states]
+        assert torch.equal(
+            batch.to_tensor(), AgentStateBatch.from_states(states).to_tensor()
+        )
+
+    def test_record_size(self):
+        """Test that the buffer size is fixed per state plus the side channel."""
+        states = [AgentState() for _ in range(10)]
+        buffer = pack_many(states)
+        assert len(buffer) == 12 + 10 * RECORD_DTYPE.itemsize
+
+    def test_truncated_buffer(self):
+        """Test that truncated buffers are rejected."""
+        buffer = pack_many(generate_agent_states(count=3, random_seed=0))
+        with pytest.raises(ValueError):
+            unpack_many(buffer[:-10])
+
+
+class TestAgentStateBinary:
+    """Tests for AgentState.to_binary/from_binary compatibility."""
+
+    def test_to_binary_uses_packed_format(self):
+        """Test that single states are written in the packed format."""
+        state = generate_agent_states(count=1, random_seed=5)[0]
+        binary = state.to_binary()
+
+        assert is_packed(binary)
+        assert_states_equal(AgentState.from_binary(binary), state)
+
+    def test_reads_legacy_json(self):
+        """Test that legacy JSON blobs are still readable."""
+        state = generate_agent_states(count=1, random_seed=5)[0]
+        legacy = state.to_json_binary()
+
+        assert not is_packed(legacy)
+        assert_states_equal(AgentState.from_binary(legacy), state)
+
+
+class TestColumnarFormat:
+    """Tests for the columnar .npz archive format."""
+
+    def test_write_and_read(self, tmp_path):
+        """Test that a columnar archive round trips every attribute."""
+        states = generate_agent_states(count=30, random_seed=42)
+        states.append(AgentState(position=(0.5, None, 1.0), role="scout"))
+        path = tmp_path / "states.npz"
+
+        write_states(path, states)
+        assert is_columnar(path)
+
+        for original, restored in zip(states, read_states(path)):
+            assert_states_equal(original, restored)
+
+    def test_archive_loads_without_pickle(self, tmp_path):
+        """Test that archives contain only plain arrays without fixed-width strings."""
+        path = tmp_path / "states.npz"
+        write_states(path, generate_agent_states(count=5, random_seed=1))
+
+        with np.load(path, allow_pickle=False) as archive:
+            assert all(archive[name].dtype.kind not in "OUS" for name in archive.files)
+
+    def test_variable_length_strings(self, tmp_path):
+        """Test UTF-8 strings of very different lengths stored as bytes plus offsets."""
+        states = [
+            AgentState(agent_id="ä", goals=["short"], notes="x" * 1000),
+            AgentState(agent_id="agent-ß-2", inventory={"wóod": 3}),
+            AgentState(agent_id="ä"),
+        ]
+        path = tmp_path / "states.npz"
+        write_states(path, states[:2])
+        append_states(path, states[2:])
+
+        for original, restored in zip(states, read_states(path)):
+            assert_states_equal(original, restored)
+
+        with np.load(path, allow_pickle=False) as archive:
+            properties = archive["chunk_000000/properties_bytes"]
+            assert properties.dtype == np.uint8
+            assert len(properties) == len('{"notes":""}') + 1000
+
+    def test_append(self, tmp_path):
+        """Test appending chunks to an existing archive."""
+        states = generate_agent_states(count=20, random_seed=7)
+        path = tmp_path / "states.npz"
+
+        append_states(path, states[:8])
+        append_states(path, states[8:15])
+        append_states(path, AgentStateBatch.from_states(states[15:]))
+
+        restored = read_states(path)
+        assert len(restored) == 20
+        for original, loaded in zip(states[:15], restored[:15]):
+            assert_states_equal(original, loaded)
+        assert [s.agent_id for s in restored[15:]] == [s.agent_id for s in states[15:]]
+
+        batch = read_batch(path)
+        assert torch.equal(
+            batch.to_tensor(), AgentStateBatch.from_states(states).to_tensor()
+        )
+
+    def test_serialize_states_compatibility(self, tmp_path):
+        """Test serialize_states output and opt-in legacy pickles with load_from_file."""
+        states = generate_agent_states(count=10, random_seed=3)
+
+        data = serialize_states(states)
+        assert is_columnar(data)
+        for original, restored in zip(states, deserialize_states(data)):
+            assert_states_equal(original, restored)
+
+        legacy = pickle.dumps([state.to_dict() for state in states])
+        with pytest.raises(ValueError):
+            deserialize_states(legacy)
+        for original, restored in zip(states, deserialize_states(legacy, allow_pickle=True)):
+            assert_states_equal(original, restored)
+
+        legacy_path = tmp_path / "states.pkl"
+        legacy_path.write_bytes(legacy)
+        with pytest.raises(ValueError):
+            AgentStateDataset().load_from_file(legacy_path)
+        dataset = AgentStateDataset()
+        dataset.load_from_file(legacy_path, allow_pickle=True)
+        assert len(dataset) == 10
+
+        path = tmp_path / "states.npz"
+        path.write_bytes(data)
+        dataset = AgentStateDataset()
+        dataset.load_from_file(path)
+        assert len(dataset) == 10
+        assert dataset.states_tensor.shape == (10, 15)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the parallel sweep executor.
+
+This script tests:
+- Trials in worker processes reading the shared memory-mapped dataset
+- Exact drift tracking states in worker processes
+- Per-worker thread budgets
+- Incremental results and resuming an interrupted sweep
+"""
+
+import json
+
+import torch
+
+from meaning_transform.experiment.sweep import SweepExecutor
+from meaning_transform.src.data import AgentStateDataset, generate_agent_states
+
+
+def describe_data(trial_id, params, data):
+    """Trial that reports what the worker sees."""
+    return {
+        "scale": params["scale"],
+        "num_train": len(data["train"].states_tensor),
+        "train_sum": float(data["train"].states_tensor.sum()),
+        "num_drift": len(data["drift_tracking"]),
+        "drift_states": [
+            [s.agent_id, s.step_number, s.inventory, s.age, s.total_reward]
+            for s in data["drift_tracking"]
+        ],
+        "threads": torch.get_num_threads(),
+    }
+
+
+def create_datasets():
+    """Small train/validation split with drift states from the validation start."""
+    states = generate_agent_states(count=40, random_seed=0)
+    return {
+        "train": AgentStateDataset(states[:30], batch_size=8),
+        "val": AgentStateDataset(states[30:], batch_size=8),
+        "drift_tracking": states[30:35],
+    }
+
+
+class TestSweepExecutor:
+    """Tests for the SweepExecutor class."""
+
+    def test_worker_processes(self, tmp_path):
+        """Test that workers see the shared dataset and their thread budget."""
+        datasets = create_datasets()
+        executor = SweepExecutor(
+            tmp_path / "trials.jsonl", max_workers=2, threads_per_worker=1
+        )
+        executor.share_dataset(datasets)
+
+        trials = {f"t{i}": {"scale": i} for i in range(3)}
+        results = executor.run(describe_data, trials)
+
+        assert list(results) == ["t0", "t1", "t2"]
+        expected_sum = float(datasets["train"].states_tensor.sum())
+        expected_drift = [
+            [s.agent_id, s.step_number, s.inventory, s.age, s.total_reward]
+            for s in datasets["drift_tracking"]
+        ]
+        for result in results.values():
+            assert result["num_train"] == 30
+            assert result["num_drift"] == 5
+            assert result["drift_states"] == expected_drift
+            assert result["threads"] == 1
+            assert abs(result["train_sum"] - expected_sum) < 1e-3
+
+    def test_resume(self, tmp_path):
+        """Test that recorded trials are skipped and a truncated line is ignored."""
+        results_path = tmp_path / "trials.jsonl"
+        with open(results_path, "w") as f:
+            f.write(json.dumps({"trial_id": "t0", "result": {"scale": -1}}) + "\n")
+            f.write('{"trial_id": "t1", "res')
+
+        calls = []
+
+        def trial(trial_id, params, data):
+            calls.append(trial_id)
+            return {"scale": params["scale"]}
+
+        executor = SweepExecutor(results_path)
+        executor.share_dataset(create_datasets())
+        results = executor.run(trial, {f"t{i}": {"scale": i} for i in range(3)})
+
+        assert calls == ["t1", "t2"]
+        assert results == {"t0": {"scale": -1}, "t1": {"scale": 1}, "t2": {"scale": 2}}
+        assert executor.load_results() == results
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the memory-mapped tensor cache.
+
+This script tests:
+- Saving and zero-copy loading of encoded feature matrices
+- Header validation and invalidation when the source changes
+- Train/validation split round trips
+"""
+
+import pytest
+import torch
+
+from meaning_transform.src.data import (
+    AgentStateBatch,
+    AgentStateDataset,
+    generate_agent_states,
+)
+from meaning_transform.src.tensor_cache import (
+    CACHE_SCHEMA_VERSION,
+    TensorCache,
+    source_fingerprint,
+)
+
+
+@pytest.fixture
+def features():
+    """Encoded feature matrix for a small set of synthetic states."""
+    states = generate_agent_states(count=20, random_seed=42)
+    return AgentStateBatch.from_states(states).to_tensor()
+
+
+class TestTensorCache:
+    """Tests for the TensorCache class."""
+
+    def test_save_and_load(self, tmp_path, features):
+        """Test that cached features load back unchanged and memory-mapped."""
+        cache = TensorCache(tmp_path)
+        header = cache.save(features, "hash", {"num_states": 20}, range(16), range(16, 20))
+
+        assert header["schema_version"] == CACHE_SCHEMA_VERSION
+        assert header["train"] == {"start": 0, "stop": 16}
+
+        loaded, loaded_header = cache.load()
+        assert loaded_header == header
+        assert loaded.dtype == torch.float32
+        assert torch.equal(loaded, features)
+
+    def test_load_split(self, tmp_path, features):
+        """Test contiguous and non-contiguous split indices."""
+        cache = TensorCache(tmp_path)
+
+        cache.save(features, "hash", {}, range(15), range(15, 20))
+        train, val, _ = cache.load_split()
+        assert torch.equal(train, features[:15])
+        assert torch.equal(val, features[15:])
+
+        cache.save(features, "hash", {}, [0, 2, 4], [1, 3])
+        train, val, _ = cache.load_split()
+        assert torch.equal(train, features[[0, 2, 4]])
+        assert torch.equal(val, features[[1, 3]])
+
+    def test_invalidation(self, tmp_path, features):
+        """Test that source or query changes invalidate the cache."""
+        cache = TensorCache(tmp_path)
+        assert not cache.is_valid("hash", {"num_states": 20})
+
+        cache.save(features, "hash", {"num_states": 20}, range(20), [])
+        assert cache.is_valid("hash", {"num_states": 20})
+        assert not cache.is_valid("other_hash", {"num_states": 20})
+        assert not cache.is_valid("hash", {"num_states": 10})
+
+    def test_get_or_build(self, tmp_path, features):
+        """Test that the cache is built once and rebuilt on source change."""
+        cache = TensorCache(tmp_path)
+        calls = []
+
+        def build():
+            calls.append(1)
+            return features, range(18), range(18, 20)
+
+        cache.get_or_build("hash", {}, build)
+        train, val, _ = cache.get_or_build("hash", {}, build)
+        assert len(calls) == 1
+        assert len(train) == 18 and len(val) == 2
+
+        cache.get_or_build("new_hash", {}, build)
+        assert len(calls) == 2
+
+    def test_source_fingerprint(self, tmp_path):
+        """Test that the fingerprint changes with file contents."""
+        source = tmp_path / "simulation.db"
+        source.write_bytes(b"a" * 100)
+        first = source_fingerprint(source)
+
+        source.write_bytes(b"b" * 101)
+        assert source_fingerprint(source) != first
+
+    def test_dataset_from_cached_tensor(self, tmp_path, features):
+        """Test that datasets wrap cached tensors without copying."""
+        cache = TensorCache(tmp_path)
+        cache.save(features, "hash", {}, range(20), [])
+        train, _, _ = cache.load_split()
+
+        dataset = AgentStateDataset.from_tensor(train, batch_size=8)
+        assert len(dataset) == 20
+        assert dataset.states_tensor.data_ptr() == train.data_ptr()
+        assert dataset.get_batch().shape == (8, 15)
+
+        # States are decoded only when first accessed
+        assert dataset._states is None
+        assert len(dataset.states) == 20
+        assert dataset.states is dataset.states
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the training helpers.
+
+This script tests:
+- On-device accumulation of per-batch loss components
+- Averaging of tensor, float and missing components
+- Mixed-precision and compile execution modes with CPU fallbacks
+- One-epoch CPU smoke tests with torch.compile and fused Adam
+- CUDA autocast with the loss computed outside it
+- Epoch hooks, including stopping training from a hook
+"""
+
+import math
+
+import pytest
+import torch
+
+from meaning_transform.src.config import Config
+from meaning_transform.src.data import AgentStateDataset, generate_agent_states
+from meaning_transform.src.train import LossAccumulator, Trainer
+
+
+def create_trainer(tmp_path, device="cpu", **training_options):
+    """Small trainer (CPU by default) with synthetic data already prepared."""
+    config = Config()
+    config.verbose = False
+    config.model.input_dim = 15
+    config.model.latent_dim = 8
+    config.training.batch_size = 16
+    config.training.checkpoint_dir = str(tmp_path)
+    for key, value in training_options.items():
+        setattr(config.training, key, value)
+
+    trainer = Trainer(config, device=device)
+    states = generate_agent_states(count=64, random_seed=0)
+    trainer.train_dataset = AgentStateDataset(states[:48], batch_size=16)
+    trainer.val_dataset = AgentStateDataset(states[48:], batch_size=16)
+    trainer.drift_tracking_states = states[48:53]
+    return trainer
+
+
+class TestLossAccumulator:
+    """Tests for the LossAccumulator class."""
+
+    def test_averages(self):
+        """Test averaging of tensor, float and missing values."""
+        accumulator = LossAccumulator(["loss", "kl_loss", "edge_loss"])
+
+        accumulator.update({"loss": torch.tensor(1.0, requires_grad=True), "kl_loss": 0.5})
+        accumulator.update({"loss": torch.tensor([3.0]), "kl_loss": torch.tensor(1.5)})
+
+        averages = accumulator.compute()
+        assert averages == pytest.approx({"loss": 2.0, "kl_loss": 1.0, "edge_loss": 0.0})
+        assert accumulator.count == 2
+
+    def test_reset(self):
+        """Test that reset clears sums and counts."""
+        accumulator = LossAccumulator(["loss"])
+        accumulator.update({"loss": torch.tensor(4.0)})
+        accumulator.reset()
+
+        assert accumulator.count == 0
+        assert accumulator.compute() == {"loss": 0.0}
+
+
+class TestExecutionModes:
+    """Tests for the Trainer precision and compile options."""
+
+    def test_fp32_default(self, tmp_path):
+        """Test that the default mode runs eagerly without autocast or scaling."""
+        trainer = create_trainer(tmp_path)
+
+        assert trainer.autocast_dtype is None
+        assert not trainer.scaler.is_enabled()
+        assert trainer.forward_fn is trainer.model
+
+    def test_cpu_fallbacks(self, tmp_path):
+        """Test that fp16 on CPU falls back to bf16 and trains."""
+        trainer = create_trainer(tmp_path, precision="fp16")
+
+        assert trainer.autocast_dtype == torch.bfloat16
+        assert not trainer.scaler.is_enabled()
+
+        metrics = trainer.train_epoch()
+        assert math.isfinite(metrics["train_loss"])
+        assert math.isfinite(trainer.validate()["val_loss"])
+
+    @pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA not available")
+    @pytest.mark.parametrize("precision", ["bf16", "fp16"])
+    def test_cuda_autocast(self, tmp_path, precision):
+        """Test that CUDA autocast trains, with the loss computed in float32."""
+        trainer = create_trainer(tmp_path, device="cuda", precision=precision)
+        if precision == "bf16" and not torch.cuda.is_bf16_supported():
+            pytest.skip("bf16 not supported on this GPU")
+
+        metrics = trainer.train_epoch()
+        assert math.isfinite(metrics["train_loss"])
+        assert math.isfinite(trainer.validate()["val_loss"])
+
+    def check_trained_epoch(self, trainer, history):
+        """Test a finite loss and uncompiled state_dict keys in the checkpoint."""
+        assert math.isfinite(history["train_losses"][0]["train_loss"])
+        assert math.isfinite(history["val_losses"][0]["val_loss"])
+
+        checkpoint = torch.load(trainer.checkpoint_writer.directory / "latest_model.pt")
+        keys = set(checkpoint["model_state_dict"])
+        assert keys == set(trainer.model.state_dict())
+        assert not any("_orig_mod" in key for key in keys)
+
+    @pytest.mark.skipif(not hasattr(torch, "compile"), reason="torch.compile not available")
+    def test_compile_smoke(self, tmp_path):
+        """Test one compiled training epoch on the CPU."""
+        trainer = create_trainer(tmp_path, num_epochs=1, compile=True)
+        assert trainer.forward_fn is not trainer.model
+
+        self.check_trained_epoch(trainer, trainer.train())
+
+    def test_fused_optimizer_smoke(self, tmp_path):
+        """Test one training epoch with fused Adam (or its fallback) on the CPU."""
+        trainer = create_trainer(tmp_path, num_epochs=1, fused_optimizer=True)
+        assert trainer.optimizer.defaults.get("fused", False) == trainer._fused_adam_supported()
+
+        self.check_trained_epoch(trainer, trainer.train())
+
+    def test_invalid_precision(self, tmp_path):
+        """Test that unknown precisions are rejected."""
+        with pytest.raises(ValueError):
+            create_trainer(tmp_path, precision="fp8")
+
+
+class TestHooks:
+    """Tests for Trainer.register_hook."""
+
+    def test_post_epoch_hook_stops_training(self, tmp_path):
+        """Test that hooks see each epoch and a post-epoch hook can stop training."""
+        trainer = create_trainer(tmp_path, num_epochs=5)
+        seen = []
+
+        trainer.register_hook("pre_epoch", lambda _, epoch: seen.append(("pre", epoch)))
+        trainer.register_hook(
+            "post_epoch",
+            lambda _, epoch, metrics: seen.append(("post", epoch, "val_loss" in metrics))
+            or epoch == 1,
+        )
+        history = trainer.train()
+
+        assert seen == [("pre", 0), ("post", 0, True), ("pre", 1), ("post", 1, True)]
+        assert len(history["val_losses"]) == 2
+
+        # The checkpoint writer thread is stopped once training ends
+        assert trainer.checkpoint_writer._executor is None
+
+    def test_unknown_event(self, tmp_path):
+        """Test that unknown hook events are rejected."""
+        with pytest.raises(ValueError):
+            create_trainer(tmp_path).register_hook("post_batch", lambda *args: None)